@@ -142,6 +142,7 @@ register('behavior.do-not-show-previously-seen-addon-updates', True)
 register('behavior.date-about-range', 50)
 register('behavior.date-after-range', 50)
 register('behavior.date-before-range', 50)
+register('behavior.filter-processes', 0)
 register('behavior.generation-depth', 15)
 register('behavior.max-age-prob-alive', 110)
 register('behavior.max-sib-age-diff', 20)
@@ -167,6 +168,10 @@ register('database.autobackup', 0)
 register('database.path', os.path.join(HOME_DIR, 'grampsdb'))
 register('database.host', '')
 register('database.port', '')
+register('database.undo-depth', 1000)
+register('database.undo-log', True)
+register('database.cache-size', 2000)
+register('database.serializer', 'blob')
 
 register('export.proxy-order',
          [["privacy", 0],
@@ -605,6 +605,146 @@ class DbReadBase:
         """
         raise NotImplementedError
 
+    def get_citations_from_handles(self, handles):
+        """
+        Return a list of the Citations in the database with the passed
+        handles, in the same order as the handles.
+
+        :param handles: handles of the objects to search for.
+        :type handles: list
+
+        If any of the Citations does not exist, a HandleError is raised.
+        Note: if used through a proxy (Filter for reports etc.) a 'None' is
+        returned for each object that is filtered out.
+        """
+        raise NotImplementedError
+
+    def get_events_from_handles(self, handles):
+        """
+        Return a list of the Events in the database with the passed
+        handles, in the same order as the handles.
+
+        :param handles: handles of the objects to search for.
+        :type handles: list
+
+        If any of the Events does not exist, a HandleError is raised.
+        Note: if used through a proxy (Filter for reports etc.) a 'None' is
+        returned for each object that is filtered out.
+        """
+        raise NotImplementedError
+
+    def get_families_from_handles(self, handles):
+        """
+        Return a list of the Families in the database with the passed
+        handles, in the same order as the handles.
+
+        :param handles: handles of the objects to search for.
+        :type handles: list
+
+        If any of the Families does not exist, a HandleError is raised.
+        Note: if used through a proxy (Filter for reports etc.) a 'None' is
+        returned for each object that is filtered out.
+        """
+        raise NotImplementedError
+
+    def get_media_from_handles(self, handles):
+        """
+        Return a list of the Media objects in the database with the passed
+        handles, in the same order as the handles.
+
+        :param handles: handles of the objects to search for.
+        :type handles: list
+
+        If any of the Media objects does not exist, a HandleError is raised.
+        Note: if used through a proxy (Filter for reports etc.) a 'None' is
+        returned for each object that is filtered out.
+        """
+        raise NotImplementedError
+
+    def get_notes_from_handles(self, handles):
+        """
+        Return a list of the Notes in the database with the passed
+        handles, in the same order as the handles.
+
+        :param handles: handles of the objects to search for.
+        :type handles: list
+
+        If any of the Notes does not exist, a HandleError is raised.
+        Note: if used through a proxy (Filter for reports etc.) a 'None' is
+        returned for each object that is filtered out.
+        """
+        raise NotImplementedError
+
+    def get_people_from_handles(self, handles):
+        """
+        Return a list of the People in the database with the passed
+        handles, in the same order as the handles.
+
+        :param handles: handles of the objects to search for.
+        :type handles: list
+
+        If any of the People does not exist, a HandleError is raised.
+        Note: if used through a proxy (Filter for reports etc.) a 'None' is
+        returned for each object that is filtered out.
+        """
+        raise NotImplementedError
+
+    def get_places_from_handles(self, handles):
+        """
+        Return a list of the Places in the database with the passed
+        handles, in the same order as the handles.
+
+        :param handles: handles of the objects to search for.
+        :type handles: list
+
+        If any of the Places does not exist, a HandleError is raised.
+        Note: if used through a proxy (Filter for reports etc.) a 'None' is
+        returned for each object that is filtered out.
+        """
+        raise NotImplementedError
+
+    def get_repositories_from_handles(self, handles):
+        """
+        Return a list of the Repositories in the database with the passed
+        handles, in the same order as the handles.
+
+        :param handles: handles of the objects to search for.
+        :type handles: list
+
+        If any of the Repositories does not exist, a HandleError is raised.
+        Note: if used through a proxy (Filter for reports etc.) a 'None' is
+        returned for each object that is filtered out.
+        """
+        raise NotImplementedError
+
+    def get_sources_from_handles(self, handles):
+        """
+        Return a list of the Sources in the database with the passed
+        handles, in the same order as the handles.
+
+        :param handles: handles of the objects to search for.
+        :type handles: list
+
+        If any of the Sources does not exist, a HandleError is raised.
+        Note: if used through a proxy (Filter for reports etc.) a 'None' is
+        returned for each object that is filtered out.
+        """
+        raise NotImplementedError
+
+    def get_tags_from_handles(self, handles):
+        """
+        Return a list of the Tags in the database with the passed
+        handles, in the same order as the handles.
+
+        :param handles: handles of the objects to search for.
+        :type handles: list
+
+        If any of the Tags does not exist, a HandleError is raised.
+        Note: if used through a proxy (Filter for reports etc.) a 'None' is
+        returned for each object that is filtered out.
+        """
+        raise NotImplementedError
+
     def get_citation_handles(self, sort_handles=False, locale=glocale):
         """
         Return a list of database handles, one handle for each Citation in
@@ -1460,6 +1600,294 @@ class DbReadBase:
         """
         return getattr(self, fmt % tuple([arg.lower() for arg in args]), None)
 
+    def select_handles(self, class_name, where, values):
+        """
+        Return the handles of the primary objects of a class that satisfy an
+        SQL condition, evaluated by the database engine.
+
+        :param class_name: the name of the class of the objects, eg 'Person'.
+        :type class_name: str
+        :param where: an SQL condition on the secondary columns of the table
+                      of the objects, with '?' for each of the values.
+        :type where: str
+        :param values: the values of the condition.
+        :type values: list
+        :returns: the handles of the matching objects, or None if the
+                  database cannot evaluate SQL conditions.
+        :rtype: list
+        """
+        return None
+
+    def get_sort_values(self, class_name, field, locale=glocale):
+        """
+        Return the value of a secondary field of every primary object of a
+        class, without unserializing the objects.
+
+        :param class_name: the name of the class of the objects, eg 'Person'.
+        :type class_name: str
+        :param field: the name of the secondary field, eg 'gramps_id'.
+        :type field: str
+        :param locale: The locale to use for collation.
+        :type locale: A GrampsLocale object.
+        :returns: a list of (value, handle) tuples ordered by value, or None
+                  if the database does not store the field separately.
+        :rtype: list
+        """
+        return None
+
+    def get_person_summary(self, handle):
+        """
+        Return the values of the people view columns of a person which
+        depend on its events, families and notes, kept up to date by the
+        database.
+
+        :param handle: handle of the person
+        :type handle: str
+        :returns: a dictionary with the keys birth_event, birth_fallback,
+                  birth_sort, birth_place_event, birth_place_fallback, the
+                  same for death, and the counts parents, marriages,
+                  children and todo, or None if the database does not keep
+                  them.
+        :rtype: dict
+        """
+        return None
+
+    def get_surname_group_counts(self):
+        """
+        Return the number of people for each combination of the fields of
+        their primary name which decide their surname group.
+
+        :returns: a list of (group_as, surname, patronymic, count) tuples,
+                  where surname is the primary surname and patronymic is 1
+                  if it is the only surname and of patronymic or matronymic
+                  origin, or None if the database cannot count them.
+        :rtype: list
+        """
+        return None
+
+    def get_surname_group_handles(self, group_as, surname, patronymic):
+        """
+        Return the handles of the people with the passed surname group
+        fields, as returned by :meth:`get_surname_group_counts`.
+
+        :returns: a list of handles, or None if the database cannot select
+                  them.
+        :rtype: list
+        """
+        return None
+
+    def get_place_child_counts(self):
+        """
+        Return the number of places directly enclosed by each place.
+
+        :returns: a dictionary keyed by the handle of the enclosing place,
+                  where top level places are counted under '', or None if
+                  the database cannot count them.
+        :rtype: dict
+        """
+        return None
+
+    def get_place_child_handles(self, handle):
+        """
+        Return the handles of the places directly enclosed by a place.
+
+        :param handle: handle of the enclosing place, or '' for the top
+                       level places.
+        :type handle: str
+        :returns: a list of handles, or None if the database cannot select
+                  them.
+        :rtype: list
+        """
+        return None
+
+    def get_ancestor_handles(self, handles, main_only=False,
+                             max_generations=None):
+        """
+        Return the ancestors of the People with the passed handles.
+
+        :param handles: handles of the People whose ancestors are wanted.
+        :type handles: list
+        :param main_only: if True, only the main parent family of each
+                          person is followed.
+        :type main_only: bool
+        :param max_generations: the number of generations to follow, or None
+                                to follow all of them.
+        :type max_generations: int
+        :returns: a dictionary mapping the handle of each ancestor to the
+                  smallest number of generations between the ancestor and
+                  one of the passed People, who are included with a
+                  generation of 0.
+        :rtype: dict
+
+        This default implementation walks the People and Families.  Database
+        backends may answer it from an index instead.
+        """
+        def get_parents(people):
+            family_handles = set()
+            for person in people:
+                if main_only:
+                    family_handle = person.get_main_parents_family_handle()
+                    if family_handle:
+                        family_handles.add(family_handle)
+                else:
+                    family_handles.update(person.parent_family_list)
+            parents = set()
+            for family in self.get_families_from_handles(family_handles):
+                if family:
+                    parents.add(family.father_handle)
+                    parents.add(family.mother_handle)
+            return parents
+        return self.__walk_people(handles, get_parents, max_generations)
+
+    def get_descendant_handles(self, handles, max_generations=None):
+        """
+        Return the descendants of the People with the passed handles.
+
+        :param handles: handles of the People whose descendants are wanted.
+        :type handles: list
+        :param max_generations: the number of generations to follow, or None
+                                to follow all of them.
+        :type max_generations: int
+        :returns: a dictionary mapping the handle of each descendant to the
+                  smallest number of generations between the descendant and
+                  one of the passed People, who are included with a
+                  generation of 0.
+        :rtype: dict
+
+        This default implementation walks the People and Families.  Database
+        backends may answer it from an index instead.
+        """
+        def get_children(people):
+            family_handles = set()
+            for person in people:
+                family_handles.update(person.family_list)
+            children = set()
+            for family in self.get_families_from_handles(family_handles):
+                if family:
+                    children.update(child_ref.ref
+                                    for child_ref in family.child_ref_list)
+            return children
+        return self.__walk_people(handles, get_children, max_generations)
+
+    def get_related_handles(self, handles):
+        """
+        Return the People related to the People with the passed handles,
+        through any chain of parents, children and spouses.
+
+        :param handles: handles of the People whose relatives are wanted.
+        :type handles: list
+        :returns: the handles of the relatives, including the passed People.
+        :rtype: set
+
+        This default implementation walks the People and Families.  Database
+        backends may answer it from an index instead.
+        """
+        seen_families = set()
+        def get_relatives(people):
+            family_handles = set()
+            for person in people:
+                family_handles.update(person.parent_family_list)
+                family_handles.update(person.family_list)
+            family_handles -= seen_families
+            seen_families.update(family_handles)
+            relatives = set()
+            for family in self.get_families_from_handles(family_handles):
+                if family:
+                    relatives.add(family.father_handle)
+                    relatives.add(family.mother_handle)
+                    relatives.update(child_ref.ref
+                                     for child_ref in family.child_ref_list)
+            return relatives
+        return set(self.__walk_people(handles, get_relatives, None))
+
+    def iter_objects_by_handle(self, class_name):
+        """
+        Return an iterator over the primary objects of a class, sorted by
+        handle.  Backends can override this method to read the objects in
+        that order without looking up each handle.
+
+        :param class_name: the name of the class of the objects, eg 'Person'.
+        :type class_name: str
+        :returns: an iterator over the objects.
+        :rtype: iterator
+        """
+        get_object = self.method('get_%s_from_handle', class_name)
+        for handle in sorted(self.method('iter_%s_handles', class_name)()):
+            obj = get_object(handle)
+            if obj:
+                yield obj
+
+    def get_reference_map(self, class_name, handles):
+        """
+        Return the references recorded in the reference map of the database
+        for the primary objects of a class with the passed handles, without
+        unserializing the objects.
+
+        :param class_name: the name of the class of the objects, eg 'Person'.
+        :type class_name: str
+        :param handles: handles of the objects.
+        :type handles: list
+        :returns: a dictionary mapping each handle to a list of the
+                  (class_name, handle) tuples recorded for the object, or
+                  None if the database has no reference map to read.
+        :rtype: dict
+        """
+        return None
+
+    def get_missing_references(self, ref_class):
+        """
+        Return the references to objects of a class which are not in the
+        database, found from the reference map of the database without
+        unserializing the objects holding them.  References without a
+        handle are included.
+
+        :param ref_class: the name of the class of the referenced objects,
+                          eg 'Place'.
+        :type ref_class: str
+        :returns: a list of (class_name, handle, ref_handle) tuples, one for
+                  each reference, giving the object holding the reference
+                  and the handle it refers to; or None if the database has
+                  no reference map to read.
+        :rtype: list
+        """
+        return None
+
+    def get_orphan_references(self):
+        """
+        Return the entries of the reference map of the database which are
+        held by objects that are not in the database.
+
+        :returns: a list of (class_name, handle, ref_class, ref_handle)
+                  tuples, one for each entry, or None if the database has no
+                  reference map to read.
+        :rtype: list
+        """
+        return None
+
+    def __walk_people(self, handles, get_next, max_generations):
+        """
+        Breadth first walk from the People with the passed handles, one
+        generation at a time.  get_next is given the People of a generation
+        and returns the handles of the next one.
+        """
+        generations = {}
+        current = set(handle for handle in handles if handle)
+        generation = 0
+        while current:
+            # Skip any dangling references
+            current = [handle for handle in current
+                       if self.basedb.has_person_handle(handle)]
+            people = [person for person in
+                      self.get_people_from_handles(current) if person]
+            for person in people:
+                generations[person.handle] = generation
+            if generation == max_generations:
+                break
+            current = set(handle for handle in get_next(people)
+                          if handle and handle not in generations)
+            generation += 1
+        return generations
+
 
 class DbWriteBase(DbReadBase):
     """
@@ -0,0 +1,133 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2020       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Read cache for the primary objects of a database.
+
+The cache holds the raw data of recently read objects, so that it can be
+shared by all the views, gramplets and reports using the database without
+decoding the stored data again.  Objects are always created afresh from the
+cached data, because callers are free to modify the objects they get.
+"""
+
+#------------------------------------------------------------------------
+#
+# Python modules
+#
+#------------------------------------------------------------------------
+from collections import OrderedDict
+
+#------------------------------------------------------------------------
+#
+# Gramps modules
+#
+#------------------------------------------------------------------------
+from .dbconst import KEY_TO_NAME_MAP
+
+__all__ = ('DbCache',)
+
+#------------------------------------------------------------------------
+#
+# DbCache
+#
+#------------------------------------------------------------------------
+class DbCache:
+    """
+    A least recently used cache of raw object data, with a separate entry
+    budget for each object type.
+    """
+
+    def __init__(self, size, budgets=None):
+        """
+        :param size: The maximum number of entries kept for each object
+                     type.  A size of 0 disables the cache.
+        :type size: int
+        :param budgets: Optional maximum number of entries for particular
+                        object types, keyed by object key.
+        :type budgets: dict
+        """
+        self.__maps = {}
+        self.__budgets = {}
+        for obj_key in KEY_TO_NAME_MAP:
+            self.__maps[obj_key] = OrderedDict()
+            self.__budgets[obj_key] = size
+        if budgets:
+            self.__budgets.update(budgets)
+        self.hits = 0
+        self.misses = 0
+
+    def enabled(self, obj_key):
+        """
+        Return True if objects of the given type are cached.
+        """
+        return self.__budgets[obj_key] > 0
+
+    def get(self, obj_key, handle):
+        """
+        Return the cached data of an object, or None if it is not cached.
+        """
+        cache = self.__maps[obj_key]
+        data = cache.get(handle)
+        if data is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            cache.move_to_end(handle)
+        return data
+
+    def put(self, obj_key, handle, data):
+        """
+        Add the data of an object to the cache, removing the least recently
+        used entry if the budget of the object type is exceeded.
+        """
+        budget = self.__budgets[obj_key]
+        if budget <= 0:
+            return
+        cache = self.__maps[obj_key]
+        cache[handle] = data
+        cache.move_to_end(handle)
+        if len(cache) > budget:
+            cache.popitem(last=False)
+
+    def discard(self, obj_key, handle):
+        """
+        Remove an object from the cache, if present.
+        """
+        self.__maps[obj_key].pop(handle, None)
+
+    def clear(self):
+        """
+        Remove all entries from the cache.
+        """
+        for cache in self.__maps.values():
+            cache.clear()
+
+    def __len__(self):
+        return sum(len(cache) for cache in self.__maps.values())
+
+    def get_stats(self):
+        """
+        Return a dictionary of cache statistics: the number of hits and
+        misses, and the number of entries for each object type.
+        """
+        stats = {'hits': self.hits, 'misses': self.misses}
+        for obj_key, cache in self.__maps.items():
+            stats[KEY_TO_NAME_MAP[obj_key]] = len(cache)
+        return stats
@@ -57,6 +57,8 @@ DBLOCKS = 100000          # Maximum number of locks supported
 DBOBJECTS = 100000          # Maximum number of simultaneously locked objects
 DBUNDO = 1000            # Maximum size of undo buffer
 ARRAYSIZE = 1000            # The arraysize for a SQL cursor
+BATCHSIZE = 1000            # Objects buffered by a batch transaction
+INSIZE = 500                # Handles in an SQL IN clause
 
 PERSON_KEY = 0
 FAMILY_KEY = 1
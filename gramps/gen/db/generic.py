@@ -35,6 +35,8 @@ import ast
 import sys
 import datetime
 import glob
+import sqlite3
+import zlib
 
 #------------------------------------------------------------------------
 #
@@ -46,12 +48,15 @@ from . import (DbReadBase, DbWriteBase, DbUndo, DBLOGNAME, DBUNDOFN,
                CITATION_KEY, SOURCE_KEY, EVENT_KEY, MEDIA_KEY, PLACE_KEY,
                REPOSITORY_KEY, NOTE_KEY, TAG_KEY, TXNADD, TXNUPD, TXNDEL,
                KEY_TO_NAME_MAP, DBMODE_R, DBMODE_W)
+from .dbconst import ARRAYSIZE, CLASS_TO_KEY_MAP
 from .utils import write_lock_file, clear_lock_file
 from .exceptions import DbVersionError, DbUpgradeRequiredError
 from ..errors import HandleError
 from ..utils.callback import Callback
 from ..updatecallback import UpdateCallback
 from .bookmarks import DbBookmarks
+from .cache import DbCache
+from .serializers import BlobSerializer, get_serializer, get_field_path
 
 from ..utils.id import create_id
 from ..lib.researcher import Researcher
@@ -79,9 +84,17 @@ def touch(fname, mode=0o666, dir_fd=None, **kwargs):
                      dir_fd=None if os.supports_fd else dir_fd, **kwargs)
 
 class DbGenericUndo(DbUndo):
+    """
+    Undo/redo manager which keeps the undo records in memory.
+
+    At most `depth` transactions are kept for undo; the records of older
+    transactions are discarded.  A depth of zero, the default, means no
+    limit.
+    """
     def __init__(self, grampsdb, path):
         super(DbGenericUndo, self).__init__(grampsdb)
         self.undodb = []
+        self.depth = 0
 
     def open(self, value=None):
         """
@@ -124,6 +137,31 @@ class DbGenericUndo(DbUndo):
         """
         return len(self.undodb)
 
+    def get_records(self, recnos):
+        """
+        Return an iterator over the unpickled records with the given record
+        numbers, in the order given.
+        """
+        for record_id in recnos:
+            yield pickle.loads(self[record_id])
+
+    def discard(self, recnos):
+        """
+        Release the records with the given record numbers.  They belong to a
+        transaction which can no longer be undone.
+        """
+        for record_id in recnos:
+            self.undodb[record_id] = None
+
+    def commit(self, txn, msg):
+        """
+        Commit the transaction to the undo/redo database, and drop the oldest
+        transactions when the undo depth is exceeded.
+        """
+        super(DbGenericUndo, self).commit(txn, msg)
+        while self.depth and len(self.undoq) > self.depth:
+            self.discard(self.undoq.popleft().get_recnos())
+
     def _redo(self, update_history):
         """
         Access the last undone transaction, and revert the data to the state
@@ -140,9 +178,8 @@ class DbGenericUndo(DbUndo):
         # Process all records in the transaction
         try:
             self.db._txn_begin()
-            for record_id in subitems:
-                (key, trans_type, handle, old_data, new_data) = \
-                    pickle.loads(self.undodb[record_id])
+            for (key, trans_type, handle, old_data, new_data) in \
+                    self.get_records(subitems):
 
                 if key == REFERENCE_KEY:
                     self.db.undo_reference(new_data, handle)
@@ -189,9 +226,8 @@ class DbGenericUndo(DbUndo):
         # Process all records in the transaction
         try:
             self.db._txn_begin()
-            for record_id in subitems:
-                (key, trans_type, handle, old_data, new_data) = \
-                        pickle.loads(self.undodb[record_id])
+            for (key, trans_type, handle, old_data, new_data) in \
+                    self.get_records(subitems):
 
                 if key == REFERENCE_KEY:
                     self.db.undo_reference(old_data, handle)
@@ -251,6 +287,130 @@ class DbGenericUndo(DbUndo):
                         self.db.emit(KEY_TO_NAME_MAP[obj_type] + typ,
                                      (handles,))
 
+class DbGenericUndoLog(DbGenericUndo):
+    """
+    Undo/redo manager which keeps the undo records in an append-only log,
+    stored in an SQLite file next to the database.
+
+    Records are compressed, and only the records of the current transaction
+    are held in memory until the transaction is committed.  The log only
+    lives for the duration of a session.  The undo depth is set by the
+    database.undo-depth option.
+    """
+    def __init__(self, grampsdb, path):
+        super(DbGenericUndoLog, self).__init__(grampsdb, path)
+        self.depth = config.get('database.undo-depth')
+        self.path = path
+        self.connection = None
+        self.window = {}
+        self.count = 0
+
+    def open(self, value=None):
+        """
+        Open the log, discarding any records left by a previous session.
+        """
+        self.connection = sqlite3.connect(self.path)
+        self.connection.execute("DROP TABLE IF EXISTS undo")
+        self.connection.execute("CREATE TABLE undo "
+                                "(recno INTEGER PRIMARY KEY, data BLOB)")
+        self.connection.commit()
+        self.window = {}
+        self.count = 0
+
+    def close(self):
+        """
+        Close and remove the log.
+        """
+        if self.connection is None:
+            return
+        self.connection.close()
+        self.connection = None
+        self.window = {}
+        if self.path != ':memory:' and os.path.isfile(self.path):
+            os.remove(self.path)
+
+    def flush(self):
+        """
+        Write the records held in memory to the log.
+        """
+        if self.window:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO undo (recno, data) VALUES (?, ?)",
+                self.window.items())
+            self.connection.commit()
+            self.window = {}
+
+    def append(self, value):
+        """
+        Add a new record on the end, and return its record number.
+        """
+        recno = self.count
+        self.count += 1
+        self.window[recno] = zlib.compress(value)
+        if len(self.window) >= ARRAYSIZE:
+            self.flush()
+        return recno
+
+    def __getitem__(self, index):
+        """
+        Returns a record by record number.
+        """
+        if index in self.window:
+            return zlib.decompress(self.window[index])
+        cursor = self.connection.execute(
+            "SELECT data FROM undo WHERE recno = ?", [index])
+        row = cursor.fetchone()
+        if row is None:
+            raise IndexError(index)
+        return zlib.decompress(row[0])
+
+    def __setitem__(self, index, value):
+        """
+        Set a record to a value.
+        """
+        self.window[index] = zlib.compress(value)
+
+    def __len__(self):
+        """
+        Returns the number of records.
+        """
+        return self.count
+
+    def get_records(self, recnos):
+        """
+        Return an iterator over the unpickled records with the given record
+        numbers, streamed from the log in the order given.
+        """
+        if not recnos:
+            return
+        self.flush()
+        first, last = min(recnos), max(recnos)
+        order = "DESC" if recnos[0] > recnos[-1] else "ASC"
+        cursor = self.connection.execute(
+            "SELECT data FROM undo WHERE recno BETWEEN ? AND ? "
+            "ORDER BY recno %s" % order, [first, last])
+        for row in cursor:
+            yield pickle.loads(zlib.decompress(row[0]))
+
+    def discard(self, recnos):
+        """
+        Delete the records with the given record numbers from the log.
+        """
+        if not recnos:
+            return
+        self.flush()
+        self.connection.execute(
+            "DELETE FROM undo WHERE recno BETWEEN ? AND ?",
+            [min(recnos), max(recnos)])
+        self.connection.commit()
+
+    def commit(self, txn, msg):
+        """
+        Commit the transaction to the undo/redo database.
+        """
+        self.flush()
+        super(DbGenericUndoLog, self).commit(txn, msg)
+
 class Cursor:
     def __init__(self, iterator):
         self.iterator = iterator
@@ -312,7 +472,7 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
 
     __callback_map = {}
 
-    VERSION = (20, 0, 0)
+    VERSION = (22, 0, 0)
 
     def __init__(self, directory=None):
         DbReadBase.__init__(self)
@@ -521,6 +681,8 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
         self.set_note_id_prefix('N%04d')
         # ----------------------------------
         self.undodb = None
+        self.cache = DbCache(0)
+        self.serializer = BlobSerializer
         self.cmap_index = 0
         self.smap_index = 0
         self.emap_index = 0
@@ -596,6 +758,18 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
         if not self._schema_exists():
             self._create_schema()
             self._set_metadata('version', str(self.VERSION[0]))
+            self._set_metadata('serializer',
+                               config.get('database.serializer'))
+
+        # Storage format of the primary objects:
+        self.serializer = get_serializer(
+            self._get_metadata('serializer', BlobSerializer.name))
+
+        # Read cache of the primary objects:
+        self.cache = DbCache(config.get('database.cache-size'))
+
+        # Secondary tables, missing before the upgrade of an old database:
+        self._check_schema()
 
         # Load metadata
         self.name_formats = self._get_metadata('name_formats')
@@ -636,11 +810,17 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
 
         self._set_save_path(directory)
 
-        if self._directory:
+        if self._directory == ':memory:':
+            self.undolog = ':memory:'
+        elif self._directory:
             self.undolog = os.path.join(self._directory, DBUNDOFN)
         else:
             self.undolog = None
-        self.undodb = DbGenericUndo(self, self.undolog)
+        if (self.undolog and not self.readonly
+                and config.get('database.undo-log')):
+            self.undodb = DbGenericUndoLog(self, self.undolog)
+        else:
+            self.undodb = DbGenericUndo(self, self.undolog)
         self.undodb.open()
 
         # Other items to load
@@ -675,6 +855,29 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
                 self.close()
                 raise DbUpgradeRequiredError(dbversion, self.VERSION[0])
 
+    def _check_schema(self):
+        """
+        Find which of the secondary tables added by schema upgrades the
+        database has.
+        """
+        pass
+
+    def _add_secondary_tables(self):
+        """
+        Add the secondary tables of schema version 21.  They are filled by
+        the rebuild of the secondary indexes at the end of the upgrade.
+        """
+        pass
+
+    def set_serializer(self, name, callback=None):
+        """
+        Convert the primary objects to another storage format.
+
+        :param name: The name of the serializer, 'blob' or 'json'.
+        :type name: str
+        """
+        raise NotImplementedError
+
     def _close(self):
         """
         Close database backend.
@@ -747,11 +950,17 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
 
             self._close()
 
-            try:
-                clear_lock_file(self.get_save_path())
-            except IOError:
-                pass
-
+            # a read-only connection did not take the lock, which may belong
+            # to another connection to the same database
+            if not self.readonly:
+                try:
+                    clear_lock_file(self.get_save_path())
+                except IOError:
+                    pass
+
+        if self.undodb is not None:
+            self.undodb.close()
+        self.cache.clear()
         self.db_is_open = False
         self._directory = None
 
@@ -1272,11 +1481,61 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
             raise HandleError('Handle is None')
         if not handle:
             raise HandleError('Handle is empty')
+        obj = self._get_object(obj_key, obj_class, handle)
+        if obj:
+            return obj
+        else:
+            raise HandleError('Handle %s not found' % handle)
+
+    def _get_object(self, obj_key, obj_class, handle):
+        """
+        Return the object with the given handle, or None if it does not exist.
+        """
         data = self._get_raw_data(obj_key, handle)
         if data:
             return obj_class.create(data)
-        else:
-            raise HandleError('Handle %s not found' % handle)
+        return None
+
+    def get_field(self, class_name, handle, path):
+        """
+        Return a single field of a primary object, without creating the
+        object.  Where the storage format allows it, the field is extracted
+        without decoding the object either.
+
+        :param class_name: The name of the primary object class, such as
+                           'Person'.
+        :type class_name: str
+        :param handle: The handle of the object.
+        :type handle: str
+        :param path: A dotted field path, such as 'primary_name.first_name'.
+                     List items are selected by index, such as
+                     'event_ref_list.0.ref'.
+        :type path: str
+        :returns: The value of the field, as in the raw data of the object,
+                  or None if the object or field does not exist.
+        :raises ValueError: If the path is not a field holding a string,
+                            number or boolean, or a list of these.
+        """
+        obj_class = self._get_table_func(class_name, "class_func")
+        steps, schema_type, is_list = get_field_path(obj_class, path)
+        value = self._get_field(CLASS_TO_KEY_MAP[class_name], handle, steps,
+                                is_list)
+        if schema_type == 'boolean' and not is_list and value is not None:
+            value = bool(value)
+        return value
+
+    def _get_field(self, obj_key, handle, steps, is_list):
+        """
+        Return a single field of a primary object, from its raw data.
+        Backends which can extract a field from the stored data should
+        override this method.
+        """
+        value = self._get_raw_data(obj_key, handle)
+        for index, dummy in steps:
+            if value is None or index >= len(value):
+                return None
+            value = value[index]
+        return value
 
     def get_event_from_handle(self, handle):
         return self._get_from_handle(EVENT_KEY, Event, handle)
@@ -1308,6 +1567,66 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
     def get_tag_from_handle(self, handle):
         return self._get_from_handle(TAG_KEY, Tag, handle)
 
+    ################################################################
+    #
+    # get_*_from_handles methods
+    #
+    ################################################################
+
+    def _get_from_handles(self, obj_key, obj_class, handles):
+        handles = list(handles)
+        objs = self._get_objects(obj_key, obj_class, handles)
+        for handle in handles:
+            if handle not in objs:
+                if not handle:
+                    raise HandleError('Handle is empty')
+                raise HandleError('Handle %s not found' % handle)
+        return [objs[handle] for handle in handles]
+
+    def _get_objects(self, obj_key, obj_class, handles):
+        """
+        Return a dictionary of the objects with the given handles.  Handles
+        which do not exist are left out.  Backends which can fetch several
+        objects at once should override this method.
+        """
+        objs = {}
+        for handle in handles:
+            if handle and handle not in objs:
+                obj = self._get_object(obj_key, obj_class, handle)
+                if obj:
+                    objs[handle] = obj
+        return objs
+
+    def get_events_from_handles(self, handles):
+        return self._get_from_handles(EVENT_KEY, Event, handles)
+
+    def get_families_from_handles(self, handles):
+        return self._get_from_handles(FAMILY_KEY, Family, handles)
+
+    def get_repositories_from_handles(self, handles):
+        return self._get_from_handles(REPOSITORY_KEY, Repository, handles)
+
+    def get_people_from_handles(self, handles):
+        return self._get_from_handles(PERSON_KEY, Person, handles)
+
+    def get_places_from_handles(self, handles):
+        return self._get_from_handles(PLACE_KEY, Place, handles)
+
+    def get_citations_from_handles(self, handles):
+        return self._get_from_handles(CITATION_KEY, Citation, handles)
+
+    def get_sources_from_handles(self, handles):
+        return self._get_from_handles(SOURCE_KEY, Source, handles)
+
+    def get_notes_from_handles(self, handles):
+        return self._get_from_handles(NOTE_KEY, Note, handles)
+
+    def get_media_from_handles(self, handles):
+        return self._get_from_handles(MEDIA_KEY, Media, handles)
+
+    def get_tags_from_handles(self, handles):
+        return self._get_from_handles(TAG_KEY, Tag, handles)
+
     ################################################################
     #
     # get_*_from_gramps_id methods
@@ -1581,13 +1900,23 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
     def iter_tags(self):
         return self._iter_objects(Tag)
 
+    def iter_objects_by_handle(self, class_name):
+        """
+        Return an iterator over the primary objects of a class, sorted by
+        handle, read from the database in that order.
+        """
+        class_ = self._get_table_func(class_name, "class_func")
+        for data in self._iter_raw_data(CLASS_TO_KEY_MAP[class_name],
+                                        ordered=True):
+            yield class_.create(data[1])
+
     ################################################################
     #
     # _iter_raw_*_data methods
     #
     ################################################################
 
-    def _iter_raw_data(self, obj_key):
+    def _iter_raw_data(self, obj_key, ordered=False):
         raise NotImplementedError
 
     def _iter_raw_person_data(self):
@@ -2492,7 +2821,7 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
         from gramps.gen.db.upgrade import (
             gramps_upgrade_14, gramps_upgrade_15, gramps_upgrade_16,
             gramps_upgrade_17, gramps_upgrade_18, gramps_upgrade_19,
-            gramps_upgrade_20)
+            gramps_upgrade_20, gramps_upgrade_21, gramps_upgrade_22)
 
         if version < 14:
             gramps_upgrade_14(self)
@@ -2508,6 +2837,10 @@ class DbGeneric(DbWriteBase, DbReadBase, UpdateCallback, Callback):
             gramps_upgrade_19(self)
         if version < 20:
             gramps_upgrade_20(self)
+        if version < 21:
+            gramps_upgrade_21(self)
+        if version < 22:
+            gramps_upgrade_22(self)
 
         self.rebuild_secondary(callback)
         self.reindex_reference_map(callback)
@@ -0,0 +1,240 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2020       Gramps Development Team
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Storage formats of the primary objects in a database.
+
+Both formats store the raw data returned by ``serialize()``, and decode it
+back to the same tuples, without creating the objects:
+
+- ``blob``: the raw data, pickled, in the ``blob_data`` column.  This is the
+  original format.
+- ``json``: the raw data as JSON, in the ``json_data`` column.  Lists are
+  stored as arrays, and tuples as ``{"t": [...]}`` objects, so that the JSON
+  decoder gives back tuples and lists where ``serialize()`` had them.  Single
+  fields can be extracted by the database engine, without decoding the
+  object at all.
+"""
+
+#------------------------------------------------------------------------
+#
+# Python modules
+#
+#------------------------------------------------------------------------
+import json
+import pickle
+from functools import lru_cache
+
+#------------------------------------------------------------------------
+#
+# Gramps modules
+#
+#------------------------------------------------------------------------
+from .. import lib
+
+__all__ = ('BlobSerializer', 'JSONSerializer', 'SERIALIZERS',
+           'get_serializer', 'get_field_path')
+
+#------------------------------------------------------------------------
+#
+# BlobSerializer
+#
+#------------------------------------------------------------------------
+class BlobSerializer:
+    """
+    Serializer for raw data stored pickled.
+    """
+    name = 'blob'
+    data_field = 'blob_data'
+    data_type = 'BLOB'
+
+    @staticmethod
+    def data_to_string(data):
+        """
+        Encode the raw data of a primary object.
+        """
+        return pickle.dumps(data)
+
+    @staticmethod
+    def string_to_data(string):
+        """
+        Decode a stored string into raw data.
+        """
+        return pickle.loads(string)
+
+    @staticmethod
+    def field_path(steps):
+        """
+        Return the path used by the database engine to extract a single
+        field, or None if the format does not support it.
+        """
+        return None
+
+#------------------------------------------------------------------------
+#
+# JSONSerializer
+#
+#------------------------------------------------------------------------
+class JSONSerializer:
+    """
+    Serializer for raw data stored in JSON format.
+    """
+    name = 'json'
+    data_field = 'json_data'
+    data_type = 'TEXT'
+
+    @staticmethod
+    def data_to_string(data):
+        """
+        Encode the raw data of a primary object.
+        """
+        return json.dumps(_encode(data), ensure_ascii=False,
+                          separators=(',', ':'))
+
+    @staticmethod
+    def string_to_data(string):
+        """
+        Decode a stored string into raw data.
+        """
+        return json.loads(string, object_hook=_decode)
+
+    @staticmethod
+    def field_path(steps):
+        """
+        Return the JSON path used by the database engine to extract a single
+        field.
+
+        :param steps: The (index, is_tuple) pairs returned by
+                      :func:`get_field_path`.
+        """
+        path = '$'
+        for index, is_tuple in steps:
+            if is_tuple:
+                path += '.t'
+            path += '[%d]' % index
+        return path
+
+def _encode(data):
+    """
+    Replace the tuples of raw data with ``{"t": [...]}`` dictionaries.
+    """
+    if isinstance(data, tuple):
+        return {'t': [_encode(item) for item in data]}
+    if isinstance(data, list):
+        return [_encode(item) for item in data]
+    return data
+
+def _decode(obj_dict):
+    """
+    Object hook of the JSON decoder, which turns the dictionaries written by
+    :func:`_encode` back into tuples.
+    """
+    return tuple(obj_dict['t'])
+
+SERIALIZERS = {serializer.name: serializer
+               for serializer in (BlobSerializer, JSONSerializer)}
+
+def get_serializer(name):
+    """
+    Return the serializer with the given name.
+    """
+    if name not in SERIALIZERS:
+        raise ValueError('Unknown serializer: %s' % name)
+    return SERIALIZERS[name]
+
+#------------------------------------------------------------------------
+#
+# Field paths
+#
+#------------------------------------------------------------------------
+def get_field_path(obj_class, path):
+    """
+    Find a field of a primary object in its raw data.
+
+    The field is given as a dotted path of the property names in the object
+    schema, such as ``primary_name.first_name``, with list items selected by
+    index, such as ``event_ref_list.0.ref``.  Only fields holding a string,
+    number or boolean, or a list of these, can be accessed.
+
+    :returns: A tuple of the (index, is_tuple) pairs which lead to the field
+              in the raw data, the schema type of the field, or of its items
+              if the field is a list, and a flag which is True if the field
+              is a list.
+    :rtype: tuple
+    """
+    schema = obj_class.get_schema()
+    sample = None
+    steps = []
+    for name in path.split('.'):
+        schema_type = _get_type(schema)
+        if schema_type == 'object':
+            schema = _get_schema(schema)
+            props = [prop for prop in schema['properties'] if prop != '_class']
+            sample = _get_sample(schema['properties']['_class']['enum'][0])
+            if name not in props or len(props) != len(sample):
+                raise ValueError('Invalid field %s for %s'
+                                 % (path, obj_class.__name__))
+            index = props.index(name)
+            steps.append((index, True))
+            schema = schema['properties'][name]
+            sample = sample[index]
+        elif (schema_type == 'array' and name.isdigit() and
+              isinstance(sample, (tuple, list))):
+            steps.append((int(name), isinstance(sample, tuple)))
+            schema = _get_schema(schema).get('items', {})
+            sample = None
+        else:
+            raise ValueError('Invalid field %s for %s'
+                             % (path, obj_class.__name__))
+    schema_type = _get_type(schema)
+    is_list = schema_type == 'array'
+    if is_list:
+        schema_type = _get_type(_get_schema(schema).get('items', {}))
+    if schema_type not in ('string', 'integer', 'number', 'boolean'):
+        raise ValueError('Field %s of %s is not a simple value'
+                         % (path, obj_class.__name__))
+    return tuple(steps), schema_type, is_list
+
+@lru_cache()
+def _get_sample(class_name):
+    """
+    Return the raw data of a new object of the given class.  It shows
+    whether a field is a tuple or a list, and whether the schema of the class
+    describes its raw data.
+    """
+    return getattr(lib, class_name)().serialize()
+
+def _get_schema(schema):
+    """
+    Return the schema itself, or the schema of an optional value.
+    """
+    for item in schema.get('oneOf', ()):
+        if item.get('type') != 'null':
+            return item
+    return schema
+
+def _get_type(schema):
+    """
+    Return the type of a schema, ignoring null.
+    """
+    schema_type = _get_schema(schema).get('type')
+    if isinstance(schema_type, list):
+        schema_type = [item for item in schema_type if item != 'null'][0]
+    return schema_type
@@ -42,11 +42,37 @@ from .dbconst import (PERSON_KEY, FAMILY_KEY, EVENT_KEY, MEDIA_KEY, PLACE_KEY,
                       REPOSITORY_KEY, CITATION_KEY, SOURCE_KEY, NOTE_KEY,
                       TAG_KEY)
 from ..const import GRAMPS_LOCALE as glocale
+from ..config import config
 _ = glocale.translation.gettext
 
 LOG = logging.getLogger(".upgrade")
 
 
+def gramps_upgrade_22(self):
+    """
+    Upgrade database from version 21 to 22.
+    Record the storage format of the primary objects, and convert them to the
+    format selected in the preferences.
+    """
+    self._set_metadata('serializer', self.serializer.name)
+    self.set_serializer(config.get('database.serializer'))
+    # Bump up database version. Separate transaction to save metadata.
+    self._set_metadata('version', 22)
+
+
+def gramps_upgrade_21(self):
+    """
+    Upgrade database from version 20 to 21.
+    Add the tables and columns of the secondary indexes, which are filled by
+    the rebuild of the secondary indexes at the end of the upgrade.
+    """
+    self._txn_begin()
+    self._add_secondary_tables()
+    self._txn_commit()
+    # Bump up database version. Separate transaction to save metadata.
+    self._set_metadata('version', 21)
+
+
 def gramps_upgrade_20(self):
     """
     Placeholder update.
@@ -131,6 +131,25 @@ def get_dbid_from_path(dirpath):
             dbid = file.read().strip()
     return dbid
 
+def get_readonly_source(db):
+    """
+    Return the (plugin id, directory) with which another read-only connection
+    to the database can be opened, by a worker thread or process, or None.
+    The database must not be a proxy, nor held in memory, and no transaction
+    may be in progress, as the new connection would not see its changes.
+    """
+    if (db.basedb is not db or
+            getattr(db, 'transaction', None) is not None):
+        return None
+    directory = db.get_save_path()
+    if not directory or directory == ':memory:':
+        return None
+    pmgr = BasePluginManager.get_instance()
+    for pdata in pmgr.get_reg_databases():
+        if pdata.databaseclass == db.__class__.__name__:
+            return (pdata.id, directory)
+    return None
+
 def import_as_dict(filename, user, skp_imp_adds=True):
     """
     Import the filename into a InMemoryDB and return it.
@@ -1010,6 +1010,28 @@ class NameDisplay:
         return db.get_name_group_mapping(_raw_primary_surname_only(
                                                     pn[_SURNAME_LIST]))
 
+    def surname_grouping(self, db, group_as, surname, patronymic):
+        """
+        Return the name under which to group, as name_grouping_data does,
+        from the fields returned by the get_surname_group_counts method of
+        the database.
+
+        :param group_as: the group_as value of the name
+        :type group_as: str
+        :param surname: the primary surname of the name
+        :type surname: str
+        :param patronymic: whether the primary surname is the only surname
+                           and of patronymic or matronymic origin
+        :type patronymic: bool
+        :returns: Returns the groupname string representation
+        :rtype: str
+        """
+        if group_as:
+            return group_as
+        if patronymic and not PAT_AS_SURN:
+            surname = ''
+        return db.get_name_group_mapping(surname)
+
     def _make_fn(self, format_str, d, args):
         """
         Create the name display function and handles dependent
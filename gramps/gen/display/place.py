@@ -38,7 +38,9 @@ import xml.dom.minidom
 from ..const import PLACE_FORMATS, GRAMPS_LOCALE as glocale
 _ = glocale.translation.gettext
 from ..config import config
-from ..utils.location import get_location_list
+from ..utils.location import (get_location_list,
+                              get_location_list_from_handle,
+                              get_location_cache)
 from ..lib import PlaceType
 
 #-------------------------------------------------------------------------
@@ -79,6 +81,20 @@ class PlaceDisplay:
             return ""
         place_handle = event.get_place_handle()
         if place_handle:
+            if config.get('preferences.place-auto'):
+                # the titles of the places of events are cached, as the
+                # views ask for them again and again
+                pf = self.__get_format(fmt)
+                date = event.get_date_object()
+                cache = get_location_cache(db)
+                key = ('title', pf.levels, pf.language, pf.street, pf.reverse)
+                title = cache.get(place_handle, date, key)
+                if title is None:
+                    all_places = get_location_list_from_handle(
+                        db, place_handle, date, pf.language)
+                    title = self.__format(all_places, pf)
+                    cache.add(place_handle, date, key, title)
+                return title
             place = db.get_place_from_handle(place_handle)
             return self.display(db, place, event.get_date_object(), fmt)
         else:
@@ -90,55 +106,59 @@ class PlaceDisplay:
         if not config.get('preferences.place-auto'):
             return place.title
         else:
-            if fmt == -1:
-                fmt = config.get('preferences.place-format')
-            pf = self.place_formats[fmt]
-            lang = pf.language
-            all_places = get_location_list(db, place, date, lang)
-
-            # Apply format string to place list
-            index = _find_populated_place(all_places)
-            places = []
-            for slice in pf.levels.split(','):
-                parts = slice.split(':')
-                if len(parts) == 1:
-                    offset = _get_offset(parts[0], index)
-                    if offset is not None:
-                        try:
-                            places.append(all_places[offset])
-                        except IndexError:
-                            pass
-                elif len(parts) == 2:
-                    start = _get_offset(parts[0], index)
-                    end = _get_offset(parts[1], index)
-                    if start is None:
-                        places.extend(all_places[:end])
-                    elif end is None:
-                        places.extend(all_places[start:])
-                    else:
-                        places.extend(all_places[start:end])
-
-            if pf.street:
-                types = [item[1] for item in places]
-                try:
-                    idx = types.index(PlaceType.NUMBER)
-                except ValueError:
-                    idx = None
-                if idx is not None and len(places) > idx+1:
-                    if pf.street == 1:
-                        combined = (places[idx][0] + ' ' + places[idx+1][0],
-                                    places[idx+1][1])
-                    else:
-                        combined = (places[idx+1][0] + ' ' + places[idx][0],
-                                    places[idx+1][1])
-                    places = places[:idx] + [combined] + places[idx+2:]
-
-            names = [item[0] for item in places]
-            if pf.reverse:
-                names.reverse()
-
-            # TODO for Arabic, should the next line's comma be translated?
-            return ", ".join(names)
+            pf = self.__get_format(fmt)
+            all_places = get_location_list(db, place, date, pf.language)
+            return self.__format(all_places, pf)
+
+    def __get_format(self, fmt):
+        if fmt == -1:
+            fmt = config.get('preferences.place-format')
+        return self.place_formats[fmt]
+
+    def __format(self, all_places, pf):
+        # Apply format string to place list
+        index = _find_populated_place(all_places)
+        places = []
+        for slice in pf.levels.split(','):
+            parts = slice.split(':')
+            if len(parts) == 1:
+                offset = _get_offset(parts[0], index)
+                if offset is not None:
+                    try:
+                        places.append(all_places[offset])
+                    except IndexError:
+                        pass
+            elif len(parts) == 2:
+                start = _get_offset(parts[0], index)
+                end = _get_offset(parts[1], index)
+                if start is None:
+                    places.extend(all_places[:end])
+                elif end is None:
+                    places.extend(all_places[start:])
+                else:
+                    places.extend(all_places[start:end])
+
+        if pf.street:
+            types = [item[1] for item in places]
+            try:
+                idx = types.index(PlaceType.NUMBER)
+            except ValueError:
+                idx = None
+            if idx is not None and len(places) > idx+1:
+                if pf.street == 1:
+                    combined = (places[idx][0] + ' ' + places[idx+1][0],
+                                places[idx+1][1])
+                else:
+                    combined = (places[idx+1][0] + ' ' + places[idx][0],
+                                places[idx+1][1])
+                places = places[:idx] + [combined] + places[idx+2:]
+
+        names = [item[0] for item in places]
+        if pf.reverse:
+            names.reverse()
+
+        # TODO for Arabic, should the next line's comma be translated?
+        return ", ".join(names)
 
     def get_formats(self):
         return self.place_formats
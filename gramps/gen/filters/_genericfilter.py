@@ -24,6 +24,17 @@
 Package providing filtering framework for Gramps.
 """
 
+#------------------------------------------------------------------------
+#
+# Python modules
+#
+#------------------------------------------------------------------------
+import logging
+import multiprocessing
+import warnings
+from itertools import islice
+from time import perf_counter
+
 #------------------------------------------------------------------------
 #
 # Gramps imports
@@ -39,9 +50,49 @@ from ..lib.repo import Repository
 from ..lib.media import Media
 from ..lib.note import Note
 from ..lib.tag import Tag
+from ..db.dbconst import ARRAYSIZE, DBMODE_R
+from ..config import config
+from .rules import Rule
 from ..const import GRAMPS_LOCALE as glocale
 _ = glocale.translation.gettext
 
+LOG = logging.getLogger(".filter")
+
+#-------------------------------------------------------------------------
+#
+# Worker processes
+#
+#-------------------------------------------------------------------------
+_WORKER_DB = None
+_WORKER_FILTER = None
+
+def _init_worker(plugin_id, directory, filter_class, logical_op, invert,
+                 rules):
+    """
+    Open the database read-only and build and prepare the filter in a worker
+    process. rules is a list of (rule class, values, use_regex) tuples.
+    """
+    global _WORKER_DB, _WORKER_FILTER
+    from .. import filters
+    from ..db.utils import make_database
+    if filters.CustomFilters is None:
+        filters.reload_custom_filters()
+    _WORKER_DB = make_database(plugin_id)
+    _WORKER_DB.load(directory, mode=DBMODE_R)
+    _WORKER_FILTER = filter_class()
+    _WORKER_FILTER.set_logical_op(logical_op)
+    _WORKER_FILTER.set_invert(invert)
+    _WORKER_FILTER.set_rules([rule_class(values, use_regex)
+                              for rule_class, values, use_regex in rules])
+    for rule in _WORKER_FILTER.flist:
+        rule.requestprepare(_WORKER_DB, None)
+
+def _check_chunk(handles):
+    """
+    Return the handles of a chunk that match the filter of a worker process.
+    """
+    return _WORKER_FILTER.check_func(_WORKER_DB, handles)
+
 #-------------------------------------------------------------------------
 #
 # GenericFilter
@@ -52,6 +103,9 @@ class GenericFilter:
 
     logical_functions = ['or', 'and', 'xor', 'one']
 
+    # number of objects handed to a worker process at a time
+    PARALLEL_CHUNK = 5000
+
     def __init__(self, source=None):
         if source:
             self.need_param = source.need_param
@@ -67,6 +121,8 @@ class GenericFilter:
             self.comment = ''
             self.logical_op = 'and'
             self.invert = False
+        # Statistics of the rules {rule: [calls, matches, seconds]}
+        self.rule_stats = {}
 
     def match(self, handle, db):
         """
@@ -133,12 +189,179 @@ class GenericFilter:
     def find_from_handle(self, db, handle):
         return db.get_person_from_handle(handle)
 
+    def find_from_handles(self, db, handles):
+        return db.get_people_from_handles(handles)
+
     def get_number(self, db):
         return db.get_number_of_people()
 
-    def check_func(self, db, id_list, task, user=None, tupleind=None,
-                   tree=False):
+    def iter_from_id_list(self, db, id_list, tupleind=None):
+        """
+        Yield each item of id_list together with the object it refers to.
+        The objects are fetched from the database in chunks, rather than one
+        at a time.
+        """
+        id_list = iter(id_list)
+        while True:
+            chunk = list(islice(id_list, ARRAYSIZE))
+            if not chunk:
+                break
+            if tupleind is None:
+                handles = chunk
+            else:
+                handles = [data[tupleind] for data in chunk]
+            yield from zip(chunk, self.find_from_handles(db, handles))
+
+    def select_handles(self, db, rules, logical_op):
+        """
+        Return the handles of the objects matched by all (logical_op 'AND')
+        or any (logical_op 'OR') of the rules, selected by the database
+        engine, or None if one of the rules or the database cannot use SQL.
+        """
+        predicates = [rule.get_sql_predicate() for rule in rules]
+        if not predicates or None in predicates:
+            return None
+        where = (" %s " % logical_op).join("(%s)" % condition
+                                           for condition, values in predicates)
+        values = [value for condition, values in predicates
+                  for value in values]
+        return db.select_handles(self.make_obj().__class__.__name__,
+                                 where, values)
+
+    def order_rules(self, rules):
+        """
+        Return the rules in the order they are best evaluated in: cheapest
+        cost class first and, within a cost class, the rules that most often
+        decided the result on their own in earlier runs of the filter.
+        """
+        logical_op = self.logical_op
+        def sort_key(rule):
+            calls, matches, seconds = self.rule_stats.get(rule, (0, 0, 0.0))
+            if not calls or logical_op not in ('and', 'or'):
+                return (rule.get_cost(), 0.5)
+            if logical_op == 'and':
+                return (rule.get_cost(), matches / calls)
+            return (rule.get_cost(), 1 - matches / calls)
+        return sorted(rules, key=sort_key)
+
+    def match_rules(self, db, rules, data=None, obj=None):
+        """
+        Return True if the rules, combined with the logical operator of the
+        filter, match an object given by its raw data or by the object
+        itself. The rules are evaluated in the given order and only until the
+        result is known, and the object is only built from the raw data when
+        a rule needs it.
+        """
+        logical_op = self.logical_op
+        found = 0
+        for rule in rules:
+            if obj is None and rule.get_cost() != Rule.RAW:
+                obj = self.make_obj()
+                obj.unserialize(data)
+            stats = self.rule_stats.setdefault(rule, [0, 0, 0.0])
+            start = perf_counter()
+            if obj is None:
+                result = rule.match_raw(data)
+            else:
+                result = rule.apply(db, obj)
+            stats[0] += 1
+            stats[2] += perf_counter() - start
+            if result:
+                stats[1] += 1
+                found += 1
+                if logical_op == 'or':
+                    break
+                if logical_op == 'one' and found > 1:
+                    break
+            elif logical_op not in ('or', 'one', 'xor'):
+                break
+        if logical_op == 'or':
+            return found > 0
+        if logical_op == 'one':
+            return found == 1
+        if logical_op == 'xor':
+            return found % 2 == 1
+        return found == len(rules)
+
+    def check_object(self, db, obj):
+        """
+        Return True if the object matches the filter. Unlike check, the
+        object is not looked up in the database again.
+        """
+        return (self.match_rules(db, self.order_rules(self.flist), obj=obj)
+                != self.invert)
+
+    def get_rule_stats(self):
+        """
+        Return a list of (rule, calls, matches, seconds) tuples, giving for
+        each rule of the filter how often it was applied, how often it
+        matched and the time spent in it, over all runs of the filter.
+        """
+        return [(rule,) + tuple(self.rule_stats.get(rule, (0, 0, 0.0)))
+                for rule in self.flist]
+
+    def get_parallel_db(self, db):
+        """
+        Return the (plugin id, directory) of the database if worker processes
+        can open it to apply the filter, or None.
+        """
+        from ..db.utils import get_readonly_source
+        return get_readonly_source(db)
+
+    def check_parallel(self, db, id_list, processes, user=None, rules=None):
+        """
+        Return the handles in id_list of the objects matching the rules,
+        applied by worker processes with their own connection to the
+        database, in the order of id_list. Each worker prepares the rules
+        itself.
+        """
+        plugin_id, directory = self.get_parallel_db(db)
+        rules = self.flist if rules is None else rules
+        initargs = (plugin_id, directory, self.__class__, self.logical_op,
+                    self.invert, [(rule.__class__, rule.list, rule.use_regex)
+                                  for rule in rules])
+        chunks = [id_list[start:start + self.PARALLEL_CHUNK]
+                  for start in range(0, len(id_list), self.PARALLEL_CHUNK)]
+        final_list = []
+        if user:
+            user.begin_progress(_('Filter'), _('Applying ...'), len(id_list))
+        context = multiprocessing.get_context('spawn')
+        with context.Pool(processes, _init_worker, initargs) as pool:
+            for chunk, handles in zip(chunks, pool.imap(_check_chunk,
+                                                        chunks)):
+                final_list.extend(handles)
+                if user:
+                    for dummy in chunk:
+                        user.step_progress()
+        if user:
+            user.end_progress()
+        return final_list
+
+    def check_func(self, db, id_list, task=None, user=None, tupleind=None,
+                   tree=False, rules=None):
+        """
+        Return the handles in id_list, or all handles if id_list is None, of
+        the objects matching the rules, by default those of the filter.
+
+        task is deprecated: if given, it is called as task(db, obj) instead
+        of applying the rules.
+        """
+        if task is not None:
+            warnings.warn("the task argument of GenericFilter.check_func is "
+                          "deprecated", DeprecationWarning, stacklevel=2)
+            return self.__check_task(db, id_list, task, user, tupleind, tree)
+        processes = config.get('behavior.filter-processes')
+        if (processes > 1 and tupleind is None and not tree and
+                self.get_parallel_db(db) and
+                (len(id_list) if id_list is not None else
+                 self.get_number(db)) > self.PARALLEL_CHUNK):
+            if id_list is None:
+                class_name = self.make_obj().__class__.__name__
+                id_list = list(db.method('iter_%s_handles', class_name)())
+            return self.check_parallel(db, id_list, processes, user, rules)
+
         final_list = []
+        rules = self.order_rules(self.flist if rules is None else rules)
         if user:
             user.begin_progress(_('Filter'), _('Applying ...'),
                                 self.get_number(db))
@@ -146,30 +369,56 @@ class GenericFilter:
             with (self.get_tree_cursor(db) if tree else
                   self.get_cursor(db)) as cursor:
                 for handle, data in cursor:
-                    person = self.make_obj()
-                    person.unserialize(data)
                     if user:
                         user.step_progress()
-                    if task(db, person) != self.invert:
+                    if self.match_rules(db, rules, data) != self.invert:
                         final_list.append(handle)
         else:
-            for data in id_list:
-                if tupleind is None:
-                    handle = data
-                else:
-                    handle = data[tupleind]
-                person = self.find_from_handle(db, handle)
+            for data, obj in self.iter_from_id_list(db, id_list, tupleind):
                 if user:
                     user.step_progress()
-                if task(db, person) != self.invert:
+                if obj is None:
+                    # an object missing from the database only matches 'and'
+                    val = self.logical_op == 'and'
+                else:
+                    val = self.match_rules(db, rules, obj=obj)
+                if val != self.invert:
                     final_list.append(data)
         if user:
             user.end_progress()
         return final_list
 
     def check_and(self, db, id_list, user=None, tupleind=None, tree=False):
+        if id_list is None and not tree and not self.invert:
+            # Let the database select the objects matched by the rules that
+            # can be written in SQL, and apply the others to those only.
+            sql_rules = [rule for rule in self.flist
+                         if rule.get_sql_predicate() is not None]
+            handles = self.select_handles(db, sql_rules, 'AND')
+            if handles is not None:
+                flist = [rule for rule in self.flist
+                         if rule not in sql_rules]
+                if not flist:
+                    return handles
+                return self.check_func(db, handles, user=user, rules=flist)
+        return self.check_func(db, id_list, user=user, tupleind=tupleind,
+                               tree=tree)
+
+    def check_or(self, db, id_list, user=None, tupleind=None, tree=False):
+        if id_list is None and not tree and not self.invert:
+            handles = self.select_handles(db, self.flist, 'OR')
+            if handles is not None:
+                return handles
+        return self.check_func(db, id_list, user=user, tupleind=tupleind)
+
+    def check_one(self, db, id_list, user=None, tupleind=None, tree=False):
+        return self.check_func(db, id_list, user=user, tupleind=tupleind)
+
+    def check_xor(self, db, id_list, user=None, tupleind=None, tree=False):
+        return self.check_func(db, id_list, user=user, tupleind=tupleind)
+
+    def __check_task(self, db, id_list, task, user, tupleind, tree):
         final_list = []
-        flist = self.flist
         if user:
             user.begin_progress(_('Filter'), _('Applying ...'),
                                 self.get_number(db))
@@ -177,58 +426,64 @@ class GenericFilter:
             with (self.get_tree_cursor(db) if tree else
                   self.get_cursor(db)) as cursor:
                 for handle, data in cursor:
-                    person = self.make_obj()
-                    person.unserialize(data)
+                    obj = self.make_obj()
+                    obj.unserialize(data)
                     if user:
                         user.step_progress()
-                    val = all(rule.apply(db, person) for rule in flist)
-                    if val != self.invert:
+                    if task(db, obj) != self.invert:
                         final_list.append(handle)
         else:
-            for data in id_list:
-                if tupleind is None:
-                    handle = data
-                else:
-                    handle = data[tupleind]
-                person = self.find_from_handle(db, handle)
+            for data, obj in self.iter_from_id_list(db, id_list, tupleind):
                 if user:
                     user.step_progress()
-                val = all(rule.apply(db, person) for rule in flist if person)
-                if val != self.invert:
+                if task(db, obj) != self.invert:
                     final_list.append(data)
         if user:
             user.end_progress()
         return final_list
 
-    def check_or(self, db, id_list, user=None, tupleind=None, tree=False):
-        return self.check_func(db, id_list, self.or_test, user, tupleind,
-                               tree=False)
-
-    def check_one(self, db, id_list, user=None, tupleind=None, tree=False):
-        return self.check_func(db, id_list, self.one_test, user, tupleind,
-                               tree=False)
-
-    def check_xor(self, db, id_list, user=None, tupleind=None, tree=False):
-        return self.check_func(db, id_list, self.xor_test, user, tupleind,
-                               tree=False)
+    def and_test(self, db, obj):
+        """
+        Deprecated: return True if all the rules match the object.
+        """
+        warnings.warn("GenericFilter.and_test is deprecated",
+                      DeprecationWarning, stacklevel=2)
+        return all(rule.apply(db, obj) for rule in self.flist)
 
-    def xor_test(self, db, person):
+    def xor_test(self, db, obj):
+        """
+        Deprecated: return True if an odd number of the rules match the
+        object.
+        """
+        warnings.warn("GenericFilter.xor_test is deprecated",
+                      DeprecationWarning, stacklevel=2)
         test = False
         for rule in self.flist:
-            test = test ^ rule.apply(db, person)
+            test = test ^ rule.apply(db, obj)
         return test
 
-    def one_test(self, db, person):
+    def one_test(self, db, obj):
+        """
+        Deprecated: return True if exactly one of the rules matches the
+        object.
+        """
+        warnings.warn("GenericFilter.one_test is deprecated",
+                      DeprecationWarning, stacklevel=2)
         found_one = False
         for rule in self.flist:
-            if rule.apply(db, person):
+            if rule.apply(db, obj):
                 if found_one:
                     return False    # There can be only one!
                 found_one = True
         return found_one
 
-    def or_test(self, db, person):
-        return any(rule.apply(db, person) for rule in self.flist)
+    def or_test(self, db, obj):
+        """
+        Deprecated: return True if any of the rules matches the object.
+        """
+        warnings.warn("GenericFilter.or_test is deprecated",
+                      DeprecationWarning, stacklevel=2)
+        return any(rule.apply(db, obj) for rule in self.flist)
 
     def get_check_func(self):
         try:
@@ -263,6 +518,10 @@ class GenericFilter:
         res = m(db, id_list, user, tupleind, tree)
         for rule in self.flist:
             rule.requestreset()
+        if LOG.isEnabledFor(logging.DEBUG):
+            for rule, calls, matches, seconds in self.get_rule_stats():
+                LOG.debug("%s: %d calls, %d matches, %.3f s",
+                          rule.__class__.__name__, calls, matches, seconds)
         return res
 
 class GenericFamilyFilter(GenericFilter):
@@ -279,6 +538,9 @@ class GenericFamilyFilter(GenericFilter):
     def find_from_handle(self, db, handle):
         return db.get_family_from_handle(handle)
 
+    def find_from_handles(self, db, handles):
+        return db.get_families_from_handles(handles)
+
     def get_number(self, db):
         return db.get_number_of_families()
 
@@ -296,6 +558,9 @@ class GenericEventFilter(GenericFilter):
     def find_from_handle(self, db, handle):
         return db.get_event_from_handle(handle)
 
+    def find_from_handles(self, db, handles):
+        return db.get_events_from_handles(handles)
+
     def get_number(self, db):
         return db.get_number_of_events()
 
@@ -313,6 +578,9 @@ class GenericSourceFilter(GenericFilter):
     def find_from_handle(self, db, handle):
         return db.get_source_from_handle(handle)
 
+    def find_from_handles(self, db, handles):
+        return db.get_sources_from_handles(handles)
+
     def get_number(self, db):
         return db.get_number_of_sources()
 
@@ -333,6 +601,9 @@ class GenericCitationFilter(GenericFilter):
     def find_from_handle(self, db, handle):
         return db.get_citation_from_handle(handle)
 
+    def find_from_handles(self, db, handles):
+        return db.get_citations_from_handles(handles)
+
     def get_number(self, db):
         return db.get_number_of_citations()
 
@@ -353,6 +624,9 @@ class GenericPlaceFilter(GenericFilter):
     def find_from_handle(self, db, handle):
         return db.get_place_from_handle(handle)
 
+    def find_from_handles(self, db, handles):
+        return db.get_places_from_handles(handles)
+
     def get_number(self, db):
         return db.get_number_of_places()
 
@@ -370,6 +644,9 @@ class GenericMediaFilter(GenericFilter):
     def find_from_handle(self, db, handle):
         return db.get_media_from_handle(handle)
 
+    def find_from_handles(self, db, handles):
+        return db.get_media_from_handles(handles)
+
     def get_number(self, db):
         return db.get_number_of_media()
 
@@ -387,6 +664,9 @@ class GenericRepoFilter(GenericFilter):
     def find_from_handle(self, db, handle):
         return db.get_repository_from_handle(handle)
 
+    def find_from_handles(self, db, handles):
+        return db.get_repositories_from_handles(handles)
+
     def get_number(self, db):
         return db.get_number_of_repositories()
 
@@ -404,6 +684,9 @@ class GenericNoteFilter(GenericFilter):
     def find_from_handle(self, db, handle):
         return db.get_note_from_handle(handle)
 
+    def find_from_handles(self, db, handles):
+        return db.get_notes_from_handles(handles)
+
     def get_number(self, db):
         return db.get_number_of_notes()
 
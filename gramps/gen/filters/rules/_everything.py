@@ -43,6 +43,7 @@ class Everything(Rule):
 
     name = 'Every object'
     category = _('General filters')
+    cost = Rule.RAW
     description = 'Matches every object in the database'
 
     def is_empty(self):
@@ -50,3 +51,6 @@ class Everything(Rule):
 
     def apply(self, db, obj):
         return True
+
+    def match_raw(self, data):
+        return True
@@ -51,6 +51,7 @@ class HasAttributeBase(Rule):
     description = "Matches objects with the given attribute " \
                   "of a particular value"
     category = _('General filters')
+    cost = Rule.OBJECT
     allow_regex = True
 
     def apply(self, db, obj):
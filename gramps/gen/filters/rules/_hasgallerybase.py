@@ -46,6 +46,7 @@ class HasGalleryBase(Rule):
     name = 'Object with <count> Media references'
     description = "Matches objects with certain number of items in the gallery"
     category = _('General filters')
+    cost = Rule.OBJECT
 
     def prepare(self, db, user):
         # things we want to do just once, not for every handle
@@ -46,6 +46,7 @@ class HasGrampsId(Rule):
     name = 'Object with <Id>'
     description = "Matches objects with a specified Gramps ID"
     category = _('General filters')
+    cost = Rule.RAW
 
     def apply(self, db, obj):
         """
@@ -53,3 +54,9 @@ class HasGrampsId(Rule):
         return true if the rule passes, false otherwise.
         """
         return obj.gramps_id == self.list[0]
+
+    def match_raw(self, data):
+        return data[1] == self.list[0]
+
+    def sql_predicate(self):
+        return ("gramps_id = ?", [self.list[0]])
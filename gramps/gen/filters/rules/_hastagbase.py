@@ -50,6 +50,7 @@ class HasTagBase(Rule):
     name = 'Objects with the <tag>'
     description = "Matches objects with the given tag"
     category = _('General filters')
+    cost = Rule.OBJECT
 
     def prepare(self, db, user):
         """
@@ -67,3 +68,10 @@ class HasTagBase(Rule):
         if self.tag_handle is None:
             return False
         return self.tag_handle in obj.get_tag_list()
+
+    def sql_predicate(self):
+        if self.tag_handle is None:
+            return ("0 = 1", [])
+        return ("handle IN (SELECT obj_handle FROM reference "
+                "WHERE ref_class = 'Tag' AND ref_handle = ?)",
+                [self.tag_handle])
@@ -40,6 +40,10 @@ class IsPrivate(Rule):
     name = 'Objects marked private'
     description = "Matches objects that are indicated as private"
     category = _('General filters')
+    cost = Rule.OBJECT
 
     def apply(self, db, obj):
         return obj.get_privacy()
+
+    def sql_predicate(self):
+        return ("private = 1", [])
@@ -37,6 +37,10 @@ class IsPublic(Rule):
     name = 'Objects not marked private'
     description = "Matches objects that are not indicated as private"
     category = _('General filters')
+    cost = Rule.OBJECT
 
     def apply(self, db, obj):
         return not obj.get_privacy()
+
+    def sql_predicate(self):
+        return ("private = 0", [])
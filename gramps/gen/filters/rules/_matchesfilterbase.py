@@ -83,7 +83,7 @@ class MatchesFilterBase(Rule):
             filters = gramps.gen.filters.CustomFilters.get_filters_dict(self.namespace)
             if self.list[0] in filters:
                 filt = filters[self.list[0]]
-                return filt.check(db, obj.handle)
+                return filt.check_object(db, obj)
         return False
 
     def find_filter(self):
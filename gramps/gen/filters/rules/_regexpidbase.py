@@ -51,6 +51,22 @@ class RegExpIdBase(Rule):
                    "or matches a regular expression"
     category = _('General filters')
     allow_regex = True
+    cost = Rule.RAW
 
     def apply(self, db, obj):
         return self.match_substring(0, obj.gramps_id)
+
+    def match_raw(self, data):
+        return self.match_substring(0, data[1])
+
+    def sql_predicate(self):
+        text = self.list[0]
+        if not text:
+            return ("1 = 1", [])
+        # Case folding in SQL is only reliable for ASCII
+        if self.use_regex or not text.isascii():
+            return None
+        for char in '\\%_':
+            text = text.replace(char, '\\' + char)
+        return ("UPPER(gramps_id) LIKE ? ESCAPE '\\'",
+                ['%' + text.upper() + '%'])
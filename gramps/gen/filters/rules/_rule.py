@@ -56,6 +56,12 @@ class Rule:
     description = _('No description')
     allow_regex = False
 
+    # Cost classes, used to evaluate the cheapest rules of a filter first
+    RAW = 0             # match_raw decides from the raw data
+    OBJECT = 1          # apply only looks at the object itself
+    DB = 2              # apply looks up other objects in the database
+    cost = DB
+
     def __init__(self, arg, use_regex=False):
         self.list = []
         self.regex = []
@@ -139,6 +145,52 @@ class Rule:
         """Apply the rule to some database entry; must be overwritten."""
         return True
 
+    def match_raw(self, data):
+        """
+        Apply the rule to the raw data of a database entry; must be
+        overwritten by rules with a cost of RAW.
+        """
+        raise NotImplementedError
+
+    def sql_predicate(self):
+        """
+        Return a (condition, values) tuple with an SQL condition on the
+        secondary columns of the table being filtered that matches the same
+        objects as apply, or None if the rule can only be applied in Python.
+        This is called after prepare.
+        """
+        return None
+
+    def get_cost(self):
+        """
+        Return the cost class of the rule.  A rule is only evaluated from the
+        raw data if its match_raw is defined in the same class as its apply,
+        so that a subclass which overrides apply alone is still applied.
+        """
+        if self.cost == Rule.RAW and not self.__same_class('match_raw'):
+            return Rule.DB
+        return self.cost
+
+    def get_sql_predicate(self):
+        """
+        Return the SQL condition of the rule, as sql_predicate does, or None
+        if sql_predicate is not defined in the same class as apply.  A
+        subclass which overrides apply alone is then applied in Python,
+        rather than with the condition of its parent.
+        """
+        if not self.__same_class('sql_predicate'):
+            return None
+        return self.sql_predicate()
+
+    def __same_class(self, method):
+        """
+        Return True if the method is defined in the same class as apply.
+        """
+        for cls in type(self).__mro__:
+            if 'apply' in vars(cls) or method in vars(cls):
+                return 'apply' in vars(cls) and method in vars(cls)
+        return False
+
     def display_values(self):
         """Return the labels and values of this rule."""
         l_v = ('%s="%s"' % (_(self.labels[ix][0] if
@@ -47,6 +47,7 @@ class HasSourceIdOf(HasGrampsId):
     description = _("Matches a citation with a source with a specified Gramps "
                     "ID")
     category = _('Source filters')
+    cost = HasGrampsId.DB
 
     def apply(self, dbase, citation):
         source = dbase.get_source_from_handle(
@@ -54,3 +55,7 @@ class HasSourceIdOf(HasGrampsId):
         if HasGrampsId.apply(self, dbase, source):
             return True
         return False
+
+    def sql_predicate(self):
+        return ("source_handle IN (SELECT handle FROM source "
+                "WHERE gramps_id = ?)", [self.list[0]])
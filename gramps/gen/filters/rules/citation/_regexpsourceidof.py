@@ -49,6 +49,7 @@ class RegExpSourceIdOf(RegExpIdBase):
     description = _("Matches citations whose source has a Gramps ID that "
                     "matches the regular expression")
     category = _('Source filters')
+    cost = RegExpIdBase.DB
 
     def apply(self, dbase, citation):
         source = dbase.get_source_from_handle(
@@ -56,3 +57,10 @@ class RegExpSourceIdOf(RegExpIdBase):
         if RegExpIdBase.apply(self, dbase, source):
             return True
         return False
+
+    def sql_predicate(self):
+        predicate = RegExpIdBase.sql_predicate(self)
+        if predicate is None:
+            return None
+        return ("source_handle IN (SELECT handle FROM source WHERE %s)"
+                % predicate[0], predicate[1])
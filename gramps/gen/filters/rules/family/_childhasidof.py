@@ -32,7 +32,7 @@ _ = glocale.translation.gettext
 #
 #-------------------------------------------------------------------------
 from .. import RegExpIdBase
-from ._memberbase import child_base
+from ._memberbase import child_base, child_sql
 
 #-------------------------------------------------------------------------
 #
@@ -48,4 +48,6 @@ class ChildHasIdOf(RegExpIdBase):
                     "Gramps ID")
     category = _('Child filters')
     base_class = RegExpIdBase
+    cost = RegExpIdBase.DB
     apply = child_base
+    sql_predicate = child_sql
@@ -32,7 +32,7 @@ _ = glocale.translation.gettext
 #
 #-------------------------------------------------------------------------
 from .. import RegExpIdBase
-from ._memberbase import father_base
+from ._memberbase import father_base, father_sql
 
 #-------------------------------------------------------------------------
 #
@@ -48,4 +48,6 @@ class FatherHasIdOf(RegExpIdBase):
                     "Gramps ID")
     category = _('Father filters')
     base_class = RegExpIdBase
+    cost = RegExpIdBase.DB
     apply = father_base
+    sql_predicate = father_sql
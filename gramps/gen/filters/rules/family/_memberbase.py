@@ -25,10 +25,13 @@ Any rule that matches family based on personal rule applied
 to father, mother, or any child, just needs to do two things:
 > Set the class attribute 'base_class' to the personal rule
 > Set apply method to be an appropriate wrapper below
+If the personal rule has an SQL predicate, the sql_predicate method is
+set in the same way.
 Example:
 in the class body, outside any method:
 >    base_class = SearchName
 >    apply = child_base
+>    sql_predicate = child_sql
 """
 
 def father_base(self, db, family):
@@ -55,3 +58,19 @@ def child_base(self, db, family):
         if self.base_class.apply(self, db, child):
             return True
     return False
+
+def father_sql(self):
+    predicate = self.base_class.sql_predicate(self)
+    if predicate:
+        return ("father_handle IN (SELECT handle FROM person WHERE %s)"
+                % predicate[0], predicate[1])
+
+def mother_sql(self):
+    predicate = self.base_class.sql_predicate(self)
+    if predicate:
+        return ("mother_handle IN (SELECT handle FROM person WHERE %s)"
+                % predicate[0], predicate[1])
+
+def child_sql(self):
+    # The children are not in a column of the family table
+    return None
@@ -32,7 +32,7 @@ _ = glocale.translation.gettext
 #
 #-------------------------------------------------------------------------
 from .. import RegExpIdBase
-from ._memberbase import mother_base
+from ._memberbase import mother_base, mother_sql
 
 #-------------------------------------------------------------------------
 #
@@ -48,4 +48,6 @@ class MotherHasIdOf(RegExpIdBase):
                     "Gramps ID")
     category = _('Mother filters')
     base_class = RegExpIdBase
+    cost = RegExpIdBase.DB
     apply = mother_base
+    sql_predicate = mother_sql
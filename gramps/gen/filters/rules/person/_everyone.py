@@ -43,6 +43,7 @@ class Everyone(Rule):
 
     name = _('Everyone')
     category = _('General filters')
+    cost = Rule.RAW
     description = _('Matches everyone in the database')
 
     def is_empty(self):
@@ -50,3 +51,6 @@ class Everyone(Rule):
 
     def apply(self,db,person):
         return True
+
+    def match_raw(self, data):
+        return True
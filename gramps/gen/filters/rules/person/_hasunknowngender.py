@@ -44,7 +44,11 @@ class HasUnknownGender(Rule):
 
     name = _('People with unknown gender')
     category = _('General filters')
+    cost = Rule.RAW
     description = _('Matches all people with unknown gender')
 
     def apply(self,db,person):
         return person.gender == Person.UNKNOWN
+
+    def match_raw(self, data):
+        return data[2] == Person.UNKNOWN
@@ -66,21 +66,24 @@ class IsAncestorOf(Rule):
     def apply(self, db, person):
         return person.handle in self.map
 
-    def init_ancestor_list(self, db, person,first):
-        if not person:
-            return
-        if person.handle in self.map:
-            return
-        if not first:
-            self.map.add(person.handle)
-        fam_id = person.get_main_parents_family_handle()
-        if fam_id:
-            fam = db.get_family_from_handle(fam_id)
-            if fam:
-                f_id = fam.get_father_handle()
-                m_id = fam.get_mother_handle()
+    def init_ancestor_list(self, db, person, first):
+        if person:
+            self.init_ancestors(db, [person], first)
 
-                if f_id:
-                    self.init_ancestor_list(db,db.get_person_from_handle(f_id),0)
-                if m_id:
-                    self.init_ancestor_list(db,db.get_person_from_handle(m_id),0)
+    def init_ancestors(self, db, people, first):
+        """
+        Add the ancestors of the given people, following the main parent
+        families, to the map.  The people themselves are only added if first
+        is not set, or if they are ancestors of one of the others.
+        """
+        if first:
+            family_handles = [person.get_main_parents_family_handle()
+                              for person in people]
+            handles = []
+            for family in db.get_families_from_handles(
+                    [handle for handle in family_handles if handle]):
+                if family:
+                    handles += [family.father_handle, family.mother_handle]
+        else:
+            handles = [person.handle for person in people]
+        self.map.update(db.get_ancestor_handles(handles, main_only=True))
@@ -67,15 +67,24 @@ class IsDescendantOf(Rule):
         return person.handle in self.map
 
     def init_list(self, person, first):
-        if not person or person.handle in self.map:
-            # if we have been here before, skip
-            return
-        if not first:
-            self.map.add(person.handle)
+        if person:
+            self.init_descendants([person], first)
 
-        for fam_id in person.get_family_handle_list():
-            fam = self.db.get_family_from_handle(fam_id)
-            if fam:
-                for child_ref in fam.get_child_ref_list():
-                    self.init_list(
-                        self.db.get_person_from_handle(child_ref.ref), 0)
+    def init_descendants(self, people, first):
+        """
+        Add the descendants of the given people to the map.  The people
+        themselves are only added if first is not set, or if they are
+        descendants of one of the others.
+        """
+        if first:
+            family_handles = set()
+            for person in people:
+                family_handles.update(person.get_family_handle_list())
+            handles = []
+            for family in self.db.get_families_from_handles(family_handles):
+                if family:
+                    handles += [child_ref.ref
+                                for child_ref in family.get_child_ref_list()]
+        else:
+            handles = [person.handle for person in people]
+        self.map.update(self.db.get_descendant_handles(handles))
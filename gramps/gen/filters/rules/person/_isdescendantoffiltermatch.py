@@ -66,11 +66,13 @@ class IsDescendantOfFilterMatch(IsDescendantOf):
             user.begin_progress(self.category,
                                 _('Retrieving all sub-filter matches'),
                                 db.get_number_of_people())
+        people = []
         for person in db.iter_people():
             if user:
                 user.step_progress()
             if self.filt.apply(db, person):
-                self.init_list(person, first)
+                people.append(person)
+        self.init_descendants(people, first)
         if user:
             user.end_progress()
 
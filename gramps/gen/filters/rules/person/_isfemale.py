@@ -44,7 +44,11 @@ class IsFemale(Rule):
 
     name = _('Females')
     category = _('General filters')
+    cost = Rule.RAW
     description = _('Matches all females')
 
     def apply(self,db,person):
         return person.gender == Person.FEMALE
+
+    def match_raw(self, data):
+        return data[2] == Person.FEMALE
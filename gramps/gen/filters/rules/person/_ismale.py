@@ -44,7 +44,11 @@ class IsMale(Rule):
 
     name = _('Males')
     category = _('General filters')
+    cost = Rule.RAW
     description = _('Matches all males')
 
     def apply(self,db,person):
         return person.gender == Person.MALE
+
+    def match_raw(self, data):
+        return data[2] == Person.MALE
@@ -31,7 +31,7 @@ _ = glocale.translation.gettext
 # Gramps modules
 #
 #-------------------------------------------------------------------------
-from ....utils.alive import probably_alive
+from ....utils.alive import probably_alive, prepare_probably_alive
 from .. import Rule
 from ....datehandler import parser
 
@@ -51,6 +51,7 @@ class ProbablyAlive(Rule):
             self.current_date = parser.parse(str(self.list[0]))
         except:
             self.current_date = None
+        prepare_probably_alive(db)
 
     def apply(self,db,person):
         return probably_alive(person,db,self.current_date)
@@ -23,12 +23,15 @@ Unittest that tests person-specific filter rules
 """
 import unittest
 import os
+import shutil
+import tempfile
 from time import perf_counter
 import inspect
 
 from ....filters import reload_custom_filters
 reload_custom_filters()
-from ....db.utils import import_as_dict
+from ....db.utils import import_as_dict, make_database, import_from_filename
+from ....config import config
 from ....filters import GenericFilter, CustomFilters
 from ....const import DATA_DIR
 from ....user import User
@@ -52,8 +55,8 @@ from ..person import (
     IsParentOfFilterMatch, IsRelatedWith, IsSiblingOfFilterMatch,
     IsSpouseOfFilterMatch, IsWitness, MissingParent, MultipleMarriages,
     NeverMarried, NoBirthdate, NoDeathdate, PeoplePrivate, PeoplePublic,
-    PersonWithIncompleteEvent, ProbablyAlive, RegExpName,
-    RelationshipPathBetweenBookmarks,
+    PersonWithIncompleteEvent, ProbablyAlive, RegExpIdOf, RegExpName,
+    RelationshipPathBetweenBookmarks, HasTag, ChangedSince,
 )
 
 TEST_DIR = os.path.abspath(os.path.join(DATA_DIR, "tests"))
@@ -876,5 +879,148 @@ class BaseTest(unittest.TestCase):
             'GNUJQCL9MD64AM56OH']))
 
 
+    def test_sql_predicates(self):
+        """
+        Test that rules answered by the database engine match the same
+        people as when they are applied in Python.
+        """
+        handles = list(self.db.iter_person_handles())
+        rule_sets = ([RegExpIdOf(['i01']), IsMale([])],
+                     [PeoplePrivate([]), HasTag(['ToDo'])],
+                     [ChangedSince(['2007-01-01', '']), RegExpIdOf(['I01'])])
+        for rules in rule_sets:
+            for l_op in ('and', 'or', 'one'):
+                for invert in (False, True):
+                    filter_ = GenericFilter()
+                    filter_.set_rules(rules)
+                    filter_.set_logical_op(l_op)
+                    filter_.set_invert(invert)
+                    self.assertEqual(set(filter_.apply(self.db)),
+                                     set(filter_.apply(self.db, handles)))
+
+
+    def test_rule_order(self):
+        """
+        Test that the cheap rules are applied first, that the selective ones
+        move forward once known, and that the other rules are only applied
+        when they can change the result.
+        """
+        rule1 = HasBirth(['', '', 'Birth'])
+        rule2 = IsFemale([])
+        rule3 = RegExpIdOf(['^I0044$'], use_regex=True)
+        filter_ = GenericFilter()
+        filter_.set_rules([rule1, rule2, rule3])
+        self.assertEqual(filter_.order_rules(filter_.flist),
+                         [rule2, rule3, rule1])
+        results = filter_.apply(self.db)
+        self.assertEqual(filter_.order_rules(filter_.flist),
+                         [rule3, rule2, rule1])
+        self.assertEqual(filter_.apply(self.db,
+                                       list(self.db.iter_person_handles())),
+                         results)
+        stats = {rule: calls for rule, calls, matches, seconds
+                 in filter_.get_rule_stats()}
+        self.assertEqual(stats[rule2],
+                         self.db.get_number_of_people() + 1)
+        self.assertLessEqual(stats[rule1], 2)
+
+    def test_apply_override(self):
+        """
+        Test that a rule which only overrides the apply method of its parent
+        is applied, rather than the SQL condition of the parent.
+        """
+        class IsI0044(PeoplePrivate):
+            def apply(self, db, person):
+                return person.gramps_id == 'I0044'
+
+        self.assertIsNotNone(PeoplePrivate([]).get_sql_predicate())
+        self.assertIsNone(IsI0044([]).get_sql_predicate())
+        handle = self.db.get_person_from_gramps_id('I0044').handle
+        for l_op in ('and', 'or'):
+            self.assertEqual(self.filter_with_rule(IsI0044([]), l_op),
+                             {handle})
+
+    def test_raw_override(self):
+        """
+        Test that a rule which only overrides the apply method of its parent
+        is applied, rather than the raw data test of the parent.
+        """
+        class IsNotMale(IsMale):
+            def apply(self, db, person):
+                return person.gender != person.MALE
+
+        self.assertEqual(IsMale([]).get_cost(), IsMale.RAW)
+        self.assertEqual(IsNotMale([]).get_cost(), IsMale.DB)
+        not_male = {person.handle for person in self.db.iter_people()
+                    if person.gender != person.MALE}
+        for l_op in ('and', 'or'):
+            self.assertEqual(self.filter_with_rule(IsNotMale([]), l_op),
+                             not_male)
+
+
+class ParallelTest(unittest.TestCase):
+    """
+    Tests of filters applied by worker processes.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        Import example database into a database on disk.
+        """
+        cls.directory = tempfile.mkdtemp()
+        cls.db = make_database("sqlite")
+        cls.db.load(cls.directory)
+        import_from_filename(cls.db, EXAMPLE, User())
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.db.close()
+        shutil.rmtree(cls.directory)
+
+    def test_parallel(self):
+        """
+        Test that worker processes match the same people, in the same order,
+        as this process.
+        """
+        processes = config.get('behavior.filter-processes')
+        for rules, l_op in (([RegExpIdOf(['I0']), IsFemale([])], 'and'),
+                            ([RegExpName(['^Garner'], use_regex=True),
+                              HasBirth(['', '', 'Birth'])], 'or')):
+            filter_ = GenericFilter()
+            filter_.set_rules(rules)
+            filter_.set_logical_op(l_op)
+            filter_.PARALLEL_CHUNK = 200
+            config.set('behavior.filter-processes', 0)
+            results = filter_.apply(self.db)
+            config.set('behavior.filter-processes', 2)
+            try:
+                self.assertEqual(filter_.apply(self.db), results)
+            finally:
+                config.set('behavior.filter-processes', processes)
+
+    def test_deprecated_api(self):
+        """
+        Test that the old task argument of check_func and the test methods
+        still give the results of the logical operators.
+        """
+        rule1 = IsFemale([])
+        rule2 = RegExpIdOf(['^I004'], use_regex=True)
+        handles = list(self.db.iter_person_handles())
+        for op in ('and', 'or', 'one', 'xor'):
+            filter_ = GenericFilter()
+            filter_.set_rules([rule1, rule2])
+            filter_.set_logical_op(op)
+            expected = filter_.apply(self.db, handles)
+            test = getattr(filter_, op + '_test')
+            with self.assertWarns(DeprecationWarning):
+                self.assertEqual(
+                    filter_.check_func(self.db, handles, test), expected)
+            with self.assertWarns(DeprecationWarning):
+                self.assertEqual(
+                    set(filter_.check_func(self.db, None, test)),
+                    set(expected))
+
+
 if __name__ == "__main__":
     unittest.main()
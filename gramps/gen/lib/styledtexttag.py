@@ -82,8 +82,9 @@ class StyledTextTag:
         :type data: tuple
 
         """
-        (the_name, self.value, self.ranges) = data
+        (the_name, self.value, ranges) = data
 
+        self.ranges = list(ranges)
         self.name = StyledTextTagType()
         self.name.unserialize(the_name)
         return self
@@ -159,7 +159,11 @@ class TableObject(BaseObject):
     def get_secondary_fields(cls):
         """
         Return all secondary fields and their types
+
+        The fields are worked out from the schema once for each class.
         """
+        if '_secondary_fields' in cls.__dict__:
+            return list(cls._secondary_fields)
         result = []
         for (key, value) in cls.get_schema()["properties"].items():
             schema_type = value.get("type")
@@ -172,4 +176,5 @@ class TableObject(BaseObject):
                 result.append((key.lower(),
                                schema_type,
                                value.get("maxLength")))
+        cls._secondary_fields = tuple(result)
         return result
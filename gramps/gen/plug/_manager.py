@@ -139,6 +139,7 @@ class BasePluginManager:
                         dirnames.remove(dirname)
                 # LOG.warning("Plugin dir scanned: %s", dirpath)
                 self.__pgr.scan_dir(dirpath, filenames, uistate=uistate)
+            self.__pgr.save_cache()
 
         if load_on_reg:
             # Run plugins that request to be loaded on startup and
@@ -32,6 +32,10 @@ and a register for the data of all plugins .
 import os
 import sys
 import re
+import ast
+import marshal
+import pickle
+from importlib.util import MAGIC_NUMBER
 import traceback
 
 #-------------------------------------------------------------------------
@@ -40,7 +44,7 @@ import traceback
 #
 #-------------------------------------------------------------------------
 from ...version import VERSION as GRAMPSVERSION, VERSION_TUPLE
-from ..const import IMAGE_DIR
+from ..const import IMAGE_DIR, PLUGIN_CACHE
 from ..const import GRAMPS_LOCALE as glocale
 _ = glocale.translation.gettext
 import logging
@@ -1111,6 +1115,23 @@ def make_environment(**kwargs):
     env.update(kwargs)
     return env
 
+# Version of the format of the plugin cache, changed when it changes
+PLUGIN_CACHE_FORMAT = 1
+
+def only_registers(tree):
+    """
+    Return True if the parsed registration code does nothing but register
+    plugins, so that what it registers does not depend on the environment.
+    """
+    for node in tree.body:
+        if isinstance(node, ast.ImportFrom):
+            if node.module not in ('gramps.gen.plug._pluginreg',
+                                   'gramps.gen.const'):
+                return False
+        elif not isinstance(node, (ast.Assign, ast.AugAssign, ast.Expr)):
+            return False
+    return True
+
 #-------------------------------------------------------------------------
 #
 # PluginRegister
@@ -1143,6 +1164,8 @@ class PluginRegister:
             self.stable_only = False
         self.__plugindata = []
         self.__id_to_pdata = {}
+        self.__cache = None
+        self.__cache_changed = False
 
     def add_plugindata(self, plugindata):
         """ This is used to add an entry to the registration list.  The way it
@@ -1171,29 +1194,42 @@ class PluginRegister:
                 continue
             lenpd = len(self.__plugindata)
             full_filename = os.path.join(dir, filename)
-            try:
-                with open(full_filename, "r", encoding='utf-8') as fd:
-                    stream = fd.read()
-            except Exception as msg:
-                print(_('ERROR: Failed reading plugin registration %(filename)s') % \
-                            {'filename' : filename})
-                print(msg)
-                continue
-            if os.path.exists(os.path.join(os.path.dirname(full_filename),
-                                           'locale')):
-                try:
-                    local_gettext = glocale.get_addon_translator(full_filename).gettext
-                except ValueError:
-                    print(_('WARNING: Plugin %(plugin_name)s has no translation'
-                            ' for any of your configured languages, using US'
-                            ' English instead') %
-                          {'plugin_name' : filename.split('.')[0] })
+            plugins, code = self.__get_cached(full_filename)
+            if plugins is None:
+                if code is None:
+                    try:
+                        with open(full_filename, "r", encoding='utf-8') as fd:
+                            stream = fd.read()
+                    except Exception as msg:
+                        print(_('ERROR: Failed reading plugin registration %(filename)s') % \
+                                    {'filename' : filename})
+                        print(msg)
+                        continue
+                if os.path.exists(os.path.join(os.path.dirname(full_filename),
+                                               'locale')):
+                    try:
+                        local_gettext = glocale.get_addon_translator(full_filename).gettext
+                    except ValueError:
+                        print(_('WARNING: Plugin %(plugin_name)s has no translation'
+                                ' for any of your configured languages, using US'
+                                ' English instead') %
+                              {'plugin_name' : filename.split('.')[0] })
+                        local_gettext = glocale.translation.gettext
+                else:
                     local_gettext = glocale.translation.gettext
-            else:
-                local_gettext = glocale.translation.gettext
             try:
-                exec (compile(stream, filename, 'exec'),
-                      make_environment(_=local_gettext), {'uistate': uistate})
+                if plugins is not None:
+                    self.__plugindata.extend(pickle.loads(plugins))
+                elif code is not None:
+                    exec (marshal.loads(code),
+                          make_environment(_=local_gettext), {'uistate': uistate})
+                else:
+                    tree = ast.parse(stream, filename)
+                    code = compile(tree, filename, 'exec')
+                    exec (code,
+                          make_environment(_=local_gettext), {'uistate': uistate})
+                    self.__set_cached(full_filename, tree, code,
+                                      self.__plugindata[lenpd:])
                 for pdata in self.__plugindata[lenpd:]:
                     # should not be duplicate IDs in different plugins
                     assert pdata.id not in self.__id_to_pdata
@@ -1265,6 +1301,86 @@ class PluginRegister:
                 del self.__id_to_pdata[self.__plugindata[ind].id]
                 del self.__plugindata[ind]
 
+    def __load_cache(self):
+        """
+        Read the plugin cache, unless it was made by another version of
+        Gramps or Python, or for other languages.
+        """
+        self.__cache = {}
+        try:
+            with open(PLUGIN_CACHE, 'rb') as cache_file:
+                cache_key, files = pickle.load(cache_file)
+        except (OSError, EOFError, ValueError, TypeError,
+                pickle.UnpicklingError):
+            return
+        if cache_key == self.__cache_key():
+            self.__cache = files
+
+    @staticmethod
+    def __cache_key():
+        return (PLUGIN_CACHE_FORMAT, GRAMPSVERSION, MAGIC_NUMBER,
+                glocale.lang, glocale.language)
+
+    def __get_cached(self, filename):
+        """
+        Return the pickled plugins registered by the registration file, or
+        else its marshalled code, from the plugin cache.  Both are None if
+        the file is not in the cache or has changed.
+        """
+        if self.__cache is None:
+            self.__load_cache()
+        entry = self.__cache.get(filename)
+        if entry is None:
+            return None, None
+        try:
+            stat = os.stat(filename)
+        except OSError:
+            return None, None
+        mtime, size, plugins, code = entry
+        if (stat.st_mtime_ns, stat.st_size) != (mtime, size):
+            return None, None
+        return plugins, code
+
+    def __set_cached(self, filename, tree, code, plugins):
+        """
+        Keep a registration file in the plugin cache.  The plugins it
+        registered are kept if it does nothing but register plugins,
+        otherwise its code is kept, to be run again.
+        """
+        try:
+            stat = os.stat(filename)
+            if only_registers(tree):
+                entry = (pickle.dumps(plugins), None)
+            else:
+                entry = (None, marshal.dumps(code))
+        except (OSError, TypeError, ValueError, AttributeError,
+                pickle.PicklingError):
+            return
+        self.__cache[filename] = (stat.st_mtime_ns, stat.st_size) + entry
+        self.__cache_changed = True
+
+    def save_cache(self):
+        """
+        Write the plugin cache, if plugins were registered from files which
+        were not in it.  The entries of files which are gone are dropped.
+        """
+        if (not self.__cache_changed or
+                not os.path.isdir(os.path.dirname(PLUGIN_CACHE))):
+            return
+        files = {filename: entry for filename, entry in self.__cache.items()
+                 if os.path.exists(filename)}
+        # write a new file and move it in place, as other processes may be
+        # reading the cache
+        temp_name = '%s.%d' % (PLUGIN_CACHE, os.getpid())
+        try:
+            with open(temp_name, 'wb') as cache_file:
+                pickle.dump((self.__cache_key(), files), cache_file)
+            os.replace(temp_name, PLUGIN_CACHE)
+        except OSError as msg:
+            LOG.warning("Failed writing the plugin cache: %s", msg)
+            return
+        self.__cache_changed = False
+
     def get_plugin(self, id):
         """
         Return the :class:`PluginData` for the plugin with id
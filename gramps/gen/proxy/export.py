@@ -0,0 +1,169 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Proxy class for the Gramps databases. Applies a chain of proxies, computing
+each object only once in each of them.
+"""
+
+#-------------------------------------------------------------------------
+#
+# Gramps libraries
+#
+#-------------------------------------------------------------------------
+from .proxybase import ProxyDbBase
+from ..lib import (Person, Family, Source, Citation, Event, Media,
+                   Place, Repository, Note, Tag)
+from ..utils.lru import LRU
+
+# number of objects each proxy of the chain keeps, in serialized form
+CACHE_SIZE = 32767
+
+#-------------------------------------------------------------------------
+#
+# CachedProxyDb
+#
+#-------------------------------------------------------------------------
+class CachedProxyDb(ProxyDbBase):
+    """
+    A proxy to a Gramps database, which keeps the objects the database
+    returns for their handles, up to CACHE_SIZE of them.
+
+    The objects are kept serialized, and each call returns a new object,
+    so callers are free to modify the objects they get.  Changes to the
+    database are not noticed, so it should only be used while the database
+    does not change, as during an export.
+    """
+
+    def __init__(self, db, size=CACHE_SIZE):
+        ProxyDbBase.__init__(self, db)
+        self.cache = LRU(size)
+
+    def _get(self, obj_class, get_object, handle):
+        """
+        Return the object of obj_class with the handle, from the cache if
+        it is there, else from get_object.
+        """
+        key = (obj_class.__name__, handle)
+        if key in self.cache:
+            data = self.cache[key]
+        else:
+            obj = get_object(handle)
+            data = obj.serialize() if obj else None
+            self.cache[key] = data
+        return obj_class.create(data) if data else None
+
+    # Read methods which ProxyDbBase does not pass on to the database
+
+    def find_backlink_handles(self, handle, include_classes=None):
+        return self.db.find_backlink_handles(handle, include_classes)
+
+    def get_surname_list(self):
+        return self.db.get_surname_list()
+
+    def get_place_types(self):
+        return self.db.get_place_types()
+
+    def get_place_tree_cursor(self):
+        return self.db.get_place_tree_cursor()
+
+    def get_person_from_handle(self, handle):
+        return self._get(Person, self.db.get_person_from_handle, handle)
+
+    def get_family_from_handle(self, handle):
+        return self._get(Family, self.db.get_family_from_handle, handle)
+
+    def get_event_from_handle(self, handle):
+        return self._get(Event, self.db.get_event_from_handle, handle)
+
+    def get_source_from_handle(self, handle):
+        return self._get(Source, self.db.get_source_from_handle, handle)
+
+    def get_citation_from_handle(self, handle):
+        return self._get(Citation, self.db.get_citation_from_handle, handle)
+
+    def get_place_from_handle(self, handle):
+        return self._get(Place, self.db.get_place_from_handle, handle)
+
+    def get_media_from_handle(self, handle):
+        return self._get(Media, self.db.get_media_from_handle, handle)
+
+    def get_repository_from_handle(self, handle):
+        return self._get(Repository, self.db.get_repository_from_handle,
+                         handle)
+
+    def get_note_from_handle(self, handle):
+        return self._get(Note, self.db.get_note_from_handle, handle)
+
+    def get_tag_from_handle(self, handle):
+        return self._get(Tag, self.db.get_tag_from_handle, handle)
+
+#-------------------------------------------------------------------------
+#
+# ExportProxyDb
+#
+#-------------------------------------------------------------------------
+class ExportProxyDb(CachedProxyDb):
+    """
+    A proxy to a Gramps database, which applies a chain of proxies like the
+    privacy, living people, filter and referenced proxies of an export.
+
+    Each proxy of the chain reads from a cache of what the proxy before it
+    returned, so an object is computed once in each proxy, however often the
+    proxies after it ask for it.  The handles of the objects the chain
+    includes are found once, when the ExportProxyDb is created.
+    """
+
+    def __init__(self, db, stages, size=CACHE_SIZE):
+        """
+        Create a new ExportProxyDb instance.
+
+        :param db: The database to be a proxy for
+        :type db: DbBase
+        :param stages: The functions which apply the proxies, in order.  Each
+                       is called with the database so far, and returns it
+                       unchanged or with a proxy applied.
+        :type stages: list of callables
+        :param size: The number of objects kept for each proxy
+        :type size: int
+        """
+        top = db
+        for stage in stages:
+            source = top if top is db else CachedProxyDb(top, size)
+            proxy = stage(source)
+            if proxy is not source:
+                top = proxy
+        CachedProxyDb.__init__(self, top, size)
+        db = top
+
+        self.handles = {}
+        for obj_class, name in ((Person, 'person'), (Family, 'family'),
+                                (Event, 'event'), (Source, 'source'),
+                                (Citation, 'citation'), (Place, 'place'),
+                                (Media, 'media'),
+                                (Repository, 'repository'),
+                                (Note, 'note'), (Tag, 'tag')):
+            handles = set(getattr(db, 'iter_%s_handles' % name)())
+            self.handles[obj_class.__name__] = handles
+            setattr(self, 'include_' + name, handles.__contains__)
+            setattr(self, 'iter_%s_handles' % name, handles.__iter__)
+
+    def _get(self, obj_class, get_object, handle):
+        if handle not in self.handles[obj_class.__name__]:
+            return None
+        return CachedProxyDb._get(self, obj_class, get_object, handle)
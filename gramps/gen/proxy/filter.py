@@ -81,39 +81,45 @@ class FilterProxyDb(ProxyDbBase):
         """
         if handle in self.plist:
             person = self.db.get_person_from_handle(handle)
-            if person is None:
-                return None
-            person.set_person_ref_list(
-                [ ref for ref in person.get_person_ref_list()
-                  if ref.ref in self.plist ])
+            return self.__filter_person(person)
+        else:
+            return None
 
-            person.set_family_handle_list(
-                [ hndl for hndl in person.get_family_handle_list()
-                  if hndl in self.flist ])
+    def __filter_person(self, person):
+        """
+        Remove the references to filtered out objects from a person.
+        """
+        if person is None:
+            return None
+        person.set_person_ref_list(
+            [ ref for ref in person.get_person_ref_list()
+              if ref.ref in self.plist ])
 
-            person.set_parent_family_handle_list(
-                [ hndl for hndl in person.get_parent_family_handle_list()
-                  if hndl in self.flist ])
+        person.set_family_handle_list(
+            [ hndl for hndl in person.get_family_handle_list()
+              if hndl in self.flist ])
 
-            eref_list = person.get_event_ref_list()
-            bref = person.get_birth_ref()
-            dref = person.get_death_ref()
+        person.set_parent_family_handle_list(
+            [ hndl for hndl in person.get_parent_family_handle_list()
+              if hndl in self.flist ])
 
-            new_eref_list = [ ref for ref in eref_list
-                              if ref.ref in self.elist]
+        eref_list = person.get_event_ref_list()
+        bref = person.get_birth_ref()
+        dref = person.get_death_ref()
 
-            person.set_event_ref_list(new_eref_list)
-            if bref in new_eref_list:
-                person.set_birth_ref(bref)
-            if dref in new_eref_list:
-                person.set_death_ref(dref)
+        new_eref_list = [ ref for ref in eref_list
+                          if ref.ref in self.elist]
 
-            # Filter notes out
-            self.sanitize_person(person)
+        person.set_event_ref_list(new_eref_list)
+        if bref in new_eref_list:
+            person.set_birth_ref(bref)
+        if dref in new_eref_list:
+            person.set_death_ref(dref)
 
-            return person
-        else:
-            return None
+        # Filter notes out
+        self.sanitize_person(person)
+
+        return person
 
     def include_person(self, handle):
         return handle in self.plist
@@ -133,7 +139,12 @@ class FilterProxyDb(ProxyDbBase):
         If no such Source exists, None is returned.
         """
         source = self.db.get_source_from_handle(handle)
+        return self.__filter_source(source)
 
+    def __filter_source(self, source):
+        """
+        Remove the filtered out notes from a source.
+        """
         if source:
             # Filter notes out
             self.sanitize_notebase(source)
@@ -157,6 +168,12 @@ class FilterProxyDb(ProxyDbBase):
         If no such Citation exists, None is returned.
         """
         citation = self.db.get_citation_from_handle(handle)
+        return self.__filter_citation(citation)
+
+    def __filter_citation(self, citation):
+        """
+        Remove the filtered out notes from a citation.
+        """
         # Filter notes out
         self.sanitize_notebase(citation)
         return citation
@@ -167,7 +184,12 @@ class FilterProxyDb(ProxyDbBase):
         If no such Object exists, None is returned.
         """
         media = self.db.get_media_from_handle(handle)
+        return self.__filter_media(media)
 
+    def __filter_media(self, media):
+        """
+        Remove the filtered out notes from a media object.
+        """
         if media:
             # Filter notes out
             self.sanitize_notebase(media)
@@ -184,7 +206,12 @@ class FilterProxyDb(ProxyDbBase):
         If no such Place exists, None is returned.
         """
         place = self.db.get_place_from_handle(handle)
+        return self.__filter_place(place)
 
+    def __filter_place(self, place):
+        """
+        Remove the filtered out notes from a place.
+        """
         if place:
             # Filter notes out
             self.sanitize_notebase(place)
@@ -205,12 +232,18 @@ class FilterProxyDb(ProxyDbBase):
         """
         if handle in self.elist:
             event = self.db.get_event_from_handle(handle)
-            # Filter all notes out
-            self.sanitize_notebase(event)
-            return event
+            return self.__filter_event(event)
         else:
             return None
 
+    def __filter_event(self, event):
+        """
+        Remove the filtered out notes from an event.
+        """
+        # Filter all notes out
+        self.sanitize_notebase(event)
+        return event
+
     def get_family_from_handle(self, handle):
         """
         Finds a Family in the database from the passed Gramps ID.
@@ -218,53 +251,59 @@ class FilterProxyDb(ProxyDbBase):
         """
         if handle in self.flist:
             family = self.db.get_family_from_handle(handle)
-            if family is None:
-                return None
-            eref_list = [ eref for eref in family.get_event_ref_list()
-                          if eref.ref in self.elist ]
-            family.set_event_ref_list(eref_list)
+            return self.__filter_family(family)
+        else:
+            return None
 
-            if family.get_father_handle() not in self.plist:
-                family.set_father_handle(None)
+    def __filter_family(self, family):
+        """
+        Remove the references to filtered out objects from a family.
+        """
+        if family is None:
+            return None
+        eref_list = [ eref for eref in family.get_event_ref_list()
+                      if eref.ref in self.elist ]
+        family.set_event_ref_list(eref_list)
 
-            if family.get_mother_handle() not in self.plist:
-                family.set_mother_handle(None)
+        if family.get_father_handle() not in self.plist:
+            family.set_father_handle(None)
 
-            clist = [ cref for cref in family.get_child_ref_list()
-                      if cref.ref in self.plist ]
-            family.set_child_ref_list(clist)
+        if family.get_mother_handle() not in self.plist:
+            family.set_mother_handle(None)
 
-            # Filter notes out
-            for cref in clist:
-                self.sanitize_notebase(cref)
+        clist = [ cref for cref in family.get_child_ref_list()
+                  if cref.ref in self.plist ]
+        family.set_child_ref_list(clist)
 
-            self.sanitize_notebase(family)
+        # Filter notes out
+        for cref in clist:
+            self.sanitize_notebase(cref)
 
-            attributes = family.get_attribute_list()
-            for attr in attributes:
-                self.sanitize_notebase(attr)
+        self.sanitize_notebase(family)
 
-            event_ref_list = family.get_event_ref_list()
-            for event_ref in event_ref_list:
-                self.sanitize_notebase(event_ref)
-                attributes = event_ref.get_attribute_list()
-                for attribute in attributes:
-                    self.sanitize_notebase(attribute)
+        attributes = family.get_attribute_list()
+        for attr in attributes:
+            self.sanitize_notebase(attr)
 
-            media_ref_list = family.get_media_list()
-            for media_ref in media_ref_list:
-                self.sanitize_notebase(media_ref)
-                attributes = media_ref.get_attribute_list()
-                for attribute in attributes:
-                    self.sanitize_notebase(attribute)
+        event_ref_list = family.get_event_ref_list()
+        for event_ref in event_ref_list:
+            self.sanitize_notebase(event_ref)
+            attributes = event_ref.get_attribute_list()
+            for attribute in attributes:
+                self.sanitize_notebase(attribute)
 
-            lds_ord_list = family.get_lds_ord_list()
-            for lds_ord in lds_ord_list:
-                self.sanitize_notebase(lds_ord)
+        media_ref_list = family.get_media_list()
+        for media_ref in media_ref_list:
+            self.sanitize_notebase(media_ref)
+            attributes = media_ref.get_attribute_list()
+            for attribute in attributes:
+                self.sanitize_notebase(attribute)
 
-            return family
-        else:
-            return None
+        lds_ord_list = family.get_lds_ord_list()
+        for lds_ord in lds_ord_list:
+            self.sanitize_notebase(lds_ord)
+
+        return family
 
     def get_repository_from_handle(self, handle):
         """
@@ -272,6 +311,12 @@ class FilterProxyDb(ProxyDbBase):
         If no such Repository exists, None is returned.
         """
         repository = self.db.get_repository_from_handle(handle)
+        return self.__filter_repository(repository)
+
+    def __filter_repository(self, repository):
+        """
+        Remove the filtered out notes from a repository.
+        """
         # Filter notes out
         self.sanitize_notebase(repository)
         self.sanitize_addressbase(repository)
@@ -287,6 +332,73 @@ class FilterProxyDb(ProxyDbBase):
         else:
             return None
 
+    def get_people_from_handles(self, handles):
+        """
+        Finds People in the database from the passed handles.
+        None is returned for each Person that is filtered out.
+        """
+        return self._get_from_handles(handles, self.include_person,
+                                      self.db.get_people_from_handles,
+                                      self.__filter_person)
+
+    def get_families_from_handles(self, handles):
+        """
+        Finds Families in the database from the passed handles.
+        None is returned for each Family that is filtered out.
+        """
+        return self._get_from_handles(handles, self.include_family,
+                                      self.db.get_families_from_handles,
+                                      self.__filter_family)
+
+    def get_events_from_handles(self, handles):
+        """
+        Finds Events in the database from the passed handles.
+        None is returned for each Event that is filtered out.
+        """
+        return self._get_from_handles(handles, self.include_event,
+                                      self.db.get_events_from_handles,
+                                      self.__filter_event)
+
+    def get_sources_from_handles(self, handles):
+        """
+        Finds Sources in the database from the passed handles.
+        """
+        return self._get_from_handles(handles, None,
+                                      self.db.get_sources_from_handles,
+                                      self.__filter_source)
+
+    def get_citations_from_handles(self, handles):
+        """
+        Finds Citations in the database from the passed handles.
+        """
+        return self._get_from_handles(handles, None,
+                                      self.db.get_citations_from_handles,
+                                      self.__filter_citation)
+
+    def get_media_from_handles(self, handles):
+        """
+        Finds Media objects in the database from the passed handles.
+        """
+        return self._get_from_handles(handles, None,
+                                      self.db.get_media_from_handles,
+                                      self.__filter_media)
+
+    def get_places_from_handles(self, handles):
+        """
+        Finds Places in the database from the passed handles.
+        """
+        return self._get_from_handles(handles, None,
+                                      self.db.get_places_from_handles,
+                                      self.__filter_place)
+
+    def get_repositories_from_handles(self, handles):
+        """
+        Finds Repositories in the database from the passed handles.
+        """
+        return self._get_from_handles(handles, None,
+                                      self.db.get_repositories_from_handles,
+                                      self.__filter_repository)
+
     def get_person_from_gramps_id(self, val):
         """
         Finds a Person in the database from the passed Gramps ID.
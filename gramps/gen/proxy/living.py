@@ -101,12 +101,7 @@ class LivingProxyDb(ProxyDbBase):
         If no such Person exists, None is returned.
         """
         person = self.db.get_person_from_handle(handle)
-        if person and self.__is_living(person):
-            if self.mode == self.MODE_EXCLUDE_ALL:
-                person = None
-            else:
-                person = self.__restrict_person(person)
-        return person
+        return self.__filter_person(person)
 
     def get_family_from_handle(self, handle):
         """
@@ -117,6 +112,35 @@ class LivingProxyDb(ProxyDbBase):
         family = self.__remove_living_from_family(family)
         return family
 
+    def get_people_from_handles(self, handles):
+        """
+        Finds People in the database from the passed handles.
+        None is returned for each Person that is excluded.
+        """
+        return self._get_from_handles(handles, None,
+                                      self.db.get_people_from_handles,
+                                      self.__filter_person)
+
+    def get_families_from_handles(self, handles):
+        """
+        Finds Families in the database from the passed handles.
+        """
+        return self._get_from_handles(handles, None,
+                                      self.db.get_families_from_handles,
+                                      self.__remove_living_from_family)
+
+    def __filter_person(self, person):
+        """
+        Return a restricted copy of a living person, or None if living people
+        are excluded.
+        """
+        if person and self.__is_living(person):
+            if self.mode == self.MODE_EXCLUDE_ALL:
+                person = None
+            else:
+                person = self.__restrict_person(person)
+        return person
+
     def iter_people(self):
         """
         Protected version of iter_people
@@ -147,6 +147,98 @@ class PrivateProxyDb(ProxyDbBase):
             return note
         return None
 
+    def __sanitizer(self, sanitize):
+        """
+        Return a function which returns a sanitized copy of an object, or
+        None if the object is private.
+        """
+        def convert(obj):
+            if obj and not obj.get_privacy():
+                return sanitize(self.db, obj) if sanitize else obj
+            return None
+        return convert
+
+    def get_people_from_handles(self, handles):
+        """
+        Finds People in the database from the passed handles.
+        None is returned for each private Person.
+        """
+        return self._get_from_handles(handles, None,
+                                      self.db.get_people_from_handles,
+                                      self.__sanitizer(sanitize_person))
+
+    def get_sources_from_handles(self, handles):
+        """
+        Finds Sources in the database from the passed handles.
+        None is returned for each private Source.
+        """
+        return self._get_from_handles(handles, None,
+                                      self.db.get_sources_from_handles,
+                                      self.__sanitizer(sanitize_source))
+
+    def get_citations_from_handles(self, handles):
+        """
+        Finds Citations in the database from the passed handles.
+        None is returned for each private Citation.
+        """
+        return self._get_from_handles(handles, None,
+                                      self.db.get_citations_from_handles,
+                                      self.__sanitizer(sanitize_citation))
+
+    def get_media_from_handles(self, handles):
+        """
+        Finds Media objects in the database from the passed handles.
+        None is returned for each private Media.
+        """
+        return self._get_from_handles(handles, None,
+                                      self.db.get_media_from_handles,
+                                      self.__sanitizer(sanitize_media))
+
+    def get_places_from_handles(self, handles):
+        """
+        Finds Places in the database from the passed handles.
+        None is returned for each private Place.
+        """
+        return self._get_from_handles(handles, None,
+                                      self.db.get_places_from_handles,
+                                      self.__sanitizer(sanitize_place))
+
+    def get_events_from_handles(self, handles):
+        """
+        Finds Events in the database from the passed handles.
+        None is returned for each private Event.
+        """
+        return self._get_from_handles(handles, None,
+                                      self.db.get_events_from_handles,
+                                      self.__sanitizer(sanitize_event))
+
+    def get_families_from_handles(self, handles):
+        """
+        Finds Families in the database from the passed handles.
+        None is returned for each private Family.
+        """
+        return self._get_from_handles(handles, None,
+                                      self.db.get_families_from_handles,
+                                      self.__sanitizer(sanitize_family))
+
+    def get_repositories_from_handles(self, handles):
+        """
+        Finds Repositories in the database from the passed handles.
+        None is returned for each private Repository.
+        """
+        return self._get_from_handles(handles, None,
+                                      self.db.get_repositories_from_handles,
+                                      self.__sanitizer(sanitize_repository))
+
+    def get_notes_from_handles(self, handles):
+        """
+        Finds Notes in the database from the passed handles.
+        None is returned for each private Note.
+        """
+        return self._get_from_handles(handles, None,
+                                      self.db.get_notes_from_handles,
+                                      self.__sanitizer(None))
+
     def get_person_from_gramps_id(self, val):
         """
         Finds a Person in the database from the passed Gramps ID.
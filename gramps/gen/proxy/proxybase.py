@@ -575,6 +575,104 @@ class ProxyDbBase(DbReadBase):
         return self.gfilter(self.include_tag,
                             self.db.get_tag_from_handle(handle))
 
+    def _get_from_handles(self, handles, predicate, get_from_handles,
+                          convert=None):
+        """
+        Helper function to find several objects with one call to the proxied
+        database.  Objects whose handles fail the predicate are not fetched.
+        If convert is given, it is applied to each fetched object.  None is
+        returned in place of each object that is filtered out.
+        """
+        handles = list(handles)
+        if predicate is not None:
+            wanted = [handle for handle in handles if predicate(handle)]
+        else:
+            wanted = handles
+        objs = dict(zip(wanted, get_from_handles(wanted)))
+        if convert is not None:
+            objs = {handle: convert(obj) for handle, obj in objs.items()}
+        return [objs.get(handle) for handle in handles]
+
+    def get_people_from_handles(self, handles):
+        """
+        Finds People in the database from the passed gramps handles.
+        None is returned for each object that is filtered out.
+        """
+        return self._get_from_handles(handles, self.include_person,
+                                      self.db.get_people_from_handles)
+
+    def get_families_from_handles(self, handles):
+        """
+        Finds Families in the database from the passed gramps handles.
+        None is returned for each object that is filtered out.
+        """
+        return self._get_from_handles(handles, self.include_family,
+                                      self.db.get_families_from_handles)
+
+    def get_events_from_handles(self, handles):
+        """
+        Finds Events in the database from the passed gramps handles.
+        None is returned for each object that is filtered out.
+        """
+        return self._get_from_handles(handles, self.include_event,
+                                      self.db.get_events_from_handles)
+
+    def get_sources_from_handles(self, handles):
+        """
+        Finds Sources in the database from the passed gramps handles.
+        None is returned for each object that is filtered out.
+        """
+        return self._get_from_handles(handles, self.include_source,
+                                      self.db.get_sources_from_handles)
+
+    def get_citations_from_handles(self, handles):
+        """
+        Finds Citations in the database from the passed gramps handles.
+        None is returned for each object that is filtered out.
+        """
+        return self._get_from_handles(handles, self.include_citation,
+                                      self.db.get_citations_from_handles)
+
+    def get_places_from_handles(self, handles):
+        """
+        Finds Places in the database from the passed gramps handles.
+        None is returned for each object that is filtered out.
+        """
+        return self._get_from_handles(handles, self.include_place,
+                                      self.db.get_places_from_handles)
+
+    def get_media_from_handles(self, handles):
+        """
+        Finds Media objects in the database from the passed gramps handles.
+        None is returned for each object that is filtered out.
+        """
+        return self._get_from_handles(handles, self.include_media,
+                                      self.db.get_media_from_handles)
+
+    def get_repositories_from_handles(self, handles):
+        """
+        Finds Repositories in the database from the passed gramps handles.
+        None is returned for each object that is filtered out.
+        """
+        return self._get_from_handles(handles, self.include_repository,
+                                      self.db.get_repositories_from_handles)
+
+    def get_notes_from_handles(self, handles):
+        """
+        Finds Notes in the database from the passed gramps handles.
+        None is returned for each object that is filtered out.
+        """
+        return self._get_from_handles(handles, self.include_note,
+                                      self.db.get_notes_from_handles)
+
+    def get_tags_from_handles(self, handles):
+        """
+        Finds Tags in the database from the passed gramps handles.
+        None is returned for each object that is filtered out.
+        """
+        return self._get_from_handles(handles, self.include_tag,
+                                      self.db.get_tags_from_handles)
+
     def get_person_from_gramps_id(self, val):
         """
         Finds a Person in the database from the passed Gramps ID.
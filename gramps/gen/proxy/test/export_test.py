@@ -0,0 +1,115 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Unittest for the export proxy, which must give the same data as the chain of
+proxies it replaces.
+"""
+import os
+import unittest
+
+from ...const import DATA_DIR
+from ...db.dbconst import CLASS_TO_KEY_MAP
+from ...db.utils import import_as_dict
+from ...filters import GenericFilter
+from ...filters.rules.person import IsFemale
+from ...user import User
+from .. import (ExportProxyDb, FilterProxyDb, LivingProxyDb, PrivateProxyDb,
+                ReferencedBySelectionProxyDb)
+
+TEST_DIR = os.path.abspath(os.path.join(DATA_DIR, "tests"))
+EXAMPLE = os.path.join(TEST_DIR, "example.gramps")
+
+def person_filter(db):
+    """ Keep the women only. """
+    filter_ = GenericFilter()
+    filter_.add_rule(IsFemale([]))
+    return FilterProxyDb(db, filter_)
+
+def private(db):
+    return PrivateProxyDb(db)
+
+def living(mode):
+    return lambda db: LivingProxyDb(db, mode)
+
+def referenced(db):
+    return ReferencedBySelectionProxyDb(db, all_people=True)
+
+class ExportProxyTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.db = import_as_dict(EXAMPLE, User())
+
+    def assert_same(self, stages):
+        """
+        Check that the export proxy with the stages has the same objects as
+        the stages applied one after the other.
+        """
+        chain = self.db
+        for stage in stages:
+            chain = stage(chain)
+        proxy = ExportProxyDb(self.db, stages)
+        for class_name in CLASS_TO_KEY_MAP:
+            handles = set(chain.method('iter_%s_handles', class_name)())
+            self.assertEqual(
+                set(proxy.method('iter_%s_handles', class_name)()), handles,
+                class_name)
+            for handle in handles:
+                obj = chain.method('get_%s_from_handle', class_name)(handle)
+                new = proxy.method('get_%s_from_handle', class_name)(handle)
+                self.assertEqual(new.serialize(), obj.serialize(), class_name)
+        return chain
+
+    def test_no_stages(self):
+        self.assert_same([])
+
+    def test_private(self):
+        self.assert_same([private])
+
+    def test_living(self):
+        for mode in (LivingProxyDb.MODE_INCLUDE_LAST_NAME_ONLY,
+                     LivingProxyDb.MODE_REPLACE_COMPLETE_NAME,
+                     LivingProxyDb.MODE_EXCLUDE_ALL):
+            with self.subTest(mode=mode):
+                self.assert_same([private, living(mode)])
+
+    def test_filter(self):
+        chain = self.assert_same(
+            [private, living(LivingProxyDb.MODE_INCLUDE_LAST_NAME_ONLY),
+             person_filter, referenced])
+        self.assertLess(chain.get_number_of_people(),
+                        self.db.get_number_of_people())
+
+    def test_order(self):
+        """ Test a filter before the privacy and living proxies. """
+        self.assert_same([person_filter, referenced, private,
+                          living(LivingProxyDb.MODE_EXCLUDE_ALL)])
+
+    def test_hidden_handle(self):
+        """ Test that an object the chain hides is not found. """
+        chain = person_filter(self.db)
+        proxy = ExportProxyDb(self.db, [person_filter])
+        hidden = set(self.db.iter_person_handles()) - set(
+            chain.iter_person_handles())
+        self.assertTrue(hidden)
+        for handle in hidden:
+            self.assertIsNone(proxy.get_person_from_handle(handle))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -829,14 +829,19 @@ class RelationshipCalculator:
     PARTNER_EX_CIVIL_UNION = 7
     PARTNER_EX_UNKNOWN_REL = 8
 
+    #number of ancestor maps kept between calls
+    MAX_STORED_MAPS = 100
+
     def __init__(self):
         self.signal_keys = []
         self.state_signal_key = None
         self.storemap = False
         self.dirtymap = True
-        self.stored_map = None
-        self.map_handle = None
-        self.map_meta = None
+        # Ancestor maps of the first person of a relationship, stored
+        # between calls while the database signals are connected.
+        # {(handle, all_families, only_birth, depth):
+        #     (map, meta, handles of the people and families visited)}
+        self.stored_maps = {}
         self.__db_connected = False
         self.depth = 15
         try:
@@ -854,6 +859,7 @@ class RelationshipCalculator:
         self.__only_birth = False
         self.__crosslinks = False
         self.__msg = []
+        self.__visited = set()
 
     def set_depth(self, depth):
         """
@@ -1249,34 +1255,37 @@ class RelationshipCalculator:
         second_map = {}
         rank = 9999999
 
+        if self.dirtymap:
+            self.stored_maps.clear()
+            self.dirtymap = False
+        map_key = (orig_person.handle, all_families, only_birth,
+                   self.__max_depth)
+
         try:
-            if (self.storemap and self.stored_map is not None
-                    and self.map_handle == orig_person.handle
-                    and not self.dirtymap):
-                first_map = self.stored_map
+            if self.storemap and map_key in self.stored_maps:
+                first_map, map_meta, visited = self.stored_maps[map_key]
                 self.__max_depth_reached, self.__loop_detected, \
-                 self.__all_families,\
-                 self.__all_dist, self.__only_birth,\
-                 self.__crosslinks, self.__msg = self.map_meta
+                 self.__crosslinks, self.__msg = map_meta
                 self.__msg = list(self.__msg)
             else:
+                self.__visited = set()
                 self.__apply_filter(db, orig_person, '', [], first_map)
-                self.map_meta = (self.__max_depth_reached,
-                                 self.__loop_detected,
-                                 self.__all_families,
-                                 self.__all_dist, self.__only_birth,
-                                 self.__crosslinks, list(self.__msg))
+                if self.storemap:
+                    if len(self.stored_maps) >= self.MAX_STORED_MAPS:
+                        # drop the oldest map
+                        del self.stored_maps[next(iter(self.stored_maps))]
+                    map_meta = (self.__max_depth_reached,
+                                self.__loop_detected,
+                                self.__crosslinks, list(self.__msg))
+                    self.stored_maps[map_key] = (first_map, map_meta,
+                                                 self.__visited |
+                                                 set(first_map))
             self.__apply_filter(db, other_person, '', [], second_map,
                                 stoprecursemap=first_map)
         except RuntimeError:
             return (-1, None, -1, [], -1, []), \
                             [_("Relationship loop detected")] + self.__msg
 
-        if self.storemap:
-            self.stored_map = first_map
-            self.dirtymap = False
-            self.map_handle = orig_person.handle
-
         for person_handle in second_map:
             if person_handle in first_map:
                 com = []
@@ -1430,6 +1439,8 @@ class RelationshipCalculator:
             fam = 0
             for family_handle in family_handles:
                 rel_fam_new = rel_fam + [fam]
+                if stoprecursemap is None:
+                    self.__visited.add(family_handle)
                 family = db.get_family_from_handle(family_handle)
                 if not family:
                     continue
@@ -1790,6 +1801,28 @@ class RelationshipCalculator:
         else:
             return rel_str
 
+    def get_relationships(self, db, orig_person, other_people,
+                          extra_info=False, olocale=glocale):
+        """
+        Return a dictionary mapping the handle of each of other_people to the
+        string representing the most relevant relationship between
+        orig_person and that person, as returned by get_one_relationship.
+
+        The ancestors of orig_person are only looked up once, so this is much
+        faster than calling get_one_relationship for each of other_people.
+        """
+        storemap = self.storemap
+        self.storemap = True
+        try:
+            return {other_person.handle:
+                    self.get_one_relationship(db, orig_person, other_person,
+                                              extra_info, olocale)
+                    for other_person in other_people}
+        finally:
+            self.storemap = storemap
+            if not storemap:
+                self.stored_maps.clear()
+
     def get_all_relationships(self, db, orig_person, other_person):
         """
         Return a tuple, of which the first entry is a list with all
@@ -2254,7 +2287,7 @@ class RelationshipCalculator:
         dbstate.disconnect(self.state_signal_key)
         list(map(dbstate.db.disconnect, self.signal_keys))
         self.storemap = False
-        self.stored_map = None
+        self.stored_maps.clear()
 
     def _dbchange_callback(self, db):
         """
@@ -2267,12 +2300,18 @@ class RelationshipCalculator:
 
     def _datachange_callback(self, handle_list=None):
         """
-        When data in database changes, the map can no  longer be used.
-        As the map might be in use or might be generated at the moment,
-        this method sets a dirty flag. Before reusing the map, this flag
-        will be checked
+        When data in database changes, the maps that went through the changed
+        people or families can no longer be used.
+        If the changed objects are not known, this method sets a dirty flag.
+        Before reusing the maps, this flag will be checked
         """
-        self.dirtymap = True
+        if handle_list is None:
+            self.dirtymap = True
+            return
+        handle_list = set(handle_list)
+        for map_key, (pmap, meta, visited) in list(self.stored_maps.items()):
+            if not handle_list.isdisjoint(visited):
+                del self.stored_maps[map_key]
 
 #-------------------------------------------------------------------------
 #
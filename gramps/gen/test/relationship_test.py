@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+""" Unittest for the stored ancestor maps of relationship.py """
+
+import unittest
+
+from ..db import DbTxn
+from ..db.utils import make_database
+from ..lib import Person, Family, ChildRef
+from ..relationship import RelationshipCalculator
+
+class Test_stored_maps(unittest.TestCase):
+    def setUp(self):
+        self.db = make_database("sqlite")
+        self.db.load(":memory:")
+        self.calc = RelationshipCalculator()
+        self.people = {}
+        with DbTxn('Add test objects', self.db) as trans:
+            for name, gender in (('father', Person.MALE),
+                                 ('mother', Person.FEMALE),
+                                 ('son', Person.MALE),
+                                 ('daughter', Person.FEMALE)):
+                person = Person()
+                person.set_gender(gender)
+                self.db.add_person(person, trans)
+                self.people[name] = person
+            self.family = Family()
+            self.family.set_father_handle(self.people['father'].handle)
+            self.family.set_mother_handle(self.people['mother'].handle)
+            self.db.add_family(self.family, trans)
+            for name in ('son', 'daughter'):
+                person = self.people[name]
+                child_ref = ChildRef()
+                child_ref.ref = person.handle
+                self.family.add_child_ref(child_ref)
+                person.add_parent_family_handle(self.family.handle)
+                self.db.commit_person(person, trans)
+            self.db.commit_family(self.family, trans)
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_get_relationships(self):
+        people = self.people
+        rels = self.calc.get_relationships(
+            self.db, people['son'],
+            [people['father'], people['mother'], people['daughter']])
+        self.assertEqual(rels, {people['father'].handle: 'father',
+                                people['mother'].handle: 'mother',
+                                people['daughter'].handle: 'sister'})
+        # The maps are only kept while the signals are connected
+        self.assertEqual(self.calc.stored_maps, {})
+
+    def test_datachange(self):
+        people = self.people
+        self.calc.storemap = True
+        self.calc.get_one_relationship(self.db, people['son'],
+                                       people['daughter'])
+        self.assertEqual(len(self.calc.stored_maps), 1)
+        self.calc._datachange_callback([people['daughter'].handle])
+        self.assertEqual(len(self.calc.stored_maps), 1)
+        self.calc._datachange_callback([self.family.handle])
+        self.assertEqual(self.calc.stored_maps, {})
+        self.calc.get_one_relationship(self.db, people['son'],
+                                       people['daughter'])
+        self.calc._datachange_callback()
+        self.calc.get_one_relationship(self.db, people['daughter'],
+                                       people['son'])
+        self.assertEqual([key[0] for key in self.calc.stored_maps],
+                         [people['daughter'].handle])
+
+if __name__ == "__main__":
+    unittest.main()
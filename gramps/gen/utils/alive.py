@@ -31,6 +31,8 @@ privacy in reports and exports.
 #
 #-------------------------------------------------------------------------
 import logging
+from collections import namedtuple
+from weakref import WeakKeyDictionary
 LOG = logging.getLogger(".gen.utils.alive")
 
 #-------------------------------------------------------------------------
@@ -40,7 +42,8 @@ LOG = logging.getLogger(".gen.utils.alive")
 #-------------------------------------------------------------------------
 from ..display.name import displayer as name_displayer
 from ..lib.date import Date, Today
-from ..errors import DatabaseError
+from ..errors import DatabaseError, HandleError
+from .callback import Callback
 from ..const import GRAMPS_LOCALE as glocale
 _ = glocale.translation.sgettext
 
@@ -61,6 +64,196 @@ except ImportError:
     _MAX_SIB_AGE_DIFF = 20
     _AVG_GENERATION_GAP = 20
 
+#-------------------------------------------------------------------------
+#
+# AliveCache class
+#
+#-------------------------------------------------------------------------
+# What the estimates need to know about an event, a person and a family.
+# Dates are kept serialized, as Date objects take a lot more memory.
+_EventFacts = namedtuple('_EventFacts',
+                         ['birth', 'death', 'birth_fallback',
+                          'death_fallback', 'empty', 'year', 'valid', 'date'])
+_PersonFacts = namedtuple('_PersonFacts',
+                          ['handle', 'birth', 'birth_primary', 'death',
+                           'death_primary', 'events', 'parent_families',
+                           'main_family', 'families'])
+_FamilyFacts = namedtuple('_FamilyFacts',
+                          ['father', 'mother', 'children', 'events'])
+
+_NONE = (None, None, "", None)
+
+def _date(event):
+    """
+    Return a new Date object with the date of the event facts.
+    """
+    date = Date()
+    date.unserialize(event.date)
+    return date
+
+class AliveCache:
+    """
+    The facts about the people, families and events of a database that
+    :class:`ProbablyAlive` looks at, and the ranges it estimated from them.
+
+    The facts of an object are read the first time they are needed, or for
+    the whole database at once by :meth:`load`.  When the cache is connected
+    to a database, the facts of changed objects are dropped on the change
+    signals, and everything on the rebuild signals.  The estimated ranges
+    depend on many objects, so they are all dropped on any change.
+    """
+
+    def __init__(self):
+        self.people = {}
+        self.families = {}
+        self.events = {}
+        self.results = {}
+        self.loaded = False
+
+    def connect(self, db):
+        """
+        Keep the cache up to date with the changes to the database.
+        """
+        for obj, callback in (('person', self._person_changed),
+                              ('family', self._family_changed),
+                              ('event', self._event_changed)):
+            for change in ('-add', '-update', '-delete'):
+                db.connect(obj + change, callback)
+            db.connect(obj + '-rebuild', self.clear)
+
+    def clear(self):
+        """
+        Drop everything in the cache.
+        """
+        self.people.clear()
+        self.families.clear()
+        self.events.clear()
+        self.results.clear()
+        self.loaded = False
+
+    def _person_changed(self, handles):
+        self.__changed(self.people, handles)
+
+    def _family_changed(self, handles):
+        self.__changed(self.families, handles)
+
+    def _event_changed(self, handles):
+        self.__changed(self.events, handles)
+
+    def __changed(self, store, handles):
+        for handle in handles:
+            store.pop(handle, None)
+        self.results.clear()
+
+    def load(self, db):
+        """
+        Read the facts of all people, families and events of the database,
+        unless they were read before.  Facts dropped since then are read
+        again the next time they are needed.
+        """
+        if self.loaded:
+            return
+        for event in db.iter_events():
+            self.events[event.handle] = self.event_facts(event)
+        for family in db.iter_families():
+            self.families[family.handle] = self.family_facts(family)
+        for person in db.iter_people():
+            self.people[person.handle] = self.person_facts(person)
+        self.loaded = True
+
+    @staticmethod
+    def person_facts(person):
+        """
+        Return the facts about a person.
+        """
+        birth_ref = person.get_birth_ref()
+        death_ref = person.get_death_ref()
+        return _PersonFacts(
+            person.handle,
+            birth_ref.ref if birth_ref else None,
+            bool(birth_ref and birth_ref.get_role().is_primary()),
+            death_ref.ref if death_ref else None,
+            bool(death_ref and death_ref.get_role().is_primary()),
+            tuple(ref.ref for ref in person.get_primary_event_ref_list()),
+            tuple(person.get_parent_family_handle_list()),
+            person.get_main_parents_family_handle(),
+            tuple(person.get_family_handle_list()))
+
+    @staticmethod
+    def family_facts(family):
+        """
+        Return the facts about a family.
+        """
+        return _FamilyFacts(
+            family.get_father_handle(),
+            family.get_mother_handle(),
+            tuple(ref.ref for ref in family.get_child_ref_list()),
+            tuple(ref.ref for ref in family.get_event_ref_list()))
+
+    @staticmethod
+    def event_facts(event):
+        """
+        Return the facts about an event.
+        """
+        etype = event.get_type()
+        date = event.get_date_object()
+        return _EventFacts(
+            etype.is_birth(), etype.is_death(),
+            etype.is_birth_fallback(), etype.is_death_fallback(),
+            date.get_start_date() == Date.EMPTY, date.get_year(),
+            date.is_valid(), date.serialize())
+
+    def get_person(self, db, handle):
+        """
+        Return the facts about the person with the handle, or None.
+        """
+        return self.__get(self.people, db.get_person_from_handle,
+                          self.person_facts, handle)
+
+    def get_family(self, db, handle):
+        """
+        Return the facts about the family with the handle, or None.
+        """
+        return self.__get(self.families, db.get_family_from_handle,
+                          self.family_facts, handle)
+
+    def get_event(self, db, handle):
+        """
+        Return the facts about the event with the handle, or None.
+        """
+        return self.__get(self.events, db.get_event_from_handle,
+                          self.event_facts, handle)
+
+    @staticmethod
+    def __get(store, get_object, get_facts, handle):
+        try:
+            return store[handle]
+        except KeyError:
+            pass
+        try:
+            obj = get_object(handle)
+        except HandleError:
+            obj = None
+        facts = get_facts(obj) if obj else None
+        store[handle] = facts
+        return facts
+
+# The cache of each database, kept as long as the database is in use.
+_CACHES = WeakKeyDictionary()
+
+def get_alive_cache(db):
+    """
+    Return the :class:`AliveCache` of a database, which is not a proxy.
+    A database without signals gets a new cache each time.
+    """
+    cache = _CACHES.get(db)
+    if cache is None:
+        cache = AliveCache()
+        if isinstance(db, Callback):
+            cache.connect(db)
+            _CACHES[db] = cache
+    return cache
+
 #-------------------------------------------------------------------------
 #
 # ProbablyAlive class
@@ -87,8 +280,52 @@ class ProbablyAlive:
         self.MAX_AGE_PROB_ALIVE = max_age_prob_alive
         self.AVG_GENERATION_GAP = avg_generation_gap
         self.pset = set()
+        self.cache = get_alive_cache(db)
 
     def probably_alive_range(self, person, is_spouse=False):
+        """
+        Return the estimated (birth date, death date, explanation, related
+        person) of the person.  The estimate is kept in the cache, so it is
+        only made again when something in the database changed.
+        """
+        if person is None:
+            return (None, None, "", None)
+        facts = self.cache.person_facts(person)
+        key = (facts, is_spouse, self.MAX_SIB_AGE_DIFF,
+               self.MAX_AGE_PROB_ALIVE, self.AVG_GENERATION_GAP)
+        result = self.cache.results.get(key)
+        if result is None:
+            result = self._range(facts, is_spouse, person)
+            self.cache.results[key] = result
+        birth, death, explain, other = result
+        if other == person.handle:
+            other = person
+        elif other:
+            other = self.db.get_person_from_handle(other)
+        # callers may change the dates they get
+        return (Date(birth) if birth else None,
+                Date(death) if death else None, explain, other)
+
+    def _person(self, handle):
+        return self.cache.get_person(self.db, handle)
+
+    def _family(self, handle):
+        return self.cache.get_family(self.db, handle)
+
+    def _events(self, person):
+        """
+        Yield the facts of the primary events of the person.
+        """
+        for event_handle in person.events:
+            event = self.cache.get_event(self.db, event_handle)
+            if event:
+                yield event
+
+    def _range(self, person, is_spouse=False, person_obj=None):
+        """
+        Estimate the range of the person facts.  The related person is
+        returned as a handle.
+        """
         # FIXME: some of these computed dates need to be a span. For
         #        example, if a person could be born +/- 20 yrs around
         #        a date then it should be a span, and yr_offset should
@@ -97,46 +334,40 @@ class ProbablyAlive:
         if person is None:
             return (None, None, "", None)
         self.pset = set()
-        birth_ref = person.get_birth_ref()
-        death_ref = person.get_death_ref()
         death_date = None
         birth_date = None
         explain = ""
         # If the recorded death year is before current year then
         # things are simple.
-        if death_ref and death_ref.get_role().is_primary():
-            if death_ref:
-                death = self.db.get_event_from_handle(death_ref.ref)
-                if death:
-                    death_date = death.get_date_object()
+        if person.death and person.death_primary:
+            death = self.cache.get_event(self.db, person.death)
+            if death:
+                death_date = _date(death)
 
         # Look for Cause Of Death, Burial or Cremation events.
         # These are fairly good indications that someone's not alive.
         if not death_date:
-            for ev_ref in person.get_primary_event_ref_list():
-                if ev_ref:
-                    ev = self.db.get_event_from_handle(ev_ref.ref)
-                    if ev and ev.type.is_death_fallback():
-                        death_date = ev.get_date_object()
-                        if not death_date.is_valid():
-                            death_date = Today() # before today
-                            death_date.set_modifier(Date.MOD_BEFORE)
+            for event in self._events(person):
+                if event.death_fallback:
+                    death_date = _date(event)
+                    if not event.valid:
+                        death_date = Today() # before today
+                        death_date.set_modifier(Date.MOD_BEFORE)
 
         # If they were born within X years before current year then
         # assume they are alive (we already know they are not dead).
         if not birth_date:
-            if birth_ref and birth_ref.get_role().is_primary():
-                birth = self.db.get_event_from_handle(birth_ref.ref)
-                if birth and birth.get_date_object().get_start_date() != Date.EMPTY:
-                    birth_date = birth.get_date_object()
+            if person.birth and person.birth_primary:
+                birth = self.cache.get_event(self.db, person.birth)
+                if birth and not birth.empty:
+                    birth_date = _date(birth)
 
         # Look for Baptism, etc events.
         # These are fairly good indications that someone's birth.
         if not birth_date:
-            for ev_ref in person.get_primary_event_ref_list():
-                ev = self.db.get_event_from_handle(ev_ref.ref)
-                if ev and ev.type.is_birth_fallback():
-                    birth_date = ev.get_date_object()
+            for event in self._events(person):
+                if event.birth_fallback:
+                    birth_date = _date(event)
 
         if not birth_date and death_date:
             # person died more than MAX after current year
@@ -150,7 +381,7 @@ class ProbablyAlive:
             explain = _("birth date")
 
         if death_date and birth_date:
-            return (birth_date, death_date, explain, person) # direct self evidence
+            return (birth_date, death_date, explain, person.handle) # direct self evidence
 
         # Neither birth nor death events are available. Try looking
         # at siblings. If a sibling was born more than X years past,
@@ -158,88 +389,74 @@ class ProbablyAlive:
         # not alive. If the sibling died more than X years
         # past, or more than X years future, then probably not alive.
 
-        family_list = person.get_parent_family_handle_list()
-        for family_handle in family_list:
-            family = self.db.get_family_from_handle(family_handle)
+        for family_handle in person.parent_families:
+            family = self._family(family_handle)
             if family is None:
                 continue
-            for child_ref in family.get_child_ref_list():
-                child_handle = child_ref.ref
-                child = self.db.get_person_from_handle(child_handle)
+            for child_handle in family.children:
+                child = self._person(child_handle)
                 if child is None:
                     continue
                 # Go through once looking for direct evidence:
-                for ev_ref in child.get_primary_event_ref_list():
-                    ev = self.db.get_event_from_handle(ev_ref.ref)
-                    if ev and ev.type.is_birth():
-                        dobj = ev.get_date_object()
-                        if dobj.get_start_date() != Date.EMPTY:
+                for event in self._events(child):
+                    if event.birth:
+                        if not event.empty:
                             # if sibling birth date too far away, then not alive:
-                            year = dobj.get_year()
+                            year = event.year
                             if year != 0:
                                 # sibling birth date
                                 return (Date().copy_ymd(year - self.MAX_SIB_AGE_DIFF),
                                         Date().copy_ymd(year - self.MAX_SIB_AGE_DIFF + self.MAX_AGE_PROB_ALIVE),
                                         _("sibling birth date"),
-                                        child)
-                    elif ev and ev.type.is_death():
-                        dobj = ev.get_date_object()
-                        if dobj.get_start_date() != Date.EMPTY:
+                                        child.handle)
+                    elif event.death:
+                        if not event.empty:
                             # if sibling death date too far away, then not alive:
-                            year = dobj.get_year()
+                            year = event.year
                             if year != 0:
                                 # sibling death date
                                 return (Date().copy_ymd(year - self.MAX_SIB_AGE_DIFF - self.MAX_AGE_PROB_ALIVE),
                                         Date().copy_ymd(year - self.MAX_SIB_AGE_DIFF - self.MAX_AGE_PROB_ALIVE
                                                                 + self.MAX_AGE_PROB_ALIVE),
                                         _("sibling death date"),
-                                        child)
+                                        child.handle)
                 # Go through again looking for fallback:
-                for ev_ref in child.get_primary_event_ref_list():
-                    ev = self.db.get_event_from_handle(ev_ref.ref)
-                    if ev and ev.type.is_birth_fallback():
-                        dobj = ev.get_date_object()
-                        if dobj.get_start_date() != Date.EMPTY:
+                for event in self._events(child):
+                    if event.birth_fallback:
+                        if not event.empty:
                             # if sibling birth date too far away, then not alive:
-                            year = dobj.get_year()
+                            year = event.year
                             if year != 0:
                                 # sibling birth date
                                 return (Date().copy_ymd(year - self.MAX_SIB_AGE_DIFF),
                                         Date().copy_ymd(year - self.MAX_SIB_AGE_DIFF + self.MAX_AGE_PROB_ALIVE),
                                         _("sibling birth-related date"),
-                                        child)
-                    elif ev and ev.type.is_death_fallback():
-                        dobj = ev.get_date_object()
-                        if dobj.get_start_date() != Date.EMPTY:
+                                        child.handle)
+                    elif event.death_fallback:
+                        if not event.empty:
                             # if sibling death date too far away, then not alive:
-                            year = dobj.get_year()
+                            year = event.year
                             if year != 0:
                                 # sibling death date
                                 return (Date().copy_ymd(year - self.MAX_SIB_AGE_DIFF - self.MAX_AGE_PROB_ALIVE),
                                         Date().copy_ymd(year - self.MAX_SIB_AGE_DIFF - self.MAX_AGE_PROB_ALIVE + self.MAX_AGE_PROB_ALIVE),
                                         _("sibling death-related date"),
-                                        child)
+                                        child.handle)
 
         if not is_spouse: # if you are not in recursion, let's recurse:
-            for family_handle in person.get_family_handle_list():
-                family = self.db.get_family_from_handle(family_handle)
+            for family_handle in person.families:
+                family = self._family(family_handle)
                 if family:
-                    mother_handle = family.get_mother_handle()
-                    father_handle = family.get_father_handle()
+                    mother_handle = family.mother
+                    father_handle = family.father
+                    spouse_handle = None
                     if mother_handle == person.handle and father_handle:
-                        father = self.db.get_person_from_handle(father_handle)
-                        date1, date2, explain, other = self.probably_alive_range(father, is_spouse=True)
-                        if date1 and date1.get_year() != 0:
-                            return (Date().copy_ymd(date1.get_year() - self.AVG_GENERATION_GAP),
-                                    Date().copy_ymd(date1.get_year() - self.AVG_GENERATION_GAP + self.MAX_AGE_PROB_ALIVE),
-                                    _("a spouse's birth-related date, ") + explain, other)
-                        elif date2 and date2.get_year() != 0:
-                            return (Date().copy_ymd(date2.get_year() + self.AVG_GENERATION_GAP - self.MAX_AGE_PROB_ALIVE),
-                                    Date().copy_ymd(date2.get_year() + self.AVG_GENERATION_GAP),
-                                    _("a spouse's death-related date, ") + explain, other)
+                        spouse_handle = father_handle
                     elif father_handle == person.handle and mother_handle:
-                        mother = self.db.get_person_from_handle(mother_handle)
-                        date1, date2, explain, other = self.probably_alive_range(mother, is_spouse=True)
+                        spouse_handle = mother_handle
+                    if spouse_handle:
+                        spouse = self._person(spouse_handle)
+                        date1, date2, explain, other = self._range(spouse, is_spouse=True)
                         if date1 and date1.get_year() != 0:
                             return (Date().copy_ymd(date1.get_year() - self.AVG_GENERATION_GAP),
                                     Date().copy_ymd(date1.get_year() - self.AVG_GENERATION_GAP + self.MAX_AGE_PROB_ALIVE),
@@ -249,216 +466,39 @@ class ProbablyAlive:
                                     Date().copy_ymd(date2.get_year() + self.AVG_GENERATION_GAP),
                                     _("a spouse's death-related date, ") + explain, other)
                     # Let's check the family events and see if we find something
-                    for ref in family.get_event_ref_list():
-                        if ref:
-                            event = self.db.get_event_from_handle(ref.ref)
-                            if event:
-                                date = event.get_date_object()
-                                year = date.get_year()
-                                if year != 0:
-                                    other = None
-                                    if person.handle == mother_handle and father_handle:
-                                        other = self.db.get_person_from_handle(father_handle)
-                                    elif person.handle == father_handle and mother_handle:
-                                        other = self.db.get_person_from_handle(mother_handle)
-                                    return (Date().copy_ymd(year - self.AVG_GENERATION_GAP),
-                                            Date().copy_ymd(year - self.AVG_GENERATION_GAP +
-                                                                    self.MAX_AGE_PROB_ALIVE),
-
-                                            _("event with spouse"), other)
-
-        # Try looking for descendants that were born more than a lifespan
-        # ago.
-
-        def descendants_too_old (person, years):
-            if person.handle in self.pset:
-                return (None, None, "", None)
-            self.pset.add(person.handle)
-            for family_handle in person.get_family_handle_list():
-                family = self.db.get_family_from_handle(family_handle)
-                if not family:
-                    # can happen with LivingProxyDb(PrivateProxyDb(db))
-                    continue
-                for child_ref in family.get_child_ref_list():
-                    child_handle = child_ref.ref
-                    child = self.db.get_person_from_handle(child_handle)
-                    child_birth_ref = child.get_birth_ref()
-                    if child_birth_ref:
-                        child_birth = self.db.get_event_from_handle(child_birth_ref.ref)
-                        dobj = child_birth.get_date_object()
-                        if dobj.get_start_date() != Date.EMPTY:
-                            d = Date(dobj)
-                            val = d.get_start_date()
-                            val = d.get_year() - years
-                            d.set_year(val)
-                            return (d, d.copy_offset_ymd(self.MAX_AGE_PROB_ALIVE),
-                                    _("descendant birth date"),
-                                    child)
-                    child_death_ref = child.get_death_ref()
-                    if child_death_ref:
-                        child_death = self.db.get_event_from_handle(child_death_ref.ref)
-                        dobj = child_death.get_date_object()
-                        if dobj.get_start_date() != Date.EMPTY:
-                            return (dobj.copy_offset_ymd(- self.AVG_GENERATION_GAP),
-                                    dobj.copy_offset_ymd(- self.AVG_GENERATION_GAP + self.MAX_AGE_PROB_ALIVE),
-                                    _("descendant death date"),
-                                    child)
-                    date1, date2, explain, other = descendants_too_old (child, years + self.AVG_GENERATION_GAP)
-                    if date1 and date2:
-                        return date1, date2, explain, other
-                    # Check fallback data:
-                    for ev_ref in child.get_primary_event_ref_list():
-                        ev = self.db.get_event_from_handle(ev_ref.ref)
-                        if ev and ev.type.is_birth_fallback():
-                            dobj = ev.get_date_object()
-                            if dobj.get_start_date() != Date.EMPTY:
-                                d = Date(dobj)
-                                val = d.get_start_date()
-                                val = d.get_year() - years
-                                d.set_year(val)
-                                return (d, d.copy_offset_ymd(self.MAX_AGE_PROB_ALIVE),
-                                        _("descendant birth-related date"),
-                                        child)
-
-                        elif ev and ev.type.is_death_fallback():
-                            dobj = ev.get_date_object()
-                            if dobj.get_start_date() != Date.EMPTY:
-                                return (dobj.copy_offset_ymd(- self.AVG_GENERATION_GAP),
-                                        dobj.copy_offset_ymd(- self.AVG_GENERATION_GAP + self.MAX_AGE_PROB_ALIVE),
-                                        _("descendant death-related date"),
-                                        child)
+                    for event_handle in family.events:
+                        event = self.cache.get_event(self.db, event_handle)
+                        if event:
+                            year = event.year
+                            if year != 0:
+                                return (Date().copy_ymd(year - self.AVG_GENERATION_GAP),
+                                        Date().copy_ymd(year - self.AVG_GENERATION_GAP +
+                                                                self.MAX_AGE_PROB_ALIVE),
 
-            return (None, None, "", None)
+                                        _("event with spouse"), spouse_handle)
 
         # If there are descendants that are too old for the person to have
         # been alive in the current year then they must be dead.
 
         date1, date2, explain, other = None, None, "", None
         try:
-            date1, date2, explain, other = descendants_too_old(person, self.AVG_GENERATION_GAP)
+            date1, date2, explain, other = self._descendants_too_old(person, self.AVG_GENERATION_GAP)
         except RuntimeError:
             raise DatabaseError(
                 _("Database error: loop in %s's descendants") %
-                name_displayer.display(person))
+                self.__name(person, person_obj))
 
         if date1 and date2:
             return (date1, date2, explain, other)
 
-        def ancestors_too_old(person, year):
-            if person.handle in self.pset:
-                return (None, None, "", None)
-            self.pset.add(person.handle)
-            LOG.debug("ancestors_too_old('%s', %s)".format(
-                name_displayer.display(person), year) )
-            family_handle = person.get_main_parents_family_handle()
-            if family_handle:
-                family = self.db.get_family_from_handle(family_handle)
-                if not family:
-                    # can happen with LivingProxyDb(PrivateProxyDb(db))
-                    return (None, None, "", None)
-                father_handle = family.get_father_handle()
-                if father_handle:
-                    father = self.db.get_person_from_handle(father_handle)
-                    father_birth_ref = father.get_birth_ref()
-                    if father_birth_ref and father_birth_ref.get_role().is_primary():
-                        father_birth = self.db.get_event_from_handle(
-                            father_birth_ref.ref)
-                        dobj = father_birth.get_date_object()
-                        if dobj.get_start_date() != Date.EMPTY:
-                            return (dobj.copy_offset_ymd(- year),
-                                    dobj.copy_offset_ymd(- year + self.MAX_AGE_PROB_ALIVE),
-                                    _("ancestor birth date"),
-                                    father)
-                    father_death_ref = father.get_death_ref()
-                    if father_death_ref and father_death_ref.get_role().is_primary():
-                        father_death = self.db.get_event_from_handle(
-                            father_death_ref.ref)
-                        dobj = father_death.get_date_object()
-                        if dobj.get_start_date() != Date.EMPTY:
-                            return (dobj.copy_offset_ymd(- year - self.MAX_AGE_PROB_ALIVE),
-                                    dobj.copy_offset_ymd(- year - self.MAX_AGE_PROB_ALIVE + self.MAX_AGE_PROB_ALIVE),
-                                    _("ancestor death date"),
-                                    father)
-
-                    # Check fallback data:
-                    for ev_ref in father.get_primary_event_ref_list():
-                        ev = self.db.get_event_from_handle(ev_ref.ref)
-                        if ev and ev.type.is_birth_fallback():
-                            dobj = ev.get_date_object()
-                            if dobj.get_start_date() != Date.EMPTY:
-                                return (dobj.copy_offset_ymd(- year),
-                                        dobj.copy_offset_ymd(- year + self.MAX_AGE_PROB_ALIVE),
-                                        _("ancestor birth-related date"),
-                                        father)
-
-                        elif ev and ev.type.is_death_fallback():
-                            dobj = ev.get_date_object()
-                            if dobj.get_start_date() != Date.EMPTY:
-                                return (dobj.copy_offset_ymd(- year - self.MAX_AGE_PROB_ALIVE),
-                                        dobj.copy_offset_ymd(- year - self.MAX_AGE_PROB_ALIVE + self.MAX_AGE_PROB_ALIVE),
-                                        _("ancestor death-related date"),
-                                        father)
-
-                    date1, date2, explain, other = ancestors_too_old (father, year - self.AVG_GENERATION_GAP)
-                    if date1 and date2:
-                        return date1, date2, explain, other
-
-                mother_handle = family.get_mother_handle()
-                if mother_handle:
-                    mother = self.db.get_person_from_handle(mother_handle)
-                    mother_birth_ref = mother.get_birth_ref()
-                    if mother_birth_ref and mother_birth_ref.get_role().is_primary():
-                        mother_birth = self.db.get_event_from_handle(mother_birth_ref.ref)
-                        dobj = mother_birth.get_date_object()
-                        if dobj.get_start_date() != Date.EMPTY:
-                            return (dobj.copy_offset_ymd(- year),
-                                    dobj.copy_offset_ymd(- year + self.MAX_AGE_PROB_ALIVE),
-                                    _("ancestor birth date"),
-                                    mother)
-                    mother_death_ref = mother.get_death_ref()
-                    if mother_death_ref and mother_death_ref.get_role().is_primary():
-                        mother_death = self.db.get_event_from_handle(
-                            mother_death_ref.ref)
-                        dobj = mother_death.get_date_object()
-                        if dobj.get_start_date() != Date.EMPTY:
-                            return (dobj.copy_offset_ymd(- year - self.MAX_AGE_PROB_ALIVE),
-                                    dobj.copy_offset_ymd(- year - self.MAX_AGE_PROB_ALIVE + self.MAX_AGE_PROB_ALIVE),
-                                    _("ancestor death date"),
-                                    mother)
-
-                    # Check fallback data:
-                    for ev_ref in mother.get_primary_event_ref_list():
-                        ev = self.db.get_event_from_handle(ev_ref.ref)
-                        if ev and ev.type.is_birth_fallback():
-                            dobj = ev.get_date_object()
-                            if dobj.get_start_date() != Date.EMPTY:
-                                return (dobj.copy_offset_ymd(- year),
-                                        dobj.copy_offset_ymd(- year + self.MAX_AGE_PROB_ALIVE),
-                                        _("ancestor birth-related date"),
-                                        mother)
-
-                        elif ev and ev.type.is_death_fallback():
-                            dobj = ev.get_date_object()
-                            if dobj.get_start_date() != Date.EMPTY:
-                                return (dobj.copy_offset_ymd(- year - self.MAX_AGE_PROB_ALIVE),
-                                        dobj.copy_offset_ymd(- year - self.MAX_AGE_PROB_ALIVE + self.MAX_AGE_PROB_ALIVE),
-                                        _("ancestor death-related date"),
-                                        mother)
-
-                    date1, date2, explain, other = ancestors_too_old (mother, year - self.AVG_GENERATION_GAP)
-                    if date1 and date2:
-                        return (date1, date2, explain, other)
-
-            return (None, None, "", None)
-
         try:
             # If there are ancestors that would be too old in the current year
             # then assume our person must be dead too.
-            date1, date2, explain, other = ancestors_too_old (person, - self.AVG_GENERATION_GAP)
+            date1, date2, explain, other = self._ancestors_too_old(person, - self.AVG_GENERATION_GAP)
         except RuntimeError:
             raise DatabaseError(
                 _("Database error: loop in %s's ancestors") %
-                name_displayer.display(person))
+                self.__name(person, person_obj))
         if date1 and date2:
             return (date1, date2, explain, other)
 
@@ -467,6 +507,127 @@ class ProbablyAlive:
 
         return (None, None, "", None)
 
+    def __name(self, person, person_obj):
+        if person_obj is None:
+            person_obj = self.db.get_person_from_handle(person.handle)
+        return name_displayer.display(person_obj)
+
+    def _descendants_too_old(self, person, years):
+        """
+        Try looking for descendants that were born more than a lifespan ago.
+        """
+        if person.handle in self.pset:
+            return _NONE
+        self.pset.add(person.handle)
+        for family_handle in person.families:
+            family = self._family(family_handle)
+            if not family:
+                # can happen with LivingProxyDb(PrivateProxyDb(db))
+                continue
+            for child_handle in family.children:
+                child = self._person(child_handle)
+                if child is None:
+                    continue
+                if child.birth:
+                    child_birth = self.cache.get_event(self.db, child.birth)
+                    if child_birth and not child_birth.empty:
+                        d = _date(child_birth)
+                        d.set_year(d.get_year() - years)
+                        return (d, d.copy_offset_ymd(self.MAX_AGE_PROB_ALIVE),
+                                _("descendant birth date"),
+                                child.handle)
+                if child.death:
+                    child_death = self.cache.get_event(self.db, child.death)
+                    if child_death and not child_death.empty:
+                        dobj = _date(child_death)
+                        return (dobj.copy_offset_ymd(- self.AVG_GENERATION_GAP),
+                                dobj.copy_offset_ymd(- self.AVG_GENERATION_GAP + self.MAX_AGE_PROB_ALIVE),
+                                _("descendant death date"),
+                                child.handle)
+                date1, date2, explain, other = self._descendants_too_old(child, years + self.AVG_GENERATION_GAP)
+                if date1 and date2:
+                    return date1, date2, explain, other
+                # Check fallback data:
+                for event in self._events(child):
+                    if event.birth_fallback:
+                        if not event.empty:
+                            d = _date(event)
+                            d.set_year(d.get_year() - years)
+                            return (d, d.copy_offset_ymd(self.MAX_AGE_PROB_ALIVE),
+                                    _("descendant birth-related date"),
+                                    child.handle)
+
+                    elif event.death_fallback:
+                        if not event.empty:
+                            dobj = _date(event)
+                            return (dobj.copy_offset_ymd(- self.AVG_GENERATION_GAP),
+                                    dobj.copy_offset_ymd(- self.AVG_GENERATION_GAP + self.MAX_AGE_PROB_ALIVE),
+                                    _("descendant death-related date"),
+                                    child.handle)
+
+        return _NONE
+
+    def _ancestors_too_old(self, person, year):
+        """
+        Try looking for ancestors that would be too old in the current year.
+        """
+        if person.handle in self.pset:
+            return _NONE
+        self.pset.add(person.handle)
+        LOG.debug("ancestors_too_old('%s', %s)", person.handle, year)
+        family_handle = person.main_family
+        if family_handle:
+            family = self._family(family_handle)
+            if not family:
+                # can happen with LivingProxyDb(PrivateProxyDb(db))
+                return _NONE
+            for parent_handle in (family.father, family.mother):
+                if not parent_handle:
+                    continue
+                parent = self._person(parent_handle)
+                if parent is None:
+                    continue
+                if parent.birth and parent.birth_primary:
+                    parent_birth = self.cache.get_event(self.db, parent.birth)
+                    if parent_birth and not parent_birth.empty:
+                        dobj = _date(parent_birth)
+                        return (dobj.copy_offset_ymd(- year),
+                                dobj.copy_offset_ymd(- year + self.MAX_AGE_PROB_ALIVE),
+                                _("ancestor birth date"),
+                                parent.handle)
+                if parent.death and parent.death_primary:
+                    parent_death = self.cache.get_event(self.db, parent.death)
+                    if parent_death and not parent_death.empty:
+                        dobj = _date(parent_death)
+                        return (dobj.copy_offset_ymd(- year - self.MAX_AGE_PROB_ALIVE),
+                                dobj.copy_offset_ymd(- year - self.MAX_AGE_PROB_ALIVE + self.MAX_AGE_PROB_ALIVE),
+                                _("ancestor death date"),
+                                parent.handle)
+
+                # Check fallback data:
+                for event in self._events(parent):
+                    if event.birth_fallback:
+                        if not event.empty:
+                            dobj = _date(event)
+                            return (dobj.copy_offset_ymd(- year),
+                                    dobj.copy_offset_ymd(- year + self.MAX_AGE_PROB_ALIVE),
+                                    _("ancestor birth-related date"),
+                                    parent.handle)
+
+                    elif event.death_fallback:
+                        if not event.empty:
+                            dobj = _date(event)
+                            return (dobj.copy_offset_ymd(- year - self.MAX_AGE_PROB_ALIVE),
+                                    dobj.copy_offset_ymd(- year - self.MAX_AGE_PROB_ALIVE + self.MAX_AGE_PROB_ALIVE),
+                                    _("ancestor death-related date"),
+                                    parent.handle)
+
+                date1, date2, explain, other = self._ancestors_too_old(parent, year - self.AVG_GENERATION_GAP)
+                if date1 and date2:
+                    return (date1, date2, explain, other)
+
+        return _NONE
+
 #-------------------------------------------------------------------------
 #
 # probably_alive
@@ -525,16 +686,30 @@ def probably_alive_range(person, db,
     Computes estimated birth and death dates.
     Returns: (birth_date, death_date, explain_text, related_person)
     """
-    # First, find the real database to use all people
-    # for determining alive status:
+    # Now, we create a wrapper for doing work:
+    pb = ProbablyAlive(_base_db(db), max_sib_age_diff,
+                       max_age_prob_alive, avg_generation_gap)
+    return pb.probably_alive_range(person)
+
+def prepare_probably_alive(db):
+    """
+    Read what is needed to estimate if people are alive for the whole
+    database at once.  This is much faster than reading it person by person
+    when most people of the database are going to be checked.
+    """
+    basedb = _base_db(db)
+    get_alive_cache(basedb).load(basedb)
+
+def _base_db(db):
+    """
+    Return the real database behind the proxies, to use all people
+    for determining alive status.
+    """
     from ..proxy.proxybase import ProxyDbBase
     basedb = db
     while isinstance(basedb, ProxyDbBase):
         basedb = basedb.db
-    # Now, we create a wrapper for doing work:
-    pb = ProbablyAlive(basedb, max_sib_age_diff,
-                       max_age_prob_alive, avg_generation_gap)
-    return pb.probably_alive_range(person)
+    return basedb
 
 def update_constants():
     """
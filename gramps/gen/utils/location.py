@@ -21,7 +21,121 @@
 """
 Location utility functions
 """
+from collections import defaultdict
+from weakref import WeakKeyDictionary
+
 from ..lib.date import Date, Today
+from .callback import Callback
+
+#-------------------------------------------------------------------------
+#
+# LocationCache class
+#
+#-------------------------------------------------------------------------
+class LocationCache:
+    """
+    The locations of the places of a database, and the titles made from
+    them, kept for each place along with the handles of the places it is
+    located in.
+
+    When the cache is connected to a database, a change to a place drops the
+    entries of all the places located in it.  A place with no dates on the
+    names and the enclosing places of its whole hierarchy has the same
+    location on any date, so its entries are shared by all dates.  The cache
+    of a proxy database is cleared whenever the cache of the database behind
+    it sees a change.
+    """
+
+    def __init__(self, base=None):
+        """
+        :param base: The cache of the database behind a proxy database
+        :type base: LocationCache
+        """
+        self.entries = {}
+        self.enclosed = defaultdict(set)
+        self.changes = 0
+        self.base = base
+        self.base_changes = base.changes if base else 0
+
+    def connect(self, db):
+        """
+        Keep the cache up to date with the changes to the database.
+        """
+        for change in ('-add', '-update', '-delete'):
+            db.connect('place' + change, self._places_changed)
+        db.connect('place-rebuild', self.clear)
+
+    def clear(self):
+        """
+        Drop everything in the cache.
+        """
+        self.entries.clear()
+        self.enclosed.clear()
+        self.changes += 1
+
+    def _places_changed(self, handles):
+        for handle in handles:
+            for enclosed in self.enclosed.pop(handle, ()):
+                self.entries.pop(enclosed, None)
+        self.changes += 1
+
+    def get(self, handle, date, key):
+        """
+        Return the entry of the place with the handle for the date and the
+        key, or None.
+        """
+        if self.base is not None and self.base.changes != self.base_changes:
+            self.clear()
+            self.base_changes = self.base.changes
+        try:
+            dated, entries = self.entries[handle]
+        except KeyError:
+            return None
+        return entries.get((self.__date_key(date, dated),) + key)
+
+    def add(self, handle, date, key, value, handles=None, dated=True):
+        """
+        Keep the entry of the place with the handle for the date and the key.
+
+        A location gives the handles of the places it depends on, and whether
+        it depends on the date.  Other entries of a place are made from its
+        location for the same date, so they depend on the same places.
+        """
+        if handle not in self.entries:
+            if handles is None:
+                return
+            self.entries[handle] = (dated, {})
+        for enclosing in handles or ():
+            self.enclosed[enclosing].add(handle)
+        dated, entries = self.entries[handle]
+        entries[(self.__date_key(date, dated),) + key] = value
+
+    @staticmethod
+    def __date_key(date, dated):
+        if dated and date is not None:
+            return date.serialize(no_text_date=True)
+        return None
+
+# The cache of each database, kept as long as the database is in use.
+_CACHES = WeakKeyDictionary()
+
+def get_location_cache(db):
+    """
+    Return the :class:`LocationCache` of a database.  A database without
+    signals, which is not a proxy of one, gets a new cache each time.
+    """
+    cache = _CACHES.get(db)
+    if cache is None:
+        basedb = getattr(db, 'basedb', None)
+        if isinstance(db, Callback):
+            cache = LocationCache()
+            cache.connect(db)
+        elif basedb is not db and isinstance(basedb, Callback):
+            cache = LocationCache(get_location_cache(basedb))
+        else:
+            return LocationCache()
+        _CACHES[db] = cache
+    return cache
 
 #-------------------------------------------------------------------------
 #
@@ -34,24 +148,64 @@ def get_location_list(db, place, date=None, lang=''):
     """
     if date is None:
         date = __get_latest_date(place)
-    visited = [place.handle]
     lines = [(__get_name(place, date, lang), place.get_type())]
-    while True:
-        handle = None
-        for placeref in place.get_placeref_list():
-            ref_date = placeref.get_date_object()
-            if ref_date.is_empty() or date.match_exact(ref_date):
-                handle = placeref.ref
+    handle = __get_enclosing_handle(place, date)
+    if handle is not None and handle != place.handle:
+        enclosing, handles = __get_location(db, handle, date, lang)
+        for line, line_handle in zip(enclosing, handles):
+            if line_handle == place.handle:
                 break
-        if handle is None or handle in visited:
-            break
-        place = db.get_place_from_handle(handle)
-        if place is None:
-            break
-        visited.append(handle)
-        lines.append((__get_name(place, date, lang), place.get_type()))
+            lines.append(line)
     return lines
 
+def get_location_list_from_handle(db, handle, date, lang=''):
+    """
+    Return a list of place names for display of the place with the handle.
+    The locations of the places are cached, so that the places are not read
+    again until they change.
+    """
+    return list(__get_location(db, handle, date, lang)[0])
+
+def __get_location(db, handle, date, lang):
+    """
+    Return the list of place names of the place with the handle, and the
+    handles of the places they are the names of, from the cache of the db.
+    """
+    cache = get_location_cache(db)
+    key = ('location', lang)
+    location = cache.get(handle, date, key)
+    if location is None:
+        start = handle
+        lines = []
+        handles = []
+        depends = []
+        dated = False
+        while handle is not None and handle not in handles:
+            depends.append(handle)
+            place = db.get_place_from_handle(handle)
+            if place is None:
+                break
+            dated = dated or __is_dated(place)
+            handles.append(handle)
+            lines.append((__get_name(place, date, lang), place.get_type()))
+            handle = __get_enclosing_handle(place, date)
+        location = (lines, handles)
+        cache.add(start, date, key, location, depends, dated)
+    return location
+
+def __get_enclosing_handle(place, date):
+    for placeref in place.get_placeref_list():
+        ref_date = placeref.get_date_object()
+        if ref_date.is_empty() or date.match_exact(ref_date):
+            return placeref.ref
+    return None
+
+def __is_dated(place):
+    return (any(not name.get_date_object().is_empty()
+                for name in place.get_all_names()) or
+            any(not placeref.get_date_object().is_empty()
+                for placeref in place.get_placeref_list()))
+
 def __get_name(place, date, lang):
     endonym = None
     for place_name in place.get_all_names():
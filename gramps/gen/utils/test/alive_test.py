@@ -0,0 +1,102 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+""" Unittest for the cache of alive.py """
+
+import unittest
+
+from ...db import DbTxn
+from ...db.utils import make_database
+from ...lib import (Person, Family, ChildRef, Event, EventType, EventRef,
+                    Date)
+from ..alive import probably_alive, prepare_probably_alive, get_alive_cache
+
+class AliveCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.db = make_database("sqlite")
+        self.db.load(":memory:")
+        with DbTxn('Add test objects', self.db) as trans:
+            self.father = Person()
+            self.db.add_person(self.father, trans)
+            self.child = Person()
+            self.db.add_person(self.child, trans)
+            family = Family()
+            family.set_father_handle(self.father.handle)
+            child_ref = ChildRef()
+            child_ref.ref = self.child.handle
+            family.add_child_ref(child_ref)
+            self.db.add_family(family, trans)
+            self.father.add_family_handle(family.handle)
+            self.db.commit_person(self.father, trans)
+            self.child.add_parent_family_handle(family.handle)
+            self.db.commit_person(self.child, trans)
+
+    def tearDown(self):
+        self.db.close()
+
+    def add_birth(self, person, year):
+        with DbTxn('Add birth', self.db) as trans:
+            event = Event()
+            event.set_type(EventType.BIRTH)
+            date = Date()
+            date.set_yr_mon_day(year, 1, 1)
+            event.set_date_object(date)
+            self.db.add_event(event, trans)
+            event_ref = EventRef()
+            event_ref.ref = event.handle
+            person.add_event_ref(event_ref)
+            person.set_birth_ref(event_ref)
+            self.db.commit_person(person, trans)
+        return event
+
+    def test_changes(self):
+        self.assertTrue(probably_alive(self.father, self.db))
+        cache = get_alive_cache(self.db)
+        self.assertEqual(len(cache.results), 1)
+        # a change to a descendant
+        event = self.add_birth(self.child, 1700)
+        self.assertEqual(cache.results, {})
+        self.assertFalse(probably_alive(self.father, self.db))
+        # a change to an event
+        with DbTxn('Change birth', self.db) as trans:
+            event.get_date_object().set_yr_mon_day(2000, 1, 1)
+            self.db.commit_event(event, trans)
+        self.assertTrue(probably_alive(self.father, self.db))
+        # the dates returned are not the ones in the cache
+        birth = probably_alive(self.father, self.db, return_range=True)[1]
+        birth.set_year(1000)
+        birth, death, explain, relative = probably_alive(
+            self.father, self.db, return_range=True)[1:]
+        self.assertEqual((birth.get_year(), death.get_year()), (1980, 2090))
+        self.assertEqual(explain, "descendant birth date")
+        self.assertEqual(relative.handle, self.child.handle)
+
+    def test_prepare(self):
+        self.add_birth(self.child, 1800)
+        cache = get_alive_cache(self.db)
+        prepare_probably_alive(self.db)
+        self.assertEqual(len(cache.people), 2)
+        self.assertEqual(len(cache.families), 1)
+        self.assertEqual(len(cache.events), 1)
+        self.assertFalse(probably_alive(self.father, self.db))
+        self.db.request_rebuild()
+        self.assertEqual(cache.people, {})
+        self.assertEqual(cache.results, {})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+""" Unittest for the cache of location.py """
+
+import unittest
+
+from ...db import DbTxn
+from ...db.utils import make_database
+from ...lib import Place, PlaceName, PlaceRef, Date
+from ...proxy import PrivateProxyDb
+from ..location import (get_location_list, get_location_list_from_handle,
+                        get_location_cache)
+
+class LocationCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.db = make_database("sqlite")
+        self.db.load(":memory:")
+        self.places = {}
+        with DbTxn('Add test objects', self.db) as trans:
+            for name, enclosed_by in (('country', None), ('county', None),
+                                      ('city', 'county'), ('street', 'city')):
+                place = Place()
+                place.set_name(PlaceName(value=name))
+                if enclosed_by:
+                    placeref = PlaceRef()
+                    placeref.ref = self.places[enclosed_by].handle
+                    place.add_placeref(placeref)
+                self.db.add_place(place, trans)
+                self.places[name] = place
+        self.date = Date(1900, 1, 1)
+
+    def tearDown(self):
+        self.db.close()
+
+    def __names(self, name, db=None):
+        return [line[0] for line in get_location_list_from_handle(
+            db or self.db, self.places[name].handle, self.date)]
+
+    def __commit(self, name):
+        with DbTxn('Change test objects', self.db) as trans:
+            self.db.commit_place(self.places[name], trans)
+
+    def test_location(self):
+        self.assertEqual(self.__names('street'), ['street', 'city', 'county'])
+        self.assertEqual(
+            [line[0] for line in get_location_list(
+                self.db, self.places['street'], self.date)],
+            ['street', 'city', 'county'])
+
+    def test_cached(self):
+        self.__names('street')
+        handle = self.places['street'].handle
+        cache = get_location_cache(self.db)
+        self.assertIsNotNone(cache.get(handle, self.date, ('location', '')))
+        # undated hierarchies have the same location on every date
+        self.assertIsNotNone(cache.get(handle, Date(2000, 1, 1),
+                                       ('location', '')))
+
+    def test_ancestor_changed(self):
+        self.assertEqual(self.__names('street'), ['street', 'city', 'county'])
+        self.places['county'].get_placeref_list().clear()
+        placeref = PlaceRef()
+        placeref.ref = self.places['country'].handle
+        self.places['county'].add_placeref(placeref)
+        self.__commit('county')
+        self.assertEqual(self.__names('street'),
+                         ['street', 'city', 'county', 'country'])
+        self.places['country'].set_name(PlaceName(value='nation'))
+        self.__commit('country')
+        self.assertEqual(self.__names('street'),
+                         ['street', 'city', 'county', 'nation'])
+
+    def test_dated(self):
+        placeref = PlaceRef()
+        placeref.ref = self.places['country'].handle
+        placeref.set_date_object(Date(1950, 0, 0))
+        self.places['city'].set_placeref_list([placeref])
+        placeref = PlaceRef()
+        placeref.ref = self.places['county'].handle
+        self.places['city'].add_placeref(placeref)
+        self.__commit('city')
+        self.assertEqual(self.__names('street'), ['street', 'city', 'county'])
+        self.date = Date(1950, 0, 0)
+        self.assertEqual(self.__names('street'), ['street', 'city', 'country'])
+        self.places['country'].set_name(PlaceName(value='nation'))
+        self.__commit('country')
+        self.assertEqual(self.__names('street'), ['street', 'city', 'nation'])
+
+    def test_proxy(self):
+        proxy = PrivateProxyDb(self.db)
+        self.assertEqual(self.__names('street', proxy),
+                         ['street', 'city', 'county'])
+        self.places['city'].set_privacy(True)
+        self.__commit('city')
+        self.assertEqual(self.__names('street', proxy), ['street'])
+
+
+if __name__ == "__main__":
+    unittest.main()
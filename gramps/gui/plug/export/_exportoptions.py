@@ -27,6 +27,7 @@
 # python modules
 #
 #-------------------------------------------------------------------------
+from functools import partial
 
 #-------------------------------------------------------------------------
 #
@@ -44,7 +45,9 @@ from ...user import User
 from gramps.gen.proxy import (PrivateProxyDb,
                               LivingProxyDb,
                               FilterProxyDb,
-                              ReferencedBySelectionProxyDb)
+                              ReferencedBySelectionProxyDb,
+                              ExportProxyDb)
+from gramps.gen.utils.alive import prepare_probably_alive
 
 #-------------------------------------------------------------------------
 #
@@ -571,6 +574,12 @@ class WriterOptionBox:
             return self.preview_dbase
 
         self.proxy_dbase.clear()
+        if not preview:
+            # apply the proxies as one, computing each object only once
+            return ExportProxyDb(
+                dbase, [partial(self.apply_proxy, proxy_name,
+                                progress=progress)
+                        for proxy_name in self.get_proxy_names()])
         for proxy_name in self.get_proxy_names():
             dbase = self.apply_proxy(proxy_name, dbase, progress)
             if preview:
@@ -614,6 +623,8 @@ class WriterOptionBox:
                 dbase = LivingProxyDb(
                             dbase,
                             mode) #
+                # the export looks at nearly everybody, so read it all now
+                prepare_probably_alive(dbase)
 
         # If the filter returned by cfilter is not empty, apply the
         # FilterProxyDb (Person Filter)
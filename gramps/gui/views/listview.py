@@ -321,15 +321,15 @@ class ListView(NavigationView):
                     search=filter_info, sort_map=self.column_order())
             else:
                 #the entire data to show is already in memory.
-                #run only the part that determines what to show
+                #run only the part that determines what to show, in the
+                #background, so the rows appear while they are found
                 self.list.set_model(None)
                 self.model.set_search(filter_info)
                 try:
-                    self.model.rebuild_data()
+                    self.model.start_rebuild(done=self.__rebuild_done,
+                                             error=self.__rebuild_error)
                 except FilterError as msg:
-                    (msg1, msg2) = msg.messages()
-                    ErrorDialog(msg1, msg2,
-                                parent=self.uistate.window)
+                    self.__rebuild_error(msg)
 
             cput1 = perf_counter()
             self.build_columns(preserve_col)
@@ -355,6 +355,26 @@ class ListView(NavigationView):
         else:
             self.dirty = True
 
+    def __rebuild_done(self):
+        """
+        Called when the model has found all the rows to show.
+        """
+        if self.model:
+            self.goto_active(None)
+            self.uistate.show_filter_results(self.dbstate,
+                                             self.model.displayed(),
+                                             self.model.total())
+
+    def __rebuild_error(self, err):
+        """
+        Called when the model could not find the rows to show.
+        """
+        if isinstance(err, FilterError):
+            (msg1, msg2) = err.messages()
+            ErrorDialog(msg1, msg2, parent=self.uistate.window)
+        else:
+            LOG.error("rebuild failed", exc_info=err)
+
     def search_build_tree(self):
         self.build_tree()
 
@@ -44,6 +44,22 @@ class BaseModel:
         self.lru_data = None
         self.lru_path = None
 
+    def start_rebuild(self, done=None, error=None):
+        """
+        Rebuild the data, and call done when it is finished.  Models which
+        can rebuild in the background override this; by default the data is
+        rebuilt straight away, and errors are raised.
+        """
+        self.rebuild_data()
+        if done:
+            done()
+
+    def cancel_rebuild(self):
+        """
+        Cancel the rebuild started by start_rebuild, if it is still running.
+        """
+        pass
+
     def clear_cache(self, handle=None):
         """
         Clear the LRU cache. Always clear lru_path, because paths may have
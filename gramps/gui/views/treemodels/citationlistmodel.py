@@ -60,6 +60,12 @@ class CitationListModel(CitationBaseModel, FlatBaseModel):
                  search=None, skip=set(), sort_map=None):
         self.map = db.get_raw_citation_data
         self.gen_cursor = db.get_citation_cursor
+        self.sort_table = 'Citation'
+        self.sort_fields = {
+            0: ('page', None),
+            1: ('gramps_id', None),
+            6: ('change', lambda change: "%012x" % change),
+            }
         self.fmap = [
             self.citation_page,
             self.citation_id,
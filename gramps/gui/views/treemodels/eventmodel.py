@@ -74,6 +74,12 @@ class EventModel(FlatBaseModel):
     def __init__(self, db, uistate, scol=0, order=Gtk.SortType.ASCENDING,
                  search=None, skip=set(), sort_map=None):
         self.gen_cursor = db.get_event_cursor
+        self.sort_table = 'Event'
+        self.sort_fields = {
+            0: ('description', None),
+            1: ('gramps_id', None),
+            7: ('change', lambda change: "%012x" % change),
+            }
         self.map = db.get_raw_event_data
 
         self.fmap = [
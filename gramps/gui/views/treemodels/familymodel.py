@@ -59,6 +59,11 @@ class FamilyModel(FlatBaseModel):
     def __init__(self, db, uistate, scol=0, order=Gtk.SortType.ASCENDING,
                  search=None, skip=set(), sort_map=None):
         self.gen_cursor = db.get_family_cursor
+        self.sort_table = 'Family'
+        self.sort_fields = {
+            0: ('gramps_id', None),
+            7: ('change', lambda change: "%012x" % change),
+            }
         self.map = db.get_raw_family_data
         self.fmap = [
             self.column_id,
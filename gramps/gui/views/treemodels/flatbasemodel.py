@@ -73,6 +73,7 @@ from gi.repository import Gtk
 from gramps.gen.filters import SearchFilter, ExactSearchFilter
 from gramps.gen.const import GRAMPS_LOCALE as glocale
 from .basemodel import BaseModel
+from .rebuild import ModelRebuild, RebuildConnection, BATCH_SIZE
 from ...user import User
 from gramps.gen.proxy.cache import CacheProxyDb
 
@@ -365,7 +366,7 @@ class FlatNodeMap:
         """
         return len(self._fullhndl)
 
-    def insert(self, srtkey_hndl, allkeyonly=False):
+    def insert(self, srtkey_hndl, allkeyonly=False, shownonly=False):
         """
         Insert a node. Given is a tuple (sortkey, handle), and this is added
         in the correct place, while the hndl2index map is updated.
@@ -373,6 +374,9 @@ class FlatNodeMap:
 
         :param srtkey_hndl: the (sortkey, handle) tuple that must be inserted
         :type srtkey_hndl: sortkey key already transformed by self.sort_func, object handle
+        :param shownonly: the tuple is already in the list of all possible
+                    tuples, so it is only added to the shown ones
+        :type shownonly: bool
 
         :Returns: path of the row inserted in the treeview
         :Returns type: Gtk.TreePath or None
@@ -381,7 +385,7 @@ class FlatNodeMap:
             print(('WARNING: Attempt to add row twice to the model (%s)' %
                     srtkey_hndl[1]))
             return
-        if not self._identical:
+        if not self._identical and not shownonly:
             bisect.insort_left(self._fullhndl, srtkey_hndl)
             if allkeyonly:
                 #key is not part of the view
@@ -445,6 +449,11 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
     It keeps a FlatNodeMap, and obtains data from database as needed
     ..Note: glocale.sort_key is applied to the underlying sort key,
             so as to have localized sort
+    ..Note: inheriting classes may set self.sort_table to the class name of
+            the objects, and self.sort_fields to a dictionary mapping model
+            columns to a (secondary field, conversion function or None)
+            tuple, so the sort keys of those columns are read from the
+            database without unserializing every object
     """
 
     def __init__(self, db, uistate, scol=0, order=Gtk.SortType.ASCENDING,
@@ -475,8 +484,14 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
         # get the function that maps data to sort_keys
         self.sort_func = lambda x: glocale.sort_key(self.smap[col](x))
         self.sort_col = scol
+        # the secondary field, if any, from which the database can give the
+        # sort values without unserializing the objects
+        self.sort_field = getattr(self, 'sort_fields', {}).get(col)
         self.skip = skip
         self._in_build = False
+        self._rebuild = None
+        # the read-only connection of the rebuilds in a worker thread
+        self._connection = RebuildConnection()
 
         self.node_map = FlatNodeMap()
         self.set_search(search)
@@ -491,6 +506,8 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
         """
         Unset all elements that prevent garbage collection
         """
+        self.cancel_rebuild()
+        self._connection.close()
         BaseModel.destroy(self)
         self.db = None
         self.sort_func = None
@@ -563,6 +580,20 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
         be shown.
         This list is sorted ascending, via localized string sort.
         """
+        if self.sort_field:
+            field, func = self.sort_field
+            values = self.db.get_sort_values(self.sort_table, field)
+            if values is not None:
+                # the values come ordered by the database, so the sort
+                # below only has to fix differences between its collation
+                # and the sort keys
+                if func:
+                    values = ((func(value), handle)
+                              for value, handle in values)
+                srt_keys = [(glocale.sort_key(value), handle)
+                            for value, handle in values]
+                srt_keys.sort()
+                return srt_keys
         # use cursor as a context manager
         with self.gen_cursor() as cursor:
             #loop over database and store the sort field, and the handle
@@ -571,10 +602,145 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
             srt_keys.sort()
             return srt_keys
 
+    def start_rebuild(self, done=None, error=None):
+        """
+        Rebuild the data in the background.  The rows which are shown are
+        inserted as they are found, so the model can be attached to the view
+        straight away.  A sidebar filter and the sort keys, when they are
+        read from secondary columns, are worked out in a worker thread with
+        its own connection to the database.  A search text is matched in the
+        main loop, a batch at a time, as it needs the columns of the model.
+
+        Calling this again, or rebuilding the data otherwise, cancels the
+        rebuild in progress, without waiting for its worker thread.  The
+        workers take turns with one read-only connection, kept until the
+        model is destroyed.
+        done is called when the rebuild is finished, and error with the
+        exception if it fails.
+        """
+        self.cancel_rebuild()
+        self.clear_cache()
+        if self.rebuild_data == self._rebuild_filter:
+            match = self.search is not None
+        else:
+            match = bool(self.search and self.search.text) or bool(self.skip)
+        allkeys = self.node_map.full_srtkey_hndl_map()
+        if (self.db is None or not self.db.is_open() or
+                not (match or (not allkeys and self.sort_field))):
+            self.rebuild_data()
+            if done:
+                done()
+            return
+
+        def add_keys(keys):
+            if match:
+                self.node_map.set_path_map([], keys, identical=False,
+                                           reverse=self._reverse)
+            else:
+                self.node_map.set_path_map(keys, keys, identical=True,
+                                           reverse=self._reverse)
+                for index in range(len(keys)):
+                    path = Gtk.TreePath((index,))
+                    self.row_inserted(path, self.do_get_iter(path)[1])
+
+        def match_rows():
+            # the worker which read the sort keys, if any, is finished
+            self.cancel_rebuild()
+            keys = list(self.node_map.full_srtkey_hndl_map())
+            self._rebuild = ModelRebuild(self._add_rows, done, error,
+                                         self._connection)
+            if self.rebuild_data == self._rebuild_filter:
+                self._rebuild.start(self.db, lambda db: self._filter_rows(
+                    db, self.search, keys), readonly=True)
+            else:
+                self._rebuild.start(self.db, lambda db: self._search_rows(
+                    db, self.search, keys))
+
+        if allkeys:
+            add_keys(allkeys)
+            match_rows()
+        elif self.sort_field:
+            self.node_map.clear_map()
+            self._rebuild = ModelRebuild(add_keys,
+                                         match_rows if match else done, error,
+                                         self._connection)
+            self._rebuild.start(self.db, self._sort_key_rows, readonly=True)
+        else:
+            add_keys(self.sort_keys())
+            match_rows()
+
+    def cancel_rebuild(self):
+        """
+        Cancel the rebuild started by start_rebuild, if it is still running.
+        """
+        if self._rebuild:
+            self._rebuild.cancel()
+            self._rebuild = None
+
+    def _sort_key_rows(self, db):
+        """
+        Yield the list of all (sort_key, handle) tuples, read from the
+        secondary column of the sort field of the database.  The sort keys
+        are worked out a batch at a time, with a None yielded after each
+        batch so that a cancelled rebuild stops early.
+        """
+        field, func = self.sort_field
+        values = db.get_sort_values(self.sort_table, field)
+        if values is None:
+            yield self.sort_keys()
+            return
+        srt_keys = []
+        for start in range(0, len(values), BATCH_SIZE):
+            batch = values[start:start + BATCH_SIZE]
+            if func:
+                batch = [(func(value), handle) for value, handle in batch]
+            srt_keys.extend((glocale.sort_key(value), handle)
+                            for value, handle in batch)
+            yield None
+        srt_keys.sort()
+        yield srt_keys
+
+    def _filter_rows(self, db, dfilter, keys):
+        """
+        Yield the (sort_key, handle) tuples of keys that match the sidebar
+        filter, a batch at a time.
+        """
+        cdb = CacheProxyDb(db)
+        check = dfilter.get_check_func()
+        for rule in dfilter.flist:
+            rule.requestprepare(cdb, None)
+        try:
+            for start in range(0, len(keys), BATCH_SIZE):
+                yield check(cdb, keys[start:start + BATCH_SIZE], tupleind=1)
+        finally:
+            for rule in dfilter.flist:
+                rule.requestreset()
+
+    def _search_rows(self, db, search, keys):
+        """
+        Yield the (sort_key, handle) tuples of keys that are not skipped and
+        match the search text, a batch at a time.
+        """
+        for start in range(0, len(keys), BATCH_SIZE):
+            yield [key for key in keys[start:start + BATCH_SIZE]
+                   if key[1] not in self.skip and
+                   (not search or not search.text or
+                    search.match(key[1], db))]
+
+    def _add_rows(self, rows):
+        """
+        Show rows found by the rebuild, unless they were added meanwhile.
+        """
+        for row in rows:
+            if self.node_map.get_path_from_handle(row[1]) is None:
+                path = self.node_map.insert(row, shownonly=True)
+                self.row_inserted(path, self.do_get_iter(path)[1])
+
     def _rebuild_search(self, ignore=None):
         """ function called when view must be build, given a search text
             in the top search bar
         """
+        self.cancel_rebuild()
         self.clear_cache()
         self._in_build = True
         if (self.db is not None) and self.db.is_open():
@@ -604,6 +770,7 @@ class FlatBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
         """ function called when view must be build, given filter options
             in the filter sidebar
         """
+        self.cancel_rebuild()
         self.clear_cache()
         self._in_build = True
         if (self.db is not None) and self.db.is_open():
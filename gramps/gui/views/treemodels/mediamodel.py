@@ -55,6 +55,13 @@ class MediaModel(FlatBaseModel):
     def __init__(self, db, uistate, scol=0, order=Gtk.SortType.ASCENDING,
                  search=None, skip=set(), sort_map=None):
         self.gen_cursor = db.get_media_cursor
+        self.sort_table = 'Media'
+        self.sort_fields = {
+            0: ('desc', None),
+            1: ('gramps_id', None),
+            3: ('path', None),
+            7: ('change', lambda change: "%012x" % change),
+            }
         self.map = db.get_raw_media_data
 
         self.fmap = [
@@ -56,6 +56,11 @@ class NoteModel(FlatBaseModel):
                  search=None, skip=set(), sort_map=None):
         """Setup initial values for instance variables."""
         self.gen_cursor = db.get_note_cursor
+        self.sort_table = 'Note'
+        self.sort_fields = {
+            1: ('gramps_id', None),
+            5: ('change', lambda change: "%012x" % change),
+            }
         self.map = db.get_raw_note_data
         self.fmap = [
             self.column_preview,
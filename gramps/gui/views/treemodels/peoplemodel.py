@@ -103,6 +103,17 @@ class PeopleBaseModel(BaseModel):
         BaseModel.__init__(self)
         self.db = db
         self.gen_cursor = db.get_person_cursor
+        self.sort_table = 'Person'
+        self.sort_fields = {
+            1: ('gramps_id', None),
+            3: ('birth_sort', None),
+            5: ('death_sort', None),
+            8: ('parents', lambda count: '%06d' % count),
+            9: ('marriages', lambda count: '%06d' % count),
+            10: ('children', lambda count: '%06d' % count),
+            11: ('todo', lambda count: '%06d' % count),
+            14: ('change', lambda change: "%012x" % change),
+            }
         self.map = db.get_raw_person_data
 
         self.fmap = [
@@ -187,6 +198,54 @@ class PeopleBaseModel(BaseModel):
             self.set_cached_value(handle, "SPOUSE", value)
         return value
 
+    def _get_summary(self, handle):
+        """
+        Return the summary values of a person kept by the database, or None.
+        """
+        cached, value = self.get_cached_value(handle, "SUMMARY")
+        if not cached:
+            value = self.db.get_person_summary(handle)
+            self.set_cached_value(handle, "SUMMARY", value)
+        return value
+
+    def _get_summary_date(self, summary, prefix, sort_mode):
+        """
+        Return the birth or death date column, as given by prefix, from the
+        summary values of a person.
+        """
+        if sort_mode:
+            return summary[prefix + '_sort']
+        event_handle = summary[prefix + '_event']
+        if not event_handle:
+            return ''
+        event = self.db.get_event_from_handle(event_handle)
+        date_str = get_date(event)
+        if not date_str:
+            return ''
+        if summary[prefix + '_fallback']:
+            retval = "<i>%s</i>" % escape(date_str)
+        else:
+            retval = escape(date_str)
+        if not get_date_valid(event):
+            return invalid_date_format % retval
+        return retval
+
+    def _get_summary_place(self, summary, prefix):
+        """
+        Return the birth or death place column, as given by prefix, from the
+        summary values of a person.
+        """
+        event_handle = summary[prefix + '_place_event']
+        if not event_handle:
+            return ''
+        event = self.db.get_event_from_handle(event_handle)
+        place_title = place_displayer.display_event(self.db, event)
+        if not place_title:
+            return ''
+        if summary[prefix + '_place_fallback']:
+            return "<i>%s</i>" % escape(place_title)
+        return escape(place_title)
+
     def column_private(self, data):
         if data[COLUMN_PRIV]:
             return 'gramps-lock'
@@ -239,6 +298,9 @@ class PeopleBaseModel(BaseModel):
         return value
 
     def _get_birth_data(self, data, sort_mode):
+        summary = self._get_summary(data[0])
+        if summary is not None:
+            return self._get_summary_date(summary, 'birth', sort_mode)
         index = data[COLUMN_BIRTH]
         if index != -1:
             try:
@@ -296,6 +358,9 @@ class PeopleBaseModel(BaseModel):
         return value
 
     def _get_death_data(self, data, sort_mode):
+        summary = self._get_summary(data[0])
+        if summary is not None:
+            return self._get_summary_date(summary, 'death', sort_mode)
         index = data[COLUMN_DEATH]
         if index != -1:
             try:
@@ -342,6 +407,11 @@ class PeopleBaseModel(BaseModel):
         cached, value = self.get_cached_value(handle, "BIRTH_PLACE")
         if cached:
             return value
+        summary = self._get_summary(handle)
+        if summary is not None:
+            value = self._get_summary_place(summary, 'birth')
+            self.set_cached_value(handle, "BIRTH_PLACE", value)
+            return value
         else:
             index = data[COLUMN_BIRTH]
             if index != -1:
@@ -382,6 +452,11 @@ class PeopleBaseModel(BaseModel):
         cached, value = self.get_cached_value(handle, "DEATH_PLACE")
         if cached:
             return value
+        summary = self._get_summary(handle)
+        if summary is not None:
+            value = self._get_summary_place(summary, 'death')
+            self.set_cached_value(handle, "DEATH_PLACE", value)
+            return value
         else:
             index = data[COLUMN_DEATH]
             if index != -1:
@@ -420,6 +495,9 @@ class PeopleBaseModel(BaseModel):
             return value
 
     def _get_parents_data(self, data):
+        summary = self._get_summary(data[0])
+        if summary is not None:
+            return summary['parents']
         parents = 0
         if data[COLUMN_PARENT]:
             family = self.db.get_family_from_handle(data[COLUMN_PARENT][0])
@@ -430,6 +508,9 @@ class PeopleBaseModel(BaseModel):
         return parents
 
     def _get_marriages_data(self, data):
+        summary = self._get_summary(data[0])
+        if summary is not None:
+            return summary['marriages']
         marriages = 0
         for family_handle in data[COLUMN_FAMILY]:
             family = self.db.get_family_from_handle(family_handle)
@@ -438,6 +519,9 @@ class PeopleBaseModel(BaseModel):
         return marriages
 
     def _get_children_data(self, data):
+        summary = self._get_summary(data[0])
+        if summary is not None:
+            return summary['children']
         children = 0
         for family_handle in data[COLUMN_FAMILY]:
             family = self.db.get_family_from_handle(family_handle)
@@ -448,6 +532,9 @@ class PeopleBaseModel(BaseModel):
         return children
 
     def _get_todo_data(self, data):
+        summary = self._get_summary(data[0])
+        if summary is not None:
+            return summary['todo']
         todo = 0
         for note_handle in data[COLUMN_NOTES]:
             note = self.db.get_note_from_handle(note_handle)
@@ -633,3 +720,39 @@ class PersonTreeModel(PeopleBaseModel, TreeBaseModel):
         # add as node: parent, child, sortkey, handle; parent and child are
         # nodes in the treebasemodel, and will be used as iters
         self.add_node(group_name, handle, sort_key, handle)
+
+    def _add_lazy_rows(self):
+        """
+        Add the surname groups, counted by the database, without the people
+        in them.
+        """
+        counts = self.db.get_surname_group_counts()
+        if counts is None:
+            return False
+        groups = {}
+        for group_as, surname, patronymic, count in counts:
+            group_name = name_displayer.surname_grouping(self.db, group_as,
+                                                         surname, patronymic)
+            groups.setdefault(group_name, []).append((group_as, surname,
+                                                      patronymic))
+        for group_name, keys in groups.items():
+            self.add_node(None, group_name, group_name, None,
+                          add_parent=False)
+            self.lazy_children[group_name] = keys
+        return True
+
+    def _get_lazy_children(self, ref, keys):
+        """
+        Return the handles of the people in a surname group.
+        """
+        for key in keys:
+            yield from self.db.get_surname_group_handles(*key)
+
+    def _get_lazy_parents(self, handle):
+        """
+        Return the surname group of a person.
+        """
+        data = self.map(handle)
+        if data is None:
+            return []
+        return [name_displayer.name_grouping_data(self.db, data[COLUMN_NAME])]
@@ -69,6 +69,12 @@ class PlaceBaseModel:
 
     def __init__(self, db):
         self.gen_cursor = db.get_place_cursor
+        self.sort_table = 'Place'
+        self.sort_fields = {
+            1: ('gramps_id', None),
+            4: ('code', None),
+            9: ('change', lambda change: "%012x" % change),
+            }
         self.map = db.get_raw_place_data
         self.fmap = [
             self.column_name,
@@ -331,6 +337,43 @@ class PlaceTreeModel(PlaceBaseModel, TreeBaseModel):
 
         self.add_node(parent, handle, sort_key, handle, add_parent=False)
 
+    def _add_lazy_rows(self):
+        """
+        Add the top level places, without the places they enclose.
+        """
+        self.child_counts = self.db.get_place_child_counts()
+        if self.child_counts is None:
+            return False
+        for handle in self._get_lazy_children(None, ''):
+            self.add_row(handle, self.map(handle))
+        return True
+
+    def _get_lazy_children(self, ref, handle):
+        """
+        Return the handles of the places enclosed by a place, marking those
+        which enclose other places to be expanded later.
+        """
+        handles = self.db.get_place_child_handles(handle)
+        for child in handles:
+            if self.child_counts.get(child):
+                self.lazy_children[child] = child
+        return handles
+
+    def _get_lazy_parents(self, handle):
+        """
+        Return the enclosing places of a place, outermost first.
+        """
+        parents = []
+        data = self.map(handle)
+        while data and data[5]:
+            parent = data[5][0][0]
+            if parent in parents:
+                break
+            parents.append(parent)
+            data = self.map(parent)
+        parents.reverse()
+        return parents
+
     def column_header(self, data):
         # should not get here!
         return '????'
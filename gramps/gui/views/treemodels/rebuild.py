@@ -0,0 +1,278 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+This module runs the work of a model rebuild in the background.
+
+The work is a generator function which takes a database and yields batches
+of rows.  When the database can be opened a second time read-only, the work
+runs in a worker thread with a read-only connection, which a view keeps for
+all its rebuilds.  Otherwise it runs in the GTK main loop, at most STEP_TIME
+seconds at a time.  Either way, each batch is passed to the model from the
+main loop as soon as it is found, so the user interface stays responsive and
+the first rows appear immediately.
+"""
+
+#-------------------------------------------------------------------------
+#
+# python modules
+#
+#-------------------------------------------------------------------------
+import logging
+import threading
+from time import perf_counter
+
+_LOG = logging.getLogger(".gui.rebuild")
+
+#-------------------------------------------------------------------------
+#
+# GNOME/GTK modules
+#
+#-------------------------------------------------------------------------
+from gi.repository import GLib
+
+#-------------------------------------------------------------------------
+#
+# Gramps modules
+#
+#-------------------------------------------------------------------------
+from gramps.gen.db.dbconst import DBMODE_R
+from gramps.gen.db.utils import get_readonly_source, make_database
+
+# number of rows a worker thread handles before passing them on
+BATCH_SIZE = 1000
+# seconds the main loop may spend on the work before handling other events
+STEP_TIME = 0.05
+
+#-------------------------------------------------------------------------
+#
+# RebuildConnection
+#
+#-------------------------------------------------------------------------
+class RebuildConnection:
+    """
+    A read-only connection to a database for the worker threads of the
+    rebuilds of a view.  It is opened by the first worker which needs it,
+    and kept until it is closed.  The workers take turns: a worker waits in
+    acquire until the worker of a cancelled rebuild has released it.
+    """
+
+    def __init__(self):
+        self.source = None
+        self.db = None
+        self.__turn = threading.Lock()
+        self.__state = threading.Lock()
+        self.__busy = False
+        self.__closing = False
+
+    def acquire(self):
+        """
+        Wait until no other worker uses the connection.  Called from a
+        worker thread, which must call release when it is done.
+        """
+        self.__turn.acquire()
+        with self.__state:
+            self.__busy = True
+
+    def release(self):
+        """
+        Let the next worker use the connection, closing it first if close
+        was called meanwhile.
+        """
+        with self.__state:
+            self.__busy = False
+            if self.__closing:
+                self.__close()
+        self.__turn.release()
+
+    def get(self, source):
+        """
+        Return the connection to the (plugin id, directory) source, opening
+        it if needed.  Called from a worker thread, between acquire and
+        release.
+        """
+        if self.db is not None and self.source != source:
+            self.__close()
+        if self.db is None:
+            plugin_id, directory = source
+            db = make_database(plugin_id)
+            db.load(directory, mode=DBMODE_R)
+            self.db = db
+            self.source = source
+        return self.db
+
+    def close(self):
+        """
+        Close the connection, without waiting for a worker using it: the
+        worker closes it when it is done.  A later worker opens it again and
+        closes it when done, too.
+        """
+        with self.__state:
+            self.__closing = True
+            if not self.__busy:
+                self.__close()
+
+    def __close(self):
+        if self.db is not None:
+            self.db.close()
+            self.db = None
+            self.source = None
+
+#-------------------------------------------------------------------------
+#
+# ModelRebuild
+#
+#-------------------------------------------------------------------------
+class ModelRebuild:
+    """
+    A model rebuild running in the background.
+
+    add is called with each batch the work yields, and done when all the
+    work is done.  If the work raises an exception, error is called with it
+    instead of done.  They are all called from the main loop, and never
+    after the rebuild is cancelled.  The work may also yield None, which is
+    not passed on, to let a cancelled rebuild stop between batches.
+
+    A worker thread reads through connection, a RebuildConnection which
+    the caller keeps open for its next rebuilds.  Without one, the worker
+    opens a connection of its own and closes it when it ends.
+    """
+
+    def __init__(self, add, done=None, error=None, connection=None):
+        self.add = add
+        self.done = done
+        self.error = error
+        self.cancelled = threading.Event()
+        self.db = None
+        self.thread = None
+        self.idle = None
+        self.connection = connection
+
+    def start(self, db, work, readonly=False):
+        """
+        Start the work.  If readonly is True, the work only reads the
+        database and may run in a worker thread, with its own connection.
+        """
+        self.db = db
+        source = get_readonly_source(db) if readonly else None
+        if source:
+            self.thread = threading.Thread(target=self.__run,
+                                           args=(source, work), daemon=True)
+            self.thread.start()
+        else:
+            self.idle = GLib.idle_add(self.__steps(work(db)).__next__)
+
+    def cancel(self):
+        """
+        Cancel the rebuild, without waiting for a worker thread.  The worker
+        stops after its current batch, and the next worker waits for it to
+        release the connection.  Nothing it passed on still reaches the
+        model.
+        """
+        self.cancelled.set()
+        if self.idle is not None:
+            GLib.source_remove(self.idle)
+            self.idle = None
+
+    def __run(self, source, work):
+        """
+        Run the work in the worker thread.
+        """
+        connection = self.connection or RebuildConnection()
+        connection.acquire()
+        try:
+            self.__work(connection, source, work)
+        finally:
+            connection.release()
+            if connection is not self.connection:
+                connection.close()
+            GLib.idle_add(self.__reap)
+
+    def __work(self, connection, source, work):
+        if self.cancelled.is_set():
+            return
+        try:
+            db = connection.get(source)
+        except Exception:
+            _LOG.exception("cannot open the database for the rebuild")
+            GLib.idle_add(self.__fallback, work)
+            return
+        try:
+            for batch in work(db):
+                if self.cancelled.is_set():
+                    return
+                if batch is not None:
+                    GLib.idle_add(self.__add, batch)
+        except Exception as err:
+            GLib.idle_add(self.__finish, err)
+        else:
+            GLib.idle_add(self.__finish)
+
+    def __reap(self):
+        """
+        Join the worker thread, which has ended or is about to.
+        """
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+        return False
+
+    def __fallback(self, work):
+        """
+        Run the work in the main loop after all.
+        """
+        if not self.cancelled.is_set():
+            self.idle = GLib.idle_add(self.__steps(work(self.db)).__next__)
+        return False
+
+    def __steps(self, batches):
+        """
+        Run the work in the main loop, a step at a time.
+        """
+        start = perf_counter()
+        try:
+            for batch in batches:
+                if batch is not None:
+                    self.add(batch)
+                if perf_counter() - start > STEP_TIME:
+                    yield True
+                    start = perf_counter()
+        except Exception as err:
+            self.idle = None
+            self.__finish(err)
+        else:
+            self.idle = None
+            self.__finish()
+        yield False
+
+    def __add(self, batch):
+        if not self.cancelled.is_set():
+            self.add(batch)
+        return False
+
+    def __finish(self, err=None):
+        if self.cancelled.is_set():
+            return False
+        if err is None:
+            if self.done:
+                self.done()
+        elif self.error:
+            self.error(err)
+        else:
+            _LOG.error("rebuild failed", exc_info=err)
+        return False
@@ -52,6 +52,12 @@ class RepositoryModel(FlatBaseModel):
     def __init__(self, db, uistate, scol=0, order=Gtk.SortType.ASCENDING,
                  search=None, skip=set(), sort_map=None):
         self.gen_cursor = db.get_repository_cursor
+        self.sort_table = 'Repository'
+        self.sort_fields = {
+            0: ('name', None),
+            1: ('gramps_id', None),
+            14: ('change', lambda change: "%012x" % change),
+            }
         self.get_handles = db.get_repository_handles
         self.map = db.get_raw_repository_data
         self.fmap = [
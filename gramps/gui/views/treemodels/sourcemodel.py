@@ -53,6 +53,15 @@ class SourceModel(FlatBaseModel):
                  search=None, skip=set(), sort_map=None):
         self.map = db.get_raw_source_data
         self.gen_cursor = db.get_source_cursor
+        self.sort_table = 'Source'
+        self.sort_fields = {
+            0: ('title', lambda title: title.replace('\n', ' ')),
+            1: ('gramps_id', None),
+            2: ('author', None),
+            3: ('abbrev', None),
+            4: ('pubinfo', None),
+            7: ('change', lambda change: "%012x" % change),
+            }
         self.fmap = [
             self.column_title,
             self.column_id,
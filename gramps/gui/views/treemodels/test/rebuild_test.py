@@ -0,0 +1,201 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+""" Unittest for the model rebuilds in the background """
+
+import tempfile
+import threading
+import unittest
+
+from gi.repository import GLib
+
+from gramps.gen.db import DbTxn
+from gramps.gen.db.utils import make_database
+from gramps.gen.lib import Person
+from ..rebuild import ModelRebuild, RebuildConnection
+
+class RebuildTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db = make_database("sqlite")
+        self.db.load(self.tmpdir.name)
+        with DbTxn('Add test objects', self.db) as trans:
+            for dummy in range(3):
+                self.db.add_person(Person(), trans)
+        self.handles = sorted(self.db.get_person_handles())
+        self.connection = RebuildConnection()
+
+    def tearDown(self):
+        self.connection.close()
+        self.db.close()
+        self.tmpdir.cleanup()
+
+    def run_rebuild(self, rebuild, db, work):
+        """
+        Start the rebuild, and run the main loop until it is finished.
+        """
+        finished = []
+        rebuild.done = lambda: finished.append(None)
+        rebuild.error = finished.append
+        rebuild.start(db, work, readonly=True)
+        context = GLib.MainContext.default()
+        while not finished or rebuild.thread is not None:
+            context.iteration(True)
+        return finished[0]
+
+    def test_connection_kept(self):
+        """
+        Test that the workers of successive rebuilds read through the same
+        read-only connection.
+        """
+        dbs = []
+        def work(db):
+            dbs.append(db)
+            yield sorted(db.get_person_handles())
+        for dummy in range(2):
+            rows = []
+            rebuild = ModelRebuild(rows.append, connection=self.connection)
+            self.assertIsNone(self.run_rebuild(rebuild, self.db, work))
+            rebuild.cancel()
+            self.assertEqual(rows, [self.handles])
+        self.assertIs(dbs[0], dbs[1])
+        self.assertIsNot(dbs[0], self.db)
+        self.assertIs(self.connection.db, dbs[0])
+        self.connection.close()
+        self.assertIsNone(self.connection.db)
+
+    def test_own_connection(self):
+        rows = []
+        rebuild = ModelRebuild(rows.append)
+        self.assertIsNone(self.run_rebuild(
+            rebuild, self.db, lambda db: iter([db.get_person_handles()])))
+        self.assertEqual(sorted(rows[0]), self.handles)
+
+    def test_main_loop(self):
+        """
+        Test that the work runs in the main loop for a database which cannot
+        be opened again.
+        """
+        memory = make_database("sqlite")
+        memory.load(":memory:")
+        self.addCleanup(memory.close)
+        threads = []
+        def work(db):
+            threads.append(threading.current_thread())
+            yield [db]
+        rows = []
+        rebuild = ModelRebuild(rows.append, connection=self.connection)
+        self.assertIsNone(self.run_rebuild(rebuild, memory, work))
+        self.assertEqual(rows, [[memory]])
+        self.assertEqual(threads, [threading.current_thread()])
+        self.assertIsNone(self.connection.db)
+
+    def test_error(self):
+        def work(db):
+            yield self.handles
+            raise ValueError("read error")
+        rebuild = ModelRebuild(lambda rows: None, connection=self.connection)
+        self.assertIsInstance(self.run_rebuild(rebuild, self.db, work),
+                              ValueError)
+
+    def test_none_batches(self):
+        """
+        Test that the None batches of the work are not passed on.
+        """
+        memory = make_database("sqlite")
+        memory.load(":memory:")
+        self.addCleanup(memory.close)
+        def work(db):
+            yield None
+            yield self.handles
+            yield None
+        for db in (self.db, memory):
+            rows = []
+            rebuild = ModelRebuild(rows.append, connection=self.connection)
+            self.assertIsNone(self.run_rebuild(rebuild, db, work))
+            self.assertEqual(rows, [self.handles])
+
+    def test_cancel(self):
+        """
+        Test that cancel does not wait for the worker, that nothing it found
+        reaches the model afterwards, and that the worker of the next
+        rebuild waits for it to release the connection.
+        """
+        started = threading.Event()
+        proceed = threading.Event()
+        dbs = []
+        def work(db):
+            dbs.append(db)
+            started.set()
+            proceed.wait(10)
+            for handle in self.handles:
+                yield [handle]
+        rows = []
+        finished = []
+        rebuild = ModelRebuild(rows.append, lambda: finished.append(None),
+                               connection=self.connection)
+        rebuild.start(self.db, work, readonly=True)
+        started.wait(10)
+        thread = rebuild.thread
+        rebuild.cancel()
+        self.assertTrue(thread.is_alive())
+        # the next rebuild waits for the connection
+        next_rows = []
+        next_rebuild = ModelRebuild(next_rows.append,
+                                    connection=self.connection)
+        def next_work(db):
+            self.assertFalse(thread.is_alive())
+            dbs.append(db)
+            yield sorted(db.get_person_handles())
+        threading.Timer(0.1, proceed.set).start()
+        self.assertIsNone(self.run_rebuild(next_rebuild, self.db, next_work))
+        self.assertEqual(next_rows, [self.handles])
+        self.assertIs(dbs[0], dbs[1])
+        context = GLib.MainContext.default()
+        while rebuild.thread is not None:
+            context.iteration(True)
+        self.assertEqual(rows, [])
+        self.assertEqual(finished, [])
+
+    def test_close_busy(self):
+        """
+        Test that closing the connection while a worker uses it does not
+        wait, and that the worker closes it when it is done.
+        """
+        started = threading.Event()
+        proceed = threading.Event()
+        def work(db):
+            started.set()
+            proceed.wait(10)
+            yield self.handles
+        rows = []
+        rebuild = ModelRebuild(rows.append, connection=self.connection)
+        rebuild.start(self.db, work, readonly=True)
+        started.wait(10)
+        rebuild.cancel()
+        self.connection.close()
+        self.assertIsNotNone(self.connection.db)
+        proceed.set()
+        context = GLib.MainContext.default()
+        while rebuild.thread is not None:
+            context.iteration(True)
+        self.assertIsNone(self.connection.db)
+        self.assertEqual(rows, [])
+
+if __name__ == "__main__":
+    unittest.main()
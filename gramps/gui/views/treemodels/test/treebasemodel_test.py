@@ -0,0 +1,192 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+""" Unittest for the lazy build of the tree models """
+
+import unittest
+
+from gramps.gen.db import DbTxn
+from gramps.gen.db.utils import make_database
+from gramps.gen.lib import Person, Surname, Place, PlaceName, PlaceRef
+from ..peoplemodel import PersonTreeModel
+from ..placemodel import PlaceTreeModel
+
+class PersonTreeTest(unittest.TestCase):
+    def setUp(self):
+        self.db = make_database("sqlite")
+        self.db.load(":memory:")
+        self.handles = {}
+        with DbTxn('Add test objects', self.db) as trans:
+            for first_name, surname in (('John', 'Smith'), ('Jane', 'Smith'),
+                                        ('Bob', 'Jones')):
+                self.handles[first_name] = self.add_person(first_name,
+                                                           surname, trans)
+        self.model = PersonTreeModel(self.db, None)
+
+    def tearDown(self):
+        self.model.destroy()
+        self.db.close()
+
+    def add_person(self, first_name, surname, trans):
+        person = Person()
+        person.primary_name.first_name = first_name
+        person.primary_name.set_surname_list([Surname()])
+        person.primary_name.get_primary_surname().set_surname(surname)
+        return self.db.add_person(person, trans)
+
+    def get_group_iter(self, group_name):
+        return self.model._get_iter(self.model.tree[group_name])
+
+    def test_lazy_build(self):
+        """
+        Test that only the surname groups are built, and that the people in
+        a group are added when it is first expanded.
+        """
+        self.assertEqual(set(self.model.lazy_children), {'Smith', 'Jones'})
+        self.assertEqual(self.model.handle2node, {})
+        self.assertEqual(self.model.displayed(), 3)
+        self.assertEqual(self.model.do_iter_n_children(None), 2)
+        group_iter = self.get_group_iter('Smith')
+        self.assertTrue(self.model.do_iter_has_child(group_iter))
+        self.assertIn('Smith', self.model.lazy_children)
+        self.assertEqual(self.model.do_iter_n_children(group_iter), 2)
+        self.assertNotIn('Smith', self.model.lazy_children)
+        self.assertEqual(set(self.model.handle2node),
+                         {self.handles['John'], self.handles['Jane']})
+        self.assertIn('Jones', self.model.lazy_children)
+
+    def test_nth_child(self):
+        """
+        Test that the children of a group are added when the view asks for
+        one of them.
+        """
+        found, child_iter = self.model.do_iter_nth_child(
+            self.get_group_iter('Smith'), 0)
+        self.assertTrue(found)
+        self.assertEqual(self.model.get_handle_from_iter(child_iter),
+                         self.handles['Jane'])
+        found, child_iter = self.model.do_iter_children(
+            self.get_group_iter('Jones'))
+        self.assertTrue(found)
+        self.assertEqual(self.model.get_handle_from_iter(child_iter),
+                         self.handles['Bob'])
+        self.assertEqual(self.model.lazy_children, {})
+
+    def test_get_node(self):
+        """
+        Test that looking up a person adds the people of their group.
+        """
+        self.assertIsNotNone(
+            self.model.get_iter_from_handle(self.handles['Jane']))
+        self.assertNotIn('Smith', self.model.lazy_children)
+        self.assertIn(self.handles['John'], self.model.handle2node)
+        self.assertIn('Jones', self.model.lazy_children)
+
+    def test_add_node(self):
+        """
+        Test that a person added to a group which is not loaded yet is added
+        once, in sort order with the people already in the group.
+        """
+        with DbTxn('Add test objects', self.db) as trans:
+            handle = self.add_person('Alice', 'Smith', trans)
+        self.model.add_row_by_handle(handle)
+        self.assertNotIn('Smith', self.model.lazy_children)
+        self.assertEqual(len(self.model.tree['Smith'].children), 3)
+        self.assertEqual(self.model.displayed(), 4)
+        found, child_iter = self.model.do_iter_nth_child(
+            self.get_group_iter('Smith'), 0)
+        self.assertEqual(self.model.get_handle_from_iter(child_iter), handle)
+
+    def test_remove_node(self):
+        """
+        Test that removing the only person of a group which is not loaded yet
+        removes the group.
+        """
+        self.model.delete_row_by_handle(self.handles['Bob'])
+        self.assertNotIn('Jones', self.model.tree)
+        self.assertNotIn('Jones', self.model.lazy_children)
+        self.assertNotIn(self.handles['Bob'], self.model.handle2node)
+        self.assertEqual(self.model.do_iter_n_children(None), 1)
+        self.assertEqual(self.model.displayed(), 2)
+
+class PlaceTreeTest(unittest.TestCase):
+    def setUp(self):
+        self.db = make_database("sqlite")
+        self.db.load(":memory:")
+        with DbTxn('Add test objects', self.db) as trans:
+            self.country = self.add_place('England', None, trans)
+            self.city = self.add_place('London', self.country, trans)
+            self.district = self.add_place('Soho', self.city, trans)
+        self.model = PlaceTreeModel(self.db, None)
+
+    def tearDown(self):
+        self.model.destroy()
+        self.db.close()
+
+    def add_place(self, name, parent, trans):
+        place = Place()
+        place.set_name(PlaceName(value=name))
+        if parent:
+            placeref = PlaceRef()
+            placeref.ref = parent
+            place.add_placeref(placeref)
+        return self.db.add_place(place, trans)
+
+    def test_lazy_build(self):
+        """
+        Test that the places enclosed by a place are added one level at a
+        time.
+        """
+        self.assertEqual(set(self.model.handle2node), {self.country})
+        self.assertEqual(set(self.model.lazy_children), {self.country})
+        country_iter = self.model.get_iter_from_handle(self.country)
+        self.assertTrue(self.model.do_iter_has_child(country_iter))
+        found, city_iter = self.model.do_iter_nth_child(country_iter, 0)
+        self.assertTrue(found)
+        self.assertEqual(self.model.get_handle_from_iter(city_iter),
+                         self.city)
+        self.assertEqual(set(self.model.lazy_children), {self.city})
+        self.assertTrue(self.model.do_iter_has_child(city_iter))
+        self.assertNotIn(self.district, self.model.handle2node)
+
+    def test_get_node(self):
+        """
+        Test that looking up a place adds its enclosing places first.
+        """
+        district_iter = self.model.get_iter_from_handle(self.district)
+        self.assertIsNotNone(district_iter)
+        self.assertEqual(self.model.lazy_children, {})
+        node = self.model.get_node_from_iter(district_iter)
+        self.assertIs(self.model.nodemap.node(node.parent),
+                      self.model.handle2node[self.city])
+
+    def test_remove_node(self):
+        """
+        Test that removing a place whose children are not loaded yet keeps
+        its node for the places it encloses.
+        """
+        self.model.delete_row_by_handle(self.country)
+        self.assertNotIn(self.country, self.model.handle2node)
+        self.assertEqual(self.model.lazy_children, {self.city: self.city})
+        self.assertEqual(self.model.do_iter_n_children(None), 1)
+        found, top_iter = self.model.do_iter_nth_child(None, 0)
+        self.assertIsNone(self.model.get_handle_from_iter(top_iter))
+        self.assertEqual(self.model.do_iter_n_children(top_iter), 1)
+
+if __name__ == "__main__":
+    unittest.main()
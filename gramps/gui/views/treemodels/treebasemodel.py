@@ -249,6 +249,11 @@ class TreeBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
     handle2node A dictionary of gramps handles.  Each entry is a node object.
     nodemap     A NodeMap, mapping id's of the nodes to the node objects. Node
                 refer to other nodes via id's in a linked list form.
+    lazy_children A dictionary of the identifiers of the nodes whose children
+                have not been added yet.  Each entry is the information the
+                model needs to find the children.  Without a search or
+                filter, models can build only the top level of the tree and
+                add the children of a node when it is first expanded.
 
     The model obtains data from database as needed and holds a cache of most
     recently used data.
@@ -309,6 +314,7 @@ class TreeBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
         self.tree = {}
         self.nodemap = NodeMap()
         self.handle2node = {}
+        self.lazy_children = {}
 
         #GTK3 We leak ref, yes??
         #self.set_property("leak_references", False)
@@ -414,6 +420,7 @@ class TreeBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
         self.clear_cache()
         self.tree.clear()
         self.handle2node.clear()
+        self.lazy_children.clear()
         self.stamp += 1
         self.nodemap.clear()
         #start with creating the new iters
@@ -515,6 +522,13 @@ class TreeBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
         self.__displayed = 0
 
         items = self.number_items()
+        if not (dfilter or skip or self.has_secondary) and \
+                self._add_lazy_rows():
+            _LOG.debug("rebuild lazy primary")
+            self.__total = items
+            self.__displayed = items
+            return
+
         _LOG.debug("rebuild search primary")
         self.__rebuild_search(dfilter, skip, items,
                               self.gen_cursor, self.add_row)
@@ -601,6 +615,45 @@ class TreeBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
 
         status_ppl.end()
 
+    def _add_lazy_rows(self):
+        """
+        Add the top level of the tree, registering the nodes with children in
+        lazy_children instead of adding them.  Return False if the model
+        cannot be built lazily, in which case nothing must be added.
+        """
+        return False
+
+    def _get_lazy_children(self, ref, info):
+        """
+        Return the handles of the objects to add under the node with the
+        identifier ref, given the information stored in lazy_children.
+        """
+        raise NotImplementedError
+
+    def _get_lazy_parents(self, handle):
+        """
+        Return the identifiers of the nodes whose children must be added for
+        the object with the given handle to be in the tree, top level first.
+        """
+        return []
+
+    def _load_children(self, node, skip=None):
+        """
+        Add the children of a node which were left out by a lazy build.  No
+        signals are emitted, as the view has not seen these rows yet.
+        """
+        info = self.lazy_children.pop(node.ref, None)
+        if info is None:
+            return
+        in_build = self._in_build
+        self._in_build = True
+        for handle in self._get_lazy_children(node.ref, info):
+            if handle != skip and handle not in self.handle2node:
+                data = self.map(handle)
+                if data:
+                    self.add_row(handle, data)
+        self._in_build = in_build
+
     def add_node(self, parent, child, sortkey, handle, add_parent=True,
                  secondary=False):
         """
@@ -619,6 +672,8 @@ class TreeBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
                     parent as a top group with no handle
         """
         self.clear_path_cache()
+        if parent in self.lazy_children:
+            self._load_children(self.tree[parent], skip=handle)
         if add_parent and not (parent in self.tree):
             #add parent to self.tree as a node with no handle, as the first
             #group level
@@ -670,6 +725,7 @@ class TreeBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
         Remove a node from the map.
         """
         self.clear_path_cache()
+        self._load_children(node)
         if node.children:
             del self.handle2node[node.handle]
             node.set_handle(None)
@@ -743,7 +799,7 @@ class TreeBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
         """
         assert isinstance(handle, str)
         self.clear_path_cache()
-        if self._get_node(handle) is not None:
+        if handle in self.handle2node:
             return # row already exists
         cput = perf_counter()
         data = self.map(handle)
@@ -846,7 +902,13 @@ class TreeBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
         """
         Get the node for a handle.
         """
-        return self.handle2node.get(handle)
+        node = self.handle2node.get(handle)
+        if node is None and handle and self.lazy_children:
+            for ref in self._get_lazy_parents(handle):
+                if ref in self.tree:
+                    self._load_children(self.tree[ref])
+            node = self.handle2node.get(handle)
+        return node
 
     def get_iter_from_handle(self, handle):
         """
@@ -961,6 +1023,7 @@ class TreeBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
         else:
             pathlist = path.get_indices()
         for index in pathlist:
+            self._load_children(node)
             _index = (-index - 1) if self.__reverse else index
             try:
                 if len(node.children[_index]) > 0:
@@ -1045,6 +1108,7 @@ class TreeBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
             nodeid = id(self.tree[None])
         else:
             nodeparent = self.get_node_from_iter(iterparent)
+            self._load_children(nodeparent)
             if nodeparent.children:
                 nodeid = nodeparent.children[-1 if self.__reverse else 0][1]
             else:
@@ -1056,7 +1120,7 @@ class TreeBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
         Find if the given node has any children.
         """
         node = self.get_node_from_iter(iter)
-        return True if node.children else False
+        return bool(node.children) or node.ref in self.lazy_children
 
     def do_iter_n_children(self, iter):
         """
@@ -1066,6 +1130,7 @@ class TreeBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
             node = self.tree[None]
         else:
             node = self.get_node_from_iter(iter)
+            self._load_children(node)
         return len(node.children)
 
     def do_iter_nth_child(self, iterparent, index):
@@ -1076,6 +1141,7 @@ class TreeBaseModel(GObject.GObject, Gtk.TreeModel, BaseModel):
             node = self.tree[None]
         else:
             node = self.get_node_from_iter(iterparent)
+            self._load_children(node)
         if node.children:
             if len(node.children) > index:
                 _index = (-index - 1) if self.__reverse else index
@@ -39,6 +39,7 @@ from gramps.gen.db.dbconst import DBBACKEND, DBMODE_W, SCHVERSFN
 from gramps.gen.db.exceptions import (DbException, DbSupportedError,
                                       DbUpgradeRequiredError, DbVersionError)
 from gramps.gen.db.utils import clear_lock_file
+from gramps.gen.db.serializers import BlobSerializer
 from gramps.gen.lib import Researcher
 from gramps.gen.const import GRAMPS_LOCALE as glocale
 from gramps.gen.updatecallback import UpdateCallback
@@ -90,6 +91,10 @@ class DbBsddb(SQLite):
         super().load(new_path, callback=None, mode='w',
                      force_schema_upgrade=False,
                      username=username, password=password)
+        # the copied objects are pickled, until the schema upgrade converts
+        # them to the storage format selected in the preferences
+        self._set_metadata('serializer', BlobSerializer.name)
+        self.serializer = BlobSerializer
 
         # now read in the bsddb and copy to dpapi
         schema_vers = None
@@ -28,6 +28,7 @@ import os
 import time
 import pickle
 import logging
+from collections import Counter
 
 #------------------------------------------------------------------------
 #
@@ -39,21 +40,59 @@ from gramps.gen.db.dbconst import (DBLOGNAME, DBBACKEND, KEY_TO_NAME_MAP,
                                    PERSON_KEY, FAMILY_KEY, SOURCE_KEY,
                                    EVENT_KEY, MEDIA_KEY, PLACE_KEY, NOTE_KEY,
                                    TAG_KEY, CITATION_KEY, REPOSITORY_KEY,
-                                   REFERENCE_KEY)
+                                   REFERENCE_KEY, BATCHSIZE, INSIZE,
+                                   ARRAYSIZE, CLASS_TO_KEY_MAP)
 from gramps.gen.db.generic import DbGeneric
+from gramps.gen.db.serializers import get_serializer
 from gramps.gen.updatecallback import UpdateCallback
 from gramps.gen.lib import (Tag, Media, Person, Family, Source,
-                            Citation, Event, Place, Repository, Note)
+                            Citation, Event, Place, Repository, Note,
+                            NameOriginType, EventType, EventRoleType,
+                            FamilyRelType, ChildRefType, NoteType)
 from gramps.gen.lib.genderstats import GenderStats
 from gramps.gen.const import GRAMPS_LOCALE as glocale
 
 LOG = logging.getLogger(".dbapi")
 _LOG = logging.getLogger(DBLOGNAME)
 
+# The columns of the person_summary table, after the handle.  For the birth
+# and death, the event is the one whose date is shown, and the place event
+# the one whose place is shown.  The fallback columns are 1 if that is a
+# baptism or burial like event instead of the birth or death.  The sort
+# columns hold the date sort value as a "%09d" string, or '' without a date.
+SUMMARY_COLUMNS = ('birth_event', 'birth_fallback', 'birth_sort',
+                   'birth_place_event', 'birth_place_fallback',
+                   'death_event', 'death_fallback', 'death_sort',
+                   'death_place_event', 'death_place_fallback',
+                   'parents', 'marriages', 'children', 'todo')
+
+BIRTH_FALLBACKS = (EventType.BAPTISM, EventType.CHRISTEN)
+DEATH_FALLBACKS = (EventType.BURIAL, EventType.CREMATION,
+                   EventType.CAUSE_DEATH)
+
 class DBAPI(DbGeneric):
     """
     Database backends class for DB-API 2.0 databases
     """
+    def __init__(self, directory=None):
+        # Objects committed in a batch transaction, waiting for a bulk write.
+        # {obj_key: {handle: (exists, data, values, references, families,
+        #                     gramps_id)}}
+        self._batch_queue = {}
+        # Number of queued objects with each Gramps ID, kept in step with
+        # the queue {obj_key: Counter(gramps_id)}
+        self._batch_ids = {}
+        # True if the parent_family table can be used
+        self._pedigree = False
+        # True if the person table has the surname group columns
+        self._surname_groups = False
+        # True if the person_summary table can be used
+        self._summaries = False
+        # Handles of the objects changed in the current transaction, which
+        # the summaries of people depend on {obj_key: set(handle)}
+        self._summary_dirty = {}
+        super().__init__(directory)
+
     def _initialize(self, directory, username, password):
         raise NotImplementedError
 
@@ -78,53 +117,66 @@ class DBAPI(DbGeneric):
                            'handle VARCHAR(50) PRIMARY KEY NOT NULL, '
                            'given_name TEXT, '
                            'surname TEXT, '
-                           'blob_data BLOB'
+                           'group_as TEXT, '
+                           'primary_surname TEXT, '
+                           'patronymic INTEGER, '
+                           'blob_data BLOB, '
+                           'json_data TEXT'
                            ')')
         self.dbapi.execute('CREATE TABLE family '
                            '('
                            'handle VARCHAR(50) PRIMARY KEY NOT NULL, '
-                           'blob_data BLOB'
+                           'blob_data BLOB, '
+                           'json_data TEXT'
                            ')')
         self.dbapi.execute('CREATE TABLE source '
                            '('
                            'handle VARCHAR(50) PRIMARY KEY NOT NULL, '
-                           'blob_data BLOB'
+                           'blob_data BLOB, '
+                           'json_data TEXT'
                            ')')
         self.dbapi.execute('CREATE TABLE citation '
                            '('
                            'handle VARCHAR(50) PRIMARY KEY NOT NULL, '
-                           'blob_data BLOB'
+                           'blob_data BLOB, '
+                           'json_data TEXT'
                            ')')
         self.dbapi.execute('CREATE TABLE event '
                            '('
                            'handle VARCHAR(50) PRIMARY KEY NOT NULL, '
-                           'blob_data BLOB'
+                           'blob_data BLOB, '
+                           'json_data TEXT'
                            ')')
         self.dbapi.execute('CREATE TABLE media '
                            '('
                            'handle VARCHAR(50) PRIMARY KEY NOT NULL, '
-                           'blob_data BLOB'
+                           'blob_data BLOB, '
+                           'json_data TEXT'
                            ')')
         self.dbapi.execute('CREATE TABLE place '
                            '('
                            'handle VARCHAR(50) PRIMARY KEY NOT NULL, '
                            'enclosed_by VARCHAR(50), '
-                           'blob_data BLOB'
+                           'blob_data BLOB, '
+                           'json_data TEXT'
                            ')')
         self.dbapi.execute('CREATE TABLE repository '
                            '('
                            'handle VARCHAR(50) PRIMARY KEY NOT NULL, '
-                           'blob_data BLOB'
+                           'blob_data BLOB, '
+                           'json_data TEXT'
                            ')')
         self.dbapi.execute('CREATE TABLE note '
                            '('
                            'handle VARCHAR(50) PRIMARY KEY NOT NULL, '
-                           'blob_data BLOB'
+                           'blob_data BLOB, '
+                           'json_data TEXT'
                            ')')
         self.dbapi.execute('CREATE TABLE tag '
                            '('
                            'handle VARCHAR(50) PRIMARY KEY NOT NULL, '
-                           'blob_data BLOB'
+                           'blob_data BLOB, '
+                           'json_data TEXT'
                            ')')
         # Secondary:
         self.dbapi.execute('CREATE TABLE reference '
@@ -153,6 +205,10 @@ class DBAPI(DbGeneric):
                            ')')
 
         self._create_secondary_columns()
+        self._create_pedigree()
+        self._surname_groups = True
+        self._create_person_summary()
+        self._summaries = True
 
         ## Indices:
         self.dbapi.execute('CREATE INDEX person_gramps_id '
@@ -161,6 +217,8 @@ class DBAPI(DbGeneric):
                            'ON person(surname)')
         self.dbapi.execute('CREATE INDEX person_given_name '
                            'ON person(given_name)')
+        self.dbapi.execute('CREATE INDEX person_primary_surname '
+                           'ON person(primary_surname)')
         self.dbapi.execute('CREATE INDEX source_title '
                            'ON source(title)')
         self.dbapi.execute('CREATE INDEX source_gramps_id '
@@ -196,6 +254,86 @@ class DBAPI(DbGeneric):
 
         self.dbapi.commit()
 
+    def _create_pedigree(self):
+        """
+        Create the parent_family table, which holds the parent families of
+        each person, and the indexes used to walk the pedigree in both
+        directions.
+        """
+        self.dbapi.execute('CREATE TABLE parent_family '
+                           '('
+                           'child_handle VARCHAR(50), '
+                           'family_handle VARCHAR(50), '
+                           'main INTEGER'
+                           ')')
+        self.dbapi.execute('CREATE INDEX parent_family_child_handle '
+                           'ON parent_family(child_handle)')
+        self.dbapi.execute('CREATE INDEX parent_family_family_handle '
+                           'ON parent_family(family_handle)')
+        self.dbapi.execute('CREATE INDEX family_father_handle '
+                           'ON family(father_handle)')
+        self.dbapi.execute('CREATE INDEX family_mother_handle '
+                           'ON family(mother_handle)')
+
+    def _create_person_summary(self):
+        """
+        Create the person_summary table, which holds the values of the people
+        view columns that depend on the events, families and notes of a
+        person.
+        """
+        self.dbapi.execute('CREATE TABLE person_summary '
+                           '('
+                           'handle VARCHAR(50) PRIMARY KEY NOT NULL, '
+                           'birth_event VARCHAR(50), '
+                           'birth_fallback INTEGER, '
+                           'birth_sort TEXT, '
+                           'birth_place_event VARCHAR(50), '
+                           'birth_place_fallback INTEGER, '
+                           'death_event VARCHAR(50), '
+                           'death_fallback INTEGER, '
+                           'death_sort TEXT, '
+                           'death_place_event VARCHAR(50), '
+                           'death_place_fallback INTEGER, '
+                           'parents INTEGER, '
+                           'marriages INTEGER, '
+                           'children INTEGER, '
+                           'todo INTEGER'
+                           ')')
+
+    def _check_schema(self):
+        """
+        Find which of the parent_family and person_summary tables and the
+        surname group columns of the person table the database has.  An old
+        database opened read only does not have them.
+        """
+        self._pedigree = self.dbapi.table_exists('parent_family')
+        self._surname_groups = self.dbapi.column_exists('person',
+                                                        'primary_surname')
+        self._summaries = self.dbapi.table_exists('person_summary')
+
+    def _add_secondary_tables(self):
+        """
+        Add the parent_family and person_summary tables and the surname
+        group columns of the person table, unless the database already has
+        them.  Does not commit.
+        """
+        self._check_schema()
+        if not self._pedigree:
+            self._create_pedigree()
+            self._pedigree = True
+        if not self._surname_groups:
+            self.dbapi.execute('ALTER TABLE person ADD COLUMN group_as TEXT')
+            self.dbapi.execute('ALTER TABLE person '
+                               'ADD COLUMN primary_surname TEXT')
+            self.dbapi.execute('ALTER TABLE person '
+                               'ADD COLUMN patronymic INTEGER')
+            self.dbapi.execute('CREATE INDEX person_primary_surname '
+                               'ON person(primary_surname)')
+            self._surname_groups = True
+        if not self._summaries:
+            self._create_person_summary()
+            self._summaries = True
+
     def _close(self):
         self.dbapi.close()
 
@@ -215,6 +353,7 @@ class DBAPI(DbGeneric):
         """
         if self.transaction == None:
             _LOG.debug("    DBAPI %s transaction commit", hex(id(self)))
+            self._update_summaries()
             self.dbapi.commit()
 
     def _txn_abort(self):
@@ -249,8 +388,8 @@ class DBAPI(DbGeneric):
                   TXNDEL: "-delete",
                   None: "-delete"}
         if txn.batch:
-            # FIXME: need a User GUI update callback here:
-            self.reindex_reference_map(lambda percent: percent)
+            self._flush_batch()
+        self._update_summaries()
         self.dbapi.commit()
         if not txn.batch:
             # Now, emit signals:
@@ -282,7 +421,11 @@ class DBAPI(DbGeneric):
         """
         Executed after a batch operation abort.
         """
+        self._batch_queue.clear()
+        self._batch_ids.clear()
+        self._summary_dirty.clear()
         self.dbapi.rollback()
+        self.cache.clear()
         self.transaction = None
         txn.clear()
         txn.first = None
@@ -360,6 +503,7 @@ class DBAPI(DbGeneric):
         :param locale: The locale to use for collation.
         :type locale: A GrampsLocale object.
         """
+        self._flush_batch()
         if sort_handles:
             if locale != glocale:
                 self.dbapi.check_collation(locale)
@@ -382,6 +526,7 @@ class DBAPI(DbGeneric):
         :param locale: The locale to use for collation.
         :type locale: A GrampsLocale object.
         """
+        self._flush_batch()
         if sort_handles:
             if locale != glocale:
                 self.dbapi.check_collation(locale)
@@ -412,6 +557,7 @@ class DBAPI(DbGeneric):
         Return a list of database handles, one handle for each Event in the
         database.
         """
+        self._flush_batch()
         self.dbapi.execute("SELECT handle FROM event")
         rows = self.dbapi.fetchall()
         return [row[0] for row in rows]
@@ -426,6 +572,7 @@ class DBAPI(DbGeneric):
         :param locale: The locale to use for collation.
         :type locale: A GrampsLocale object.
         """
+        self._flush_batch()
         if sort_handles:
             if locale != glocale:
                 self.dbapi.check_collation(locale)
@@ -448,6 +595,7 @@ class DBAPI(DbGeneric):
         :param locale: The locale to use for collation.
         :type locale: A GrampsLocale object.
         """
+        self._flush_batch()
         if sort_handles:
             if locale != glocale:
                 self.dbapi.check_collation(locale)
@@ -470,6 +618,7 @@ class DBAPI(DbGeneric):
         :param locale: The locale to use for collation.
         :type locale: A GrampsLocale object.
         """
+        self._flush_batch()
         if sort_handles:
             if locale != glocale:
                 self.dbapi.check_collation(locale)
@@ -487,6 +636,7 @@ class DBAPI(DbGeneric):
         Return a list of database handles, one handle for each Repository in
         the database.
         """
+        self._flush_batch()
         self.dbapi.execute("SELECT handle FROM repository")
         rows = self.dbapi.fetchall()
         return [row[0] for row in rows]
@@ -501,6 +651,7 @@ class DBAPI(DbGeneric):
         :param locale: The locale to use for collation.
         :type locale: A GrampsLocale object.
         """
+        self._flush_batch()
         if sort_handles:
             if locale != glocale:
                 self.dbapi.check_collation(locale)
@@ -518,6 +669,7 @@ class DBAPI(DbGeneric):
         Return a list of database handles, one handle for each Note in the
         database.
         """
+        self._flush_batch()
         self.dbapi.execute("SELECT handle FROM note")
         rows = self.dbapi.fetchall()
         return [row[0] for row in rows]
@@ -532,6 +684,7 @@ class DBAPI(DbGeneric):
         :param locale: The locale to use for collation.
         :type locale: A GrampsLocale object.
         """
+        self._flush_batch()
         if sort_handles:
             if locale != glocale:
                 self.dbapi.check_collation(locale)
@@ -550,13 +703,16 @@ class DBAPI(DbGeneric):
 
         If no such Tag exists, None is returned.
         """
-        self.dbapi.execute("SELECT blob_data FROM tag WHERE name = ?", [name])
+        self._flush_batch()
+        self.dbapi.execute("SELECT %s FROM tag WHERE name = ?"
+                           % self.serializer.data_field, [name])
         row = self.dbapi.fetchone()
         if row:
-            return Tag.create(pickle.loads(row[0]))
+            return Tag.create(self.serializer.string_to_data(row[0]))
         return None
 
     def _get_number_of(self, obj_key):
+        self._flush_batch()
         table = KEY_TO_NAME_MAP[obj_key]
         sql = "SELECT count(1) FROM %s" % table
         self.dbapi.execute(sql)
@@ -602,20 +758,28 @@ class DBAPI(DbGeneric):
         obj.change = int(change_time or time.time())
         table = KEY_TO_NAME_MAP[obj_key]
 
+        if trans.batch:
+            return self._queue_batch(obj, obj_key)
+
+        string = self.serializer.data_to_string(obj.serialize())
         if self._has_handle(obj_key, obj.handle):
             old_data = self._get_raw_data(obj_key, obj.handle)
             # update the object:
-            sql = "UPDATE %s SET blob_data = ? WHERE handle = ?" % table
+            sql = ("UPDATE %s SET %s = ? WHERE handle = ?"
+                   % (table, self.serializer.data_field))
             self.dbapi.execute(sql,
-                               [pickle.dumps(obj.serialize()),
+                               [string,
                                 obj.handle])
         else:
             # Insert the object:
-            sql = ("INSERT INTO %s (handle, blob_data) VALUES (?, ?)") % table
+            sql = ("INSERT INTO %s (handle, %s) VALUES (?, ?)"
+                   % (table, self.serializer.data_field))
             self.dbapi.execute(sql,
                                [obj.handle,
-                                pickle.dumps(obj.serialize())])
+                                string])
+        self.cache.discard(obj_key, obj.handle)
         self._update_secondary_values(obj)
+        self._mark_summaries(obj_key, [obj.handle])
         if not trans.batch:
             self._update_backlinks(obj, trans)
             if old_data:
@@ -629,6 +793,135 @@ class DBAPI(DbGeneric):
 
         return old_data
 
+    def _queue_batch(self, obj, obj_key):
+        """
+        Queue the specified object for a bulk write, instead of writing it
+        straight away.  Used by batch transactions, which do not record undo
+        data.  The queue is flushed when it is full, before any query that
+        could see the queued rows, and at the end of the transaction.
+
+        The stored row of the object is not read here: the rows which
+        already exist are found with one query per table when the queue is
+        flushed.  So the old data is only returned for an object which is
+        already queued.
+        """
+        queue = self._batch_queue.setdefault(obj_key, {})
+        ids = self._batch_ids.setdefault(obj_key, Counter())
+        if obj.handle in queue:
+            old_data = queue[obj.handle][0]
+            # the object may have a new Gramps ID
+            old_id = queue[obj.handle][4]
+            if old_id is not None:
+                ids[old_id] -= 1
+                if not ids[old_id]:
+                    del ids[old_id]
+        else:
+            old_data = None
+            self.cache.discard(obj_key, obj.handle)
+        data = obj.serialize()
+        values = self._get_secondary_values(obj)
+        references = set(obj.get_referenced_handles_recursively())
+        if obj_key == PERSON_KEY:
+            families = self._get_pedigree_rows(obj)
+        else:
+            families = []
+        gramps_id = obj.gramps_id if obj_key != TAG_KEY else None
+        queue[obj.handle] = (data,
+                             [self.serializer.data_to_string(data)] + values,
+                             references, families, gramps_id)
+        if gramps_id is not None:
+            ids[gramps_id] += 1
+
+        if sum(len(queue) for queue in self._batch_queue.values()) >= \
+                BATCHSIZE:
+            self._flush_batch()
+        return old_data
+
+    def _flush_batch(self):
+        """
+        Write all queued objects to the database.
+
+        The rows which already exist are found with one query for each chunk
+        of INSIZE handles, and deleted, which is a portable way to do an
+        upsert.  Each table is then written with a single multi-row insert
+        of the stored data and secondary columns.  The reference rows of the
+        objects are written in the same way.
+        """
+        if not self._batch_queue:
+            return
+        for obj_key, queue in self._batch_queue.items():
+            if not queue:
+                continue
+            table = KEY_TO_NAME_MAP[obj_key]
+            obj_class = KEY_TO_CLASS_MAP[obj_key]
+            columns = ([self.serializer.data_field] +
+                       self._get_secondary_columns(obj_class))
+            existing = self._get_existing_rows(obj_key, queue)
+            if existing:
+                self.dbapi.executemany("DELETE FROM %s WHERE handle = ?"
+                                       % table, existing)
+                self.dbapi.executemany("DELETE FROM reference "
+                                       "WHERE obj_handle = ?", existing)
+            self.dbapi.executemany("INSERT INTO %s (%s) VALUES (%s)"
+                                   % (table, ", ".join(columns),
+                                      ", ".join(["?"] * len(columns))),
+                                   [entry[1] for entry in queue.values()])
+            self.dbapi.executemany("INSERT INTO reference "
+                                   "(obj_handle, obj_class, "
+                                   "ref_handle, ref_class) "
+                                   "VALUES (?, ?, ?, ?)",
+                                   [[handle, obj_class, ref_handle,
+                                     ref_class_name]
+                                    for handle, entry in queue.items()
+                                    for (ref_class_name, ref_handle)
+                                    in entry[2]])
+            if obj_key == PERSON_KEY:
+                if existing:
+                    self.dbapi.executemany("DELETE FROM parent_family "
+                                           "WHERE child_handle = ?", existing)
+                self.dbapi.executemany("INSERT INTO parent_family "
+                                       "(child_handle, family_handle, main) "
+                                       "VALUES (?, ?, ?)",
+                                       [row for entry in queue.values()
+                                        for row in entry[3]])
+            self._mark_summaries(obj_key, list(queue))
+        self._batch_queue.clear()
+        self._batch_ids.clear()
+
+    def _get_existing_rows(self, obj_key, queue):
+        """
+        Return the handles of the queued objects which are already stored,
+        as rows for executemany.
+
+        The people were counted as new ones by commit_person, so the gender
+        statistics and the surname list are corrected here for the stored
+        version of each person.
+        """
+        table = KEY_TO_NAME_MAP[obj_key]
+        handles = list(queue)
+        existing = []
+        for start in range(0, len(handles), INSIZE):
+            chunk = handles[start:start + INSIZE]
+            marks = ", ".join(["?"] * len(chunk))
+            if obj_key != PERSON_KEY:
+                self.dbapi.execute("SELECT handle FROM %s "
+                                   "WHERE handle IN (%s)" % (table, marks),
+                                   chunk)
+                existing += [[row[0]] for row in self.dbapi.fetchall()]
+                continue
+            self.dbapi.execute("SELECT handle, %s FROM person "
+                               "WHERE handle IN (%s)"
+                               % (self.serializer.data_field, marks), chunk)
+            for handle, string in self.dbapi.fetchall():
+                existing.append([handle])
+                old_person = Person(self.serializer.string_to_data(string))
+                person = Person(queue[handle][0])
+                self.genderStats.uncount_person(old_person)
+                if (self._order_by_person_key(person) !=
+                        self._order_by_person_key(old_person)):
+                    self.remove_from_surname_list(old_person)
+        return existing
+
     def _commit_raw(self, data, obj_key):
         """
         Commit a serialized primary object to the database, storing the
@@ -636,19 +929,22 @@ class DBAPI(DbGeneric):
         """
         table = KEY_TO_NAME_MAP[obj_key]
         handle = data[0]
+        self.cache.discard(obj_key, handle)
 
         if self._has_handle(obj_key, handle):
             # update the object:
-            sql = "UPDATE %s SET blob_data = ? WHERE handle = ?" % table
+            sql = ("UPDATE %s SET %s = ? WHERE handle = ?"
+                   % (table, self.serializer.data_field))
             self.dbapi.execute(sql,
-                               [pickle.dumps(data),
+                               [self.serializer.data_to_string(data),
                                 handle])
         else:
             # Insert the object:
-            sql = ("INSERT INTO %s (handle, blob_data) VALUES (?, ?)") % table
+            sql = ("INSERT INTO %s (handle, %s) VALUES (?, ?)"
+                   % (table, self.serializer.data_field))
             self.dbapi.execute(sql,
                                [handle,
-                                pickle.dumps(data)])
+                                self.serializer.data_to_string(data)])
 
         return
 
@@ -698,13 +994,19 @@ class DBAPI(DbGeneric):
     def _do_remove(self, handle, transaction, obj_key):
         if self.readonly or not handle:
             return
+        self._flush_batch()
         if self._has_handle(obj_key, handle):
             data = self._get_raw_data(obj_key, handle)
+            self.cache.discard(obj_key, handle)
             obj_class = KEY_TO_CLASS_MAP[obj_key]
+            self._mark_summaries(obj_key, [handle])
             self._remove_backlinks(obj_class, handle, transaction)
             table = KEY_TO_NAME_MAP[obj_key]
             sql = "DELETE FROM %s WHERE handle = ?" % table
             self.dbapi.execute(sql, [handle])
+            if obj_key == PERSON_KEY:
+                self.dbapi.execute("DELETE FROM parent_family "
+                                   "WHERE child_handle = ?", [handle])
             if not transaction.batch:
                 transaction.add(obj_key, TXNDEL, handle, data, None)
 
@@ -743,6 +1045,7 @@ class DBAPI(DbGeneric):
 
             result_list = list(find_backlink_handles(handle))
         """
+        self._flush_batch()
         self.dbapi.execute("SELECT obj_class, obj_handle "
                            "FROM reference "
                            "WHERE ref_handle = ?",
@@ -752,10 +1055,405 @@ class DBAPI(DbGeneric):
             if (include_classes is None) or (row[0] in include_classes):
                 yield (row[0], row[1])
 
+    def get_reference_map(self, class_name, handles):
+        """
+        Return the references recorded in the reference table for the
+        objects with the passed handles, read with one query for each chunk
+        of INSIZE handles.
+        """
+        self._flush_batch()
+        references = {handle: [] for handle in handles}
+        handles = list(references)
+        for start in range(0, len(handles), INSIZE):
+            chunk = handles[start:start + INSIZE]
+            self.dbapi.execute("SELECT obj_handle, ref_class, ref_handle "
+                               "FROM reference "
+                               "WHERE obj_class = ? AND obj_handle IN (%s)"
+                               % ", ".join(["?"] * len(chunk)),
+                               [class_name] + chunk)
+            for row in self.dbapi.fetchall():
+                references[row[0]].append((row[1], row[2]))
+        return references
+
+    def get_missing_references(self, ref_class):
+        """
+        Return the references to objects of a class which are not in the
+        database, found by an anti-join of the reference table on the table
+        of the class.
+        """
+        self._flush_batch()
+        table = KEY_TO_NAME_MAP[CLASS_TO_KEY_MAP[ref_class]]
+        self.dbapi.execute("SELECT reference.obj_class, reference.obj_handle, "
+                           "reference.ref_handle "
+                           "FROM reference LEFT JOIN %(table)s "
+                           "ON %(table)s.handle = reference.ref_handle "
+                           "WHERE reference.ref_class = ? "
+                           "AND %(table)s.handle IS NULL" % {'table': table},
+                           [ref_class])
+        return [tuple(row) for row in self.dbapi.fetchall()]
+
+    def get_orphan_references(self):
+        """
+        Return the entries of the reference table held by objects which are
+        not in the database, found by an anti-join of the reference table on
+        the table of each class.
+        """
+        self._flush_batch()
+        rows = []
+        for class_name, obj_key in CLASS_TO_KEY_MAP.items():
+            table = KEY_TO_NAME_MAP[obj_key]
+            self.dbapi.execute("SELECT reference.obj_handle, "
+                               "reference.ref_class, reference.ref_handle "
+                               "FROM reference LEFT JOIN %(table)s "
+                               "ON %(table)s.handle = reference.obj_handle "
+                               "WHERE reference.obj_class = ? "
+                               "AND %(table)s.handle IS NULL"
+                               % {'table': table},
+                               [class_name])
+            rows.extend((class_name,) + tuple(row)
+                        for row in self.dbapi.fetchall())
+        return rows
+
+    def get_ancestor_handles(self, handles, main_only=False,
+                             max_generations=None):
+        """
+        Return the ancestors of the People with the passed handles, read
+        from the parent_family table one generation at a time.
+        """
+        if not self._pedigree:
+            return super().get_ancestor_handles(handles, main_only,
+                                                max_generations)
+        sql = ("SELECT family.father_handle FROM parent_family "
+               "JOIN family ON family.handle = parent_family.family_handle "
+               "WHERE parent_family.child_handle IN (%(handles)s) "
+               "%(main)s "
+               "UNION "
+               "SELECT family.mother_handle FROM parent_family "
+               "JOIN family ON family.handle = parent_family.family_handle "
+               "WHERE parent_family.child_handle IN (%(handles)s) "
+               "%(main)s")
+        main = "AND parent_family.main = 1" if main_only else ""
+        return self.__walk_pedigree(handles, [sql.replace('%(main)s', main)],
+                                    max_generations)
+
+    def get_descendant_handles(self, handles, max_generations=None):
+        """
+        Return the descendants of the People with the passed handles, read
+        from the parent_family table one generation at a time.
+        """
+        if not self._pedigree:
+            return super().get_descendant_handles(handles, max_generations)
+        sql = ("SELECT parent_family.child_handle FROM family "
+               "JOIN parent_family "
+               "ON parent_family.family_handle = family.handle "
+               "WHERE family.father_handle IN (%(handles)s) "
+               "UNION "
+               "SELECT parent_family.child_handle FROM family "
+               "JOIN parent_family "
+               "ON parent_family.family_handle = family.handle "
+               "WHERE family.mother_handle IN (%(handles)s)")
+        return self.__walk_pedigree(handles, [sql], max_generations)
+
+    def get_related_handles(self, handles):
+        """
+        Return the People related to the People with the passed handles,
+        read from the parent_family table.
+        """
+        if not self._pedigree:
+            return super().get_related_handles(handles)
+        # A person leads to the families where they are a child or a parent,
+        # and a family leads to its parents and children.
+        families_sql = ("SELECT family_handle FROM parent_family "
+                        "WHERE child_handle IN (%(handles)s) "
+                        "UNION "
+                        "SELECT handle FROM family "
+                        "WHERE father_handle IN (%(handles)s) "
+                        "UNION "
+                        "SELECT handle FROM family "
+                        "WHERE mother_handle IN (%(handles)s)")
+        people_sql = ("SELECT father_handle FROM family "
+                      "WHERE handle IN (%(handles)s) "
+                      "UNION "
+                      "SELECT mother_handle FROM family "
+                      "WHERE handle IN (%(handles)s) "
+                      "UNION "
+                      "SELECT child_handle FROM parent_family "
+                      "WHERE family_handle IN (%(handles)s)")
+        return set(self.__walk_pedigree(handles, [families_sql, people_sql],
+                                        None))
+
+    def __walk_pedigree(self, handles, steps, max_generations):
+        """
+        Breadth first walk from the People with the passed handles.  Each
+        generation is found by running the queries in steps in turn, each
+        one on the handles found by the previous one.
+        """
+        self._flush_batch()
+        generations = {}
+        current = set(handles)
+        generation = 0
+        while current:
+            # Skip any dangling references
+            current = self.__select_handles("SELECT handle FROM person "
+                                            "WHERE handle IN (%(handles)s)",
+                                            current)
+            for handle in current:
+                generations[handle] = generation
+            if generation == max_generations:
+                break
+            for sql in steps:
+                current = self.__select_handles(sql, current)
+            current -= generations.keys()
+            generation += 1
+        return generations
+
+    def __select_handles(self, sql, handles):
+        """
+        Run a query returning handles for each chunk of INSIZE of the passed
+        handles, and return the set of non-empty handles found.  The query
+        refers to the chunk as %(handles)s.
+        """
+        result = set()
+        handles = [handle for handle in handles if handle]
+        count = sql.count('%(handles)s')
+        for start in range(0, len(handles), INSIZE):
+            chunk = handles[start:start + INSIZE]
+            self.dbapi.execute(sql % {'handles': ", ".join(["?"] *
+                                                           len(chunk))},
+                               chunk * count)
+            result.update(row[0] for row in self.dbapi.fetchall() if row[0])
+        return result
+
+    def select_handles(self, class_name, where, values):
+        """
+        Return the handles of the primary objects of a class that satisfy an
+        SQL condition on the secondary columns of their table.
+        """
+        self._flush_batch()
+        table = KEY_TO_NAME_MAP[CLASS_TO_KEY_MAP[class_name]]
+        self.dbapi.execute("SELECT handle FROM %s WHERE %s" % (table, where),
+                           values)
+        return [row[0] for row in self.dbapi.fetchall()]
+
+    def get_sort_values(self, class_name, field, locale=glocale):
+        """
+        Return (value, handle) tuples for a secondary column of a table,
+        ordered by the value.
+        """
+        if (class_name == 'Person' and self._summaries and
+                field in SUMMARY_COLUMNS):
+            table = 'person_summary'
+        elif field in self._get_secondary_columns(class_name):
+            table = KEY_TO_NAME_MAP[CLASS_TO_KEY_MAP[class_name]]
+        else:
+            return None
+        self._flush_batch()
+        if locale != glocale:
+            self.dbapi.check_collation(locale)
+        self.dbapi.execute('SELECT %s, handle FROM %s ORDER BY %s '
+                           'COLLATE "%s"' % (field, table, field,
+                                             locale.get_collation()))
+        return self.dbapi.fetchall()
+
+    def get_person_summary(self, handle):
+        """
+        Return a dictionary of the summary values of a person, keyed by the
+        names in SUMMARY_COLUMNS.
+        """
+        if not self._summaries:
+            return None
+        self._flush_batch()
+        self.dbapi.execute("SELECT %s FROM person_summary WHERE handle = ?"
+                           % ", ".join(SUMMARY_COLUMNS), [handle])
+        row = self.dbapi.fetchone()
+        if row is None:
+            return None
+        return dict(zip(SUMMARY_COLUMNS, row))
+
+    def _mark_summaries(self, obj_key, handles):
+        """
+        Mark the objects with the given handles as changed.  The summaries
+        of the people that depend on them are rewritten together when the
+        transaction is committed.
+        """
+        if self._summaries and obj_key in (PERSON_KEY, EVENT_KEY,
+                                           FAMILY_KEY, NOTE_KEY):
+            self._summary_dirty.setdefault(obj_key, set()).update(handles)
+
+    def _update_summaries(self):
+        """
+        Rewrite the summaries of the people changed, and of the people who
+        reference the events, families and notes changed.  Does not commit.
+        """
+        if not self._summary_dirty:
+            return
+        dirty = self._summary_dirty
+        self._summary_dirty = {}
+        handles = dirty.pop(PERSON_KEY, set())
+        related = set().union(*dirty.values())
+        if related:
+            handles |= self.__select_handles(
+                "SELECT obj_handle FROM reference "
+                "WHERE ref_handle IN (%(handles)s) AND obj_class = 'Person'",
+                related)
+        self._write_summaries(list(handles))
+
+    def _rebuild_summaries(self):
+        """
+        Rewrite the summaries of all people.  Does not commit.
+        """
+        self._summary_dirty = {}
+        self.dbapi.execute("DELETE FROM person_summary")
+        self._write_summaries(list(self._iter_handles(PERSON_KEY)))
+
+    def _write_summaries(self, handles):
+        """
+        Write the summaries of the people with the given handles.  The people
+        and their events, families and notes are read with one query for each
+        chunk of INSIZE handles.  Does not commit.
+        """
+        for start in range(0, len(handles), INSIZE):
+            chunk = handles[start:start + INSIZE]
+            people = self._get_objects(PERSON_KEY, Person, chunk).values()
+            events = self._get_objects(
+                EVENT_KEY, Event, [ref.ref for person in people
+                                   for ref in person.get_event_ref_list()])
+            families = self._get_objects(
+                FAMILY_KEY, Family, [handle for person in people
+                                     for handle in
+                                     person.parent_family_list[:1] +
+                                     person.family_list])
+            notes = self._get_objects(
+                NOTE_KEY, Note, [handle for person in people
+                                 for handle in person.note_list])
+            self.dbapi.execute("DELETE FROM person_summary "
+                               "WHERE handle IN (%s)"
+                               % ", ".join(["?"] * len(chunk)), chunk)
+            self.dbapi.executemany("INSERT INTO person_summary (handle, %s) "
+                                   "VALUES (?, %s)"
+                                   % (", ".join(SUMMARY_COLUMNS),
+                                      ", ".join(["?"] *
+                                                len(SUMMARY_COLUMNS))),
+                                   [self._get_summary_values(person, events,
+                                                             families, notes)
+                                    for person in people])
+
+    def _get_summary_values(self, person, events, families, notes):
+        """
+        Return the person_summary row of a person, given dictionaries of the
+        events, families and notes it references.  The events are chosen as
+        the people view does without the table.
+        """
+        events = [(ref, events.get(ref.ref))
+                  for ref in person.get_event_ref_list()]
+        values = [person.handle]
+        for index, fallbacks in ((person.birth_ref_index, BIRTH_FALLBACKS),
+                                 (person.death_ref_index, DEATH_FALLBACKS)):
+            main = events[index][1] if 0 <= index < len(events) else None
+            others = [event for ref, event in events
+                      if event and ref.get_role() == EventRoleType.PRIMARY and
+                      event.get_type() in fallbacks]
+            if main:
+                date_event, date_fallback = main, 0
+            else:
+                date_event = next((event for event in others
+                                   if not event.get_date_object().is_empty()),
+                                  None)
+                date_fallback = 1
+            if main and main.get_place_handle():
+                place_event, place_fallback = main, 0
+            else:
+                place_event = next((event for event in others
+                                    if event.get_place_handle()), None)
+                place_fallback = 1
+            if date_event:
+                sort = "%09d" % date_event.get_date_object().get_sort_value()
+                values.extend([date_event.handle, date_fallback, sort])
+            else:
+                values.extend(['', 0, ''])
+            if place_event:
+                values.extend([place_event.handle, place_fallback])
+            else:
+                values.extend(['', 0])
+
+        parents = 0
+        if person.parent_family_list:
+            family = families.get(person.parent_family_list[0])
+            if family:
+                parents = (bool(family.get_father_handle()) +
+                           bool(family.get_mother_handle()))
+        marriages = 0
+        children = 0
+        for family_handle in person.family_list:
+            family = families.get(family_handle)
+            if family is None:
+                continue
+            if int(family.get_relationship()) == FamilyRelType.MARRIED:
+                marriages += 1
+            for child_ref in family.get_child_ref_list():
+                if (child_ref.get_father_relation() == ChildRefType.BIRTH and
+                        child_ref.get_mother_relation() == ChildRefType.BIRTH):
+                    children += 1
+        todo = 0
+        for note_handle in person.note_list:
+            note = notes.get(note_handle)
+            if note and int(note.get_type()) == NoteType.TODO:
+                todo += 1
+        values.extend([parents, marriages, children, todo])
+        return values
+
+    def get_surname_group_counts(self):
+        """
+        Return (group_as, surname, patronymic, count) tuples counting the
+        people for each combination of the fields which decide their
+        surname group.
+        """
+        if not self._surname_groups:
+            return None
+        self._flush_batch()
+        self.dbapi.execute("SELECT group_as, primary_surname, patronymic, "
+                           "COUNT(*) FROM person "
+                           "GROUP BY group_as, primary_surname, patronymic")
+        return self.dbapi.fetchall()
+
+    def get_surname_group_handles(self, group_as, surname, patronymic):
+        """
+        Return the handles of the people with the passed surname group
+        fields.
+        """
+        if not self._surname_groups:
+            return None
+        self._flush_batch()
+        self.dbapi.execute("SELECT handle FROM person WHERE group_as = ? "
+                           "AND primary_surname = ? AND patronymic = ?",
+                           [group_as, surname, patronymic])
+        return [row[0] for row in self.dbapi.fetchall()]
+
+    def get_place_child_counts(self):
+        """
+        Return a dictionary of the number of places directly enclosed by
+        each place, keyed by handle.  Top level places are counted under ''.
+        """
+        self._flush_batch()
+        self.dbapi.execute("SELECT enclosed_by, COUNT(*) FROM place "
+                           "GROUP BY enclosed_by")
+        return dict(self.dbapi.fetchall())
+
+    def get_place_child_handles(self, handle):
+        """
+        Return the handles of the places directly enclosed by a place, or of
+        the top level places if the handle is ''.
+        """
+        self._flush_batch()
+        self.dbapi.execute("SELECT handle FROM place WHERE enclosed_by = ?",
+                           [handle])
+        return [row[0] for row in self.dbapi.fetchall()]
+
     def find_initial_person(self):
         """
         Returns first person in the database
         """
+        self._flush_batch()
         handle = self.get_default_handle()
         person = None
         if handle:
@@ -771,6 +1469,7 @@ class DBAPI(DbGeneric):
         """
         Return an iterator over handles in the database
         """
+        self._flush_batch()
         table = KEY_TO_NAME_MAP[obj_key]
         sql = "SELECT handle FROM %s" % table
         self.dbapi.execute(sql)
@@ -778,33 +1477,39 @@ class DBAPI(DbGeneric):
         for row in rows:
             yield row[0]
 
-    def _iter_raw_data(self, obj_key):
+    def _iter_raw_data(self, obj_key, ordered=False):
         """
-        Return an iterator over raw data in the database.
+        Return an iterator over raw data in the database, in order of handle
+        if ordered is True.
         """
+        self._flush_batch()
         table = KEY_TO_NAME_MAP[obj_key]
-        sql = "SELECT handle, blob_data FROM %s" % table
+        sql = "SELECT handle, %s FROM %s" % (self.serializer.data_field, table)
+        if ordered:
+            sql += " ORDER BY handle"
         with self.dbapi.cursor() as cursor:
             cursor.execute(sql)
             rows = cursor.fetchmany()
             while rows:
                 for row in rows:
-                    yield (row[0], pickle.loads(row[1]))
+                    yield (row[0], self.serializer.string_to_data(row[1]))
                 rows = cursor.fetchmany()
 
     def _iter_raw_place_tree_data(self):
         """
         Return an iterator over raw data in the place hierarchy.
         """
+        self._flush_batch()
         to_do = ['']
-        sql = 'SELECT handle, blob_data FROM place WHERE enclosed_by = ?'
+        sql = ('SELECT handle, %s FROM place WHERE enclosed_by = ?'
+               % self.serializer.data_field)
         while to_do:
             handle = to_do.pop()
             self.dbapi.execute(sql, [handle])
             rows = self.dbapi.fetchall()
             for row in rows:
                 to_do.append(row[0])
-                yield (row[0], pickle.loads(row[1]))
+                yield (row[0], self.serializer.string_to_data(row[1]))
 
     def reindex_reference_map(self, callback):
         """
@@ -839,15 +1544,15 @@ class DBAPI(DbGeneric):
                     obj = class_func.create(val)
                     references = set(obj.get_referenced_handles_recursively())
                     # handle addition of new references
-                    for (ref_class_name, ref_handle) in references:
-                        self.dbapi.execute(
-                            "INSERT INTO reference "
-                            "(obj_handle, obj_class, ref_handle, ref_class) "
-                            "VALUES (?, ?, ?, ?)",
-                            [obj.handle,
-                             obj.__class__.__name__,
-                             ref_handle,
-                             ref_class_name])
+                    self.dbapi.executemany(
+                        "INSERT INTO reference "
+                        "(obj_handle, obj_class, ref_handle, ref_class) "
+                        "VALUES (?, ?, ?, ?)",
+                        [[obj.handle,
+                          obj.__class__.__name__,
+                          ref_handle,
+                          ref_class_name]
+                         for (ref_class_name, ref_handle) in references])
                     self.update()
         self._txn_commit()
 
@@ -873,6 +1578,8 @@ class DBAPI(DbGeneric):
                 obj = self.method('get_%s_from_handle', obj_type)(handle)
                 self._update_secondary_values(obj)
                 self.update()
+        if self._summaries:
+            self._rebuild_summaries()
         self._txn_commit()
 
         # Next, rebuild stats:
@@ -880,18 +1587,25 @@ class DBAPI(DbGeneric):
         self.genderStats = GenderStats(gstats)
 
     def _has_handle(self, obj_key, handle):
+        if handle in self._batch_queue.get(obj_key, ()):
+            return True
         table = KEY_TO_NAME_MAP[obj_key]
         sql = "SELECT 1 FROM %s WHERE handle = ?" % table
         self.dbapi.execute(sql, [handle])
         return self.dbapi.fetchone() is not None
 
     def _has_gramps_id(self, obj_key, gramps_id):
+        if gramps_id in self._batch_ids.get(obj_key, ()):
+            return True
         table = KEY_TO_NAME_MAP[obj_key]
-        sql = "SELECT 1 FROM %s WHERE gramps_id = ?" % table
+        sql = "SELECT handle FROM %s WHERE gramps_id = ?" % table
         self.dbapi.execute(sql, [gramps_id])
-        return self.dbapi.fetchone() != None
+        # the stored row of a queued object may have an old Gramps ID
+        queue = self._batch_queue.get(obj_key, ())
+        return any(row[0] not in queue for row in self.dbapi.fetchall())
 
     def _get_gramps_ids(self, obj_key):
+        self._flush_batch()
         table = KEY_TO_NAME_MAP[obj_key]
         sql = "SELECT gramps_id FROM %s" % table
         self.dbapi.execute(sql)
@@ -899,20 +1613,153 @@ class DBAPI(DbGeneric):
         return [row[0] for row in rows]
 
     def _get_raw_data(self, obj_key, handle):
+        if handle in self._batch_queue.get(obj_key, ()):
+            return self._batch_queue[obj_key][handle][0]
+        if self.cache.enabled(obj_key):
+            data = self.cache.get(obj_key, handle)
+            if data is not None:
+                return data
         table = KEY_TO_NAME_MAP[obj_key]
-        sql = "SELECT blob_data FROM %s WHERE handle = ?" % table
+        sql = ("SELECT %s FROM %s WHERE handle = ?"
+               % (self.serializer.data_field, table))
         self.dbapi.execute(sql, [handle])
         row = self.dbapi.fetchone()
         if row:
-            return pickle.loads(row[0])
+            data = self.serializer.string_to_data(row[0])
+            self.cache.put(obj_key, handle, data)
+            return data
+
+    def _get_object(self, obj_key, obj_class, handle):
+        if handle in self._batch_queue.get(obj_key, ()):
+            return obj_class.create(self._batch_queue[obj_key][handle][0])
+        if self.cache.enabled(obj_key):
+            # The cache holds raw data, so that every caller gets its own
+            # object to modify.
+            data = self._get_raw_data(obj_key, handle)
+            if data is not None:
+                return obj_class.create(data)
+            return None
+        table = KEY_TO_NAME_MAP[obj_key]
+        sql = ("SELECT %s FROM %s WHERE handle = ?"
+               % (self.serializer.data_field, table))
+        self.dbapi.execute(sql, [handle])
+        row = self.dbapi.fetchone()
+        if row:
+            return obj_class.create(self.serializer.string_to_data(row[0]))
+        return None
+
+    def _get_objects(self, obj_key, obj_class, handles):
+        """
+        Return a dictionary of the objects with the given handles, fetched
+        with one query for each chunk of INSIZE handles.
+        """
+        objs = {}
+        queue = self._batch_queue.get(obj_key, {})
+        cached = self.cache.enabled(obj_key)
+        wanted = []
+        for handle in set(handles):
+            if handle in queue:
+                objs[handle] = obj_class.create(queue[handle][0])
+            elif handle:
+                data = self.cache.get(obj_key, handle) if cached else None
+                if data is None:
+                    wanted.append(handle)
+                else:
+                    objs[handle] = obj_class.create(data)
+        table = KEY_TO_NAME_MAP[obj_key]
+        for start in range(0, len(wanted), INSIZE):
+            chunk = wanted[start:start + INSIZE]
+            sql = ("SELECT handle, %s FROM %s WHERE handle IN (%s)"
+                   % (self.serializer.data_field, table,
+                      ", ".join(["?"] * len(chunk))))
+            self.dbapi.execute(sql, chunk)
+            for row in self.dbapi.fetchall():
+                data = self.serializer.string_to_data(row[1])
+                if cached:
+                    self.cache.put(obj_key, row[0], data)
+                objs[row[0]] = obj_class.create(data)
+        return objs
+
+    def _get_field(self, obj_key, handle, steps, is_list):
+        """
+        Return a single field of a primary object.  If the storage format
+        allows it, the field is extracted by the database engine.
+        """
+        path = self.serializer.field_path(steps)
+        if path is None or handle in self._batch_queue.get(obj_key, ()):
+            return super()._get_field(obj_key, handle, steps, is_list)
+        table = KEY_TO_NAME_MAP[obj_key]
+        sql = ("SELECT json_extract(%s, ?) FROM %s WHERE handle = ?"
+               % (self.serializer.data_field, table))
+        self.dbapi.execute(sql, [path, handle])
+        row = self.dbapi.fetchone()
+        if row is None or row[0] is None:
+            return None
+        if is_list:
+            return self.serializer.string_to_data(row[0])
+        return row[0]
+
+    def set_serializer(self, name, callback=None):
+        """
+        Convert the primary objects to another storage format.  The objects
+        are read and written in chunks of ARRAYSIZE rows, in order of handle.
+
+        :param name: The name of the serializer, 'blob' or 'json'.
+        :type name: str
+        """
+        serializer = get_serializer(name)
+        if self.readonly or serializer is self.serializer:
+            return
+        self._flush_batch()
+
+        total = 0
+        for tbl in ('people', 'families', 'events', 'places', 'sources',
+                    'citations', 'media', 'repositories', 'notes', 'tags'):
+            total += self.method("get_number_of_%s", tbl)()
+        UpdateCallback.__init__(self, callback)
+        self.set_total(total)
+
+        done = 0
+        self._txn_begin()
+        for obj_key, table in KEY_TO_NAME_MAP.items():
+            if obj_key == REFERENCE_KEY:
+                continue
+            if not self.dbapi.column_exists(table, serializer.data_field):
+                self.dbapi.execute("ALTER TABLE %s ADD COLUMN %s %s"
+                                   % (table, serializer.data_field,
+                                      serializer.data_type))
+            select = ("SELECT handle, %s FROM %s WHERE handle > ? "
+                      "ORDER BY handle LIMIT %d"
+                      % (self.serializer.data_field, table, ARRAYSIZE))
+            update = ("UPDATE %s SET %s = ?, %s = NULL WHERE handle = ?"
+                      % (table, serializer.data_field,
+                         self.serializer.data_field))
+            last = ''
+            while True:
+                self.dbapi.execute(select, [last])
+                rows = self.dbapi.fetchall()
+                if not rows:
+                    break
+                self.dbapi.executemany(
+                    update, [[serializer.data_to_string(
+                        self.serializer.string_to_data(string)), handle]
+                             for handle, string in rows])
+                last = rows[-1][0]
+                done += len(rows)
+                self.update(done)
+        self._txn_commit()
+        self.serializer = serializer
+        self._set_metadata('serializer', serializer.name)
 
     def _get_raw_from_id_data(self, obj_key, gramps_id):
+        self._flush_batch()
         table = KEY_TO_NAME_MAP[obj_key]
-        sql = "SELECT blob_data FROM %s WHERE gramps_id = ?" % table
+        sql = ("SELECT %s FROM %s WHERE gramps_id = ?"
+               % (self.serializer.data_field, table))
         self.dbapi.execute(sql, [gramps_id])
         row = self.dbapi.fetchone()
         if row:
-            return pickle.loads(row[0])
+            return self.serializer.string_to_data(row[0])
 
     def get_gender_stats(self):
         """
@@ -957,16 +1804,24 @@ class DBAPI(DbGeneric):
         """
         cls = KEY_TO_CLASS_MAP[obj_key]
         table = cls.lower()
+        self.cache.discard(obj_key, handle)
+        self._mark_summaries(obj_key, [handle])
         if data is None:
             sql = "DELETE FROM %s WHERE handle = ?" % table
             self.dbapi.execute(sql, [handle])
+            if obj_key == PERSON_KEY:
+                self.dbapi.execute("DELETE FROM parent_family "
+                                   "WHERE child_handle = ?", [handle])
         else:
+            string = self.serializer.data_to_string(data)
             if self._has_handle(obj_key, handle):
-                sql = "UPDATE %s SET blob_data = ? WHERE handle = ?" % table
-                self.dbapi.execute(sql, [pickle.dumps(data), handle])
+                sql = ("UPDATE %s SET %s = ? WHERE handle = ?"
+                       % (table, self.serializer.data_field))
+                self.dbapi.execute(sql, [string, handle])
             else:
-                sql = "INSERT INTO %s (handle, blob_data) VALUES (?, ?)" % table
-                self.dbapi.execute(sql, [handle, pickle.dumps(data)])
+                sql = ("INSERT INTO %s (handle, %s) VALUES (?, ?)"
+                       % (table, self.serializer.data_field))
+                self.dbapi.execute(sql, [handle, string])
             obj = self._get_table_func(cls)["class_func"].create(data)
             self._update_secondary_values(obj)
 
@@ -974,6 +1829,7 @@ class DBAPI(DbGeneric):
         """
         Return the list of locale-sorted surnames contained in the database.
         """
+        self._flush_batch()
         self.dbapi.execute("SELECT DISTINCT surname "
                            "FROM person "
                            "ORDER BY surname")
@@ -1013,6 +1869,39 @@ class DBAPI(DbGeneric):
                     self.dbapi.execute("ALTER TABLE %s ADD COLUMN %s %s"
                                        % (table_name, field, sql_type))
 
+    def _get_secondary_columns(self, class_name):
+        """
+        Return the names of the secondary columns of a table, including the
+        derived columns.
+        """
+        obj_class = self._get_table_func(class_name, "class_func")
+        columns = [field[0] for field in obj_class.get_secondary_fields()]
+        if class_name == 'Person':
+            columns += ['given_name', 'surname']
+            if self._surname_groups:
+                columns += ['group_as', 'primary_surname', 'patronymic']
+        elif class_name == 'Place':
+            columns += ['enclosed_by']
+        return columns
+
+    def _get_secondary_values(self, obj):
+        """
+        Given a primary object return its secondary field values, in the
+        order of the columns returned by _get_secondary_columns.
+        """
+        table = obj.__class__.__name__
+        fields = [field[0] for field in obj.get_secondary_fields()]
+        values = [getattr(obj, field) for field in fields]
+
+        # Derived fields
+        if table == 'Person':
+            values.extend(self._get_person_data(obj))
+            if self._surname_groups:
+                values.extend(self._get_surname_group_data(obj))
+        elif table == 'Place':
+            values.append(self._get_place_data(obj))
+        return self._sql_cast_list(values)
+
     def _update_secondary_values(self, obj):
         """
         Given a primary object update its secondary field values
@@ -1020,31 +1909,47 @@ class DBAPI(DbGeneric):
         Does not commit.
         """
         table = obj.__class__.__name__
-        fields = [field[0] for field in obj.get_secondary_fields()]
-        sets = []
-        values = []
-        for field in fields:
-            sets.append("%s = ?" % field)
-            values.append(getattr(obj, field))
-
-        # Derived fields
+        columns = self._get_secondary_columns(table)
+        values = self._get_secondary_values(obj)
+        self.dbapi.execute("UPDATE %s SET %s where handle = ?"
+                           % (table.lower(),
+                              ", ".join("%s = ?" % column
+                                        for column in columns)),
+                           values + [obj.handle])
         if table == 'Person':
-            given_name, surname = self._get_person_data(obj)
-            sets.append("given_name = ?")
-            values.append(given_name)
-            sets.append("surname = ?")
-            values.append(surname)
-        if table == 'Place':
-            handle = self._get_place_data(obj)
-            sets.append("enclosed_by = ?")
-            values.append(handle)
-
-        if len(values) > 0:
-            table_name = table.lower()
-            self.dbapi.execute("UPDATE %s SET %s where handle = ?"
-                               % (table_name, ", ".join(sets)),
-                               self._sql_cast_list(values)
-                               + [obj.handle])
+            self.dbapi.execute("DELETE FROM parent_family "
+                               "WHERE child_handle = ?", [obj.handle])
+            self.dbapi.executemany("INSERT INTO parent_family "
+                                   "(child_handle, family_handle, main) "
+                                   "VALUES (?, ?, ?)",
+                                   self._get_pedigree_rows(obj))
+
+    def _get_surname_group_data(self, person):
+        """
+        Return the fields of the primary name of a person which decide its
+        surname group: the group_as value, the primary surname, and whether
+        that is the only surname and of patronymic or matronymic origin.
+        """
+        name = person.get_primary_name()
+        surname_list = name.get_surname_list()
+        for surname in surname_list:
+            if surname.get_primary():
+                patronymic = (len(surname_list) == 1 and
+                              surname.get_origintype().value in
+                              (NameOriginType.PATRONYMIC,
+                               NameOriginType.MATRONYMIC))
+                return (name.get_group_as(), surname.get_surname(),
+                        int(patronymic))
+        return (name.get_group_as(), '', 0)
+
+    def _get_pedigree_rows(self, person):
+        """
+        Return the parent_family rows of a person.  The first parent family
+        is the main one.
+        """
+        return [[person.handle, family_handle, int(index == 0)]
+                for index, family_handle
+                in enumerate(person.parent_family_list)]
 
     def _sql_cast_list(self, values):
         """
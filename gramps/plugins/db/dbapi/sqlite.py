@@ -69,7 +69,10 @@ class SQLite(DBAPI):
             path_to_db = ':memory:'
         else:
             path_to_db = os.path.join(directory, 'sqlite.db')
-        self.dbapi = Connection(path_to_db)
+        # a read-only connection may be passed from one worker thread to the
+        # next, which never use it at the same time
+        self.dbapi = Connection(path_to_db,
+                                check_same_thread=not self.readonly)
 
 
 #-------------------------------------------------------------------------
@@ -126,6 +129,19 @@ class Connection:
         self.log.debug(args)
         self.__cursor.execute(*args, **kwargs)
 
+    def executemany(self, *args, **kwargs):
+        """
+        Executes an SQL statement against all parameter sequences.
+
+        :param args: arguments to be passed to the sqlite3 executemany statement
+        :type args: list
+        :param kwargs: arguments to be passed to the sqlite3 executemany
+                       statement
+        :type kwargs: list
+        """
+        self.log.debug(args[0])
+        self.__cursor.executemany(*args, **kwargs)
+
     def fetchone(self):
         """
         Fetches the next row of a query result set, returning a single sequence,
@@ -176,6 +192,20 @@ class Connection:
                      "WHERE type='table' AND name='%s';" % table)
         return self.fetchone()[0] != 0
 
+    def column_exists(self, table, column):
+        """
+        Test whether the specified SQL column exists in the specified table.
+
+        :param table: table name to check.
+        :type table: str
+        :param column: column name to check.
+        :type column: str
+        :returns: True if the column exists, False otherwise.
+        :rtype: bool
+        """
+        self.execute("PRAGMA table_info(%s);" % table)
+        return column in [row[1] for row in self.fetchall()]
+
     def close(self):
         """
         Close the current database.
@@ -23,17 +23,35 @@
 # Standard python modules
 #
 #-------------------------------------------------------------------------
+import os
 import unittest
+import sqlite3
+from unittest.mock import patch
 
 #-------------------------------------------------------------------------
 #
 # Gramps modules
 #
 #-------------------------------------------------------------------------
-from gramps.gen.db import DbTxn
-from gramps.gen.db.utils import make_database
+from gramps.gen.config import config
+from gramps.gen.const import DATA_DIR
+from gramps.gen.db import (DbTxn, DbGenericUndo, DbGenericUndoLog,
+                           FAMILY_KEY, PERSON_KEY)
+from gramps.gen.db.cache import DbCache
+from gramps.gen.db.dbconst import CLASS_TO_KEY_MAP
+from gramps.gen.db.serializers import BlobSerializer, JSONSerializer
+from gramps.gen.db.utils import make_database, import_as_dict
+from gramps.gen.errors import HandleError
+from gramps.gen.proxy import PrivateProxyDb
 from gramps.gen.lib import (Person, Family, Event, Place, Repository, Source,
-                            Citation, Media, Note, Tag, Researcher, Surname)
+                            Citation, Media, Note, Tag, Researcher, Surname,
+                            ChildRef, NameOriginType, PlaceRef, EventRef,
+                            EventType, EventRoleType, FamilyRelType,
+                            NoteType, Date)
+from gramps.gen.display.name import displayer as name_displayer
+from gramps.gen.user import User
+
+EXAMPLE = os.path.join(DATA_DIR, "tests", "example.gramps")
 
 #-------------------------------------------------------------------------
 #
@@ -246,6 +264,12 @@ class DbRandomTest(unittest.TestCase):
                                 self.db.get_number_of_tags,
                                 sort_handles=True)
 
+    def test_iter_objects_by_handle(self):
+        for obj_type in ('Person', 'Event', 'Note'):
+            handles = [obj.handle
+                       for obj in self.db.iter_objects_by_handle(obj_type)]
+            self.assertEqual(handles, sorted(self.handles[obj_type]))
+
     ################################################################
     #
     # Test get_*_gramps_ids methods
@@ -302,6 +326,23 @@ class DbRandomTest(unittest.TestCase):
                              self.db.get_note_gramps_ids,
                              self.db.get_number_of_notes)
 
+    ################################################################
+    #
+    # Test get_sort_values method
+    #
+    ################################################################
+    def test_get_sort_values(self):
+        values = self.db.get_sort_values('Event', 'gramps_id')
+        self.assertEqual(len(values), self.db.get_number_of_events())
+        for gid, handle in values:
+            self.assertEqual(self.db.get_event_from_handle(handle).gramps_id,
+                             gid)
+        self.assertEqual([value[0] for value in values],
+                         sorted(self.gids['Event']))
+
+    def test_get_sort_values_unknown_field(self):
+        self.assertIsNone(self.db.get_sort_values('Event', 'type'))
+
     ################################################################
     #
     # Test get_*_from_handle methods
@@ -364,6 +405,73 @@ class DbRandomTest(unittest.TestCase):
                                     self.db.get_tag_handles,
                                     self.db.get_tag_from_handle)
 
+    ################################################################
+    #
+    # Test get_*_from_handles methods
+    #
+    ################################################################
+
+    def __get_from_handles_test(self, obj_class, handles_func, get_func):
+        handles = handles_func()
+        handles.reverse()
+        objs = get_func(handles)
+        self.assertEqual(len(objs), len(handles))
+        for handle, obj in zip(handles, objs):
+            self.assertIsInstance(obj, obj_class)
+            self.assertEqual(obj.handle, handle)
+        self.assertEqual(get_func([]), [])
+        self.assertRaises(HandleError, get_func, handles + ['does_not_exist'])
+
+    def test_get_people_from_handles(self):
+        self.__get_from_handles_test(Person,
+                                     self.db.get_person_handles,
+                                     self.db.get_people_from_handles)
+
+    def test_get_families_from_handles(self):
+        self.__get_from_handles_test(Family,
+                                     self.db.get_family_handles,
+                                     self.db.get_families_from_handles)
+
+    def test_get_events_from_handles(self):
+        self.__get_from_handles_test(Event,
+                                     self.db.get_event_handles,
+                                     self.db.get_events_from_handles)
+
+    def test_get_places_from_handles(self):
+        self.__get_from_handles_test(Place,
+                                     self.db.get_place_handles,
+                                     self.db.get_places_from_handles)
+
+    def test_get_repositories_from_handles(self):
+        self.__get_from_handles_test(Repository,
+                                     self.db.get_repository_handles,
+                                     self.db.get_repositories_from_handles)
+
+    def test_get_sources_from_handles(self):
+        self.__get_from_handles_test(Source,
+                                     self.db.get_source_handles,
+                                     self.db.get_sources_from_handles)
+
+    def test_get_citations_from_handles(self):
+        self.__get_from_handles_test(Citation,
+                                     self.db.get_citation_handles,
+                                     self.db.get_citations_from_handles)
+
+    def test_get_media_from_handles(self):
+        self.__get_from_handles_test(Media,
+                                     self.db.get_media_handles,
+                                     self.db.get_media_from_handles)
+
+    def test_get_notes_from_handles(self):
+        self.__get_from_handles_test(Note,
+                                     self.db.get_note_handles,
+                                     self.db.get_notes_from_handles)
+
+    def test_get_tags_from_handles(self):
+        self.__get_from_handles_test(Tag,
+                                     self.db.get_tag_handles,
+                                     self.db.get_tags_from_handles)
+
     ################################################################
     #
     # Test get_*_from_gramps_id methods
@@ -865,6 +973,836 @@ class DbPersonTest(unittest.TestCase):
         self.assertEqual(saved['John'], (3, 1, 1))
         self.assertEqual(saved['Mary'], (1, 4, 0))
 
+#-------------------------------------------------------------------------
+#
+# DbBatchTest class
+#
+#-------------------------------------------------------------------------
+class DbBatchTest(unittest.TestCase):
+    '''
+    Tests with objects committed in a batch transaction.
+    '''
+
+    @classmethod
+    def setUpClass(cls):
+        cls.db = make_database("sqlite")
+        cls.db.load(":memory:")
+
+    def tearDown(self):
+        with DbTxn('Remove test objects', self.db, batch=True) as trans:
+            for handle in self.db.get_person_handles():
+                self.db.remove_person(handle, trans)
+            for handle in self.db.get_note_handles():
+                self.db.remove_note(handle, trans)
+
+    def __add_person(self, first_name, trans):
+        person = Person()
+        person.primary_name.first_name = first_name
+        surname = Surname()
+        surname.surname = 'Smith'
+        person.primary_name.set_surname_list([surname])
+        self.db.add_person(person, trans)
+        return person
+
+    def test_batch_read_back(self):
+        with DbTxn('Add test objects', self.db, batch=True) as trans:
+            person = self.__add_person('John', trans)
+            self.assertTrue(self.db.has_person_handle(person.handle))
+            self.assertTrue(self.db.has_person_gramps_id(person.gramps_id))
+            self.assertEqual(
+                self.db.get_person_from_handle(person.handle).serialize(),
+                person.serialize())
+            self.assertEqual(self.db.get_number_of_people(), 1)
+        self.assertEqual(
+            self.db.get_person_from_gramps_id(person.gramps_id).handle,
+            person.handle)
+
+    def test_batch_gramps_ids(self):
+        with DbTxn('Add test objects', self.db, batch=True) as trans:
+            for first_name in ('John', 'Mary', 'Jane'):
+                self.__add_person(first_name, trans)
+        gramps_ids = self.db.get_person_gramps_ids()
+        self.assertEqual(len(set(gramps_ids)), 3)
+
+    def test_batch_gramps_id_changed(self):
+        with DbTxn('Add test objects', self.db) as trans:
+            stored = self.__add_person('Mary', trans)
+        old_id = stored.gramps_id
+        with DbTxn('Add test objects', self.db, batch=True) as trans:
+            person = self.__add_person('John', trans)
+            queued_id = person.gramps_id
+            person.gramps_id = 'X0001'
+            self.db.commit_person(person, trans)
+            stored.gramps_id = 'X0002'
+            self.db.commit_person(stored, trans)
+            self.assertFalse(self.db.has_person_gramps_id(queued_id))
+            self.assertFalse(self.db.has_person_gramps_id(old_id))
+            self.assertTrue(self.db.has_person_gramps_id('X0001'))
+            self.assertTrue(self.db.has_person_gramps_id('X0002'))
+        self.assertFalse(self.db.has_person_gramps_id(old_id))
+        self.assertTrue(self.db.has_person_gramps_id('X0002'))
+
+    def test_batch_secondary_columns(self):
+        with DbTxn('Add test objects', self.db, batch=True) as trans:
+            person = self.__add_person('John', trans)
+            person.primary_name.first_name = 'Jack'
+            self.db.commit_person(person, trans)
+        self.db.dbapi.execute('SELECT given_name, surname, gramps_id '
+                              'FROM person WHERE handle = ?', [person.handle])
+        self.assertEqual(self.db.dbapi.fetchone(),
+                         ('Jack', 'Smith', person.gramps_id))
+
+    def test_batch_update_existing(self):
+        with DbTxn('Add test objects', self.db) as trans:
+            person = self.__add_person('John', trans)
+        with DbTxn('Update test objects', self.db, batch=True) as trans:
+            person.primary_name.first_name = 'Jack'
+            self.db.commit_person(person, trans)
+        self.assertEqual(self.db.get_number_of_people(), 1)
+        self.assertEqual(self.db.get_person_from_handle(
+            person.handle).primary_name.first_name, 'Jack')
+
+    def test_batch_existing_rows(self):
+        with DbTxn('Add test objects', self.db) as trans:
+            note = Note()
+            self.db.add_note(note, trans)
+            person = self.__add_person('Walter', trans)
+            person.add_note(note.handle)
+            self.db.commit_person(person, trans)
+        with patch.object(self.db, '_get_raw_data',
+                          wraps=self.db._get_raw_data) as get_raw_data:
+            with DbTxn('Update test objects', self.db, batch=True) as trans:
+                person.primary_name.first_name = 'Wolfgang'
+                person.set_note_list([])
+                self.db.commit_person(person, trans)
+                self.db.commit_note(note, trans)
+            get_raw_data.assert_not_called()
+        self.assertEqual(self.db.get_number_of_people(), 1)
+        self.assertEqual(self.db.get_number_of_notes(), 1)
+        self.assertEqual(list(self.db.find_backlink_handles(note.handle)), [])
+        self.assertEqual(self.db.genderStats.name_stats('Walter'), (0, 0, 0))
+        self.assertEqual(self.db.genderStats.name_stats('Wolfgang'),
+                         (0, 0, 1))
+
+    def test_batch_references(self):
+        with DbTxn('Add test objects', self.db, batch=True) as trans:
+            note = Note()
+            self.db.add_note(note, trans)
+            person = Person()
+            person.add_note(note.handle)
+            self.db.add_person(person, trans)
+        self.assertEqual(list(self.db.find_backlink_handles(note.handle)),
+                         [('Person', person.handle)])
+
+    def test_batch_abort(self):
+        try:
+            with DbTxn('Add test objects', self.db, batch=True) as trans:
+                self.__add_person('John', trans)
+                raise ValueError
+        except ValueError:
+            pass
+        self.assertEqual(self.db.get_number_of_people(), 0)
+
+#-------------------------------------------------------------------------
+#
+# DbUndoLogTest class
+#
+#-------------------------------------------------------------------------
+class DbUndoLogTest(unittest.TestCase):
+    '''
+    Tests of the undo log.
+    '''
+
+    def setUp(self):
+        self.db = make_database("sqlite")
+        self.db.load(":memory:")
+
+    def tearDown(self):
+        self.db.close()
+
+    def __commit_name(self, person, first_name):
+        with DbTxn('Set name %s' % first_name, self.db) as trans:
+            person.primary_name.first_name = first_name
+            self.db.commit_person(person, trans)
+
+    def __get_name(self, handle):
+        return self.db.get_person_from_handle(handle).primary_name.first_name
+
+    def test_undo_redo(self):
+        self.assertIsInstance(self.db.undodb, DbGenericUndoLog)
+        person = Person()
+        with DbTxn('Add person', self.db) as trans:
+            self.db.add_person(person, trans)
+        self.__commit_name(person, 'John')
+        self.__commit_name(person, 'Jack')
+        self.assertTrue(self.db.undo())
+        self.assertEqual(self.__get_name(person.handle), 'John')
+        self.assertTrue(self.db.undo())
+        self.assertEqual(self.__get_name(person.handle), '')
+        self.assertTrue(self.db.redo())
+        self.assertEqual(self.__get_name(person.handle), 'John')
+
+    def test_undo_depth(self):
+        self.db.undodb.depth = 2
+        person = Person()
+        with DbTxn('Add person', self.db) as trans:
+            self.db.add_person(person, trans)
+        first = self.db.undodb.undoq[0].get_recnos()
+        self.__commit_name(person, 'John')
+        self.__commit_name(person, 'Jack')
+        self.assertEqual(self.db.undodb.undo_count, 2)
+        self.assertRaises(IndexError, self.db.undodb.__getitem__, first[0])
+        self.assertTrue(self.db.undo())
+        self.assertTrue(self.db.undo())
+        self.assertFalse(self.db.undo())
+        self.assertEqual(self.__get_name(person.handle), '')
+        self.assertTrue(self.db.has_person_handle(person.handle))
+
+    def test_memory_undo_depth(self):
+        self.assertEqual(self.db.undodb.depth,
+                         config.get('database.undo-depth'))
+        undodb = DbGenericUndo(self.db, None)
+        self.assertEqual(undodb.depth, 0)
+        for msg in ('First', 'Second', 'Third'):
+            undodb.commit(DbTxn(msg, self.db), msg)
+        self.assertEqual(undodb.undo_count, 3)
+        undodb.depth = 2
+        undodb.commit(DbTxn('Fourth', self.db), 'Fourth')
+        self.assertEqual(undodb.undo_count, 2)
+
+
+#-------------------------------------------------------------------------
+#
+# DbCacheTest class
+#
+#-------------------------------------------------------------------------
+class DbCacheTest(unittest.TestCase):
+    '''
+    Tests of the read cache.
+    '''
+
+    def setUp(self):
+        self.db = make_database("sqlite")
+        self.db.load(":memory:")
+        self.family = Family()
+        self.person = Person()
+        self.person.primary_name.first_name = 'John'
+        with DbTxn('Add test objects', self.db) as trans:
+            self.db.add_family(self.family, trans)
+            self.person.add_family_handle(self.family.handle)
+            self.db.add_person(self.person, trans)
+        self.db.cache.clear()
+
+    def tearDown(self):
+        self.db.close()
+
+    def __first_name(self):
+        return self.db.get_person_from_handle(
+            self.person.handle).primary_name.first_name
+
+    def test_hits(self):
+        hits = self.db.cache.hits
+        misses = self.db.cache.misses
+        self.assertEqual(self.__first_name(), 'John')
+        self.assertEqual(self.__first_name(), 'John')
+        self.db.get_raw_person_data(self.person.handle)
+        self.assertEqual(self.db.cache.hits - hits, 2)
+        self.assertEqual(self.db.cache.misses - misses, 1)
+        self.assertEqual(self.db.cache.get_stats()['person'], 1)
+
+    def test_bulk(self):
+        self.db.get_person_from_handle(self.person.handle)
+        hits = self.db.cache.hits
+        people = self.db.get_people_from_handles([self.person.handle])
+        self.assertEqual(people[0].handle, self.person.handle)
+        self.assertEqual(self.db.cache.hits - hits, 1)
+
+    def test_objects_not_shared(self):
+        person = self.db.get_person_from_handle(self.person.handle)
+        person.primary_name.first_name = 'Jack'
+        person.family_list.append('no-such-family')
+        person = self.db.get_person_from_handle(self.person.handle)
+        self.assertEqual(person.primary_name.first_name, 'John')
+        self.assertEqual(person.family_list, [self.family.handle])
+
+    def test_commit(self):
+        self.assertEqual(self.__first_name(), 'John')
+        with DbTxn('Update test objects', self.db) as trans:
+            self.person.primary_name.first_name = 'Jack'
+            self.db.commit_person(self.person, trans)
+            self.assertEqual(self.__first_name(), 'Jack')
+        self.assertEqual(self.__first_name(), 'Jack')
+        self.assertTrue(self.db.undo())
+        self.assertEqual(self.__first_name(), 'John')
+        self.assertTrue(self.db.redo())
+        self.assertEqual(self.__first_name(), 'Jack')
+
+    def test_batch(self):
+        self.assertEqual(self.__first_name(), 'John')
+        with DbTxn('Update test objects', self.db, batch=True) as trans:
+            self.person.primary_name.first_name = 'Jack'
+            self.db.commit_person(self.person, trans)
+        self.assertEqual(self.__first_name(), 'Jack')
+
+    def test_remove(self):
+        self.db.get_family_from_handle(self.family.handle)
+        with DbTxn('Remove test objects', self.db) as trans:
+            self.db.remove_family(self.family.handle, trans)
+        self.assertRaises(HandleError, self.db.get_family_from_handle,
+                          self.family.handle)
+        self.assertIsNone(self.db.get_raw_family_data(self.family.handle))
+
+    def test_budget(self):
+        self.db.cache = DbCache(1, {FAMILY_KEY: 0})
+        other = Person()
+        with DbTxn('Add test objects', self.db) as trans:
+            self.db.add_person(other, trans)
+        self.db.get_person_from_handle(self.person.handle)
+        self.db.get_person_from_handle(other.handle)
+        self.db.get_family_from_handle(self.family.handle)
+        stats = self.db.cache.get_stats()
+        self.assertEqual(stats['person'], 1)
+        self.assertEqual(stats['family'], 0)
+        self.assertEqual(len(self.db.cache), 1)
+
+#-------------------------------------------------------------------------
+#
+# DbPedigreeTest class
+#
+#-------------------------------------------------------------------------
+class DbPedigreeTest(unittest.TestCase):
+    '''
+    Tests of the ancestor, descendant and relative queries.
+    '''
+
+    def setUp(self):
+        self.db = make_database("sqlite")
+        self.db.load(":memory:")
+        self.people = {}
+        with DbTxn('Add test objects', self.db) as trans:
+            for name in ('grandfather', 'father', 'mother', 'child',
+                         'stepfather', 'orphan', 'sibling', 'stranger'):
+                person = Person()
+                self.db.add_person(person, trans)
+                self.people[name] = person
+            self.__add_family('grandfather', None, ['father'], trans)
+            self.__add_family('father', 'mother', ['child'], trans)
+            self.__add_family('stepfather', 'mother', ['child'], trans)
+            self.__add_family(None, None, ['orphan', 'sibling'], trans)
+
+    def tearDown(self):
+        self.db.close()
+
+    def __add_family(self, father, mother, children, trans):
+        family = Family()
+        self.db.add_family(family, trans)
+        for name, set_parent in ((father, family.set_father_handle),
+                                 (mother, family.set_mother_handle)):
+            if name:
+                person = self.people[name]
+                set_parent(person.handle)
+                person.add_family_handle(family.handle)
+                self.db.commit_person(person, trans)
+        for name in children:
+            person = self.people[name]
+            child_ref = ChildRef()
+            child_ref.ref = person.handle
+            family.add_child_ref(child_ref)
+            person.add_parent_family_handle(family.handle)
+            self.db.commit_person(person, trans)
+        self.db.commit_family(family, trans)
+        return family
+
+    def __handles(self, *names):
+        return [self.people[name].handle for name in names]
+
+    def __generations(self, **generations):
+        return {self.people[name].handle: generation
+                for name, generation in generations.items()}
+
+    def __check(self, db):
+        child, = self.__handles('child')
+        self.assertEqual(db.get_ancestor_handles([child]),
+                         self.__generations(child=0, father=1, mother=1,
+                                            stepfather=1, grandfather=2))
+        self.assertEqual(db.get_ancestor_handles([child], main_only=True),
+                         self.__generations(child=0, father=1, mother=1,
+                                            grandfather=2))
+        self.assertEqual(db.get_ancestor_handles([child], max_generations=1),
+                         self.__generations(child=0, father=1, mother=1,
+                                            stepfather=1))
+        self.assertEqual(
+            db.get_descendant_handles(self.__handles('grandfather')),
+            self.__generations(grandfather=0, father=1, child=2))
+        self.assertEqual(
+            db.get_descendant_handles(self.__handles('grandfather',
+                                                     'stepfather'),
+                                      max_generations=1),
+            self.__generations(grandfather=0, stepfather=0, father=1,
+                               child=1))
+        self.assertEqual(db.get_related_handles([child]),
+                         set(self.__handles('grandfather', 'father', 'mother',
+                                            'child', 'stepfather')))
+        self.assertEqual(db.get_related_handles(self.__handles('orphan')),
+                         set(self.__handles('orphan', 'sibling')))
+        self.assertEqual(db.get_ancestor_handles(['missing']), {})
+
+    def test_index(self):
+        self.__check(self.db)
+
+    def test_default(self):
+        self.__check(PrivateProxyDb(self.db))
+
+    def test_upgrade(self):
+        self.db.dbapi.execute('DROP TABLE parent_family')
+        self.db.dbapi.execute('DROP INDEX family_father_handle')
+        self.db.dbapi.execute('DROP INDEX family_mother_handle')
+        self.db._add_secondary_tables()
+        self.db.rebuild_secondary()
+        self.__check(self.db)
+
+    def test_commit(self):
+        child = self.people['child']
+        with DbTxn('Update test objects', self.db) as trans:
+            child.parent_family_list.reverse()
+            self.db.commit_person(child, trans)
+        self.assertEqual(
+            self.db.get_ancestor_handles([child.handle], main_only=True),
+            self.__generations(child=0, stepfather=1, mother=1))
+        self.assertTrue(self.db.undo())
+        self.assertEqual(
+            self.db.get_ancestor_handles([child.handle], main_only=True),
+            self.__generations(child=0, father=1, mother=1, grandfather=2))
+
+    def test_batch(self):
+        child = self.people['child']
+        with DbTxn('Update test objects', self.db, batch=True) as trans:
+            child.parent_family_list.reverse()
+            self.db.commit_person(child, trans)
+            self.assertEqual(
+                self.db.get_ancestor_handles([child.handle], main_only=True),
+                self.__generations(child=0, stepfather=1, mother=1))
+
+    def test_remove(self):
+        with DbTxn('Remove test objects', self.db) as trans:
+            self.db.remove_person(self.people['child'].handle, trans)
+        self.assertEqual(
+            self.db.get_descendant_handles(self.__handles('mother')),
+            self.__generations(mother=0))
+
+
+#-------------------------------------------------------------------------
+#
+# DbTreeGroupTest class
+#
+#-------------------------------------------------------------------------
+class DbTreeGroupTest(unittest.TestCase):
+    '''
+    Tests of the queries used to build the tree views lazily.
+    '''
+
+    def setUp(self):
+        self.db = make_database("sqlite")
+        self.db.load(":memory:")
+        self.people = {}
+        self.places = {}
+        with DbTxn('Add test objects', self.db) as trans:
+            for name, surname, origin, group_as in (
+                    ('smith', 'Smith', None, ''),
+                    ('smyth', 'Smyth', None, ''),
+                    ('jones', 'Jones', None, 'Smith'),
+                    ('ivanovich', 'Ivanovich', NameOriginType.PATRONYMIC, ''),
+                    ('unknown', '', None, '')):
+                person = Person()
+                surname_obj = Surname()
+                surname_obj.set_surname(surname)
+                if origin:
+                    surname_obj.set_origintype(NameOriginType(origin))
+                person.primary_name.set_surname_list([surname_obj])
+                person.primary_name.set_group_as(group_as)
+                self.db.add_person(person, trans)
+                self.people[name] = person
+            for name, enclosed_by in (('country', None), ('city', 'country'),
+                                      ('street', 'city'), ('island', None)):
+                place = Place()
+                if enclosed_by:
+                    placeref = PlaceRef()
+                    placeref.ref = self.places[enclosed_by].handle
+                    place.add_placeref(placeref)
+                self.db.add_place(place, trans)
+                self.places[name] = place
+        self.db.set_name_group_mapping('Smyth', 'Smith')
+
+    def tearDown(self):
+        self.db.close()
+
+    def __groups(self):
+        groups = {}
+        for group_as, surname, patronymic, count in \
+                self.db.get_surname_group_counts():
+            group = name_displayer.surname_grouping(self.db, group_as,
+                                                    surname, patronymic)
+            handles = self.db.get_surname_group_handles(group_as, surname,
+                                                        patronymic)
+            self.assertEqual(len(handles), count)
+            groups.setdefault(group, set()).update(handles)
+        return groups
+
+    def test_surname_groups(self):
+        groups = self.__groups()
+        self.assertEqual(sorted(groups), ['', 'Smith'])
+        for person in self.people.values():
+            group = name_displayer.name_grouping_data(
+                self.db, person.primary_name.serialize())
+            self.assertIn(person.handle, groups[group])
+
+    @unittest.skipUnless(sqlite3.sqlite_version_info >= (3, 35),
+                         "DROP COLUMN needs SQLite 3.35")
+    def test_upgrade(self):
+        self.db.dbapi.execute('DROP INDEX person_primary_surname')
+        for column in ('group_as', 'primary_surname', 'patronymic'):
+            self.db.dbapi.execute('ALTER TABLE person DROP COLUMN %s'
+                                  % column)
+        self.db._add_secondary_tables()
+        self.db.rebuild_secondary()
+        self.test_surname_groups()
+
+    def test_commit(self):
+        person = self.people['unknown']
+        with DbTxn('Update test objects', self.db) as trans:
+            person.primary_name.get_primary_surname().set_surname('Smith')
+            self.db.commit_person(person, trans)
+        self.assertIn(person.handle, self.__groups()['Smith'])
+        self.assertTrue(self.db.undo())
+        self.assertIn(person.handle, self.__groups()[''])
+
+    def test_place_children(self):
+        counts = self.db.get_place_child_counts()
+        self.assertEqual(counts, {'': 2, self.places['country'].handle: 1,
+                                  self.places['city'].handle: 1})
+        self.assertEqual(set(self.db.get_place_child_handles('')),
+                         {self.places['country'].handle,
+                          self.places['island'].handle})
+        self.assertEqual(
+            self.db.get_place_child_handles(self.places['city'].handle),
+            [self.places['street'].handle])
+
+
+#-------------------------------------------------------------------------
+#
+# DbPersonSummaryTest class
+#
+#-------------------------------------------------------------------------
+class DbPersonSummaryTest(unittest.TestCase):
+    '''
+    Tests of the person_summary table.
+    '''
+
+    def setUp(self):
+        self.db = make_database("sqlite")
+        self.db.load(":memory:")
+        with DbTxn('Add test objects', self.db) as trans:
+            self.father = Person()
+            self.mother = Person()
+            self.child = Person()
+            for person in (self.father, self.mother, self.child):
+                self.db.add_person(person, trans)
+            self.place = Place()
+            self.db.add_place(self.place, trans)
+            self.birth = self.__add_event(EventType.BIRTH, 1900, None, trans)
+            self.baptism = self.__add_event(EventType.BAPTISM, 1901,
+                                            self.place, trans)
+            self.child.add_event_ref(self.__ref(self.birth))
+            self.child.set_birth_ref(self.child.get_event_ref_list()[0])
+            self.child.add_event_ref(self.__ref(self.baptism))
+            note = Note()
+            note.set_type(NoteType.TODO)
+            self.db.add_note(note, trans)
+            self.child.add_note(note.handle)
+            self.family = Family()
+            self.family.set_father_handle(self.father.handle)
+            self.family.set_mother_handle(self.mother.handle)
+            self.family.set_relationship(FamilyRelType(FamilyRelType.MARRIED))
+            child_ref = ChildRef()
+            child_ref.ref = self.child.handle
+            self.family.add_child_ref(child_ref)
+            self.db.add_family(self.family, trans)
+            self.father.add_family_handle(self.family.handle)
+            self.mother.add_family_handle(self.family.handle)
+            self.child.add_parent_family_handle(self.family.handle)
+            for person in (self.father, self.mother, self.child):
+                self.db.commit_person(person, trans)
+
+    def tearDown(self):
+        self.db.close()
+
+    def __add_event(self, event_type, year, place, trans):
+        event = Event()
+        event.set_type(EventType(event_type))
+        date = Date()
+        date.set_yr_mon_day(year, 1, 1)
+        event.set_date_object(date)
+        if place:
+            event.set_place_handle(place.handle)
+        self.db.add_event(event, trans)
+        return event
+
+    def __ref(self, event):
+        ref = EventRef()
+        ref.ref = event.handle
+        return ref
+
+    def test_summary(self):
+        summary = self.db.get_person_summary(self.child.handle)
+        self.assertEqual(summary['birth_event'], self.birth.handle)
+        self.assertEqual(summary['birth_fallback'], 0)
+        self.assertEqual(summary['birth_sort'], "%09d" %
+                         self.birth.get_date_object().get_sort_value())
+        # the birth has no place, so the place of the baptism is shown
+        self.assertEqual(summary['birth_place_event'], self.baptism.handle)
+        self.assertEqual(summary['birth_place_fallback'], 1)
+        self.assertEqual(summary['death_event'], '')
+        self.assertEqual(summary['death_sort'], '')
+        self.assertEqual((summary['parents'], summary['todo']), (2, 1))
+        summary = self.db.get_person_summary(self.father.handle)
+        self.assertEqual((summary['marriages'], summary['children']), (1, 1))
+
+    def test_related_changes(self):
+        with DbTxn('Change test objects', self.db) as trans:
+            self.birth.get_date_object().set_yr_mon_day(1850, 1, 1)
+            self.db.commit_event(self.birth, trans)
+            self.family.set_relationship(
+                FamilyRelType(FamilyRelType.UNMARRIED))
+            self.db.commit_family(self.family, trans)
+        summary = self.db.get_person_summary(self.child.handle)
+        self.assertEqual(summary['birth_sort'], "%09d" %
+                         self.birth.get_date_object().get_sort_value())
+        summary = self.db.get_person_summary(self.father.handle)
+        self.assertEqual(summary['marriages'], 0)
+        with DbTxn('Remove test objects', self.db) as trans:
+            self.db.remove_event(self.birth.handle, trans)
+        summary = self.db.get_person_summary(self.child.handle)
+        # the baptism is used when the birth event is missing
+        self.assertEqual(summary['birth_event'], self.baptism.handle)
+        self.assertEqual(summary['birth_fallback'], 1)
+        self.db.undo()
+        summary = self.db.get_person_summary(self.child.handle)
+        self.assertEqual(summary['birth_event'], self.birth.handle)
+
+    def test_sort_values(self):
+        with DbTxn('Remove test objects', self.db) as trans:
+            self.db.remove_person(self.mother.handle, trans)
+        values = self.db.get_sort_values('Person', 'children')
+        self.assertEqual(sorted(values),
+                         sorted([(0, self.child.handle),
+                                 (1, self.father.handle)]))
+
+    def test_batch(self):
+        with DbTxn('Change test objects', self.db, batch=True) as trans:
+            self.child.get_event_ref_list()[1].set_role(
+                EventRoleType(EventRoleType.FAMILY))
+            self.db.commit_person(self.child, trans)
+        summary = self.db.get_person_summary(self.child.handle)
+        self.assertEqual(summary['birth_place_event'], '')
+
+    def test_batch_written_once(self):
+        written = []
+        write_summaries = self.db._write_summaries
+        def count(handles):
+            written.append(sorted(handles))
+            write_summaries(handles)
+        self.db._write_summaries = count
+        with DbTxn('Change test objects', self.db, batch=True) as trans:
+            for year in (1850, 1860):
+                self.birth.get_date_object().set_yr_mon_day(year, 1, 1)
+                self.db.commit_event(self.birth, trans)
+                self.db._flush_batch()
+            self.db.commit_person(self.father, trans)
+        self.assertEqual(written, [sorted([self.child.handle,
+                                           self.father.handle])])
+        summary = self.db.get_person_summary(self.child.handle)
+        self.assertEqual(summary['birth_sort'], "%09d" %
+                         self.birth.get_date_object().get_sort_value())
+
+    def test_read_in_transaction(self):
+        sort = "%09d" % self.birth.get_date_object().get_sort_value()
+        with DbTxn('Change test objects', self.db) as trans:
+            self.birth.get_date_object().set_yr_mon_day(1850, 1, 1)
+            self.db.commit_event(self.birth, trans)
+            # the summaries are written when the transaction is committed
+            summary = self.db.get_person_summary(self.child.handle)
+            self.assertEqual(summary['birth_sort'], sort)
+        summary = self.db.get_person_summary(self.child.handle)
+        self.assertEqual(summary['birth_sort'], "%09d" %
+                         self.birth.get_date_object().get_sort_value())
+
+    def test_upgrade(self):
+        self.db.dbapi.execute('DROP TABLE person_summary')
+        self.db._add_secondary_tables()
+        self.db.rebuild_secondary()
+        self.test_summary()
+
+
+class DbReferenceMapTest(unittest.TestCase):
+    '''
+    Tests of the queries of the reference map used by the Check tool.
+    '''
+
+    def setUp(self):
+        self.db = make_database("sqlite")
+        self.db.load(":memory:")
+        with DbTxn('Add test objects', self.db) as trans:
+            self.note = Note()
+            self.db.add_note(self.note, trans)
+            self.person = Person()
+            self.person.add_note(self.note.handle)
+            self.person.add_note('missing')
+            self.db.add_person(self.person, trans)
+            self.family = Family()
+            self.family.add_note(self.note.handle)
+            self.db.add_family(self.family, trans)
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_reference_map(self):
+        refs = self.db.get_reference_map('Person', [self.person.handle,
+                                                    'unknown'])
+        self.assertEqual(sorted(refs[self.person.handle]),
+                         sorted([('Note', 'missing'),
+                                 ('Note', self.note.handle)]))
+        self.assertEqual(refs['unknown'], [])
+
+    def test_missing_references(self):
+        self.assertEqual(self.db.get_missing_references('Note'),
+                         [('Person', self.person.handle, 'missing')])
+        self.assertEqual(self.db.get_missing_references('Person'), [])
+
+    def test_orphan_references(self):
+        self.assertEqual(self.db.get_orphan_references(), [])
+        self.db.dbapi.execute('DELETE FROM family')
+        self.db.dbapi.commit()
+        self.assertEqual(self.db.get_orphan_references(),
+                         [('Family', self.family.handle,
+                           'Note', self.note.handle)])
+
+
+class DbSerializerTest(unittest.TestCase):
+    '''
+    Tests of the storage formats of the primary objects.
+    '''
+
+    @classmethod
+    def setUpClass(cls):
+        cls.db = import_as_dict(EXAMPLE, User())
+        cls.data = {class_name: dict(cls.db._iter_raw_data(obj_key))
+                    for class_name, obj_key in CLASS_TO_KEY_MAP.items()}
+
+    def tearDown(self):
+        self.db.set_serializer('blob')
+
+    def __check_data(self):
+        for class_name, obj_key in CLASS_TO_KEY_MAP.items():
+            data = self.data[class_name]
+            self.assertEqual(dict(self.db._iter_raw_data(obj_key)), data)
+            for handle in list(data)[:10]:
+                self.db.cache.discard(obj_key, handle)
+                self.assertEqual(self.db._get_raw_data(obj_key, handle),
+                                 data[handle])
+
+    def test_convert(self):
+        self.assertIs(self.db.serializer, BlobSerializer)
+        self.db.set_serializer('json')
+        self.assertIs(self.db.serializer, JSONSerializer)
+        self.assertEqual(self.db._get_metadata('serializer'), 'json')
+        self.__check_data()
+        self.db.dbapi.execute('SELECT COUNT(*) FROM person '
+                              'WHERE blob_data IS NOT NULL')
+        self.assertEqual(self.db.dbapi.fetchone()[0], 0)
+        self.db.set_serializer('blob')
+        self.assertIs(self.db.serializer, BlobSerializer)
+        self.__check_data()
+
+    @unittest.skipUnless(sqlite3.sqlite_version_info >= (3, 35),
+                         "DROP COLUMN needs SQLite 3.35")
+    def test_upgrade(self):
+        for table in ('person', 'family', 'event', 'place', 'repository',
+                      'source', 'citation', 'media', 'note', 'tag'):
+            self.db.dbapi.execute('ALTER TABLE %s DROP COLUMN json_data'
+                                  % table)
+        self.db.set_serializer('json')
+        self.__check_data()
+
+    def __check_fields(self):
+        for class_name, path in (('Person', 'gramps_id'),
+                                 ('Person', 'gender'),
+                                 ('Person', 'private'),
+                                 ('Person', 'primary_name.first_name'),
+                                 ('Person',
+                                  'primary_name.surname_list.0.surname'),
+                                 ('Person', 'event_ref_list.1.ref'),
+                                 ('Person', 'family_list'),
+                                 ('Event', 'date.sortval'),
+                                 ('Event', 'date.dateval'),
+                                 ('Note', 'text.string')):
+            for handle in self.data[class_name]:
+                value = self.db.get_field(class_name, handle, path)
+                obj = self.db.method('get_%s_from_handle', class_name)(handle)
+                for name in path.split('.'):
+                    if name.isdigit():
+                        obj = (obj[int(name)] if int(name) < len(obj)
+                               else None)
+                    else:
+                        obj = getattr(obj, name) if obj else None
+                    if (isinstance(obj, Date) and obj.is_empty() and
+                            not obj.text):
+                        # empty dates are None in the raw data
+                        obj = None
+                self.assertEqual(value, obj, (class_name, handle, path))
+                self.assertEqual(type(value), type(obj))
+        self.assertIsNone(self.db.get_field('Person', 'missing', 'gramps_id'))
+
+    def test_get_field(self):
+        self.__check_fields()
+        self.db.set_serializer('json')
+        self.__check_fields()
+
+    def test_get_field_invalid(self):
+        for path in ('missing', 'primary_name', 'primary_name.type.string',
+                     'address_list.0.street', 'family_list.x'):
+            self.assertRaises(ValueError, self.db.get_field, 'Person',
+                              'handle', path)
+
+    def test_new_database(self):
+        config.set('database.serializer', 'json')
+        db = make_database("sqlite")
+        try:
+            db.load(":memory:")
+        finally:
+            config.set('database.serializer', 'blob')
+        self.assertIs(db.serializer, JSONSerializer)
+        person = Person()
+        person.set_gramps_id('I1')
+        with DbTxn('Add test objects', db) as trans:
+            db.add_person(person, trans)
+        db.cache.discard(PERSON_KEY, person.handle)
+        self.assertEqual(db.get_raw_person_data(person.handle),
+                         person.serialize())
+        self.assertEqual(db.get_field('Person', person.handle, 'gramps_id'),
+                         'I1')
+        self.assertTrue(db.undo())
+        self.assertFalse(db.has_person_handle(person.handle))
+        with DbTxn('Add test objects', db, batch=True) as trans:
+            db.add_person(person, trans)
+            family = Family()
+            family.set_father_handle(person.handle)
+            db.add_family(family, trans)
+        self.assertEqual(db.get_family_from_handle(family.handle).serialize(),
+                         family.serialize())
+        self.assertEqual(db.get_field('Family', family.handle,
+                                      'father_handle'), person.handle)
+        db.close()
+
 
 if __name__ == "__main__":
     unittest.main()
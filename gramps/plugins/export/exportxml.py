@@ -38,7 +38,8 @@ Gramps' XML file format.
 import time
 import shutil
 import os
-import codecs
+import queue
+import threading
 from xml.sax.saxutils import escape
 
 #------------------------------------------------------------------------
@@ -87,6 +88,70 @@ def escxml(d):
                    '>' : '&gt;',
                    }) if d else ""
 
+# characters collected before they are passed on to be written
+CHUNK_SIZE = 1 << 20
+# chunks waiting to be written
+QUEUE_SIZE = 4
+
+#-------------------------------------------------------------------------
+#
+# ChunkWriter
+#
+#-------------------------------------------------------------------------
+class ChunkWriter:
+    """
+    Collects the text written to it in chunks of CHUNK_SIZE characters, and
+    writes them UTF-8 encoded to a file in a worker thread, so that writing
+    and compressing the file overlaps with reading the database.
+    """
+
+    def __init__(self, fileobj):
+        self.fileobj = fileobj
+        self.parts = []
+        self.size = 0
+        self.error = None
+        self.queue = queue.Queue(QUEUE_SIZE)
+        self.thread = threading.Thread(target=self.__run, daemon=True)
+        self.thread.start()
+
+    def write(self, text):
+        self.parts.append(text)
+        self.size += len(text)
+        if self.size >= CHUNK_SIZE:
+            self.__flush()
+
+    def close(self, abort=False):
+        """
+        Write what is left and wait until it is written.  The file itself
+        is not closed.  If abort is True, as another exception is in flight,
+        what is left is dropped and an error of the writer is not raised.
+        """
+        if not abort:
+            self.__flush()
+        self.queue.put(None)
+        self.thread.join()
+        if self.error and not abort:
+            raise self.error
+
+    def __flush(self):
+        if self.error:
+            raise self.error
+        if self.parts:
+            self.queue.put(''.join(self.parts).encode('utf-8'))
+            self.parts = []
+            self.size = 0
+
+    def __run(self):
+        while True:
+            chunk = self.queue.get()
+            if chunk is None:
+                break
+            if self.error is None:
+                try:
+                    self.fileobj.write(chunk)
+                except Exception as err:
+                    self.error = err
+
 #-------------------------------------------------------------------------
 #
 #
@@ -174,9 +239,13 @@ class GrampsXmlWriter(UpdateCallback):
                                         str(msg))
                 return 0
 
-        self.g = codecs.getwriter("utf8")(g)
-
-        self.write_xml_data()
+        self.g = ChunkWriter(g)
+        try:
+            self.write_xml_data()
+        except:
+            self.g.close(abort=True)
+            raise
+        self.g.close()
         if filename != '-':
             g.close()
         return 1
@@ -194,9 +263,13 @@ class GrampsXmlWriter(UpdateCallback):
         else:
             g = handle
 
-        self.g = codecs.getwriter("utf8")(g)
-
-        self.write_xml_data()
+        self.g = ChunkWriter(g)
+        try:
+            self.write_xml_data()
+        except:
+            self.g.close(abort=True)
+            raise
+        self.g.close()
         g.close()
         return 1
 
@@ -256,20 +329,16 @@ class GrampsXmlWriter(UpdateCallback):
         # Write table objects
         if tag_len > 0:
             self.g.write("  <tags>\n")
-            for key in sorted(self.db.get_tag_handles()):
-                tag = self.db.get_tag_from_handle(key)
-                if tag:
-                    self.write_tag(tag, 2)
+            for tag in self.db.iter_objects_by_handle('Tag'):
+                self.write_tag(tag, 2)
                 self.update()
             self.g.write("  </tags>\n")
 
         # Write primary objects
         if event_len > 0:
             self.g.write("  <events>\n")
-            for handle in sorted(self.db.get_event_handles()):
-                event = self.db.get_event_from_handle(handle)
-                if event:
-                    self.write_event(event,2)
+            for event in self.db.iter_objects_by_handle('Event'):
+                self.write_event(event,2)
                 self.update()
             self.g.write("  </events>\n")
 
@@ -280,74 +349,57 @@ class GrampsXmlWriter(UpdateCallback):
                 self.g.write(' home="_%s"' % person.handle)
             self.g.write('>\n')
 
-            for handle in sorted(self.db.get_person_handles()):
-                person = self.db.get_person_from_handle(handle)
-                if person:
-                    self.write_person(person, 2)
+            for person in self.db.iter_objects_by_handle('Person'):
+                self.write_person(person, 2)
                 self.update()
             self.g.write("  </people>\n")
 
         if family_len > 0:
             self.g.write("  <families>\n")
-            for handle in sorted(self.db.iter_family_handles()):
-                family = self.db.get_family_from_handle(handle)
-                if family:
-                    self.write_family(family,2)
+            for family in self.db.iter_objects_by_handle('Family'):
+                self.write_family(family,2)
                 self.update()
             self.g.write("  </families>\n")
 
         if citation_len > 0:
             self.g.write("  <citations>\n")
-            for handle in sorted(self.db.get_citation_handles()):
-                citation = self.db.get_citation_from_handle(handle)
-                if citation:
-                    self.write_citation(citation,2)
+            for citation in self.db.iter_objects_by_handle('Citation'):
+                self.write_citation(citation,2)
                 self.update()
             self.g.write("  </citations>\n")
 
         if source_len > 0:
             self.g.write("  <sources>\n")
-            for handle in sorted(self.db.get_source_handles()):
-                source = self.db.get_source_from_handle(handle)
-                if source:
-                    self.write_source(source,2)
+            for source in self.db.iter_objects_by_handle('Source'):
+                self.write_source(source,2)
                 self.update()
             self.g.write("  </sources>\n")
 
         if place_len > 0:
             self.g.write("  <places>\n")
-            for key in sorted(self.db.get_place_handles()):
-                # try:
-                place = self.db.get_place_from_handle(key)
-                if place:
-                    self.write_place_obj(place,2)
+            for place in self.db.iter_objects_by_handle('Place'):
+                self.write_place_obj(place,2)
                 self.update()
             self.g.write("  </places>\n")
 
         if obj_len > 0:
             self.g.write("  <objects>\n")
-            for handle in sorted(self.db.get_media_handles()):
-                obj = self.db.get_media_from_handle(handle)
-                if obj:
-                    self.write_object(obj,2)
+            for obj in self.db.iter_objects_by_handle('Media'):
+                self.write_object(obj,2)
                 self.update()
             self.g.write("  </objects>\n")
 
         if repo_len > 0:
             self.g.write("  <repositories>\n")
-            for key in sorted(self.db.get_repository_handles()):
-                repo = self.db.get_repository_from_handle(key)
-                if repo:
-                    self.write_repository(repo,2)
+            for repo in self.db.iter_objects_by_handle('Repository'):
+                self.write_repository(repo,2)
                 self.update()
             self.g.write("  </repositories>\n")
 
         if note_len > 0:
             self.g.write("  <notes>\n")
-            for key in sorted(self.db.get_note_handles()):
-                note = self.db.get_note_from_handle(key)
-                if note:
-                    self.write_note(note, 2)
+            for note in self.db.iter_objects_by_handle('Note'):
+                self.write_note(note, 2)
                 self.update()
             self.g.write("  </notes>\n")
 
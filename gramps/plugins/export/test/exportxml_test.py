@@ -0,0 +1,102 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Unittest for export to Gramps XML
+"""
+import io
+import os
+import tempfile
+import unittest
+
+from gramps.gen.const import DATA_DIR
+from gramps.gen.db.dbconst import CLASS_TO_KEY_MAP
+from gramps.gen.db.utils import import_as_dict
+from gramps.gen.user import User
+from gramps.version import VERSION
+from ..exportxml import ChunkWriter, GrampsXmlWriter
+
+TEST_DIR = os.path.abspath(os.path.join(DATA_DIR, "tests"))
+EXAMPLE = os.path.join(TEST_DIR, "example.gramps")
+
+class FailingFile(io.BytesIO):
+    """ A file which cannot be written to. """
+    def write(self, data):
+        raise OSError("disk full")
+
+class ChunkWriterTest(unittest.TestCase):
+    def test_write(self):
+        fileobj = io.BytesIO()
+        writer = ChunkWriter(fileobj)
+        writer.write('abc')
+        writer.write('é')
+        writer.close()
+        self.assertEqual(fileobj.getvalue(), 'abcé'.encode('utf-8'))
+
+    def test_writer_error(self):
+        writer = ChunkWriter(FailingFile())
+        writer.write('abc')
+        with self.assertRaises(OSError):
+            writer.close()
+
+    def test_abort(self):
+        writer = ChunkWriter(FailingFile())
+        writer.write('abc')
+        writer.close(abort=True)
+
+class ExportXmlTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.db = import_as_dict(EXAMPLE, User())
+
+    def test_round_trip(self):
+        """
+        Test that a database exported and imported again has the same
+        objects.
+        """
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, "export.gramps")
+            writer = GrampsXmlWriter(self.db, compress=0, version=VERSION,
+                                     user=User())
+            self.assertEqual(writer.write(filename), 1)
+            db = import_as_dict(filename, User())
+        for class_name in CLASS_TO_KEY_MAP:
+            handles = set(self.db.method('get_%s_handles', class_name)())
+            self.assertEqual(
+                set(db.method('get_%s_handles', class_name)()), handles)
+            for handle in handles:
+                obj = self.db.method('get_%s_from_handle', class_name)(handle)
+                new = db.method('get_%s_from_handle', class_name)(handle)
+                self.assertEqual(new.serialize(),
+                                 obj.serialize(), class_name)
+
+    def test_error_in_flight(self):
+        """
+        Test that an error while reading the database is not replaced by an
+        error of the writer.
+        """
+        writer = GrampsXmlWriter(self.db, compress=0, user=User())
+        def fail():
+            raise ValueError("read error")
+        writer.write_xml_data = fail
+        with self.assertRaises(ValueError):
+            writer.write_handle(FailingFile())
+
+
+if __name__ == "__main__":
+    unittest.main()
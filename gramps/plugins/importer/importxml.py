@@ -567,6 +567,12 @@ class GrampsParser(UpdateCallback):
         self.nidswap = {}
         self.eidswap = {}
         self.import_handles = {}
+        # objects made for references to objects which are not in the file
+        # yet, by primary object type and handle; only the ones which never
+        # turn up are added to the database, by add_placeholders
+        self.placeholders = {}
+        # bookmarks by target and original handle, added by add_bookmarks
+        self.bookmarks = []
 
         if default_tag_format:
             name = time.strftime(default_tag_format)
@@ -713,13 +719,15 @@ class GrampsParser(UpdateCallback):
     def inaugurate(self, handle, target, prim_obj):
         """
         Assign a handle (identity) to a primary object (and create it if it
-        doesn't exist yet) and add it to the database.
+        doesn't exist yet).
 
         This method can be called with an object instance or with a
         class object. Be aware that in the first case the side effect of this
         function is to fill the object instance with the data read from the db.
         In the second case, an empty object with the correct handle will be
-        created.
+        created, and kept as a placeholder until the object itself is read.
+        Placeholders of objects which are not read are added to the database
+        by add_placeholders.
 
         :param handle: The handle of the primary object, typically as read
                        directly from the XML attributes.
@@ -739,17 +747,22 @@ class GrampsParser(UpdateCallback):
             handle = self.import_handles[handle][target][HANDLE]
             if not isinstance(prim_obj, abc.Callable):
                 # This method is called by a start_<primary_object> method.
-                get_raw_obj_data = {"person": self.db.get_raw_person_data,
-                                    "family": self.db.get_raw_family_data,
-                                    "event": self.db.get_raw_event_data,
-                                    "place": self.db.get_raw_place_data,
-                                    "source": self.db.get_raw_source_data,
-                                    "citation": self.db.get_raw_citation_data,
-                                    "repository": self.db.get_raw_repository_data,
-                                    "media": self.db.get_raw_media_data,
-                                    "note": self.db.get_raw_note_data,
-                                    "tag": self.db.get_raw_tag_data}[target]
-                raw = get_raw_obj_data(handle)
+                placeholder = self.placeholders.pop((target, handle), None)
+                if placeholder is not None:
+                    raw = placeholder.serialize()
+                else:
+                    get_raw_obj_data = {
+                        "person": self.db.get_raw_person_data,
+                        "family": self.db.get_raw_family_data,
+                        "event": self.db.get_raw_event_data,
+                        "place": self.db.get_raw_place_data,
+                        "source": self.db.get_raw_source_data,
+                        "citation": self.db.get_raw_citation_data,
+                        "repository": self.db.get_raw_repository_data,
+                        "media": self.db.get_raw_media_data,
+                        "note": self.db.get_raw_note_data,
+                        "tag": self.db.get_raw_tag_data}[target]
+                    raw = get_raw_obj_data(handle)
                 prim_obj.unserialize(raw)
                 self.import_handles[orig_handle][target][INSTANTIATED] = True
             return handle
@@ -783,24 +796,34 @@ class GrampsParser(UpdateCallback):
         # method is called by a reference
         if isinstance(prim_obj, abc.Callable):
             prim_obj = prim_obj()
+            self.placeholders[(target, handle)] = prim_obj
         else:
+            # the stop_<primary_object> method commits the object
             self.import_handles[orig_handle][target][INSTANTIATED] = True
         prim_obj.set_handle(handle)
-        if target == "tag":
-            self.db.add_tag(prim_obj, self.trans)
-        else:
-            add_func = {"person": self.db.add_person,
-                        "family": self.db.add_family,
-                        "event": self.db.add_event,
-                        "place": self.db.add_place,
-                        "source": self.db.add_source,
-                        "citation": self.db.add_citation,
-                        "repository": self.db.add_repository,
-                        "media": self.db.add_media,
-                        "note": self.db.add_note}[target]
-            add_func(prim_obj, self.trans, set_gid=False)
         return handle
 
+    def add_placeholders(self):
+        """
+        Add the objects made for references to objects which are not in the
+        file (yet) to the database, so that they can be looked up.
+        """
+        for (target, handle), prim_obj in self.placeholders.items():
+            if target == "tag":
+                self.db.add_tag(prim_obj, self.trans)
+            else:
+                add_func = {"person": self.db.add_person,
+                            "family": self.db.add_family,
+                            "event": self.db.add_event,
+                            "place": self.db.add_place,
+                            "source": self.db.add_source,
+                            "citation": self.db.add_citation,
+                            "repository": self.db.add_repository,
+                            "media": self.db.add_media,
+                            "note": self.db.add_note}[target]
+                add_func(prim_obj, self.trans, set_gid=False)
+        self.placeholders.clear()
+
     def inaugurate_id(self, id_, key, prim_obj):
         """
         Equivalent of inaugurate but for old style XML.
@@ -934,6 +957,8 @@ class GrampsParser(UpdateCallback):
             self.p.EndElementHandler = self.endElement
             self.p.CharacterDataHandler = self.characters
             self.p.ParseFile(ifile)
+            self.add_placeholders()
+            self.add_bookmarks()
 
             if len(self.name_formats) > 0:
                 # add new name formats to the existing table
@@ -1301,7 +1326,9 @@ class GrampsParser(UpdateCallback):
 
         # We count here on events being already parsed prior to parsing
         # people or families. This code will fail if this is not true.
-        event = self.db.get_event_from_handle(self.eventref.ref)
+        event = self.placeholders.get(("event", handle))
+        if event is None:
+            event = self.db.get_event_from_handle(self.eventref.ref)
         if not event:
             return
 
@@ -1385,48 +1412,58 @@ class GrampsParser(UpdateCallback):
             self.db.bookmarks.append(handle)
             return
 
-        # This is new XML, so we are guaranteed to have a handle ref
-        handle = attrs['hlink'].replace('_', '')
-        handle = self.import_handles[handle][target][HANDLE]
-        # Due to pre 2.2.9 bug, bookmarks might be handle of other object
-        # Make sure those are filtered out.
-        # Bookmarks are at end, so all handle must exist before we do bookmrks
-        if target == 'person':
-            if (self.db.get_person_from_handle(handle) is not None
-                    and handle not in self.db.bookmarks.get() ):
-                self.db.bookmarks.append(handle)
-        elif target == 'family':
-            if (self.db.get_family_from_handle(handle) is not None
-                    and handle not in self.db.family_bookmarks.get() ):
-                self.db.family_bookmarks.append(handle)
-        elif target == 'event':
-            if (self.db.get_event_from_handle(handle) is not None
-                    and handle not in self.db.event_bookmarks.get() ):
-                self.db.event_bookmarks.append(handle)
-        elif target == 'source':
-            if (self.db.get_source_from_handle(handle) is not None
-                    and handle not in self.db.source_bookmarks.get() ):
-                self.db.source_bookmarks.append(handle)
-        elif target == 'citation':
-            if (self.db.get_citation_from_handle(handle) is not None
-                    and handle not in self.db.citation_bookmarks.get() ):
-                self.db.citation_bookmarks.append(handle)
-        elif target == 'place':
-            if (self.db.get_place_from_handle(handle) is not None
-                    and handle not in self.db.place_bookmarks.get() ):
-                self.db.place_bookmarks.append(handle)
-        elif target == 'media':
-            if (self.db.get_media_from_handle(handle) is not None
-                    and handle not in self.db.media_bookmarks.get() ):
-                self.db.media_bookmarks.append(handle)
-        elif target == 'repository':
-            if (self.db.get_repository_from_handle(handle)
-                    is not None and handle not in self.db.repo_bookmarks.get()):
-                self.db.repo_bookmarks.append(handle)
-        elif target == 'note':
-            if (self.db.get_note_from_handle(handle) is not None
-                    and handle not in self.db.note_bookmarks.get() ):
-                self.db.note_bookmarks.append(handle)
+        # This is new XML, so we are guaranteed to have a handle ref.
+        # The object may come later in the file, so the bookmark is added
+        # by add_bookmarks, after the parse.
+        self.bookmarks.append((target, attrs['hlink'].replace('_', '')))
+
+    def add_bookmarks(self):
+        """
+        Add the bookmarks of the file to db, if their objects exist.
+        """
+        for target, handle in self.bookmarks:
+            if target not in self.import_handles.get(handle, {}):
+                # the object is missing from the file
+                continue
+            handle = self.import_handles[handle][target][HANDLE]
+            # Due to pre 2.2.9 bug, bookmarks might be handle of other object
+            # Make sure those are filtered out.
+            if target == 'person':
+                if (self.db.get_person_from_handle(handle) is not None
+                        and handle not in self.db.bookmarks.get() ):
+                    self.db.bookmarks.append(handle)
+            elif target == 'family':
+                if (self.db.get_family_from_handle(handle) is not None
+                        and handle not in self.db.family_bookmarks.get() ):
+                    self.db.family_bookmarks.append(handle)
+            elif target == 'event':
+                if (self.db.get_event_from_handle(handle) is not None
+                        and handle not in self.db.event_bookmarks.get() ):
+                    self.db.event_bookmarks.append(handle)
+            elif target == 'source':
+                if (self.db.get_source_from_handle(handle) is not None
+                        and handle not in self.db.source_bookmarks.get() ):
+                    self.db.source_bookmarks.append(handle)
+            elif target == 'citation':
+                if (self.db.get_citation_from_handle(handle) is not None
+                        and handle not in self.db.citation_bookmarks.get() ):
+                    self.db.citation_bookmarks.append(handle)
+            elif target == 'place':
+                if (self.db.get_place_from_handle(handle) is not None
+                        and handle not in self.db.place_bookmarks.get() ):
+                    self.db.place_bookmarks.append(handle)
+            elif target == 'media':
+                if (self.db.get_media_from_handle(handle) is not None
+                        and handle not in self.db.media_bookmarks.get() ):
+                    self.db.media_bookmarks.append(handle)
+            elif target == 'repository':
+                if (self.db.get_repository_from_handle(handle) is not None
+                        and handle not in self.db.repo_bookmarks.get()):
+                    self.db.repo_bookmarks.append(handle)
+            elif target == 'note':
+                if (self.db.get_note_from_handle(handle) is not None
+                        and handle not in self.db.note_bookmarks.get() ):
+                    self.db.note_bookmarks.append(handle)
 
     def start_format(self, attrs):
         number = int(attrs['number'])
@@ -2678,6 +2715,7 @@ class GrampsParser(UpdateCallback):
         if self.event.get_description() == "" and \
                self.event.get_type() != EventType.CUSTOM:
             if self.family:
+                self.add_placeholders()
                 text = EVENT_FAMILY_STR % {
                     'event_name' : str(self.event.get_type()),
                     'family' : family_name(self.family, self.db),
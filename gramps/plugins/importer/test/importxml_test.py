@@ -0,0 +1,123 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Unittest of import of Gramps XML, with references to objects which come
+later in the file or are missing from it
+"""
+import os
+import tempfile
+import unittest
+
+from gramps.gen.db.utils import import_as_dict
+from gramps.gen.lib import EventType
+from gramps.gen.user import User
+from gramps.plugins.lib.libgrampsxml import GRAMPS_XML_VERSION
+from gramps.version import VERSION
+
+PERSON = """
+<person handle="_p1" id="I0001">
+  <gender>F</gender>
+  <name type="Birth Name"><surname>Smith</surname></name>
+  <eventref hlink="_%s" role="Primary"/>
+</person>"""
+
+EVENT = """
+<event handle="_e1" id="E0001">
+  <type>Birth</type>
+  <description>Birth of Smith</description>
+</event>"""
+
+BOOKMARKS = """
+<bookmarks>
+  <bookmark target="person" hlink="_%s"/>
+  <bookmark target="event" hlink="_e1"/>
+</bookmarks>"""
+
+class ImportXmlTest(unittest.TestCase):
+    def import_xml(self, *sections):
+        """
+        Import a Gramps XML file with the sections, and return the database.
+        """
+        text = ('<?xml version="1.0" encoding="UTF-8"?>\n'
+                '<database xmlns="http://gramps-project.org/xml/%s/">\n'
+                '<header><created date="2020-01-01" version="%s"/></header>'
+                % (GRAMPS_XML_VERSION, VERSION) +
+                "".join(sections) + "</database>\n")
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, "test.gramps")
+            with open(filename, "w", encoding="utf-8") as xml_file:
+                xml_file.write(text)
+            db = import_as_dict(filename, User())
+        self.assertIsNotNone(db)
+        self.addCleanup(db.close)
+        return db
+
+    def check_event(self, db):
+        """
+        Check that the person refers to the event, which has its data.
+        """
+        self.assertEqual(db.get_number_of_events(), 1)
+        person = db.get_person_from_gramps_id("I0001")
+        event = db.get_event_from_gramps_id("E0001")
+        self.assertEqual(event.get_description(), "Birth of Smith")
+        self.assertEqual([ref.ref for ref in person.get_event_ref_list()],
+                         [event.handle])
+        self.assertEqual(db.get_event_bookmarks().get(), [event.handle])
+        return person, event
+
+    def test_event_first(self):
+        db = self.import_xml("<events>%s</events>" % EVENT,
+                             "<people>%s</people>" % (PERSON % "e1"),
+                             BOOKMARKS % "p1")
+        person, event = self.check_event(db)
+        self.assertEqual(person.get_birth_ref().ref, event.handle)
+        self.assertEqual(db.get_bookmarks().get(), [person.handle])
+
+    def test_forward_references(self):
+        """
+        Test references to objects which come later in the file.
+        """
+        db = self.import_xml(BOOKMARKS % "p1",
+                             "<people>%s</people>" % (PERSON % "e1"),
+                             "<events>%s</events>" % EVENT)
+        person, event = self.check_event(db)
+        self.assertEqual(event.get_type(), EventType.BIRTH)
+        self.assertEqual(db.get_bookmarks().get(), [person.handle])
+
+    def test_missing_handles(self):
+        """
+        Test references to objects which are not in the file.
+        """
+        db = self.import_xml("<people>%s</people>" % (PERSON % "e2"),
+                             "<events>%s</events>" % EVENT,
+                             BOOKMARKS % "p2")
+        self.assertEqual(db.get_number_of_events(), 2)
+        person = db.get_person_from_gramps_id("I0001")
+        handle = person.get_event_ref_list()[0].ref
+        # an empty event is made for the missing one
+        missing = db.get_event_from_handle(handle)
+        self.assertEqual(missing.get_description(), "")
+        event = db.get_event_from_gramps_id("E0001")
+        self.assertNotEqual(handle, event.handle)
+        self.assertEqual(db.get_bookmarks().get(), [])
+        self.assertEqual(db.get_event_bookmarks().get(), [event.handle])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,563 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# Copyright (C) 2000-2007  Donald N. Allingham
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Find the people of a database who may be the same person.
+
+The people are read once, into the features the comparison uses.  Only the
+people of the same sex, with similar surnames, a given name starting with
+the same letter and the same year of birth are compared, which are the only
+ones the comparison can find alike.
+"""
+
+#-------------------------------------------------------------------------
+#
+# Python modules
+#
+#-------------------------------------------------------------------------
+from collections import namedtuple
+import multiprocessing
+
+#-------------------------------------------------------------------------
+#
+# Gramps modules
+#
+#-------------------------------------------------------------------------
+from gramps.gen.lib import Date, Person
+from gramps.gen.soundex import soundex
+from gramps.gen.const import GRAMPS_LOCALE as glocale
+_ = glocale.translation.sgettext
+
+#-------------------------------------------------------------------------
+#
+# Features
+#
+#-------------------------------------------------------------------------
+
+# What the comparison uses of a person
+_Features = namedtuple('_Features', ['female', 'name', 'birth', 'death',
+                                     'birth_place', 'death_place', 'parents',
+                                     'families'])
+
+# What the comparison uses of a name: the key of the surnames, the suffix,
+# the first name and its (name, key, is initial) parts
+_Name = namedtuple('_Name', ['surname_key', 'suffix', 'first_name', 'parts'])
+
+# What the comparison uses of a place: its handle, title and (name, key)
+# parts of the title
+_Place = namedtuple('_Place', ['handle', 'title', 'parts'])
+
+_EMPTY_DATE = Date()
+
+def is_initial(name):
+    if len(name) > 2:
+        return 0
+    elif len(name) == 2:
+        if name[0] == name[0].upper() and name[1] == '.':
+            return 1
+    else:
+        return name[0] == name[0].upper()
+
+def get_surnames(name):
+    """Construct a full surname of the surnames"""
+    return ' '.join([surn.get_surname() for surn in name.get_surname_list()])
+
+#-------------------------------------------------------------------------
+#
+# Comparison
+#
+#-------------------------------------------------------------------------
+def date_match(date1, date2):
+    if date1.is_empty() or date2.is_empty():
+        return 0
+    if date1.is_equal(date2):
+        return 1
+
+    if date1.is_compound() or date2.is_compound():
+        return range_compare(date1, date2)
+
+    if date1.get_year() == date2.get_year():
+        if date1.get_month() == date2.get_month():
+            return 0.75
+        if not date1.get_month_valid() or not date2.get_month_valid():
+            return 0.75
+        else:
+            return -1
+    else:
+        return -1
+
+def range_compare(date1, date2):
+    start_date_1 = date1.get_start_date()[0:3]
+    start_date_2 = date2.get_start_date()[0:3]
+    stop_date_1 = date1.get_stop_date()[0:3]
+    stop_date_2 = date2.get_stop_date()[0:3]
+    if date1.is_compound() and date2.is_compound():
+        if (start_date_2 <= start_date_1 <= stop_date_2 or
+                start_date_1 <= start_date_2 <= stop_date_1 or
+                start_date_2 <= stop_date_1 <= stop_date_2 or
+                start_date_1 <= stop_date_2 <= stop_date_1):
+            return 0.5
+        else:
+            return -1
+    elif date2.is_compound():
+        if start_date_2 <= start_date_1 <= stop_date_2:
+            return 0.5
+        else:
+            return -1
+    else:
+        if start_date_1 <= start_date_2 <= stop_date_1:
+            return 0.5
+        else:
+            return -1
+
+def name_match(name1, name2):
+    """
+    Compare two _Name features, either of which may be None.
+    """
+    if not name1 or not name2:
+        return 0
+
+    if name1.surname_key != name2.surname_key:
+        return -1
+    if name1.suffix != name2.suffix:
+        if name1.suffix != "" and name2.suffix != "":
+            return -1
+
+    if name1.first_name == name2.first_name:
+        return 1
+    elif len(name1.parts) < len(name2.parts):
+        return list_reduce(name1.parts, name2.parts)
+    else:
+        return list_reduce(name2.parts, name1.parts)
+
+def list_reduce(list1, list2):
+    value = 0
+    for name1, key1, initial1 in list1:
+        for name2, key2, initial2 in list2:
+            if name1[0] != name2[0]:
+                continue
+            if initial1 or initial2:
+                value += 0.25
+            elif name1 == name2:
+                value += 0.5
+            elif key1 == key2:
+                value += 0.25
+    return min(value, 1) if value else -1
+
+def place_match(place1, place2):
+    """
+    Compare two _Place features.
+    """
+    if place1.handle == place2.handle:
+        return 1
+    if not (place1.title and place2.title):
+        return 0
+    if place1.title == place2.title:
+        return 1
+
+    value = 0
+    for name1, key1 in place1.parts:
+        for name2, key2 in place2.parts:
+            if name1 == name2:
+                value += 0.5
+            elif name1[0] == name2[0] and key1 == key2:
+                value += 0.25
+    return min(value, 1) if value else -1
+
+#-------------------------------------------------------------------------
+#
+# Scorer
+#
+#-------------------------------------------------------------------------
+class _Scorer:
+    """
+    Compare the people of the blocks, from their features.
+    """
+    def __init__(self, people, parents, thresh):
+        """
+        :param people: The (handle, male, givens, year, _Features) of the
+                       people, in the order of the database
+        :type people: list of tuples
+        :param parents: The (father, mother) handles of the main parents of
+                        the people, by handle
+        :type parents: dict
+        :param thresh: The lowest chance of a match to return
+        :type thresh: float
+        """
+        self.people = people
+        self.parents = parents
+        self.thresh = thresh
+        self.ancestors = {}
+
+    def ancestors_of(self, handle):
+        """
+        Return the handles of the person and their ancestors.
+        """
+        if handle not in self.ancestors:
+            id_set = set()
+            todo = [handle]
+            while todo:
+                person_handle = todo.pop()
+                if person_handle and person_handle not in id_set:
+                    id_set.add(person_handle)
+                    todo.extend(self.parents.get(person_handle, ()))
+            self.ancestors[handle] = id_set
+        return self.ancestors[handle]
+
+    def compare_people(self, handle1, handle2, p1, p2):
+
+        chance = name_match(p1.name, p2.name)
+        if chance == -1:
+            return -1
+
+        value = date_match(p1.birth, p2.birth)
+        if value == -1:
+            return -1
+        chance += value
+
+        value = date_match(p1.death, p2.death)
+        if value == -1:
+            return -1
+        chance += value
+
+        value = place_match(p1.birth_place, p2.birth_place)
+        if value == -1:
+            return -1
+        chance += value
+
+        value = place_match(p1.death_place, p2.death_place)
+        if value == -1:
+            return -1
+        chance += value
+
+        if (handle2 in self.ancestors_of(handle1) or
+                handle1 in self.ancestors_of(handle2)):
+            return -1
+
+        if p1.parents and p2.parents:
+            value = name_match(p1.parents[0], p2.parents[0])
+            if value == -1:
+                return -1
+            chance += value
+
+            value = name_match(p1.parents[1], p2.parents[1])
+            if value == -1:
+                return -1
+            chance += value
+
+        for father1, fname1, mother1, mname1 in p1.families:
+            for father2, fname2, mother2, mname2 in p2.families:
+                if p1.female:
+                    spouse1, spouse2 = father1, father2
+                    sname1, sname2 = fname1, fname2
+                else:
+                    spouse1, spouse2 = mother1, mother2
+                    sname1, sname2 = mname1, mname2
+                if spouse1 and spouse2:
+                    if spouse1 == spouse2:
+                        chance += 1
+                    else:
+                        value = name_match(sname1, sname2)
+                        if value != -1:
+                            chance += value
+        return chance
+
+    def search(self, block):
+        """
+        Compare the people of a block with each other.  A block is a
+        (given, [(index, year), ...]) tuple, where year is None for the
+        people who can be born in any year, and given is None if the block
+        is not split by given names.  Two people with several given name
+        initials in common are compared in the block of the first one.
+
+        Return a list of (index1, index2, chance) tuples, for each ordered
+        pair of people whose chance of being the same is at least the
+        threshold.
+        """
+        given, members = block
+        years = {}
+        anytime = []
+        for index, year in members:
+            if year is None:
+                anytime.append(index)
+            else:
+                years.setdefault(year, []).append(index)
+
+        found = []
+        for indices in years.values():
+            self.__compare_within(given, indices, found)
+            self.__compare_across(given, indices, anytime, found)
+        self.__compare_within(given, anytime, found)
+        return found
+
+    def __compare_within(self, given, indices, found):
+        for pos, index1 in enumerate(indices):
+            for index2 in indices[pos + 1:]:
+                self.__compare(given, index1, index2, found)
+
+    def __compare_across(self, given, indices1, indices2, found):
+        for index1 in indices1:
+            for index2 in indices2:
+                self.__compare(given, index1, index2, found)
+
+    def __compare(self, given, index1, index2, found):
+        handle1, dummy, givens1, dummy, p1 = self.people[index1]
+        handle2, dummy, givens2, dummy, p2 = self.people[index2]
+        if (given is not None and len(givens1) > 1 and len(givens2) > 1 and
+                min(givens1 & givens2) != given):
+            return
+        chance = self.compare_people(handle1, handle2, p1, p2)
+        if chance >= self.thresh:
+            found.append((index1, index2, chance))
+        if p1.female != p2.female:
+            chance = self.compare_people(handle2, handle1, p2, p1)
+        if chance >= self.thresh:
+            found.append((index2, index1, chance))
+
+#-------------------------------------------------------------------------
+#
+# Worker processes
+#
+#-------------------------------------------------------------------------
+_WORKER_SCORER = None
+
+def _init_worker(people, parents, thresh):
+    """
+    Keep the features of the people in a worker process.
+    """
+    global _WORKER_SCORER
+    _WORKER_SCORER = _Scorer(people, parents, thresh)
+
+def _search_chunk(blocks):
+    """
+    Return the matches found in each block of a chunk, in a worker process.
+    """
+    return [_WORKER_SCORER.search(block) for block in blocks]
+
+#-------------------------------------------------------------------------
+#
+# DuplicateFinder
+#
+#-------------------------------------------------------------------------
+class DuplicateFinder:
+    """
+    Find the people of a database who may be the same person.
+    """
+
+    # number of blocks handed to a worker process at a time
+    PARALLEL_CHUNK = 500
+
+    def __init__(self, db, use_soundex=True):
+        """
+        :param db: The database to search
+        :type db: DbReadBase
+        :param use_soundex: Whether names are compared by their SoundEx codes
+        :type use_soundex: bool
+        """
+        self.db = db
+        self.use_soundex = use_soundex
+
+    def gen_key(self, val):
+        if self.use_soundex:
+            return soundex(val)
+        else:
+            return val
+
+    def find(self, thresh, user=None, processes=0):
+        """
+        Return a dict giving for the handle of each person with a possible
+        duplicate the (handle, chance) of the one least likely, among the
+        ones at least as likely as thresh.
+
+        :param thresh: The lowest chance of a match
+        :type thresh: float
+        :param user: The user to show the progress to
+        :type user: User
+        :param processes: The number of worker processes to compare the
+                          people in, or 0 to compare them in this process
+        :type processes: int
+        """
+        handles, people, parents = self.__read_people(user)
+        blocks = self.__make_blocks(people, thresh > -1)
+
+        if user:
+            user.begin_progress(_('Find Duplicates'),
+                                _('Pass 2: Calculating potential matches'),
+                                len(blocks))
+        found = []
+        if processes > 1 and len(blocks) > self.PARALLEL_CHUNK:
+            chunks = [blocks[start:start + self.PARALLEL_CHUNK]
+                      for start in range(0, len(blocks), self.PARALLEL_CHUNK)]
+            context = multiprocessing.get_context('spawn')
+            with context.Pool(processes, _init_worker,
+                              (people, parents, thresh)) as pool:
+                for results in pool.imap_unordered(_search_chunk, chunks):
+                    for result in results:
+                        found.extend(result)
+                        if user:
+                            user.step_progress()
+        else:
+            scorer = _Scorer(people, parents, thresh)
+            for block in blocks:
+                found.extend(scorer.search(block))
+                if user:
+                    user.step_progress()
+        if user:
+            user.end_progress()
+
+        # pair the people as comparing each with all of the others in the
+        # order of the database would
+        found.sort(key=lambda match: match[:2])
+        the_map = {}
+        for index1, index2, chance in found:
+            p1key = handles[index1]
+            p2key = handles[index2]
+            if p2key in the_map and the_map[p2key][0] == p1key:
+                continue
+            if p1key in the_map:
+                if the_map[p1key][1] > chance:
+                    the_map[p1key] = (p2key, chance)
+            else:
+                the_map[p1key] = (p2key, chance)
+        return the_map
+
+    def __read_people(self, user):
+        """
+        Read the features of the people.  Return the handles of the people
+        in the order of the database, a list of their (handle, male, givens,
+        year, _Features) tuples in the same order, and the (father, mother)
+        handles of the main parents of each.
+        """
+        db = self.db
+        if user:
+            user.begin_progress(_('Find Duplicates'),
+                                _('Pass 1: Building preliminary lists'),
+                                db.get_number_of_people())
+        names = {}
+        records = {}
+        event_handles = set()
+        for person in db.iter_people():
+            name = person.get_primary_name()
+            birth_ref = person.get_birth_ref()
+            death_ref = person.get_death_ref()
+            birth = birth_ref.ref if birth_ref else None
+            death = death_ref.ref if death_ref else None
+            event_handles.update((birth, death))
+            names[person.handle] = self.__name_features(name)
+            records[person.handle] = (
+                person.get_gender(), birth, death,
+                person.get_main_parents_family_handle(),
+                person.get_family_handle_list())
+            if user:
+                user.step_progress()
+        if user:
+            user.end_progress()
+
+        couples = {family.handle: (family.get_father_handle(),
+                                   family.get_mother_handle())
+                   for family in db.iter_families()}
+        events = {event.handle: (event.get_date_object(),
+                                 event.get_place_handle())
+                  for event in db.iter_events()
+                  if event.handle in event_handles}
+        place_handles = {place for dummy, place in events.values()}
+        places = {place.handle: self.__place_features(place)
+                  for place in db.iter_places()
+                  if place.handle in place_handles}
+        no_event = (_EMPTY_DATE, "")
+
+        handles = list(db.iter_person_handles())
+        people = []
+        parents = {}
+        for handle in handles:
+            gender, birth, death, main_family, families = records[handle]
+            name = names[handle]
+            birth_date, birth_place = events.get(birth, no_event)
+            death_date, death_place = events.get(death, no_event)
+            if main_family in couples:
+                father, mother = parents[handle] = couples[main_family]
+                parent_names = (names.get(father), names.get(mother))
+            else:
+                parent_names = None
+            spouses = []
+            for family in families:
+                if family in couples:
+                    father, mother = couples[family]
+                    spouses.append((father, names.get(father),
+                                    mother, names.get(mother)))
+            features = _Features(
+                gender == Person.FEMALE, name, birth_date, death_date,
+                places.get(birth_place, _Place(birth_place, "", ())),
+                places.get(death_place, _Place(death_place, "", ())),
+                parent_names, spouses)
+
+            # the blocks of the person: a block for each initial of their
+            # given names, and for the year of their birth if it is known
+            if name.parts:
+                givens = frozenset(part[0][0] for part in name.parts)
+            else:
+                givens = frozenset([name.first_name])
+            if (birth_date.is_empty() or birth_date.is_compound() or
+                    birth_date.get_modifier() == Date.MOD_TEXTONLY):
+                year = None
+            else:
+                year = birth_date.get_year()
+            people.append((handle, gender == Person.MALE, givens, year,
+                           features))
+        return handles, people, parents
+
+    def __make_blocks(self, people, split):
+        """
+        Return a list of the (given, [(index, year), ...]) blocks of the
+        people who can be alike: of the same sex and with the same key of
+        their surnames.  If split, these are split by the initials of the
+        given names and by year of birth, which people with a chance of -1
+        would be compared across.
+        """
+        blocks = {}
+        for index, (dummy, male, givens, year, features) in enumerate(people):
+            if split:
+                for given in givens:
+                    key = (male, features.name.surname_key, given)
+                    blocks.setdefault(key, []).append((index, year))
+            else:
+                key = (male, features.name.surname_key, None)
+                blocks.setdefault(key, []).append((index, None))
+        return [(key[2], members) for key, members in blocks.items()
+                if len(members) > 1]
+
+    def __name_features(self, name):
+        """
+        Return the _Name features of a Name.
+        """
+        first_name = name.get_first_name()
+        return _Name(self.gen_key(get_surnames(name)), name.get_suffix(),
+                     first_name,
+                     tuple((part, self.gen_key(part), is_initial(part))
+                           for part in first_name.split()))
+
+    def __place_features(self, place):
+        """
+        Return the _Place features of a Place.
+        """
+        title = place.get_title()
+        return _Place(place.handle, title,
+                      tuple((part, self.gen_key(part))
+                            for part in title.replace(",", " ").split()))
@@ -90,6 +90,8 @@ all lines until the next level 2 token is found (in this case, skipping the
 #-------------------------------------------------------------------------
 import os
 import re
+import queue
+import threading
 import time
 # from xml.parsers.expat import ParserCreate
 from collections import defaultdict, OrderedDict
@@ -838,8 +840,21 @@ class GedcomDateParser(DateParser):
 # Lexer - serves as the lexical analysis engine
 #
 #-------------------------------------------------------------------------
+
+# number of lines the reading thread tokenizes before passing them on
+LEX_BATCH_SIZE = 1000
+# number of batches the reading thread may get ahead of the parser
+LEX_QUEUE_SIZE = 8
+
 class Lexer:
-    """ low level line reading and early parsing """
+    """
+    low level line reading and early parsing
+
+    The lines are read, decoded and tokenized by a thread of their own,
+    which passes them on in batches through a bounded queue, so the reading
+    overlaps with the parsing and the database writes.  Problems found in
+    the lines are passed on with them, and reported in the same order.
+    """
     def __init__(self, ifile, __add_msg):
         self.ifile = ifile
         self.current_list = []
@@ -850,6 +865,11 @@ class Lexer:
         self.func_map = {TOKEN_CONT : self.__fix_token_cont,
                          TOKEN_CONC : self.__fix_token_conc}
         self.__add_msg = __add_msg
+        self.queue = queue.Queue(LEX_QUEUE_SIZE)
+        self.batch = []
+        self.items = iter(())
+        self.thread = None
+        self.stopped = threading.Event()
 
     def readline(self):
         """ read a line from file with possibility of putting it back """
@@ -861,6 +881,28 @@ class Lexer:
             LOG.debug('Error in reading Gedcom line', exc_info=True)
             return None
 
+    def report(self, problem):
+        """
+        Report a problem found while reading a line.  Called from the
+        reading thread.
+        """
+        self.batch.append(problem)
+
+    def stop(self):
+        """
+        Stop the reading thread, if it is still running.
+        """
+        if self.thread is None:
+            return
+        self.stopped.set()
+        try:
+            while True:
+                self.queue.get_nowait()
+        except queue.Empty:
+            pass
+        self.thread.join()
+        self.thread = None
+
     def __fix_token_cont(self, data):
         line = self.current_list[0]
         new_value = line[2] + '\n' + data[2]
@@ -882,79 +924,137 @@ class Lexer:
         self.current_list[0] = (line[0], line[1], new_value, line[3], line[4])
 
     def __readahead(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.__read, daemon=True)
+            self.thread.start()
         while len(self.current_list) < 5:
-            line = self.ifile.readline()
-            self.index += 1
-            if not line:
+            data = self.__next_item()
+            if data is None:
                 self.eof = True
                 return
-
-            original_line = line
-            try:
-                # According to the GEDCOM 5.5 standard,
-                # Chapter 1 subsection Grammar "leading whitespace preceeding
-                # a GEDCOM line should be ignored"
-                # We will also strip the terminator which is any combination
-                # of carriage_return and line_feed
-                line = line.lstrip(' ').rstrip('\n\r')
-                # split into level+delim+rest
-                line = line.partition(' ')
-                level = int(line[0])
-                # there should only be one space after the level,
-                # but we can ignore more,
-                line = line[2].lstrip(' ')
-                # then split into tag+delim+line_value
-                # or xfef_id+delim+rest
-                # the xref_id can have spaces in it
-                if line.startswith('@'):
-                    line = line.split('@', 2)
-                    # line is now [None, alphanum+pointer_string, rest]
-                    tag = '@' + line[1] + '@'
-                    line_value = line[2].lstrip()
-                    # Ignore meaningless @IDENT@ on CONT or CONC line
-                    # as noted at http://www.tamurajones.net/IdentCONT.xhtml
-                    if (line_value.lstrip().startswith("CONT ") or
-                            line_value.lstrip().startswith("CONC ")):
-                        line = line_value.lstrip().partition(' ')
-                        tag = line[0]
-                        line_value = line[2]
-                else:
-                    line = line.partition(' ')
-                    tag = line[0]
-                    line_value = line[2]
-            except:
-                problem = _("Line ignored ")
-                text = original_line.rstrip('\n\r')
-                prob_width = 66
-                problem = problem.ljust(prob_width)[0:(prob_width - 1)]
-                text = text.replace("\n", "\n".ljust(prob_width + 22))
-                message = "%s              %s" % (problem, text)
-                self.__add_msg(message)
+            if isinstance(data, str):
+                self.__add_msg(data)
                 continue
-
-            # Need to un-double '@' See Gedcom 5.5 spec 'any_char'
-            line_value = line_value.replace('@@', '@')
-            token = TOKENS.get(tag, TOKEN_UNKNOWN)
-            data = (level, token, line_value, tag, self.index)
+            self.index = data[4]
 
             func = self.func_map.get(data[1])
             if func:
                 func(data)
             else:
-                # There will normally only be one space between tag and
-                # line_value, but in case there is more then one, remove extra
-                # spaces after CONC/CONT processing
-                # Also, Gedcom spec says there should be no spaces at end of
-                # line, however some programs put them there (FTM), so let's
-                # leave them in place.
-                data = data[:2] + (data[2].lstrip(),) + data[3:]
                 self.current_list.insert(0, data)
 
+    def __next_item(self):
+        """
+        Return the next tokenized line or problem from the reading thread,
+        or None at the end of the file.
+        """
+        for item in self.items:
+            return item
+        items = self.queue.get()
+        if isinstance(items, Exception):
+            raise items
+        self.items = iter(items)
+        return next(self.items)
+
+    def __put(self, items):
+        """
+        Pass items on from the reading thread, unless it is stopped.
+        """
+        if items and not self.stopped.is_set():
+            self.queue.put(items)
+
+    def __read(self):
+        """
+        Read and tokenize the lines of the file, in the reading thread.
+        """
+        index = 0
+        try:
+            while not self.stopped.is_set():
+                line = self.ifile.readline()
+                index += 1
+                if not line:
+                    self.batch.append(None)
+                    break
+                data = self.__tokenize(line, index)
+                if data:
+                    self.batch.append(data)
+                if len(self.batch) >= LEX_BATCH_SIZE:
+                    self.__put(self.batch)
+                    self.batch = []
+        except Exception as err:
+            self.__put(self.batch)
+            self.__put(err)
+        else:
+            self.__put(self.batch)
+        self.batch = []
+
+    def __tokenize(self, line, index):
+        """
+        Split a line into level, token, value and tag.  Return None, after
+        reporting the problem, if the line cannot be split.
+        """
+        original_line = line
+        try:
+            # According to the GEDCOM 5.5 standard,
+            # Chapter 1 subsection Grammar "leading whitespace preceeding
+            # a GEDCOM line should be ignored"
+            # We will also strip the terminator which is any combination
+            # of carriage_return and line_feed
+            line = line.lstrip(' ').rstrip('\n\r')
+            # split into level+delim+rest
+            line = line.partition(' ')
+            level = int(line[0])
+            # there should only be one space after the level,
+            # but we can ignore more,
+            line = line[2].lstrip(' ')
+            # then split into tag+delim+line_value
+            # or xfef_id+delim+rest
+            # the xref_id can have spaces in it
+            if line.startswith('@'):
+                line = line.split('@', 2)
+                # line is now [None, alphanum+pointer_string, rest]
+                tag = '@' + line[1] + '@'
+                line_value = line[2].lstrip()
+                # Ignore meaningless @IDENT@ on CONT or CONC line
+                # as noted at http://www.tamurajones.net/IdentCONT.xhtml
+                if (line_value.lstrip().startswith("CONT ") or
+                        line_value.lstrip().startswith("CONC ")):
+                    line = line_value.lstrip().partition(' ')
+                    tag = line[0]
+                    line_value = line[2]
+            else:
+                line = line.partition(' ')
+                tag = line[0]
+                line_value = line[2]
+        except:
+            problem = _("Line ignored ")
+            text = original_line.rstrip('\n\r')
+            prob_width = 66
+            problem = problem.ljust(prob_width)[0:(prob_width - 1)]
+            text = text.replace("\n", "\n".ljust(prob_width + 22))
+            message = "%s              %s" % (problem, text)
+            self.report(message)
+            return None
+
+        # Need to un-double '@' See Gedcom 5.5 spec 'any_char'
+        line_value = line_value.replace('@@', '@')
+        token = TOKENS.get(tag, TOKEN_UNKNOWN)
+        if token not in (TOKEN_CONT, TOKEN_CONC):
+            # There will normally only be one space between tag and
+            # line_value, but in case there is more then one, remove extra
+            # spaces after CONC/CONT processing
+            # Also, Gedcom spec says there should be no spaces at end of
+            # line, however some programs put them there (FTM), so let's
+            # leave them in place.
+            line_value = line_value.lstrip()
+        return (level, token, line_value, tag, index)
+
     def clean_up(self):
         """
         Break circular references to parsing methods stored in dictionaries
         to aid garbage collection
         """
+        self.stop()
         for key in list(self.func_map.keys()):
             del self.func_map[key]
         del self.func_map
@@ -2703,15 +2803,15 @@ class GedcomParser(UpdateCallback):
         enc = stage_one.get_encoding()
 
         if enc == "ANSEL":
-            rdr = AnselReader(ifile, self.__add_msg)
+            rdr = AnselReader(ifile, self.__add_line_msg)
         elif enc in ("UTF-8", "UTF8", "UTF_8_SIG"):
-            rdr = UTF8Reader(ifile, self.__add_msg, enc)
+            rdr = UTF8Reader(ifile, self.__add_line_msg, enc)
         elif enc in ("UTF-16LE", "UTF-16BE", "UTF16", "UNICODE"):
-            rdr = UTF16Reader(ifile, self.__add_msg)
+            rdr = UTF16Reader(ifile, self.__add_line_msg)
         elif enc in ("CP1252", "WINDOWS-1252"):
-            rdr = CP1252Reader(ifile, self.__add_msg)
+            rdr = CP1252Reader(ifile, self.__add_line_msg)
         else:
-            rdr = AnsiReader(ifile, self.__add_msg)
+            rdr = AnsiReader(ifile, self.__add_line_msg)
 
         self.lexer = Lexer(rdr, self.__add_msg)
         self.filename = filename
@@ -2738,31 +2838,34 @@ class GedcomParser(UpdateCallback):
 
         """
         no_magic = self.maxpeople < 1000
-        with DbTxn(_("GEDCOM import"), self.dbase, not use_trans,
-                   no_magic=no_magic) as self.trans:
-
-            self.dbase.disable_signals()
-            self.__parse_header_head()
-            self.want_parse_warnings = False
-            self.__parse_header()
-            self.want_parse_warnings = True
-            if self.use_def_src:
-                self.dbase.add_source(self.def_src, self.trans)
-            if self.default_tag and self.default_tag.handle is None:
-                self.dbase.add_tag(self.default_tag, self.trans)
-            self.__parse_record()
-            self.__parse_trailer()
-            for title, handle in self.inline_srcs.items():
-                src = Source()
-                src.set_handle(handle)
-                src.set_title(title)
-                self.dbase.add_source(src, self.trans)
-            self.__clean_up()
-
-            self.place_import.generate_hierarchy(self.trans)
-
-            if not self.dbase.get_feature("skip-check-xref"):
-                self.__check_xref()
+        try:
+            with DbTxn(_("GEDCOM import"), self.dbase, not use_trans,
+                       no_magic=no_magic) as self.trans:
+
+                self.dbase.disable_signals()
+                self.__parse_header_head()
+                self.want_parse_warnings = False
+                self.__parse_header()
+                self.want_parse_warnings = True
+                if self.use_def_src:
+                    self.dbase.add_source(self.def_src, self.trans)
+                if self.default_tag and self.default_tag.handle is None:
+                    self.dbase.add_tag(self.default_tag, self.trans)
+                self.__parse_record()
+                self.__parse_trailer()
+                for title, handle in self.inline_srcs.items():
+                    src = Source()
+                    src.set_handle(handle)
+                    src.set_title(title)
+                    self.dbase.add_source(src, self.trans)
+                self.__clean_up()
+
+                self.place_import.generate_hierarchy(self.trans)
+
+                if not self.dbase.get_feature("skip-check-xref"):
+                    self.__check_xref()
+        finally:
+            self.lexer.stop()
         self.dbase.enable_signals()
         self.dbase.request_rebuild()
         if self.number_of_errors == 0:
@@ -3181,6 +3284,14 @@ class GedcomParser(UpdateCallback):
             state.msg += message
         self.errors.append(message)
 
+    def __add_line_msg(self, problem):
+        """
+        Add a problem the file reader found in a line.  The lines are read
+        in the lexer's reading thread, so the problem is passed on with
+        them, to be added in order.
+        """
+        self.lexer.report(problem)
+
     def __check_msgs(self, record_name, state, obj):
         if state.msg == "":
             return
@@ -0,0 +1,194 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Unittest for the GEDCOM Lexer, which reads the lines in a thread of its own
+"""
+import io
+import os
+import threading
+import unittest
+from unittest.mock import patch
+
+from gramps.gen.config import config
+from gramps.gen.const import DATA_DIR
+from gramps.gen.db.dbconst import CLASS_TO_KEY_MAP
+from gramps.gen.db.utils import import_as_dict
+from gramps.gen.user import User
+from gramps.gen.utils.id import set_det_id
+from .. import libgedcom
+from ..libgedcom import (Lexer, LEX_BATCH_SIZE, LEX_QUEUE_SIZE, TOKEN_HEAD,
+                         TOKEN_SOUR, TOKEN_NOTE)
+
+TEST_DIR = os.path.abspath(os.path.join(DATA_DIR, "tests"))
+
+class FailingFile(io.StringIO):
+    """ A file which cannot be read past its first lines. """
+    def readline(self):
+        line = io.StringIO.readline(self)
+        if not line:
+            raise OSError("read error")
+        return line
+
+class InlineThread:
+    """
+    A thread which runs when it is started, so that the Lexer reads the
+    whole file before the parsing starts, as it did without a thread.
+    """
+    def __init__(self, target, daemon=None):
+        self.target = target
+
+    def start(self):
+        self.target()
+
+    def join(self):
+        pass
+
+class LexerTest(unittest.TestCase):
+    def setUp(self):
+        self.messages = []
+        self.lexer = None
+
+    def tearDown(self):
+        if self.lexer:
+            self.lexer.stop()
+
+    def lex(self, ifile):
+        self.lexer = Lexer(ifile, self.messages.append)
+        return self.lexer
+
+    def read_all(self, lexer):
+        lines = []
+        while True:
+            line = lexer.readline()
+            if line is None:
+                return lines
+            lines.append(line)
+
+    def test_lines(self):
+        lexer = self.lex(io.StringIO("0 HEAD\n1 SOUR Gramps\n"
+                                     "1 NOTE first\n2 CONT second\n"
+                                     "2 CONC  third\n"))
+        lines = self.read_all(lexer)
+        self.assertEqual([(line.level, line.token, line.data)
+                          for line in lines],
+                         [(0, TOKEN_HEAD, ''), (1, TOKEN_SOUR, 'Gramps'),
+                          (1, TOKEN_NOTE, 'first\nsecond third')])
+        self.assertEqual([line.line for line in lines], [1, 2, 3])
+        self.assertEqual(self.messages, [])
+
+    def test_malformed_line(self):
+        """
+        Test that a malformed line is reported when the parser reaches it,
+        and the lines around it are read.
+        """
+        lexer = self.lex(io.StringIO("0 HEAD\nbad line\n1 SOUR Gramps\n"))
+        self.assertEqual(lexer.readline().token, TOKEN_HEAD)
+        line = lexer.readline()
+        self.assertEqual(len(self.messages), 1)
+        self.assertTrue(self.messages[0].startswith("Line ignored"))
+        self.assertTrue(self.messages[0].endswith("bad line"))
+        self.assertEqual(line.token, TOKEN_SOUR)
+        self.assertIsNone(lexer.readline())
+
+    def test_read_error(self):
+        """
+        Test that an error while reading is raised in the parser, after the
+        lines read before it.
+        """
+        lexer = self.lex(FailingFile("0 HEAD\n1 SOUR Gramps\n"))
+        with self.assertRaises(OSError):
+            self.read_all(lexer)
+        lexer.stop()
+        self.assertIsNone(lexer.thread)
+
+    def test_stop_early(self):
+        """
+        Test that the reading thread stops, when the parser stops before the
+        end of the file and the thread waits for room in the queue.
+        """
+        count = LEX_BATCH_SIZE * (LEX_QUEUE_SIZE + 4)
+        lexer = self.lex(io.StringIO("1 NOTE text\n" * count))
+        self.assertEqual(lexer.readline().token, TOKEN_NOTE)
+        thread = lexer.thread
+        while not lexer.queue.full():
+            thread.join(0.01)
+        stopper = threading.Thread(target=lexer.stop, daemon=True)
+        stopper.start()
+        stopper.join(10)
+        self.assertFalse(stopper.is_alive())
+        self.assertFalse(thread.is_alive())
+        self.assertIsNone(lexer.thread)
+
+    def test_stop_unstarted(self):
+        self.lex(io.StringIO("0 HEAD\n")).stop()
+
+class ImportTest(unittest.TestCase):
+    """
+    Test that the GEDCOM files import the same as when the Lexer read the
+    whole file before the parsing.
+    """
+    def setUp(self):
+        default_source = config.get('preferences.default-source')
+        self.addCleanup(config.set, 'preferences.default-source',
+                        default_source)
+
+    def import_ged(self, filename):
+        messages = []
+        user = User()
+        user.info = lambda msg1, infotext, **kwargs: messages.append(infotext)
+        # the files for a default source are tested with one
+        default_source = "_dfs" in filename
+        config.set('preferences.default-source', default_source)
+        set_det_id(True)
+        db = import_as_dict(filename, user, skp_imp_adds=not default_source)
+        self.assertIsNotNone(db, filename)
+        data = {}
+        for class_name in CLASS_TO_KEY_MAP:
+            data[class_name] = {
+                handle: db.method('get_%s_from_handle', class_name)(
+                    handle).serialize()
+                for handle in db.method('get_%s_handles', class_name)()}
+        db.close()
+        return data, messages
+
+    @patch('gramps.gen.utils.unknown.localtime')
+    @patch('gramps.gen.utils.unknown.time')
+    @patch('time.time')
+    def test_import(self, mock_time, mock_unknown_time, mock_localtime):
+        mock_time.return_value = 946101600.
+        mock_unknown_time.return_value = 946101600.
+        mock_localtime.return_value = (1999, 12, 25, 6, 0, 0, 5, 359, 0)
+        for filename in sorted(os.listdir(TEST_DIR)):
+            if not (filename.startswith("imp_") and
+                    filename.endswith(".ged")):
+                continue
+            with self.subTest(filename=filename):
+                filename = os.path.join(TEST_DIR, filename)
+                threaded = self.import_ged(filename)
+                with patch.object(libgedcom, 'LEX_BATCH_SIZE', 1), \
+                        patch.object(libgedcom, 'LEX_QUEUE_SIZE', 1):
+                    self.assertEqual(self.import_ged(filename), threaded)
+                with patch.object(libgedcom.threading, 'Thread',
+                                  InlineThread), \
+                        patch.object(libgedcom, 'LEX_QUEUE_SIZE', 0):
+                    self.assertEqual(self.import_ged(filename), threaded)
+
+
+if __name__ == "__main__":
+    unittest.main()
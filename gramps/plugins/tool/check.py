@@ -184,9 +184,28 @@ class Check(tool.BatchTool):
                     "Repair tool should be run anew on this new Family Tree."),
                        cli)
                 return
-        with DbTxn(_("Check Integrity"), self.db, batch=True) as trans:
-            self.db.disable_signals()
-            checker = CheckIntegrity(dbstate, uistate, trans)
+        self.db.disable_signals()
+        checker = CheckIntegrity(dbstate, uistate, None)
+
+        # the reference checks read the reference map of the database, so it
+        # is checked first.
+        # for bsddb the check_backlinks doesn't work in 'batch' mode because
+        # the table used for backlinks is closed.
+        with DbTxn(_("Check Backlink Integrity"), self.db,
+                   batch=False) as checker.trans:
+            checker.check_backlinks()
+
+        # rebuilding reference maps needs to be done outside of a transaction
+        # to avoid nesting transactions.
+        if checker.bad_backlinks:
+            checker.progress.set_pass(_('Rebuilding reference maps...'), 6)
+            logging.info('Rebuilding reference maps...')
+            self.db.reindex_reference_map(checker.callback)
+        else:
+            logging.info('    OK: no backlink problems found')
+
+        with DbTxn(_("Check Integrity"), self.db,
+                   batch=True) as checker.trans:
             # start with empty objects, broken links can be corrected below
             # then. This is done before fixing encoding and missing photos,
             # since otherwise we will be trying to fix empty records which are
@@ -225,21 +244,6 @@ class Check(tool.BatchTool):
             checker.check_checksum()
             checker.check_media_sourceref()
 
-        # for bsddb the check_backlinks doesn't work in 'batch' mode because
-        # the table used for backlinks is closed.
-        with DbTxn(_("Check Backlink Integrity"), self.db,
-                   batch=False) as checker.trans:
-            checker.check_backlinks()
-
-        # rebuilding reference maps needs to be done outside of a transaction
-        # to avoid nesting transactions.
-        if checker.bad_backlinks:
-            checker.progress.set_pass(_('Rebuilding reference maps...'), 6)
-            logging.info('Rebuilding reference maps...')
-            self.db.reindex_reference_map(checker.callback)
-        else:
-            logging.info('    OK: no backlink problems found')
-
         self.db.enable_signals()
         self.db.request_rebuild()
 
@@ -255,6 +259,10 @@ class Check(tool.BatchTool):
 # -------------------------------------------------------------------------
 class CheckIntegrity:
 
+    # the number of objects whose references are compared with the
+    # reference map at a time
+    REFERENCE_CHUNK = 1000
+
     def __init__(self, dbstate, uistate, trans):
         self.uistate = uistate
         if self.uistate:
@@ -290,6 +298,9 @@ class CheckIntegrity:
         self.place_errors = 0
         self.duplicated_gramps_ids = 0
         self.bad_backlinks = 0
+        # the handles of the objects with person or repository references
+        # without a handle, by class, found while checking the reference map
+        self.empty_references = None
         self.text = StringIO()
         self.last_img_dir = config.get('behavior.addmedia-image-dir')
         self.progress = ProgressMeter(_('Checking Database'), '',
@@ -1241,6 +1252,11 @@ class CheckIntegrity:
                                ' (1)', total)
         logging.info('Looking for backlink reference problems')
 
+        orphans = self.db.get_orphan_references()
+        if orphans is not None:
+            self.check_reference_map(orphans)
+            return
+
         # dict of object handles indexed by forward link created here
         my_blinks = defaultdict(list)
         my_items = 0  # count of my backlinks for progress meter
@@ -1281,12 +1297,10 @@ class CheckIntegrity:
                 if item not in db_blinks[key]:
                     # Object has reference with no cooresponding backlink
                     self.bad_backlinks += 1
-                    pri_obj = self.db.method('get_%s_from_handle',
-                                             key[0])(key[1])
                     logging.warning('    FAIL: the "%(cls)s" [%(gid)s] '
                                     'has a "%(cls2)s" reference'
                                     ' with no corresponding backlink.',
-                                    {'gid': pri_obj.gramps_id,
+                                    {'gid': self._get_gramps_id(*key),
                                      'cls': key[0], 'cls2': item[0]})
 
         # Now we go through the db table and make checks against ours
@@ -1299,186 +1313,488 @@ class CheckIntegrity:
                 if item not in db_blinks:
                     # backlink to object entirely missing
                     self.bad_backlinks += 1
-                    pri_obj = self.db.method('get_%s_from_handle',
-                                             key[0])(key[1])
                     logging.warning('    FAIL: the "%(cls)s" [%(gid)s] '
                                     'has a backlink to a missing'
                                     ' "%(cls2)s" object.',
-                                    {'gid': pri_obj.gramps_id,
+                                    {'gid': self._get_gramps_id(*key),
                                      'cls': key[0], 'cls2': item[0]})
                     continue
                 # Check if the object has a reference to the backlinked one
                 if key not in my_blinks or item not in my_blinks[key]:
                     # backlink to object which doesn't have reference
                     self.bad_backlinks += 1
-                    pri_obj = self.db.method('get_%s_from_handle',
-                                             key[0])(key[1])
                     logging.warning('    FAIL: the "%(cls)s" [%(gid)s] '
                                     'has a backlink to a "%(cls2)s"'
                                     ' with no corresponding reference.',
-                                    {'gid': pri_obj.gramps_id,
+                                    {'gid': self._get_gramps_id(*key),
                                      'cls': key[0], 'cls2': item[0]})
 
+    def check_reference_map(self, orphans):
+        '''
+        Compare the reference map of the database with the references of
+        the objects, reading the map for a chunk of objects at a time.
+        orphans are the entries of the map held by missing objects.
+        '''
+        self.empty_references = defaultdict(set)
+        for obj_class in CLASS_TO_KEY_MAP.keys():
+            chunk = []
+            for obj in self.db.iter_objects_by_handle(obj_class):
+                chunk.append(obj)
+                if len(chunk) == self.REFERENCE_CHUNK:
+                    self._check_reference_chunk(obj_class, chunk)
+                    chunk = []
+            self._check_reference_chunk(obj_class, chunk)
+
+        self.progress.set_pass(_('Looking for backlink reference problems') +
+                               ' (2)', len(orphans))
+        for obj_class, dummy, ref_class, ref_handle in orphans:
+            self.progress.step()
+            # backlink to object entirely missing
+            self.bad_backlinks += 1
+            if self._has_object(ref_class, ref_handle):
+                logging.warning('    FAIL: the "%(cls)s" [%(gid)s] '
+                                'has a backlink to a missing'
+                                ' "%(cls2)s" object.',
+                                {'gid': self._get_gramps_id(ref_class,
+                                                            ref_handle),
+                                 'cls': ref_class, 'cls2': obj_class})
+            else:
+                logging.warning('    FAIL: a missing "%(cls2)s" object '
+                                'has a reference to a missing "%(cls)s" '
+                                'object in the reference map.',
+                                {'cls': ref_class, 'cls2': obj_class})
+
+    def _check_reference_chunk(self, obj_class, objs):
+        '''
+        Compare the references of a chunk of objects of a class with the
+        reference map.  Every difference is counted as a bad backlink, also
+        when the referenced object is missing, since the reference checks
+        find the missing objects in the map once it is rebuilt.
+        '''
+        db_blinks = self.db.get_reference_map(
+            obj_class, [obj.handle for obj in objs])
+        for obj in objs:
+            self.progress.step()
+            self._find_empty_references(obj_class, obj)
+            handle_list = set(obj.get_referenced_handles_recursively())
+            blinks = db_blinks[obj.handle]
+            for key in handle_list.difference(blinks):
+                self.bad_backlinks += 1
+                if not self._has_object(*key):
+                    logging.warning('    Fail: reference to an object %(obj)s'
+                                    ' not in the db by %(ref)s!',
+                                    {'obj': key,
+                                     'ref': (obj_class, obj.handle)})
+                    continue
+                # Object has reference with no cooresponding backlink
+                logging.warning('    FAIL: the "%(cls)s" [%(gid)s] '
+                                'has a "%(cls2)s" reference'
+                                ' with no corresponding backlink.',
+                                {'gid': self._get_gramps_id(*key),
+                                 'cls': key[0], 'cls2': obj_class})
+            for key in blinks:
+                if key in handle_list:
+                    continue
+                # backlink to object which doesn't have reference
+                self.bad_backlinks += 1
+                if not self._has_object(*key):
+                    logging.warning('    FAIL: the "%(cls2)s" [%(gid)s] '
+                                    'has a backlink to a missing "%(cls)s"'
+                                    ' with no corresponding reference.',
+                                    {'gid': self._get_gramps_id(obj_class,
+                                                                obj.handle),
+                                     'cls': key[0], 'cls2': obj_class})
+                    continue
+                logging.warning('    FAIL: the "%(cls)s" [%(gid)s] '
+                                'has a backlink to a "%(cls2)s"'
+                                ' with no corresponding reference.',
+                                {'gid': self._get_gramps_id(*key),
+                                 'cls': key[0], 'cls2': obj_class})
+
+    def _find_empty_references(self, obj_class, obj):
+        '''
+        Record an object with person or repository references without a
+        handle, which are not in the reference map.
+        '''
+        if obj_class == 'Person':
+            ref_list = obj.get_person_ref_list()
+        elif obj_class == 'Source':
+            ref_list = obj.get_reporef_list()
+        else:
+            return
+        if any(not ref.ref for ref in ref_list):
+            self.empty_references[obj_class].add(obj.handle)
+
+    def _get_empty_references(self, obj_class):
+        '''
+        Return the handles of the objects of a class with person or
+        repository references without a handle.  They are found while
+        checking the reference map, or else by reading the objects.
+        '''
+        if self.empty_references is None:
+            self.empty_references = defaultdict(set)
+            for class_name in ('Person', 'Source'):
+                for obj in self.db.iter_objects_by_handle(class_name):
+                    self._find_empty_references(class_name, obj)
+        return self.empty_references[obj_class]
+
+    def _has_object(self, obj_class, handle):
+        '''
+        Return True if the object of a class with the handle is in the db.
+        '''
+        return bool(handle) and self.db.method('has_%s_handle',
+                                               obj_class)(handle)
+
+    def _get_gramps_id(self, obj_class, handle):
+        '''
+        Return the Gramps ID of an object, or the name of a tag.
+        '''
+        obj = self.db.method('get_%s_from_handle', obj_class)(handle)
+        if obj_class == 'Tag':
+            return obj.get_name()
+        return obj.gramps_id
+
+    def _get_missing_references(self, ref_class, obj_classes=None):
+        '''
+        Return the references to missing objects of a class, as a list of
+        (obj_class, handle, ref_handle), read from the reference map; or
+        None if the db has no reference map to read.  The references can be
+        limited to those held by objects of obj_classes.
+        '''
+        missing = self.db.get_missing_references(ref_class)
+        if missing is None or obj_classes is None:
+            return missing
+        return [item for item in missing if item[0] in obj_classes]
+
+    def _add_missing_references(self, ref_class, missing, invalid, replace):
+        '''
+        Add the handles of the missing objects of ref_class to the set
+        invalid.  Each reference without a handle gets a new handle, which
+        is added too, with the method of the object called replace.
+        '''
+        fixed = set()
+        for obj_class, handle, ref_handle in missing:
+            self.progress.step()
+            if ref_handle:
+                invalid.add(ref_handle)
+                continue
+            if (obj_class, handle) in fixed:
+                continue
+            fixed.add((obj_class, handle))
+            obj = self.db.method('get_%s_from_handle', obj_class)(handle)
+            for item in obj.get_referenced_handles_recursively():
+                if item[0] == ref_class and not item[1]:
+                    new_handle = create_id()
+                    getattr(obj, replace)(None, new_handle)
+                    self.db.method('commit_%s', obj_class)(obj, self.trans)
+                    invalid.add(new_handle)
+
     def callback(self, *args):
         self.progress.step()
 
     def check_person_references(self):
         '''Looking for person reference problems'''
-        plist = self.db.get_person_handles()
-
-        self.progress.set_pass(_('Looking for person reference problems'),
-                               len(plist))
-        logging.info('Looking for person reference problems')
-
-        for key in plist:
-            self.progress.step()
-            none_handle = False
-            newlist = []
-            person = self.db.get_person_from_handle(key)
-            for pref in person.get_person_ref_list():
-                newlist.append(pref)
-                if not pref.ref:
-                    none_handle = True
-                    pref.ref = create_id()
-                try:
-                    self.db.get_person_from_handle(pref.ref)
-                except HandleError:
+        missing = self._get_missing_references('Person', ['Person'])
+        if missing is not None:
+            self.progress.set_pass(_('Looking for person reference problems'),
+                                   len(missing))
+            logging.info('Looking for person reference problems')
+
+            unknown = set()
+            for dummy, key, ref_handle in missing:
+                self.progress.step()
+                if ref_handle not in unknown:
                     # The referenced person does not exist in the database
-                    make_unknown(pref.ref, self.explanation.handle,
+                    unknown.add(ref_handle)
+                    make_unknown(ref_handle, self.explanation.handle,
                                  self.class_person, self.commit_person,
                                  self.trans)
                     self.invalid_person_references.add(key)
-            if none_handle:
-                person.set_person_ref_list(newlist)
+            # references without a handle are not in the reference map
+            for key in self._get_empty_references('Person'):
+                person = self.db.get_person_from_handle(key)
+                for pref in person.get_person_ref_list():
+                    if not pref.ref:
+                        pref.ref = create_id()
+                        make_unknown(pref.ref, self.explanation.handle,
+                                     self.class_person, self.commit_person,
+                                     self.trans)
                 self.db.commit_person(person, self.trans)
+                self.invalid_person_references.add(key)
+        else:
+            plist = self.db.get_person_handles()
+
+            self.progress.set_pass(_('Looking for person reference problems'),
+                                   len(plist))
+            logging.info('Looking for person reference problems')
+
+            for key in plist:
+                self.progress.step()
+                none_handle = False
+                newlist = []
+                person = self.db.get_person_from_handle(key)
+                for pref in person.get_person_ref_list():
+                    newlist.append(pref)
+                    if not pref.ref:
+                        none_handle = True
+                        pref.ref = create_id()
+                    try:
+                        self.db.get_person_from_handle(pref.ref)
+                    except HandleError:
+                        # The referenced person does not exist in the database
+                        make_unknown(pref.ref, self.explanation.handle,
+                                     self.class_person, self.commit_person,
+                                     self.trans)
+                        self.invalid_person_references.add(key)
+                if none_handle:
+                    person.set_person_ref_list(newlist)
+                    self.db.commit_person(person, self.trans)
 
         if len(self.invalid_person_references) == 0:
             logging.info('    OK: no event problems found')
 
     def check_family_references(self):
         '''Looking for family reference problems'''
-        plist = self.db.get_person_handles()
+        missing = self._get_missing_references('Family', ['Person'])
+        if missing is not None:
+            self.progress.set_pass(_('Looking for family reference problems'),
+                                   len(missing))
+            logging.info('Looking for family reference problems')
+
+            unknown = set()
+            for dummy, key, family_handle in missing:
+                self.progress.step()
+                if family_handle not in unknown:
+                    # The referenced family does not exist in the database
+                    unknown.add(family_handle)
+                    make_unknown(family_handle, self.explanation.handle,
+                                 self.class_family, self.commit_family,
+                                 self.trans, db=self.db)
+                    self.invalid_family_references.add(key)
+        else:
+            plist = self.db.get_person_handles()
 
-        self.progress.set_pass(_('Looking for family reference problems'),
-                               len(plist))
-        logging.info('Looking for family reference problems')
+            self.progress.set_pass(_('Looking for family reference problems'),
+                                   len(plist))
+            logging.info('Looking for family reference problems')
 
-        for key in plist:
-            self.progress.step()
-            person = self.db.get_person_from_handle(key)
-            for ordinance in person.get_lds_ord_list():
-                family_handle = ordinance.get_family_handle()
-                if family_handle:
-                    try:
-                        self.db.get_family_from_handle(family_handle)
-                    except HandleError:
-                        # The referenced family does not exist in the database
-                        make_unknown(family_handle, self.explanation.handle,
-                                     self.class_family, self.commit_family,
-                                     self.trans, db=self.db)
-                        self.invalid_family_references.add(key)
+            for key in plist:
+                self.progress.step()
+                person = self.db.get_person_from_handle(key)
+                for ordinance in person.get_lds_ord_list():
+                    family_handle = ordinance.get_family_handle()
+                    if family_handle:
+                        try:
+                            self.db.get_family_from_handle(family_handle)
+                        except HandleError:
+                            # The referenced family does not exist in the
+                            # database
+                            make_unknown(family_handle,
+                                         self.explanation.handle,
+                                         self.class_family, self.commit_family,
+                                         self.trans, db=self.db)
+                            self.invalid_family_references.add(key)
 
         if len(self.invalid_family_references) == 0:
             logging.info('    OK: no event problems found')
 
     def check_repo_references(self):
         '''Looking for repository reference problems'''
-        slist = self.db.get_source_handles()
-
-        self.progress.set_pass(_('Looking for repository reference problems'),
-                               len(slist))
-        logging.info('Looking for repository reference problems')
-
-        for key in slist:
-            self.progress.step()
-            none_handle = False
-            newlist = []
-            source = self.db.get_source_from_handle(key)
-            for reporef in source.get_reporef_list():
-                newlist.append(reporef)
-                if not reporef.ref:
-                    none_handle = True
-                    reporef.ref = create_id()
-                try:
-                    self.db.get_repository_from_handle(reporef.ref)
-                except HandleError:
-                    # The referenced repository does not exist in the database
-                    make_unknown(reporef.ref, self.explanation.handle,
+        missing = self._get_missing_references('Repository')
+        if missing is not None:
+            self.progress.set_pass(
+                _('Looking for repository reference problems'), len(missing))
+            logging.info('Looking for repository reference problems')
+
+            unknown = set()
+            for dummy, key, ref_handle in missing:
+                self.progress.step()
+                if ref_handle not in unknown:
+                    # The referenced repository does not exist in the
+                    # database
+                    unknown.add(ref_handle)
+                    make_unknown(ref_handle, self.explanation.handle,
                                  self.class_repo, self.commit_repo, self.trans)
                     self.invalid_repo_references.add(key)
-            if none_handle:
-                source.set_reporef_list(newlist)
+            # references without a handle are not in the reference map
+            for key in self._get_empty_references('Source'):
+                source = self.db.get_source_from_handle(key)
+                for reporef in source.get_reporef_list():
+                    if not reporef.ref:
+                        reporef.ref = create_id()
+                        make_unknown(reporef.ref, self.explanation.handle,
+                                     self.class_repo, self.commit_repo,
+                                     self.trans)
                 self.db.commit_source(source, self.trans)
+                self.invalid_repo_references.add(key)
+        else:
+            slist = self.db.get_source_handles()
+
+            self.progress.set_pass(
+                _('Looking for repository reference problems'), len(slist))
+            logging.info('Looking for repository reference problems')
+
+            for key in slist:
+                self.progress.step()
+                none_handle = False
+                newlist = []
+                source = self.db.get_source_from_handle(key)
+                for reporef in source.get_reporef_list():
+                    newlist.append(reporef)
+                    if not reporef.ref:
+                        none_handle = True
+                        reporef.ref = create_id()
+                    try:
+                        self.db.get_repository_from_handle(reporef.ref)
+                    except HandleError:
+                        # The referenced repository does not exist in the
+                        # database
+                        make_unknown(reporef.ref, self.explanation.handle,
+                                     self.class_repo, self.commit_repo,
+                                     self.trans)
+                        self.invalid_repo_references.add(key)
+                if none_handle:
+                    source.set_reporef_list(newlist)
+                    self.db.commit_source(source, self.trans)
 
         if len(self.invalid_repo_references) == 0:
             logging.info('    OK: no repository reference problems found')
 
     def check_place_references(self):
         '''Looking for place reference problems'''
-        plist = self.db.get_person_handles()
-        flist = self.db.get_family_handles()
-        elist = self.db.get_event_handles()
-        llist = self.db.get_place_handles()
-        self.progress.set_pass(
-            _('Looking for place reference problems'),
-            len(elist) + len(plist) + len(flist) + len(llist))
-        logging.info('Looking for place reference problems')
-
-        for key in llist:
-            self.progress.step()
-            none_handle = False
-            newlist = []
-            place = self.db.get_place_from_handle(key)
-            for placeref in place.get_placeref_list():
-                newlist.append(placeref)
-                if not placeref.ref:
-                    none_handle = True
-                    placeref.ref = create_id()
-                try:
-                    self.db.get_place_from_handle(placeref.ref)
-                except HandleError:
-                    # The referenced place does not exist in the database
-                    make_unknown(placeref.ref, self.explanation.handle,
-                                 self.class_place, self.commit_place,
-                                 self.trans)
-                    logging.warning('    FAIL: the place "%(gid)s" refers '
-                                    'to a parent place "%(hand)s" which '
-                                    'does not exist in the database',
-                                    {'gid': place.gramps_id,
-                                     'hand': placeref.ref})
-                    self.invalid_place_references.add(key)
-            if none_handle:
-                place.set_placeref_list(newlist)
-                self.db.commit_place(place, self.trans)
-
-        # check persons -> the LdsOrd references a place
-        for key in plist:
-            self.progress.step()
-            person = self.db.get_person_from_handle(key)
-            for ordinance in person.lds_ord_list:
-                place_handle = ordinance.get_place_handle()
+        missing = self._get_missing_references('Place')
+        if missing is not None:
+            self.progress.set_pass(_('Looking for place reference problems'),
+                                   len(missing))
+            logging.info('Looking for place reference problems')
+
+            messages = {
+                'Place': '    FAIL: the place "%(gid)s" refers to a parent '
+                         'place "%(hand)s" which does not exist in the '
+                         'database',
+                'Person': '    FAIL: the person "%(gid)s" refers to an LdsOrd '
+                          'place "%(hand)s" which does not exist in the '
+                          'database',
+                'Family': '    FAIL: the family "%(gid)s" refers to an LdsOrd '
+                          'place "%(hand)s" which does not exist in the '
+                          'database',
+                'Event': '    FAIL: the event "%(gid)s" refers to an LdsOrd '
+                         'place "%(hand)s" which does not exist in the '
+                         'database'}
+            unknown = set()
+            for obj_class, key, place_handle in missing:
+                self.progress.step()
+                obj = self.db.method('get_%s_from_handle', obj_class)(key)
                 if place_handle:
+                    handles = [place_handle]
+                else:
+                    # only place references can be without a handle
+                    handles = []
+                    for placeref in obj.get_placeref_list():
+                        if not placeref.ref:
+                            placeref.ref = create_id()
+                            handles.append(placeref.ref)
+                    if handles:
+                        self.db.commit_place(obj, self.trans)
+                for place_handle in handles:
+                    if place_handle not in unknown:
+                        # The referenced place does not exist in the database
+                        unknown.add(place_handle)
+                        make_unknown(place_handle, self.explanation.handle,
+                                     self.class_place, self.commit_place,
+                                     self.trans)
+                        logging.warning(messages[obj_class],
+                                        {'gid': obj.gramps_id,
+                                         'hand': place_handle})
+                        self.invalid_place_references.add(key)
+        else:
+            plist = self.db.get_person_handles()
+            flist = self.db.get_family_handles()
+            elist = self.db.get_event_handles()
+            llist = self.db.get_place_handles()
+            self.progress.set_pass(
+                _('Looking for place reference problems'),
+                len(elist) + len(plist) + len(flist) + len(llist))
+            logging.info('Looking for place reference problems')
+
+            for key in llist:
+                self.progress.step()
+                none_handle = False
+                newlist = []
+                place = self.db.get_place_from_handle(key)
+                for placeref in place.get_placeref_list():
+                    newlist.append(placeref)
+                    if not placeref.ref:
+                        none_handle = True
+                        placeref.ref = create_id()
                     try:
-                        place = self.db.get_place_from_handle(place_handle)
+                        self.db.get_place_from_handle(placeref.ref)
                     except HandleError:
                         # The referenced place does not exist in the database
-                        # This is tested by TestcaseGenerator person "Broken17"
-                        # This is tested by TestcaseGenerator person "Broken18"
-                        make_unknown(place_handle, self.explanation.handle,
+                        make_unknown(placeref.ref, self.explanation.handle,
                                      self.class_place, self.commit_place,
                                      self.trans)
-                        logging.warning('    FAIL: the person "%(gid)s" refers'
-                                        ' to an LdsOrd place "%(hand)s" which '
+                        logging.warning('    FAIL: the place "%(gid)s" refers '
+                                        'to a parent place "%(hand)s" which '
                                         'does not exist in the database',
-                                        {'gid': person.gramps_id,
-                                         'hand': place_handle})
+                                        {'gid': place.gramps_id,
+                                         'hand': placeref.ref})
                         self.invalid_place_references.add(key)
-        # check families -> the LdsOrd references a place
-        for key in flist:
-            self.progress.step()
-            family = self.db.get_family_from_handle(key)
-            for ordinance in family.lds_ord_list:
-                place_handle = ordinance.get_place_handle()
+                if none_handle:
+                    place.set_placeref_list(newlist)
+                    self.db.commit_place(place, self.trans)
+
+            # check persons -> the LdsOrd references a place
+            for key in plist:
+                self.progress.step()
+                person = self.db.get_person_from_handle(key)
+                for ordinance in person.lds_ord_list:
+                    place_handle = ordinance.get_place_handle()
+                    if place_handle:
+                        try:
+                            place = self.db.get_place_from_handle(place_handle)
+                        except HandleError:
+                            # The referenced place does not exist in the
+                            # database
+                            # This is tested by TestcaseGenerator person
+                            # "Broken17" and "Broken18"
+                            make_unknown(place_handle, self.explanation.handle,
+                                         self.class_place, self.commit_place,
+                                         self.trans)
+                            logging.warning('    FAIL: the person "%(gid)s" '
+                                            'refers to an LdsOrd place '
+                                            '"%(hand)s" which does not exist '
+                                            'in the database',
+                                            {'gid': person.gramps_id,
+                                             'hand': place_handle})
+                            self.invalid_place_references.add(key)
+            # check families -> the LdsOrd references a place
+            for key in flist:
+                self.progress.step()
+                family = self.db.get_family_from_handle(key)
+                for ordinance in family.lds_ord_list:
+                    place_handle = ordinance.get_place_handle()
+                    if place_handle:
+                        try:
+                            place = self.db.get_place_from_handle(place_handle)
+                        except HandleError:
+                            # The referenced place does not exist in the
+                            # database
+                            make_unknown(place_handle, self.explanation.handle,
+                                         self.class_place, self.commit_place,
+                                         self.trans)
+                            logging.warning('    FAIL: the family "%(gid)s" '
+                                            'refers to an LdsOrd place '
+                                            '"%(hand)s" which does not exist '
+                                            'in the database',
+                                            {'gid': family.gramps_id,
+                                             'hand': place_handle})
+                            self.invalid_place_references.add(key)
+            # check events
+            for key in elist:
+                self.progress.step()
+                event = self.db.get_event_from_handle(key)
+                place_handle = event.get_place_handle()
                 if place_handle:
                     try:
                         place = self.db.get_place_from_handle(place_handle)
@@ -1487,152 +1803,145 @@ class CheckIntegrity:
                         make_unknown(place_handle, self.explanation.handle,
                                      self.class_place, self.commit_place,
                                      self.trans)
-                        logging.warning('    FAIL: the family "%(gid)s" refers'
-                                        ' to an LdsOrd place "%(hand)s" which '
+                        logging.warning('    FAIL: the event "%(gid)s" refers '
+                                        'to an LdsOrd place "%(hand)s" which '
                                         'does not exist in the database',
-                                        {'gid': family.gramps_id,
+                                        {'gid': event.gramps_id,
                                          'hand': place_handle})
                         self.invalid_place_references.add(key)
-        # check events
-        for key in elist:
-            self.progress.step()
-            event = self.db.get_event_from_handle(key)
-            place_handle = event.get_place_handle()
-            if place_handle:
-                try:
-                    place = self.db.get_place_from_handle(place_handle)
-                except HandleError:
-                    # The referenced place does not exist in the database
-                    make_unknown(place_handle, self.explanation.handle,
-                                 self.class_place, self.commit_place,
-                                 self.trans)
-                    logging.warning('    FAIL: the event "%(gid)s" refers '
-                                    'to an LdsOrd place "%(hand)s" which '
-                                    'does not exist in the database',
-                                    {'gid': event.gramps_id,
-                                     'hand': place_handle})
-                    self.invalid_place_references.add(key)
 
         if len(self.invalid_place_references) == 0:
             logging.info('    OK: no place reference problems found')
 
     def check_citation_references(self):
         '''Looking for citation reference problems'''
-        known_handles = self.db.get_citation_handles()
+        missing = self._get_missing_references('Citation')
+        if missing is not None:
+            self.progress.set_pass(
+                _('Looking for citation reference problems'), len(missing))
+            logging.info('Looking for citation reference problems')
+            self._add_missing_references('Citation', missing,
+                                         self.invalid_citation_references,
+                                         'replace_citation_references')
+        else:
+            known_handles = self.db.get_citation_handles()
+
+            total = (
+                self.db.get_number_of_people() +
+                self.db.get_number_of_families() +
+                self.db.get_number_of_events() +
+                self.db.get_number_of_places() +
+                self.db.get_number_of_citations() +
+                self.db.get_number_of_sources() +
+                self.db.get_number_of_media() +
+                self.db.get_number_of_repositories()
+                )
 
-        total = (
-            self.db.get_number_of_people() +
-            self.db.get_number_of_families() +
-            self.db.get_number_of_events() +
-            self.db.get_number_of_places() +
-            self.db.get_number_of_citations() +
-            self.db.get_number_of_sources() +
-            self.db.get_number_of_media() +
-            self.db.get_number_of_repositories()
-            )
+            self.progress.set_pass(
+                _('Looking for citation reference problems'), total)
+            logging.info('Looking for citation reference problems')
 
-        self.progress.set_pass(_('Looking for citation reference problems'),
-                               total)
-        logging.info('Looking for citation reference problems')
+            for handle in self.db.get_person_handles():
+                self.progress.step()
+                person = self.db.get_person_from_handle(handle)
+                handle_list = person.get_referenced_handles_recursively()
+                for item in handle_list:
+                    if item[0] == 'Citation':
+                        if not item[1]:
+                            new_handle = create_id()
+                            person.replace_citation_references(
+                                None, new_handle)
+                            self.db.commit_person(person, self.trans)
+                            self.invalid_citation_references.add(new_handle)
+                        elif item[1] not in known_handles:
+                            self.invalid_citation_references.add(item[1])
 
-        for handle in self.db.get_person_handles():
-            self.progress.step()
-            person = self.db.get_person_from_handle(handle)
-            handle_list = person.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == 'Citation':
-                    if not item[1]:
-                        new_handle = create_id()
-                        person.replace_citation_references(None, new_handle)
-                        self.db.commit_person(person, self.trans)
-                        self.invalid_citation_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_citation_references.add(item[1])
-
-        for handle in self.db.get_family_handles():
-            self.progress.step()
-            family = self.db.get_family_from_handle(handle)
-            handle_list = family.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == 'Citation':
-                    if not item[1]:
-                        new_handle = create_id()
-                        family.replace_citation_references(None, new_handle)
-                        self.db.commit_family(family, self.trans)
-                        self.invalid_citation_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_citation_references.add(item[1])
+            for handle in self.db.get_family_handles():
+                self.progress.step()
+                family = self.db.get_family_from_handle(handle)
+                handle_list = family.get_referenced_handles_recursively()
+                for item in handle_list:
+                    if item[0] == 'Citation':
+                        if not item[1]:
+                            new_handle = create_id()
+                            family.replace_citation_references(
+                                None, new_handle)
+                            self.db.commit_family(family, self.trans)
+                            self.invalid_citation_references.add(new_handle)
+                        elif item[1] not in known_handles:
+                            self.invalid_citation_references.add(item[1])
 
-        for handle in self.db.get_place_handles():
-            self.progress.step()
-            place = self.db.get_place_from_handle(handle)
-            handle_list = place.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == 'Citation':
-                    if not item[1]:
-                        new_handle = create_id()
-                        place.replace_citation_references(None, new_handle)
-                        self.db.commit_place(place, self.trans)
-                        self.invalid_citation_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_citation_references.add(item[1])
-
-        for handle in self.db.get_citation_handles():
-            self.progress.step()
-            citation = self.db.get_citation_from_handle(handle)
-            handle_list = citation.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == 'Citation':
-                    if not item[1]:
-                        new_handle = create_id()
-                        citation.replace_citation_references(None, new_handle)
-                        self.db.commit_citation(citation, self.trans)
-                        self.invalid_citation_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_citation_references.add(item[1])
+            for handle in self.db.get_place_handles():
+                self.progress.step()
+                place = self.db.get_place_from_handle(handle)
+                handle_list = place.get_referenced_handles_recursively()
+                for item in handle_list:
+                    if item[0] == 'Citation':
+                        if not item[1]:
+                            new_handle = create_id()
+                            place.replace_citation_references(None, new_handle)
+                            self.db.commit_place(place, self.trans)
+                            self.invalid_citation_references.add(new_handle)
+                        elif item[1] not in known_handles:
+                            self.invalid_citation_references.add(item[1])
 
-        for handle in self.db.get_repository_handles():
-            self.progress.step()
-            repository = self.db.get_repository_from_handle(handle)
-            handle_list = repository.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == 'Citation':
-                    if not item[1]:
-                        new_handle = create_id()
-                        repository.replace_citation_references(None,
-                                                               new_handle)
-                        self.db.commit_repository(repository, self.trans)
-                        self.invalid_citation_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_citation_references.add(item[1])
+            for handle in self.db.get_citation_handles():
+                self.progress.step()
+                citation = self.db.get_citation_from_handle(handle)
+                handle_list = citation.get_referenced_handles_recursively()
+                for item in handle_list:
+                    if item[0] == 'Citation':
+                        if not item[1]:
+                            new_handle = create_id()
+                            citation.replace_citation_references(
+                                None, new_handle)
+                            self.db.commit_citation(citation, self.trans)
+                            self.invalid_citation_references.add(new_handle)
+                        elif item[1] not in known_handles:
+                            self.invalid_citation_references.add(item[1])
+
+            for handle in self.db.get_repository_handles():
+                self.progress.step()
+                repository = self.db.get_repository_from_handle(handle)
+                handle_list = repository.get_referenced_handles_recursively()
+                for item in handle_list:
+                    if item[0] == 'Citation':
+                        if not item[1]:
+                            new_handle = create_id()
+                            repository.replace_citation_references(None,
+                                                                   new_handle)
+                            self.db.commit_repository(repository, self.trans)
+                            self.invalid_citation_references.add(new_handle)
+                        elif item[1] not in known_handles:
+                            self.invalid_citation_references.add(item[1])
+
+            for handle in self.db.get_media_handles():
+                self.progress.step()
+                obj = self.db.get_media_from_handle(handle)
+                handle_list = obj.get_referenced_handles_recursively()
+                for item in handle_list:
+                    if item[0] == 'Citation':
+                        if not item[1]:
+                            new_handle = create_id()
+                            obj.replace_citation_references(None, new_handle)
+                            self.db.commit_media(obj, self.trans)
+                            self.invalid_citation_references.add(new_handle)
+                        elif item[1] not in known_handles:
+                            self.invalid_citation_references.add(item[1])
 
-        for handle in self.db.get_media_handles():
-            self.progress.step()
-            obj = self.db.get_media_from_handle(handle)
-            handle_list = obj.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == 'Citation':
-                    if not item[1]:
-                        new_handle = create_id()
-                        obj.replace_citation_references(None, new_handle)
-                        self.db.commit_media(obj, self.trans)
-                        self.invalid_citation_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_citation_references.add(item[1])
-
-        for handle in self.db.get_event_handles():
-            self.progress.step()
-            event = self.db.get_event_from_handle(handle)
-            handle_list = event.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == 'Citation':
-                    if not item[1]:
-                        new_handle = create_id()
-                        event.replace_citation_references(None, new_handle)
-                        self.db.commit_event(event, self.trans)
-                        self.invalid_citation_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_citation_references.add(item[1])
+            for handle in self.db.get_event_handles():
+                self.progress.step()
+                event = self.db.get_event_from_handle(handle)
+                handle_list = event.get_referenced_handles_recursively()
+                for item in handle_list:
+                    if item[0] == 'Citation':
+                        if not item[1]:
+                            new_handle = create_id()
+                            event.replace_citation_references(None, new_handle)
+                            self.db.commit_event(event, self.trans)
+                            self.invalid_citation_references.add(new_handle)
+                        elif item[1] not in known_handles:
+                            self.invalid_citation_references.add(item[1])
 
         for bad_handle in self.invalid_citation_references:
             created = make_unknown(bad_handle, self.explanation.handle,
@@ -1648,136 +1957,183 @@ class CheckIntegrity:
 
     def check_source_references(self):
         '''Looking for source reference problems'''
-        clist = self.db.get_citation_handles()
-        self.progress.set_pass(_('Looking for source reference problems'),
-                               len(clist))
-        logging.info('Looking for source reference problems')
+        missing = self._get_missing_references('Source')
+        if missing is not None:
+            clist = self.db.get_citation_handles()
+            self.progress.set_pass(_('Looking for source reference problems'),
+                                   len(clist))
+            logging.info('Looking for source reference problems')
+
+            # a citation without a source has no source in the reference map
+            for start in range(0, len(clist), self.REFERENCE_CHUNK):
+                chunk = clist[start:start + self.REFERENCE_CHUNK]
+                references = self.db.get_reference_map('Citation', chunk)
+                for key in chunk:
+                    self.progress.step()
+                    if 'Source' not in (item[0] for item in references[key]):
+                        citation = self.db.get_citation_from_handle(key)
+                        source_handle = create_id()
+                        citation.set_reference_handle(source_handle)
+                        self.db.commit_citation(citation, self.trans)
+                        missing.append(('Citation', key, source_handle))
 
-        for key in clist:
-            self.progress.step()
-            citation = self.db.get_citation_from_handle(key)
-            source_handle = citation.get_reference_handle()
-            if not source_handle:
-                source_handle = create_id()
-                citation.set_reference_handle(source_handle)
-                self.db.commit_citation(citation, self.trans)
-            if source_handle:
-                try:
-                    self.db.get_source_from_handle(source_handle)
-                except HandleError:
+            unknown = set()
+            for dummy, key, source_handle in missing:
+                if source_handle not in unknown:
                     # The referenced source does not exist in the database
+                    unknown.add(source_handle)
                     make_unknown(source_handle, self.explanation.handle,
                                  self.class_source, self.commit_source,
                                  self.trans)
+                    citation = self.db.get_citation_from_handle(key)
                     logging.warning('    FAIL: the citation "%(gid)s" refers '
-                                    'to source "%(hand)s" which does not exist'
-                                    ' in the database',
+                                    'to source "%(hand)s" which does not '
+                                    'exist in the database',
                                     {'gid': citation.gramps_id,
                                      'hand': source_handle})
                     self.invalid_source_references.add(key)
+        else:
+            clist = self.db.get_citation_handles()
+            self.progress.set_pass(_('Looking for source reference problems'),
+                                   len(clist))
+            logging.info('Looking for source reference problems')
+
+            for key in clist:
+                self.progress.step()
+                citation = self.db.get_citation_from_handle(key)
+                source_handle = citation.get_reference_handle()
+                if not source_handle:
+                    source_handle = create_id()
+                    citation.set_reference_handle(source_handle)
+                    self.db.commit_citation(citation, self.trans)
+                if source_handle:
+                    try:
+                        self.db.get_source_from_handle(source_handle)
+                    except HandleError:
+                        # The referenced source does not exist in the database
+                        make_unknown(source_handle, self.explanation.handle,
+                                     self.class_source, self.commit_source,
+                                     self.trans)
+                        logging.warning('    FAIL: the citation "%(gid)s" '
+                                        'refers to source "%(hand)s" which '
+                                        'does not exist in the database',
+                                        {'gid': citation.gramps_id,
+                                         'hand': source_handle})
+                        self.invalid_source_references.add(key)
+
         if len(self.invalid_source_references) == 0:
             logging.info('   OK: no source reference problems found')
 
     def check_media_references(self):
         '''Looking for media object reference problems'''
-        known_handles = self.db.get_media_handles(False)
+        missing = self._get_missing_references('Media')
+        if missing is not None:
+            self.progress.set_pass(_('Looking for media object reference '
+                                     'problems'),
+                                   len(missing))
+            logging.info('Looking for media object reference problems')
+            self._add_missing_references('Media', missing,
+                                         self.invalid_media_references,
+                                         'replace_media_references')
+        else:
+            known_handles = self.db.get_media_handles(False)
+
+            total = (
+                self.db.get_number_of_people() +
+                self.db.get_number_of_families() +
+                self.db.get_number_of_events() +
+                self.db.get_number_of_places() +
+                self.db.get_number_of_citations() +
+                self.db.get_number_of_sources()
+                )
 
-        total = (
-            self.db.get_number_of_people() +
-            self.db.get_number_of_families() +
-            self.db.get_number_of_events() +
-            self.db.get_number_of_places() +
-            self.db.get_number_of_citations() +
-            self.db.get_number_of_sources()
-            )
+            self.progress.set_pass(_('Looking for media object reference '
+                                     'problems'), total)
+            logging.info('Looking for media object reference problems')
 
-        self.progress.set_pass(_('Looking for media object reference '
-                                 'problems'), total)
-        logging.info('Looking for media object reference problems')
+            for handle in self.db.get_person_handles():
+                self.progress.step()
+                person = self.db.get_person_from_handle(handle)
+                handle_list = person.get_referenced_handles_recursively()
+                for item in handle_list:
+                    if item[0] == 'Media':
+                        if not item[1]:
+                            new_handle = create_id()
+                            person.replace_media_references(None, new_handle)
+                            self.db.commit_person(person, self.trans)
+                            self.invalid_media_references.add(new_handle)
+                        elif item[1] not in known_handles:
+                            self.invalid_media_references.add(item[1])
 
-        for handle in self.db.get_person_handles():
-            self.progress.step()
-            person = self.db.get_person_from_handle(handle)
-            handle_list = person.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == 'Media':
-                    if not item[1]:
-                        new_handle = create_id()
-                        person.replace_media_references(None, new_handle)
-                        self.db.commit_person(person, self.trans)
-                        self.invalid_media_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_media_references.add(item[1])
-
-        for handle in self.db.get_family_handles():
-            self.progress.step()
-            family = self.db.get_family_from_handle(handle)
-            handle_list = family.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == 'Media':
-                    if not item[1]:
-                        new_handle = create_id()
-                        family.replace_media_references(None, new_handle)
-                        self.db.commit_family(family, self.trans)
-                        self.invalid_media_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_media_references.add(item[1])
+            for handle in self.db.get_family_handles():
+                self.progress.step()
+                family = self.db.get_family_from_handle(handle)
+                handle_list = family.get_referenced_handles_recursively()
+                for item in handle_list:
+                    if item[0] == 'Media':
+                        if not item[1]:
+                            new_handle = create_id()
+                            family.replace_media_references(None, new_handle)
+                            self.db.commit_family(family, self.trans)
+                            self.invalid_media_references.add(new_handle)
+                        elif item[1] not in known_handles:
+                            self.invalid_media_references.add(item[1])
 
-        for handle in self.db.get_place_handles():
-            self.progress.step()
-            place = self.db.get_place_from_handle(handle)
-            handle_list = place.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == 'Media':
-                    if not item[1]:
-                        new_handle = create_id()
-                        place.replace_media_references(None, new_handle)
-                        self.db.commit_place(place, self.trans)
-                        self.invalid_media_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_media_references.add(item[1])
-
-        for handle in self.db.get_event_handles():
-            self.progress.step()
-            event = self.db.get_event_from_handle(handle)
-            handle_list = event.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == 'Media':
-                    if not item[1]:
-                        new_handle = create_id()
-                        event.replace_media_references(None, new_handle)
-                        self.db.commit_event(event, self.trans)
-                        self.invalid_media_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_media_references.add(item[1])
-
-        for handle in self.db.get_citation_handles():
-            self.progress.step()
-            citation = self.db.get_citation_from_handle(handle)
-            handle_list = citation.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == 'Media':
-                    if not item[1]:
-                        new_handle = create_id()
-                        citation.replace_media_references(None, new_handle)
-                        self.db.commit_citation(citation, self.trans)
-                        self.invalid_media_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_media_references.add(item[1])
+            for handle in self.db.get_place_handles():
+                self.progress.step()
+                place = self.db.get_place_from_handle(handle)
+                handle_list = place.get_referenced_handles_recursively()
+                for item in handle_list:
+                    if item[0] == 'Media':
+                        if not item[1]:
+                            new_handle = create_id()
+                            place.replace_media_references(None, new_handle)
+                            self.db.commit_place(place, self.trans)
+                            self.invalid_media_references.add(new_handle)
+                        elif item[1] not in known_handles:
+                            self.invalid_media_references.add(item[1])
 
-        for handle in self.db.get_source_handles():
-            self.progress.step()
-            source = self.db.get_source_from_handle(handle)
-            handle_list = source.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == 'Media':
-                    if not item[1]:
-                        new_handle = create_id()
-                        source.replace_media_references(None, new_handle)
-                        self.db.commit_source(source, self.trans)
-                        self.invalid_media_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_media_references.add(item[1])
+            for handle in self.db.get_event_handles():
+                self.progress.step()
+                event = self.db.get_event_from_handle(handle)
+                handle_list = event.get_referenced_handles_recursively()
+                for item in handle_list:
+                    if item[0] == 'Media':
+                        if not item[1]:
+                            new_handle = create_id()
+                            event.replace_media_references(None, new_handle)
+                            self.db.commit_event(event, self.trans)
+                            self.invalid_media_references.add(new_handle)
+                        elif item[1] not in known_handles:
+                            self.invalid_media_references.add(item[1])
+
+            for handle in self.db.get_citation_handles():
+                self.progress.step()
+                citation = self.db.get_citation_from_handle(handle)
+                handle_list = citation.get_referenced_handles_recursively()
+                for item in handle_list:
+                    if item[0] == 'Media':
+                        if not item[1]:
+                            new_handle = create_id()
+                            citation.replace_media_references(None, new_handle)
+                            self.db.commit_citation(citation, self.trans)
+                            self.invalid_media_references.add(new_handle)
+                        elif item[1] not in known_handles:
+                            self.invalid_media_references.add(item[1])
+
+            for handle in self.db.get_source_handles():
+                self.progress.step()
+                source = self.db.get_source_from_handle(handle)
+                handle_list = source.get_referenced_handles_recursively()
+                for item in handle_list:
+                    if item[0] == 'Media':
+                        if not item[1]:
+                            new_handle = create_id()
+                            source.replace_media_references(None, new_handle)
+                            self.db.commit_source(source, self.trans)
+                            self.invalid_media_references.add(new_handle)
+                        elif item[1] not in known_handles:
+                            self.invalid_media_references.add(item[1])
 
         for bad_handle in self.invalid_media_references:
             make_unknown(bad_handle, self.explanation.handle, self.class_media,
@@ -1802,132 +2158,141 @@ class CheckIntegrity:
         if missing_references:
             self.db.add_note(self.explanation, self.trans, set_gid=True)
 
-        known_handles = self.db.get_note_handles()
-
-        total = (self.db.get_number_of_people() +
-                 self.db.get_number_of_families() +
-                 self.db.get_number_of_events() +
-                 self.db.get_number_of_places() +
-                 self.db.get_number_of_media() +
-                 self.db.get_number_of_citations() +
-                 self.db.get_number_of_sources() +
-                 self.db.get_number_of_repositories())
+        missing = self._get_missing_references('Note')
+        if missing is not None:
+            self.progress.set_pass(_('Looking for note reference problems'),
+                                   len(missing))
+            logging.info('Looking for note reference problems')
+            self._add_missing_references('Note', missing,
+                                         self.invalid_note_references,
+                                         'replace_note_references')
+        else:
+            known_handles = self.db.get_note_handles()
+
+            total = (self.db.get_number_of_people() +
+                     self.db.get_number_of_families() +
+                     self.db.get_number_of_events() +
+                     self.db.get_number_of_places() +
+                     self.db.get_number_of_media() +
+                     self.db.get_number_of_citations() +
+                     self.db.get_number_of_sources() +
+                     self.db.get_number_of_repositories())
+
+            self.progress.set_pass(_('Looking for note reference problems'),
+                                   total)
+            logging.info('Looking for note reference problems')
+
+            for handle in self.db.get_person_handles():
+                self.progress.step()
+                person = self.db.get_person_from_handle(handle)
+                handle_list = person.get_referenced_handles_recursively()
+                for item in handle_list:
+                    if item[0] == 'Note':
+                        if not item[1]:
+                            new_handle = create_id()
+                            person.replace_note_references(None, new_handle)
+                            self.db.commit_person(person, self.trans)
+                            self.invalid_note_references.add(new_handle)
+                        elif item[1] not in known_handles:
+                            self.invalid_note_references.add(item[1])
 
-        self.progress.set_pass(_('Looking for note reference problems'),
-                               total)
-        logging.info('Looking for note reference problems')
+            for handle in self.db.get_family_handles():
+                self.progress.step()
+                family = self.db.get_family_from_handle(handle)
+                handle_list = family.get_referenced_handles_recursively()
+                for item in handle_list:
+                    if item[0] == 'Note':
+                        if not item[1]:
+                            new_handle = create_id()
+                            family.replace_note_references(None, new_handle)
+                            self.db.commit_family(family, self.trans)
+                            self.invalid_note_references.add(new_handle)
+                        elif item[1] not in known_handles:
+                            self.invalid_note_references.add(item[1])
 
-        for handle in self.db.get_person_handles():
-            self.progress.step()
-            person = self.db.get_person_from_handle(handle)
-            handle_list = person.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == 'Note':
-                    if not item[1]:
-                        new_handle = create_id()
-                        person.replace_note_references(None, new_handle)
-                        self.db.commit_person(person, self.trans)
-                        self.invalid_note_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_note_references.add(item[1])
-
-        for handle in self.db.get_family_handles():
-            self.progress.step()
-            family = self.db.get_family_from_handle(handle)
-            handle_list = family.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == 'Note':
-                    if not item[1]:
-                        new_handle = create_id()
-                        family.replace_note_references(None, new_handle)
-                        self.db.commit_family(family, self.trans)
-                        self.invalid_note_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_note_references.add(item[1])
+            for handle in self.db.get_place_handles():
+                self.progress.step()
+                place = self.db.get_place_from_handle(handle)
+                handle_list = place.get_referenced_handles_recursively()
+                for item in handle_list:
+                    if item[0] == 'Note':
+                        if not item[1]:
+                            new_handle = create_id()
+                            place.replace_note_references(None, new_handle)
+                            self.db.commit_place(place, self.trans)
+                            self.invalid_note_references.add(new_handle)
+                        elif item[1] not in known_handles:
+                            self.invalid_note_references.add(item[1])
 
-        for handle in self.db.get_place_handles():
-            self.progress.step()
-            place = self.db.get_place_from_handle(handle)
-            handle_list = place.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == 'Note':
-                    if not item[1]:
-                        new_handle = create_id()
-                        place.replace_note_references(None, new_handle)
-                        self.db.commit_place(place, self.trans)
-                        self.invalid_note_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_note_references.add(item[1])
-
-        for handle in self.db.get_citation_handles():
-            self.progress.step()
-            citation = self.db.get_citation_from_handle(handle)
-            handle_list = citation.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == 'Note':
-                    if not item[1]:
-                        new_handle = create_id()
-                        citation.replace_note_references(None, new_handle)
-                        self.db.commit_citation(citation, self.trans)
-                        self.invalid_note_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_note_references.add(item[1])
+            for handle in self.db.get_citation_handles():
+                self.progress.step()
+                citation = self.db.get_citation_from_handle(handle)
+                handle_list = citation.get_referenced_handles_recursively()
+                for item in handle_list:
+                    if item[0] == 'Note':
+                        if not item[1]:
+                            new_handle = create_id()
+                            citation.replace_note_references(None, new_handle)
+                            self.db.commit_citation(citation, self.trans)
+                            self.invalid_note_references.add(new_handle)
+                        elif item[1] not in known_handles:
+                            self.invalid_note_references.add(item[1])
 
-        for handle in self.db.get_source_handles():
-            self.progress.step()
-            source = self.db.get_source_from_handle(handle)
-            handle_list = source.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == 'Note':
-                    if not item[1]:
-                        new_handle = create_id()
-                        source.replace_note_references(None, new_handle)
-                        self.db.commit_source(source, self.trans)
-                        self.invalid_note_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_note_references.add(item[1])
+            for handle in self.db.get_source_handles():
+                self.progress.step()
+                source = self.db.get_source_from_handle(handle)
+                handle_list = source.get_referenced_handles_recursively()
+                for item in handle_list:
+                    if item[0] == 'Note':
+                        if not item[1]:
+                            new_handle = create_id()
+                            source.replace_note_references(None, new_handle)
+                            self.db.commit_source(source, self.trans)
+                            self.invalid_note_references.add(new_handle)
+                        elif item[1] not in known_handles:
+                            self.invalid_note_references.add(item[1])
+
+            for handle in self.db.get_media_handles():
+                self.progress.step()
+                obj = self.db.get_media_from_handle(handle)
+                handle_list = obj.get_referenced_handles_recursively()
+                for item in handle_list:
+                    if item[0] == 'Note':
+                        if not item[1]:
+                            new_handle = create_id()
+                            obj.replace_note_references(None, new_handle)
+                            self.db.commit_media(obj, self.trans)
+                            self.invalid_note_references.add(new_handle)
+                        elif item[1] not in known_handles:
+                            self.invalid_note_references.add(item[1])
 
-        for handle in self.db.get_media_handles():
-            self.progress.step()
-            obj = self.db.get_media_from_handle(handle)
-            handle_list = obj.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == 'Note':
-                    if not item[1]:
-                        new_handle = create_id()
-                        obj.replace_note_references(None, new_handle)
-                        self.db.commit_media(obj, self.trans)
-                        self.invalid_note_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_note_references.add(item[1])
-
-        for handle in self.db.get_event_handles():
-            self.progress.step()
-            event = self.db.get_event_from_handle(handle)
-            handle_list = event.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == 'Note':
-                    if not item[1]:
-                        new_handle = create_id()
-                        event.replace_note_references(None, new_handle)
-                        self.db.commit_event(event, self.trans)
-                        self.invalid_note_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_note_references.add(item[1])
-
-        for handle in self.db.get_repository_handles():
-            self.progress.step()
-            repo = self.db.get_repository_from_handle(handle)
-            handle_list = repo.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == 'Note':
-                    if not item[1]:
-                        new_handle = create_id()
-                        repo.replace_note_references(None, new_handle)
-                        self.db.commit_repository(repo, self.trans)
-                        self.invalid_note_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_note_references.add(item[1])
+            for handle in self.db.get_event_handles():
+                self.progress.step()
+                event = self.db.get_event_from_handle(handle)
+                handle_list = event.get_referenced_handles_recursively()
+                for item in handle_list:
+                    if item[0] == 'Note':
+                        if not item[1]:
+                            new_handle = create_id()
+                            event.replace_note_references(None, new_handle)
+                            self.db.commit_event(event, self.trans)
+                            self.invalid_note_references.add(new_handle)
+                        elif item[1] not in known_handles:
+                            self.invalid_note_references.add(item[1])
+
+            for handle in self.db.get_repository_handles():
+                self.progress.step()
+                repo = self.db.get_repository_from_handle(handle)
+                handle_list = repo.get_referenced_handles_recursively()
+                for item in handle_list:
+                    if item[0] == 'Note':
+                        if not item[1]:
+                            new_handle = create_id()
+                            repo.replace_note_references(None, new_handle)
+                            self.db.commit_repository(repo, self.trans)
+                            self.invalid_note_references.add(new_handle)
+                        elif item[1] not in known_handles:
+                            self.invalid_note_references.add(item[1])
 
         for bad_handle in self.invalid_note_references:
             make_unknown(bad_handle, self.explanation.handle,
@@ -1955,147 +2320,156 @@ class CheckIntegrity:
 
     def check_tag_references(self):
         '''Looking for tag reference problems'''
-        known_handles = self.db.get_tag_handles()
-
-        total = (self.db.get_number_of_people() +
-                 self.db.get_number_of_families() +
-                 self.db.get_number_of_media() +
-                 self.db.get_number_of_notes() +
-                 self.db.get_number_of_events() +
-                 self.db.get_number_of_citations() +
-                 self.db.get_number_of_sources() +
-                 self.db.get_number_of_places() +
-                 self.db.get_number_of_repositories())
-
-        self.progress.set_pass(_('Looking for tag reference problems'),
-                               total)
-        logging.info('Looking for tag reference problems')
+        missing = self._get_missing_references('Tag')
+        if missing is not None:
+            self.progress.set_pass(_('Looking for tag reference problems'),
+                                   len(missing))
+            logging.info('Looking for tag reference problems')
+            self._add_missing_references('Tag', missing,
+                                         self.invalid_tag_references,
+                                         'replace_tag_references')
+        else:
+            known_handles = self.db.get_tag_handles()
+
+            total = (self.db.get_number_of_people() +
+                     self.db.get_number_of_families() +
+                     self.db.get_number_of_media() +
+                     self.db.get_number_of_notes() +
+                     self.db.get_number_of_events() +
+                     self.db.get_number_of_citations() +
+                     self.db.get_number_of_sources() +
+                     self.db.get_number_of_places() +
+                     self.db.get_number_of_repositories())
+
+            self.progress.set_pass(_('Looking for tag reference problems'),
+                                   total)
+            logging.info('Looking for tag reference problems')
+
+            for handle in self.db.get_person_handles():
+                self.progress.step()
+                person = self.db.get_person_from_handle(handle)
+                handle_list = person.get_referenced_handles_recursively()
+                for item in handle_list:
+                    if item[0] == 'Tag':
+                        if not item[1]:
+                            new_handle = create_id()
+                            person.replace_tag_references(None, new_handle)
+                            self.db.commit_person(person, self.trans)
+                            self.invalid_tag_references.add(new_handle)
+                        elif item[1] not in known_handles:
+                            self.invalid_tag_references.add(item[1])
 
-        for handle in self.db.get_person_handles():
-            self.progress.step()
-            person = self.db.get_person_from_handle(handle)
-            handle_list = person.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == 'Tag':
-                    if not item[1]:
-                        new_handle = create_id()
-                        person.replace_tag_references(None, new_handle)
-                        self.db.commit_person(person, self.trans)
-                        self.invalid_tag_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_tag_references.add(item[1])
-
-        for handle in self.db.get_family_handles():
-            self.progress.step()
-            family = self.db.get_family_from_handle(handle)
-            handle_list = family.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == 'Tag':
-                    if not item[1]:
-                        new_handle = create_id()
-                        family.replace_tag_references(None, new_handle)
-                        self.db.commit_family(family, self.trans)
-                        self.invalid_tag_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_tag_references.add(item[1])
+            for handle in self.db.get_family_handles():
+                self.progress.step()
+                family = self.db.get_family_from_handle(handle)
+                handle_list = family.get_referenced_handles_recursively()
+                for item in handle_list:
+                    if item[0] == 'Tag':
+                        if not item[1]:
+                            new_handle = create_id()
+                            family.replace_tag_references(None, new_handle)
+                            self.db.commit_family(family, self.trans)
+                            self.invalid_tag_references.add(new_handle)
+                        elif item[1] not in known_handles:
+                            self.invalid_tag_references.add(item[1])
+
+            for handle in self.db.get_media_handles():
+                self.progress.step()
+                obj = self.db.get_media_from_handle(handle)
+                handle_list = obj.get_referenced_handles_recursively()
+                for item in handle_list:
+                    if item[0] == 'Tag':
+                        if not item[1]:
+                            new_handle = create_id()
+                            obj.replace_tag_references(None, new_handle)
+                            self.db.commit_media(obj, self.trans)
+                            self.invalid_tag_references.add(new_handle)
+                        elif item[1] not in known_handles:
+                            self.invalid_tag_references.add(item[1])
+
+            for handle in self.db.get_note_handles():
+                self.progress.step()
+                note = self.db.get_note_from_handle(handle)
+                handle_list = note.get_referenced_handles_recursively()
+                for item in handle_list:
+                    if item[0] == 'Tag':
+                        if not item[1]:
+                            new_handle = create_id()
+                            note.replace_tag_references(None, new_handle)
+                            self.db.commit_note(note, self.trans)
+                            self.invalid_tag_references.add(new_handle)
+                        elif item[1] not in known_handles:
+                            self.invalid_tag_references.add(item[1])
 
-        for handle in self.db.get_media_handles():
-            self.progress.step()
-            obj = self.db.get_media_from_handle(handle)
-            handle_list = obj.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == 'Tag':
-                    if not item[1]:
-                        new_handle = create_id()
-                        obj.replace_tag_references(None, new_handle)
-                        self.db.commit_media(obj, self.trans)
-                        self.invalid_tag_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_tag_references.add(item[1])
+            for handle in self.db.get_event_handles():
+                self.progress.step()
+                event = self.db.get_event_from_handle(handle)
+                handle_list = event.get_referenced_handles_recursively()
+                for item in handle_list:
+                    if item[0] == 'Tag':
+                        if not item[1]:
+                            new_handle = create_id()
+                            event.replace_tag_references(None, new_handle)
+                            self.db.commit_event(event, self.trans)
+                            self.invalid_tag_references.add(new_handle)
+                        elif item[1] not in known_handles:
+                            self.invalid_tag_references.add(item[1])
 
-        for handle in self.db.get_note_handles():
-            self.progress.step()
-            note = self.db.get_note_from_handle(handle)
-            handle_list = note.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == 'Tag':
-                    if not item[1]:
-                        new_handle = create_id()
-                        note.replace_tag_references(None, new_handle)
-                        self.db.commit_note(note, self.trans)
-                        self.invalid_tag_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_tag_references.add(item[1])
-
-        for handle in self.db.get_event_handles():
-            self.progress.step()
-            event = self.db.get_event_from_handle(handle)
-            handle_list = event.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == 'Tag':
-                    if not item[1]:
-                        new_handle = create_id()
-                        event.replace_tag_references(None, new_handle)
-                        self.db.commit_event(event, self.trans)
-                        self.invalid_tag_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_tag_references.add(item[1])
-
-        for handle in self.db.get_citation_handles():
-            self.progress.step()
-            citation = self.db.get_citation_from_handle(handle)
-            handle_list = citation.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == 'Tag':
-                    if not item[1]:
-                        new_handle = create_id()
-                        citation.replace_tag_references(None, new_handle)
-                        self.db.commit_citation(citation, self.trans)
-                        self.invalid_tag_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_tag_references.add(item[1])
+            for handle in self.db.get_citation_handles():
+                self.progress.step()
+                citation = self.db.get_citation_from_handle(handle)
+                handle_list = citation.get_referenced_handles_recursively()
+                for item in handle_list:
+                    if item[0] == 'Tag':
+                        if not item[1]:
+                            new_handle = create_id()
+                            citation.replace_tag_references(None, new_handle)
+                            self.db.commit_citation(citation, self.trans)
+                            self.invalid_tag_references.add(new_handle)
+                        elif item[1] not in known_handles:
+                            self.invalid_tag_references.add(item[1])
 
-        for handle in self.db.get_source_handles():
-            self.progress.step()
-            source = self.db.get_source_from_handle(handle)
-            handle_list = source.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == 'Tag':
-                    if not item[1]:
-                        new_handle = create_id()
-                        source.replace_tag_references(None, new_handle)
-                        self.db.commit_source(source, self.trans)
-                        self.invalid_tag_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_tag_references.add(item[1])
+            for handle in self.db.get_source_handles():
+                self.progress.step()
+                source = self.db.get_source_from_handle(handle)
+                handle_list = source.get_referenced_handles_recursively()
+                for item in handle_list:
+                    if item[0] == 'Tag':
+                        if not item[1]:
+                            new_handle = create_id()
+                            source.replace_tag_references(None, new_handle)
+                            self.db.commit_source(source, self.trans)
+                            self.invalid_tag_references.add(new_handle)
+                        elif item[1] not in known_handles:
+                            self.invalid_tag_references.add(item[1])
 
-        for handle in self.db.get_place_handles():
-            self.progress.step()
-            place = self.db.get_place_from_handle(handle)
-            handle_list = place.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == 'Tag':
-                    if not item[1]:
-                        new_handle = create_id()
-                        place.replace_tag_references(None, new_handle)
-                        self.db.commit_place(place, self.trans)
-                        self.invalid_tag_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_tag_references.add(item[1])
-
-        for handle in self.db.get_repository_handles():
-            self.progress.step()
-            repository = self.db.get_repository_from_handle(handle)
-            handle_list = repository.get_referenced_handles_recursively()
-            for item in handle_list:
-                if item[0] == 'Tag':
-                    if not item[1]:
-                        new_handle = create_id()
-                        repository.replace_tag_references(None, new_handle)
-                        self.db.commit_repository(repository, self.trans)
-                        self.invalid_tag_references.add(new_handle)
-                    elif item[1] not in known_handles:
-                        self.invalid_tag_references.add(item[1])
+            for handle in self.db.get_place_handles():
+                self.progress.step()
+                place = self.db.get_place_from_handle(handle)
+                handle_list = place.get_referenced_handles_recursively()
+                for item in handle_list:
+                    if item[0] == 'Tag':
+                        if not item[1]:
+                            new_handle = create_id()
+                            place.replace_tag_references(None, new_handle)
+                            self.db.commit_place(place, self.trans)
+                            self.invalid_tag_references.add(new_handle)
+                        elif item[1] not in known_handles:
+                            self.invalid_tag_references.add(item[1])
+
+            for handle in self.db.get_repository_handles():
+                self.progress.step()
+                repository = self.db.get_repository_from_handle(handle)
+                handle_list = repository.get_referenced_handles_recursively()
+                for item in handle_list:
+                    if item[0] == 'Tag':
+                        if not item[1]:
+                            new_handle = create_id()
+                            repository.replace_tag_references(None, new_handle)
+                            self.db.commit_repository(repository, self.trans)
+                            self.invalid_tag_references.add(new_handle)
+                        elif item[1] not in known_handles:
+                            self.invalid_tag_references.add(item[1])
 
         for bad_handle in self.invalid_tag_references:
             make_unknown(bad_handle, None, self.class_tag,
@@ -0,0 +1,130 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+""" Unittest for the reference checks of the Check and Repair tool """
+
+import unittest
+
+from gramps.gen.db import DbTxn
+from gramps.gen.db.utils import make_database
+from gramps.gen.dbstate import DbState
+from gramps.gen.lib import Person, PersonRef, RepoRef, Source
+from ..check import CheckIntegrity
+
+class CheckReferencesTest(unittest.TestCase):
+    def setUp(self):
+        self.db = make_database("sqlite")
+        self.db.load(":memory:")
+        self.dbstate = DbState()
+        self.dbstate.change_database_noclose(self.db)
+        self.checker = CheckIntegrity(self.dbstate, None, None)
+
+    def tearDown(self):
+        self.db.close()
+
+    def __check_backlinks(self):
+        with DbTxn('Check backlinks', self.db) as self.checker.trans:
+            self.checker.check_backlinks()
+        if self.checker.bad_backlinks:
+            self.db.reindex_reference_map(self.checker.callback)
+
+    def test_stale_reference(self):
+        """
+        An entry of the reference map to a missing object, which the object
+        does not reference, is removed before the references are checked.
+        """
+        person = Person()
+        with DbTxn('Add test objects', self.db) as trans:
+            self.db.add_person(person, trans)
+        self.db.dbapi.execute("INSERT INTO reference (obj_handle, obj_class, "
+                              "ref_handle, ref_class) VALUES (?, ?, ?, ?)",
+                              [person.handle, 'Person', 'XXXX', 'Person'])
+        self.db.dbapi.commit()
+        self.__check_backlinks()
+        self.assertEqual(self.checker.bad_backlinks, 1)
+        with DbTxn('Check references', self.db) as self.checker.trans:
+            self.checker.check_person_references()
+        self.assertEqual(self.db.get_number_of_people(), 1)
+        self.assertEqual(self.checker.invalid_person_references, set())
+
+    def test_orphan_reference(self):
+        """
+        An entry of the reference map held by a missing object is a bad
+        backlink, whether the referenced object exists or not.
+        """
+        self.db.dbapi.execute("INSERT INTO reference (obj_handle, obj_class, "
+                              "ref_handle, ref_class) VALUES (?, ?, ?, ?)",
+                              ['YYYY', 'Person', 'XXXX', 'Person'])
+        self.db.dbapi.commit()
+        self.__check_backlinks()
+        self.assertEqual(self.checker.bad_backlinks, 1)
+        self.assertEqual(self.db.get_orphan_references(), [])
+
+    def test_empty_person_reference(self):
+        """
+        A person reference without a handle gets a new unknown person.
+        """
+        person = Person()
+        person.add_person_ref(PersonRef())
+        with DbTxn('Add test objects', self.db) as trans:
+            self.db.add_person(person, trans)
+        self.__check_backlinks()
+        self.assertEqual(self.checker.bad_backlinks, 0)
+        with DbTxn('Check references', self.db) as self.checker.trans:
+            self.checker.check_person_references()
+        self.assertEqual(self.checker.invalid_person_references,
+                         {person.handle})
+        person = self.db.get_person_from_handle(person.handle)
+        ref_handle = person.get_person_ref_list()[0].ref
+        self.assertTrue(self.db.has_person_handle(ref_handle))
+
+    def test_empty_repo_reference(self):
+        """
+        A repository reference without a handle gets a new unknown
+        repository.
+        """
+        source = Source()
+        source.add_repo_reference(RepoRef())
+        with DbTxn('Add test objects', self.db) as trans:
+            self.db.add_source(source, trans)
+        self.__check_backlinks()
+        with DbTxn('Check references', self.db) as self.checker.trans:
+            self.checker.check_repo_references()
+        self.assertEqual(self.checker.invalid_repo_references,
+                         {source.handle})
+        source = self.db.get_source_from_handle(source.handle)
+        ref_handle = source.get_reporef_list()[0].ref
+        self.assertTrue(self.db.has_repository_handle(ref_handle))
+
+    def test_empty_reference_unchecked_map(self):
+        """
+        References without a handle are found without the backlink check.
+        """
+        person = Person()
+        person.add_person_ref(PersonRef())
+        with DbTxn('Add test objects', self.db) as trans:
+            self.db.add_person(person, trans)
+        with DbTxn('Check references', self.db) as self.checker.trans:
+            self.checker.check_person_references()
+        self.assertEqual(self.checker.invalid_person_references,
+                         {person.handle})
+        self.assertEqual(self.db.get_number_of_people(), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
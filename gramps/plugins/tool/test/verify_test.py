@@ -0,0 +1,138 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+""" Unittest for the rules of the Verify the Data tool """
+
+import os
+import unittest
+from collections import defaultdict
+
+from gramps.gen.const import DATA_DIR
+from gramps.gen.db import DbTxn
+from gramps.gen.db.utils import import_as_dict, make_database
+from gramps.gen.lib import ChildRef, Family, Person
+from gramps.gen.user import User
+from ..verify import (VerifyFacts, VerifyOptions, TooManyChildren,
+                      check_chunks)
+
+TEST_DIR = os.path.abspath(os.path.join(DATA_DIR, "tests"))
+EXAMPLE = os.path.join(TEST_DIR, "example.gramps")
+# the results before the rules read the facts, with TooManyChildren fixed
+RESULTS = os.path.join(TEST_DIR, "example_verify.txt")
+
+# options which break more of the rules
+STRICT = {'oldage': 80, 'hwdif': 15, 'cspace': 5, 'cbspan': 15,
+          'yngmar': 20, 'oldmar': 40, 'oldmom': 40, 'yngmom': 20,
+          'yngdad': 20, 'olddad': 50, 'wedder': 1, 'mxchildmom': 4,
+          'mxchilddad': 4, 'oldunm': 60, 'estimate_age': 1}
+
+def check(facts, o_dict, processes=0, chunk_size=100):
+    """
+    Return the type, Gramps ID and rule ID of the results, in order.
+    """
+    found = []
+    for dummy, results in check_chunks(facts, o_dict, chunk_size, processes):
+        found.extend((result[3], result[1], result[4][0])
+                     for result in results)
+    return found
+
+class VerifyTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        db = import_as_dict(EXAMPLE, User())
+        cls.facts = VerifyFacts(db)
+        db.close()
+        default = VerifyOptions('verify').options_dict
+        cls.options = {'default': default, 'strict': dict(default, **STRICT)}
+        cls.expected = defaultdict(list)
+        with open(RESULTS, encoding='utf-8') as results:
+            for line in results:
+                if line.startswith('#'):
+                    continue
+                name, obj_type, gramps_id, rule_id = line.split()
+                cls.expected[name].append((obj_type, gramps_id,
+                                           int(rule_id)))
+
+    def test_results(self):
+        for name, o_dict in self.options.items():
+            with self.subTest(options=name):
+                self.assertEqual(check(self.facts, o_dict),
+                                 self.expected[name])
+
+    def test_processes(self):
+        """
+        Test that worker processes give the same results, in the same order.
+        """
+        for name, o_dict in self.options.items():
+            with self.subTest(options=name):
+                self.assertEqual(check(self.facts, o_dict, processes=2),
+                                 self.expected[name])
+
+    def test_chunk_size(self):
+        o_dict = self.options['strict']
+        self.assertEqual(check(self.facts, o_dict, chunk_size=1),
+                         self.expected['strict'])
+
+class TooManyChildrenTest(unittest.TestCase):
+    def setUp(self):
+        self.db = make_database("sqlite")
+        self.db.load(":memory:")
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_too_many_children(self):
+        """
+        Test that the gender of the parents is compared with the limits for
+        fathers and mothers.
+        """
+        family = Family()
+        with DbTxn('Add test objects', self.db) as trans:
+            for gender in (Person.MALE, Person.FEMALE):
+                parent = Person()
+                parent.set_gender(gender)
+                self.db.add_person(parent, trans)
+                if gender == Person.MALE:
+                    family.set_father_handle(parent.handle)
+                else:
+                    family.set_mother_handle(parent.handle)
+            for dummy in range(3):
+                child = Person()
+                self.db.add_person(child, trans)
+                child_ref = ChildRef()
+                child_ref.ref = child.handle
+                family.add_child_ref(child_ref)
+            self.db.add_family(family, trans)
+            for handle in (family.get_father_handle(),
+                           family.get_mother_handle()):
+                parent = self.db.get_person_from_handle(handle)
+                parent.add_family_handle(family.handle)
+                self.db.commit_person(parent, trans)
+        facts = VerifyFacts(self.db)
+        for max_dad, max_mom, broken in ((3, 3, []), (2, 3, [Person.MALE]),
+                                         (3, 2, [Person.FEMALE])):
+            with self.subTest(max_dad=max_dad, max_mom=max_mom):
+                self.assertEqual(
+                    [person.gender for person in facts.people.values()
+                     if TooManyChildren(facts, person, max_dad,
+                                        max_mom).broken()],
+                    broken)
+
+
+if __name__ == "__main__":
+    unittest.main()
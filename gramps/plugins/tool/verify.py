@@ -33,7 +33,6 @@ options are defined (and read in) is not done the way it would be now.
 
 # pylint: disable=not-callable
 # pylint: disable=no-self-use
-# pylint: disable=undefined-variable
 
 #------------------------------------------------------------------------
 #
@@ -43,6 +42,8 @@ options are defined (and read in) is not done the way it would be now.
 
 import os
 import pickle
+import multiprocessing
+from collections import namedtuple
 from hashlib import md5
 
 #------------------------------------------------------------------------
@@ -66,8 +67,8 @@ from gramps.gen.const import URL_MANUAL_PAGE, VERSION_DIR
 from gramps.gen.lib import (ChildRefType, EventRoleType, EventType,
                             FamilyRelType, NameType, Person)
 from gramps.gen.lib.date import Today
+from gramps.gen.display.name import displayer as name_displayer
 from gramps.gui.editors import EditPerson, EditFamily
-from gramps.gen.utils.db import family_name
 from gramps.gui.display import display_help
 from gramps.gui.managedwindow import ManagedWindow
 from gramps.gen.updatecallback import UpdateCallback
@@ -84,199 +85,392 @@ WIKI_HELP_SEC = _('manual|Verify_the_Data')
 
 #-------------------------------------------------------------------------
 #
-# temp storage and related functions
+# The facts the rules check
 #
 #-------------------------------------------------------------------------
-_person_cache = {}
-_family_cache = {}
-_event_cache = {}
 _today = Today().get_sort_value()
 
-def find_event(db, handle):
-    """ find an event, given a handle """
-    if handle in _event_cache:
-        obj = _event_cache[handle]
-    else:
-        obj = db.get_event_from_handle(handle)
-        _event_cache[handle] = obj
-    return obj
+# What the rules use of an event: its type, the sort value of its date,
+# whether the day or month of the date is missing, and whether the date is
+# text only
+EventFacts = namedtuple('EventFacts', ['type', 'sortval', 'inexact',
+                                       'invalid'])
+
+# What the rules use of a person: the dates are the sort values of the
+# events, or 0, with the _est ones estimated from baptism and burial
+PersonFacts = namedtuple('PersonFacts', [
+    'handle', 'gramps_id', 'name', 'display', 'birth_surname', 'gender',
+    'parent_families', 'families', 'n_children', 'birth', 'birth_est',
+    'death', 'death_est', 'bapt', 'bury', 'dead', 'birth_invalid',
+    'death_invalid'])
+
+# What the rules use of a family
+FamilyFacts = namedtuple('FamilyFacts', [
+    'handle', 'gramps_id', 'name', 'father', 'mother', 'children',
+    'marriage', 'married'])
+
+# What the rules use of a child reference
+ChildFacts = namedtuple('ChildFacts', ['ref', 'frel', 'mrel'])
+
+# the types of the events the rules look for
+_EVENT_TYPES = (EventType.BAPTISM, EventType.BURIAL, EventType.MARRIAGE)
 
-def find_person(db, handle):
+class VerifyFacts:
+    """
+    The facts about the people and families of a database which the rules
+    check, read in one pass over the people, the families and the events.
+    """
+
+    def __init__(self, db, callback=None):
+        """
+        :param db: The database to read
+        :type db: DbReadBase
+        :param callback: Called after each object read, if given
+        :type callback: function
+        """
+        self.people = {}
+        self.families = {}
+        self.person_handles = list(db.iter_person_handles())
+        self.family_handles = list(db.iter_family_handles())
+
+        people = {}
+        event_handles = set()
+        for person in db.iter_people():
+            name = person.get_primary_name()
+            birth_ref = person.get_birth_ref()
+            death_ref = person.get_death_ref()
+            birth = birth_ref.ref if birth_ref else None
+            death = death_ref.ref if death_ref else None
+            event_handles.update((birth, death))
+            if name.get_type() == NameType.BIRTH:
+                birth_surname = name.get_surname()
+            else:
+                birth_surname = ''
+            people[person.handle] = (
+                person.gramps_id, name.get_name(),
+                name_displayer.display(person), birth_surname,
+                person.get_gender(),
+                len(person.get_parent_family_handle_list()),
+                tuple(person.get_family_handle_list()), birth, death,
+                [(ref.ref, int(ref.get_role()))
+                 for ref in person.get_event_ref_list()])
+            if callback:
+                callback()
+
+        families = {}
+        for family in db.iter_families():
+            families[family.handle] = (
+                family.gramps_id, family.get_father_handle(),
+                family.get_mother_handle(),
+                tuple(ChildFacts(ref.ref, int(ref.get_father_relation()),
+                                 int(ref.get_mother_relation()))
+                      for ref in family.get_child_ref_list()),
+                [(ref.ref, int(ref.get_role()))
+                 for ref in family.get_event_ref_list()],
+                family.get_relationship() == FamilyRelType.MARRIED)
+            if callback:
+                callback()
+
+        events = {}
+        for event in db.iter_events():
+            event_type = event.get_type()
+            if event_type in _EVENT_TYPES or event.handle in event_handles:
+                date_obj = event.get_date_object()
+                events[event.handle] = EventFacts(
+                    int(event_type), date_obj.get_sort_value(),
+                    date_obj.get_day() == 0 or date_obj.get_month() == 0,
+                    not date_obj.get_valid())
+            if callback:
+                callback()
+
+        for handle, data in people.items():
+            self.people[handle] = self.__person_facts(handle, data, families,
+                                                      events)
+        for handle, data in families.items():
+            self.families[handle] = self.__family_facts(handle, data, events)
+
+    def __person_facts(self, handle, data, families, events):
+        """
+        Return the PersonFacts of a person.
+        """
+        (gramps_id, name, display, birth_surname, gender, parent_families,
+         family_list, birth, death, event_refs) = data
+        n_children = sum(len(families[family_handle][3])
+                         for family_handle in family_list
+                         if family_handle in families)
+        bapt = get_date_from_event_type(events, event_refs,
+                                        EventType.BAPTISM)
+        bapt_est = get_date_from_event_type(events, event_refs,
+                                            EventType.BAPTISM, True)
+        bury = get_date_from_burial(events, event_refs)
+        bury_est = get_date_from_burial(events, event_refs, True)
+        birth_est = get_date_from_event_handle(events, birth, True)
+        death_est = get_date_from_event_handle(events, death, True)
+        return PersonFacts(
+            handle, gramps_id, name, display, birth_surname, gender,
+            parent_families, family_list, n_children,
+            get_date_from_event_handle(events, birth),
+            birth_est or bapt_est,
+            get_date_from_event_handle(events, death),
+            death_est or bury_est, bapt, bury, death is not None,
+            birth in events and events[birth].invalid,
+            death in events and events[death].invalid)
+
+    def __family_facts(self, handle, data, events):
+        """
+        Return the FamilyFacts of a family.
+        """
+        gramps_id, father, mother, children, event_refs, married = data
+        father = father if father in self.people else None
+        mother = mother if mother in self.people else None
+        if father and mother:
+            name = _("%(father)s and %(mother)s") % {
+                "father" : self.people[father].display,
+                "mother" : self.people[mother].display}
+        elif father:
+            name = self.people[father].display
+        elif mother:
+            name = self.people[mother].display
+        else:
+            name = _("unknown")
+        return FamilyFacts(handle, gramps_id, name, father, mother, children,
+                           get_marriage_date(events, event_refs), married)
+
+def find_person(facts, handle):
     """ find a person, given a handle """
-    if handle in _person_cache:
-        obj = _person_cache[handle]
-    else:
-        obj = db.get_person_from_handle(handle)
-        _person_cache[handle] = obj
-    return obj
+    return facts.people.get(handle)
 
-def find_family(db, handle):
+def find_family(facts, handle):
     """ find a family, given a handle """
-    if handle in _family_cache:
-        obj = _family_cache[handle]
-    else:
-        obj = db.get_family_from_handle(handle)
-        _family_cache[handle] = obj
-    return obj
-
-def clear_cache():
-    """ clear the cache """
-    _person_cache.clear()
-    _family_cache.clear()
-    _event_cache.clear()
+    return facts.families.get(handle)
 
 #-------------------------------------------------------------------------
 #
 # helper functions
 #
 #-------------------------------------------------------------------------
-def get_date_from_event_handle(db, event_handle, estimate=False):
+def get_date_from_event_handle(events, event_handle, estimate=False):
     """ get a date from an event handle """
     if not event_handle:
         return 0
-    event = find_event(db, event_handle)
+    event = events.get(event_handle)
     if event:
-        date_obj = event.get_date_object()
-        if (not estimate
-                and (date_obj.get_day() == 0 or date_obj.get_month() == 0)):
+        if not estimate and event.inexact:
             return 0
-        return date_obj.get_sort_value()
+        return event.sortval
     else:
         return 0
 
-def get_date_from_event_type(db, person, event_type, estimate=False):
+def get_date_from_event_type(events, event_refs, event_type, estimate=False):
     """ get a date from a person's specific event type """
-    if not person:
-        return 0
-    for event_ref in person.get_event_ref_list():
-        event = find_event(db, event_ref.ref)
+    for event_handle, role in event_refs:
+        event = events.get(event_handle)
         if event:
-            if (event_ref.get_role() != EventRoleType.PRIMARY
-                    and event.get_type() == EventType.BURIAL):
+            if (role != EventRoleType.PRIMARY
+                    and event.type == EventType.BURIAL):
                 continue
-            if event.get_type() == event_type:
-                date_obj = event.get_date_object()
-                if (not estimate
-                        and (date_obj.get_day() == 0
-                             or date_obj.get_month() == 0)):
+            if event.type == event_type:
+                if not estimate and event.inexact:
                     return 0
-                return date_obj.get_sort_value()
+                return event.sortval
     return 0
 
-def get_bapt_date(db, person, estimate=False):
-    """ get a person's baptism date """
-    return get_date_from_event_type(db, person,
-                                    EventType.BAPTISM, estimate)
-
-def get_bury_date(db, person, estimate=False):
-    """ get a person's burial date """
+def get_date_from_burial(events, event_refs, estimate=False):
+    """ get a date from a person's burial """
     # check role on burial event
-    for event_ref in person.get_event_ref_list():
-        event = find_event(db, event_ref.ref)
+    for event_handle, role in event_refs:
+        event = events.get(event_handle)
         if (event
-                and event.get_type() == EventType.BURIAL
-                and event_ref.get_role() == EventRoleType.PRIMARY):
-            return get_date_from_event_type(db, person,
+                and event.type == EventType.BURIAL
+                and role == EventRoleType.PRIMARY):
+            return get_date_from_event_type(events, event_refs,
                                             EventType.BURIAL, estimate)
+    return 0
 
-def get_birth_date(db, person, estimate=False):
+def get_marriage_date(events, event_refs):
+    """ get a family's marriage date """
+    for event_handle, role in event_refs:
+        event = events.get(event_handle)
+        if (event and event.type == EventType.MARRIAGE
+                and (role == EventRoleType.FAMILY
+                     or role == EventRoleType.PRIMARY)):
+            return event.sortval
+    return 0
+
+def get_bapt_date(facts, person):
+    """ get a person's baptism date """
+    return person.bapt
+
+def get_bury_date(facts, person):
+    """ get a person's burial date """
+    return person.bury
+
+def get_birth_date(facts, person, estimate=False):
     """ get a person's birth date (or baptism date if 'estimated') """
     if not person:
         return 0
-    birth_ref = person.get_birth_ref()
-    if not birth_ref:
-        ret = 0
-    else:
-        ret = get_date_from_event_handle(db, birth_ref.ref, estimate)
-    if estimate and (ret == 0):
-        ret = get_bapt_date(db, person, estimate)
-        ret = 0 if ret is None else ret
-    return ret
+    return person.birth_est if estimate else person.birth
 
-def get_death(db, person):
+def get_death(facts, person):
     """
     boolean whether there is a death event or not
     (if a user claims a person is dead, we will believe it even with no date)
     """
     if not person:
         return False
-    death_ref = person.get_death_ref()
-    if death_ref:
-        return True
-    else:
-        return False
+    return person.dead
 
-def get_death_date(db, person, estimate=False):
+def get_death_date(facts, person, estimate=False):
     """ get a person's death date (or burial date if 'estimated') """
     if not person:
         return 0
-    death_ref = person.get_death_ref()
-    if not death_ref:
-        ret = 0
-    else:
-        ret = get_date_from_event_handle(db, death_ref.ref, estimate)
-    if estimate and (ret == 0):
-        ret = get_bury_date(db, person, estimate)
-        ret = 0 if ret is None else ret
-    return ret
+    return person.death_est if estimate else person.death
 
-def get_age_at_death(db, person, estimate):
+def get_age_at_death(facts, person, estimate):
     """ get a person's age at death """
-    birth_date = get_birth_date(db, person, estimate)
-    death_date = get_death_date(db, person, estimate)
+    birth_date = get_birth_date(facts, person, estimate)
+    death_date = get_death_date(facts, person, estimate)
     if (birth_date > 0) and (death_date > 0):
         return death_date - birth_date
     return 0
 
-def get_father(db, family):
+def get_father(facts, family):
     """ get a family's father """
-    if not family:
+    if not family or not family.father:
         return None
-    father_handle = family.get_father_handle()
-    if father_handle:
-        return find_person(db, father_handle)
-    return None
+    return find_person(facts, family.father)
 
-def get_mother(db, family):
+def get_mother(facts, family):
     """ get a family's mother """
-    if not family:
+    if not family or not family.mother:
         return None
-    mother_handle = family.get_mother_handle()
-    if mother_handle:
-        return find_person(db, mother_handle)
-    return None
+    return find_person(facts, family.mother)
 
-def get_child_birth_dates(db, family, estimate):
+def get_child_birth_dates(facts, family, estimate):
     """ get a family's children's birth dates """
     dates = []
-    for child_ref in family.get_child_ref_list():
-        child = find_person(db, child_ref.ref)
-        child_birth_date = get_birth_date(db, child, estimate)
+    for child_ref in family.children:
+        child = find_person(facts, child_ref.ref)
+        child_birth_date = get_birth_date(facts, child, estimate)
         if child_birth_date > 0:
             dates.append(child_birth_date)
     return dates
 
-def get_n_children(db, person):
-    """ get the number of a family's children """
-    number = 0
-    for family_handle in person.get_family_handle_list():
-        family = find_family(db, family_handle)
-        if family:
-            number += len(family.get_child_ref_list())
-    return number
+#-------------------------------------------------------------------------
+#
+# The rules of the objects
+#
+#-------------------------------------------------------------------------
+def get_person_rules(facts, person, o_dict):
+    """ return the rules to check a person with """
+    est = o_dict['estimate_age']
+    return [
+        BirthAfterBapt(facts, person),
+        DeathBeforeBapt(facts, person),
+        BirthAfterBury(facts, person),
+        DeathAfterBury(facts, person),
+        BirthAfterDeath(facts, person),
+        BaptAfterBury(facts, person),
+        OldAge(facts, person, o_dict['oldage'], est),
+        OldAgeButNoDeath(facts, person, o_dict['oldage'], est),
+        UnknownGender(facts, person),
+        MultipleParents(facts, person),
+        MarriedOften(facts, person, o_dict['wedder']),
+        OldUnmarried(facts, person, o_dict['oldunm'], est),
+        TooManyChildren(facts, person, o_dict['mxchilddad'],
+                        o_dict['mxchildmom']),
+        Disconnected(facts, person),
+        InvalidBirthDate(facts, person, o_dict['invdate']),
+        InvalidDeathDate(facts, person, o_dict['invdate']),
+        BirthEqualsDeath(facts, person),
+        BirthEqualsMarriage(facts, person),
+        DeathEqualsMarriage(facts, person),
+        ]
+
+def get_family_rules(facts, family, o_dict):
+    """ return the rules to check a family with """
+    est = o_dict['estimate_age']
+    return [
+        SameSexFamily(facts, family),
+        FemaleHusband(facts, family),
+        MaleWife(facts, family),
+        SameSurnameFamily(facts, family),
+        LargeAgeGapFamily(facts, family, o_dict['hwdif'], est),
+        MarriageBeforeBirth(facts, family, est),
+        MarriageAfterDeath(facts, family, est),
+        EarlyMarriage(facts, family, o_dict['yngmar'], est),
+        LateMarriage(facts, family, o_dict['oldmar'], est),
+        OldParent(facts, family, o_dict['oldmom'], o_dict['olddad'], est),
+        YoungParent(facts, family, o_dict['yngmom'], o_dict['yngdad'], est),
+        UnbornParent(facts, family, est),
+        DeadParent(facts, family, est),
+        LargeChildrenSpan(facts, family, o_dict['cbspan'], est),
+        LargeChildrenAgeDiff(facts, family, o_dict['cspace'], est),
+        MarriedRelation(facts, family),
+        ]
+
+def check_objects(facts, obj_type, handles, o_dict):
+    """
+    Return the results of the rules broken by the people or families with
+    the handles, as obj_type is 'Person' or 'Family'.
+    """
+    results = []
+    for handle in handles:
+        if obj_type == 'Person':
+            rule_list = get_person_rules(facts, facts.people[handle], o_dict)
+        else:
+            rule_list = get_family_rules(facts, facts.families[handle],
+                                         o_dict)
+        for rule in rule_list:
+            if rule.broken():
+                results.append(rule.report_itself())
+    return results
 
-def get_marriage_date(db, family):
-    """ get a family's marriage date """
-    if not family:
-        return 0
-    for event_ref in family.get_event_ref_list():
-        event = find_event(db, event_ref.ref)
-        if (event.get_type() == EventType.MARRIAGE
-                and (event_ref.get_role() == EventRoleType.FAMILY
-                     or event_ref.get_role() == EventRoleType.PRIMARY)):
-            date_obj = event.get_date_object()
-            return date_obj.get_sort_value()
-    return 0
+#-------------------------------------------------------------------------
+#
+# Worker processes
+#
+#-------------------------------------------------------------------------
+_WORKER_FACTS = None
+_WORKER_OPTIONS = None
+
+def _init_worker(facts, o_dict):
+    """
+    Keep the facts and the options in a worker process.
+    """
+    global _WORKER_FACTS, _WORKER_OPTIONS
+    _WORKER_FACTS = facts
+    _WORKER_OPTIONS = o_dict
+
+def _check_chunk(chunk):
+    """
+    Return the results of the rules broken by an (object type, handles)
+    chunk of the objects, in a worker process.
+    """
+    obj_type, handles = chunk
+    return check_objects(_WORKER_FACTS, obj_type, handles, _WORKER_OPTIONS)
+
+def check_chunks(facts, o_dict, chunk_size, processes=0):
+    """
+    Check the people and then the families in (object type, handles) chunks
+    of chunk_size objects.  Yield each chunk with the results of the rules
+    its objects break, in database order.  With more than one process, the
+    chunks are checked by a pool of worker processes.
+    """
+    chunks = []
+    for obj_type, handles in (('Person', facts.person_handles),
+                              ('Family', facts.family_handles)):
+        for start in range(0, len(handles), chunk_size):
+            chunks.append((obj_type, handles[start:start + chunk_size]))
+
+    if processes > 1 and len(chunks) > 1:
+        context = multiprocessing.get_context('spawn')
+        with context.Pool(processes, _init_worker, (facts, o_dict)) as pool:
+            yield from zip(chunks, pool.imap(_check_chunk, chunks))
+    else:
+        for obj_type, handles in chunks:
+            yield ((obj_type, handles),
+                   check_objects(facts, obj_type, handles, o_dict))
 
 #-------------------------------------------------------------------------
 #
@@ -289,6 +483,9 @@ class Verify(tool.Tool, ManagedWindow, UpdateCallback):
     This is the research tool, not the low-level data ingerity check.
     """
 
+    # number of objects handed to a worker process at a time
+    PARALLEL_CHUNK = 5000
+
     def __init__(self, dbstate, user, options_class, name, callback=None):
         """ initialize things """
         uistate = user.uistate
@@ -336,6 +533,8 @@ class Verify(tool.Tool, ManagedWindow, UpdateCallback):
 
         o_dict = self.options.handler.options_dict
         for option in o_dict:
+            if option == 'processes': # not in the dialog
+                continue
             if option in ['estimate_age', 'invdate']:
                 self.top.get_object(option).set_active(o_dict[option])
             else:
@@ -358,6 +557,8 @@ class Verify(tool.Tool, ManagedWindow, UpdateCallback):
         close_button.set_sensitive(False)
         o_dict = self.options.handler.options_dict
         for option in o_dict:
+            if option == 'processes': # not in the dialog
+                continue
             if option in ['estimate_age', 'invdate']:
                 o_dict[option] = self.top.get_object(option).get_active()
             else:
@@ -402,81 +603,30 @@ class Verify(tool.Tool, ManagedWindow, UpdateCallback):
     def run_the_tool(self, cli=False):
         """ run the tool """
 
-        person_handles = self.db.iter_person_handles()
-
-        for option, value in self.options.handler.options_dict.items():
-            exec('%s = %s' % (option, value), globals())
-            # TODO my pylint doesn't seem to understand these variables really
-            # are defined here, so I have disabled the undefined-variable error
+        o_dict = self.options.handler.options_dict
+        processes = o_dict['processes']
 
         if self.v_r:
             self.v_r.real_model.clear()
 
-        self.set_total(self.db.get_number_of_people() +
-                       self.db.get_number_of_families())
-
-        for person_handle in person_handles:
-            person = find_person(self.db, person_handle)
-
-            rule_list = [
-                BirthAfterBapt(self.db, person),
-                DeathBeforeBapt(self.db, person),
-                BirthAfterBury(self.db, person),
-                DeathAfterBury(self.db, person),
-                BirthAfterDeath(self.db, person),
-                BaptAfterBury(self.db, person),
-                OldAge(self.db, person, oldage, estimate_age),
-                OldAgeButNoDeath(self.db, person, oldage, estimate_age),
-                UnknownGender(self.db, person),
-                MultipleParents(self.db, person),
-                MarriedOften(self.db, person, wedder),
-                OldUnmarried(self.db, person, oldunm, estimate_age),
-                TooManyChildren(self.db, person, mxchilddad, mxchildmom),
-                Disconnected(self.db, person),
-                InvalidBirthDate(self.db, person, invdate),
-                InvalidDeathDate(self.db, person, invdate),
-                BirthEqualsDeath(self.db, person),
-                BirthEqualsMarriage(self.db, person),
-                DeathEqualsMarriage(self.db, person),
-                ]
-
-            for rule in rule_list:
-                if rule.broken():
-                    self.add_results(rule.report_itself())
-
-            clear_cache()
-            if not cli:
-                self.update()
+        n_people = self.db.get_number_of_people()
+        n_families = self.db.get_number_of_families()
+        self.set_total(2 * (n_people + n_families) +
+                       self.db.get_number_of_events())
+
+        update = None if cli else self.update
+        facts = VerifyFacts(self.db, update)
+
+        for chunk, results in check_chunks(facts, o_dict,
+                                           self.PARALLEL_CHUNK, processes):
+            self.__add_chunk_results(chunk, results, cli)
 
-        # Family-based rules
-        for family_handle in self.db.iter_family_handles():
-            family = find_family(self.db, family_handle)
-
-            rule_list = [
-                SameSexFamily(self.db, family),
-                FemaleHusband(self.db, family),
-                MaleWife(self.db, family),
-                SameSurnameFamily(self.db, family),
-                LargeAgeGapFamily(self.db, family, hwdif, estimate_age),
-                MarriageBeforeBirth(self.db, family, estimate_age),
-                MarriageAfterDeath(self.db, family, estimate_age),
-                EarlyMarriage(self.db, family, yngmar, estimate_age),
-                LateMarriage(self.db, family, oldmar, estimate_age),
-                OldParent(self.db, family, oldmom, olddad, estimate_age),
-                YoungParent(self.db, family, yngmom, yngdad, estimate_age),
-                UnbornParent(self.db, family, estimate_age),
-                DeadParent(self.db, family, estimate_age),
-                LargeChildrenSpan(self.db, family, cbspan, estimate_age),
-                LargeChildrenAgeDiff(self.db, family, cspace, estimate_age),
-                MarriedRelation(self.db, family),
-                ]
-
-            for rule in rule_list:
-                if rule.broken():
-                    self.add_results(rule.report_itself())
-
-            clear_cache()
-            if not cli:
+    def __add_chunk_results(self, chunk, results, cli):
+        """ show the results of a chunk of the objects """
+        for result in results:
+            self.add_results(result)
+        if not cli:
+            for dummy in chunk[1]:
                 self.update()
 
 #-------------------------------------------------------------------------
@@ -792,6 +942,7 @@ class VerifyOptions(tool.ToolOptions):
             'oldunm'       : 99,
             'estimate_age' : 0,
             'invdate'      : 1,
+            'processes'    : 0,
         }
         # TODO these strings are defined in the glade file (more or less, since
         # those have accelerators), and so are not translated here, but that
@@ -837,6 +988,8 @@ class VerifyOptions(tool.ToolOptions):
             'invdate'      : ("=0/1", "Whether to check for invalid dates"
                               "Do not identify invalid dates",
                               "Identify invalid dates", True),
+            'processes'    : ("=num", "Number of worker processes",
+                              "0 to check the data in this process"),
         }
 
 #-------------------------------------------------------------------------
@@ -912,7 +1065,7 @@ class PersonRule(Rule):
     TYPE = 'Person'
     def get_name(self):
         """ return the person's primary name """
-        return self.obj.get_primary_name().get_name()
+        return self.obj.name
 
 class FamilyRule(Rule):
     """
@@ -921,7 +1074,7 @@ class FamilyRule(Rule):
     TYPE = 'Family'
     def get_name(self):
         """ return the name of the family """
-        return family_name(self.obj, self.db)
+        return self.obj.name
 
 #-------------------------------------------------------------------------
 #
@@ -1053,8 +1206,8 @@ class UnknownGender(PersonRule):
     SEVERITY = Rule.WARNING
     def broken(self):
         """ return boolean indicating whether this rule is violated """
-        female = self.obj.get_gender() == Person.FEMALE
-        male = self.obj.get_gender() == Person.MALE
+        female = self.obj.gender == Person.FEMALE
+        male = self.obj.gender == Person.MALE
         return not (male or female)
 
     def get_message(self):
@@ -1067,7 +1220,7 @@ class MultipleParents(PersonRule):
     SEVERITY = Rule.WARNING
     def broken(self):
         """ return boolean indicating whether this rule is violated """
-        n_parent_sets = len(self.obj.get_parent_family_handle_list())
+        n_parent_sets = self.obj.parent_families
         return n_parent_sets > 1
 
     def get_message(self):
@@ -1089,7 +1242,7 @@ class MarriedOften(PersonRule):
 
     def broken(self):
         """ return boolean indicating whether this rule is violated """
-        n_spouses = len(self.obj.get_family_handle_list())
+        n_spouses = len(self.obj.families)
         return n_spouses > self.wedder
 
     def get_message(self):
@@ -1113,7 +1266,7 @@ class OldUnmarried(PersonRule):
     def broken(self):
         """ return boolean indicating whether this rule is violated """
         age_at_death = get_age_at_death(self.db, self.obj, self.est)
-        n_spouses = len(self.obj.get_family_handle_list())
+        n_spouses = len(self.obj.families)
         return age_at_death / 365 > self.old_unm and n_spouses == 0
 
     def get_message(self):
@@ -1136,13 +1289,13 @@ class TooManyChildren(PersonRule):
 
     def broken(self):
         """ return boolean indicating whether this rule is violated """
-        n_child = get_n_children(self.db, self.obj)
+        n_child = self.obj.n_children
 
-        if (self.obj.get_gender == Person.MALE
+        if (self.obj.gender == Person.MALE
                 and n_child > self.mx_child_dad):
             return True
 
-        if (self.obj.get_gender == Person.FEMALE
+        if (self.obj.gender == Person.FEMALE
                 and n_child > self.mx_child_mom):
             return True
 
@@ -1161,9 +1314,9 @@ class SameSexFamily(FamilyRule):
         mother = get_mother(self.db, self.obj)
         father = get_father(self.db, self.obj)
         same_sex = (mother and father and
-                    (mother.get_gender() == father.get_gender()))
+                    (mother.gender == father.gender))
         unknown_sex = (mother and
-                       (mother.get_gender() == Person.UNKNOWN))
+                       (mother.gender == Person.UNKNOWN))
         return same_sex and not unknown_sex
 
     def get_message(self):
@@ -1177,7 +1330,7 @@ class FemaleHusband(FamilyRule):
     def broken(self):
         """ return boolean indicating whether this rule is violated """
         father = get_father(self.db, self.obj)
-        return father and (father.get_gender() == Person.FEMALE)
+        return father and (father.gender == Person.FEMALE)
 
     def get_message(self):
         """ return the rule's error message """
@@ -1190,7 +1343,7 @@ class MaleWife(FamilyRule):
     def broken(self):
         """ return boolean indicating whether this rule is violated """
         mother = get_mother(self.db, self.obj)
-        return mother and (mother.get_gender() == Person.MALE)
+        return mother and (mother.gender == Person.MALE)
 
     def get_message(self):
         """ return the rule's error message """
@@ -1208,17 +1361,12 @@ class SameSurnameFamily(FamilyRule):
 
         # Make sure both mother and father exist.
         if mother and father:
-            mname = mother.get_primary_name()
-            fname = father.get_primary_name()
-            # Only compare birth names (not married names).
-            if (mname.get_type() == NameType.BIRTH
-                    and fname.get_type() == NameType.BIRTH):
-                # Empty names don't count.
-                if (len(mname.get_surname()) != 0
-                        and len(fname.get_surname()) != 0):
-                    # Finally, check if the names are the same.
-                    if mname.get_surname() == fname.get_surname():
-                        _broken = True
+            # Only compare birth names (not married names), which are
+            # empty otherwise.  Empty names don't count.
+            if mother.birth_surname and father.birth_surname:
+                # Finally, check if the names are the same.
+                if mother.birth_surname == father.birth_surname:
+                    _broken = True
 
         return _broken
 
@@ -1271,7 +1419,7 @@ class MarriageBeforeBirth(FamilyRule):
 
     def broken(self):
         """ return boolean indicating whether this rule is violated """
-        marr_date = get_marriage_date(self.db, self.obj)
+        marr_date = self.obj.marriage
         marr_date_ok = marr_date > 0
 
         mother = get_mother(self.db, self.obj)
@@ -1307,7 +1455,7 @@ class MarriageAfterDeath(FamilyRule):
 
     def broken(self):
         """ return boolean indicating whether this rule is violated """
-        marr_date = get_marriage_date(self.db, self.obj)
+        marr_date = self.obj.marriage
         marr_date_ok = marr_date > 0
 
         mother = get_mother(self.db, self.obj)
@@ -1344,7 +1492,7 @@ class EarlyMarriage(FamilyRule):
 
     def broken(self):
         """ return boolean indicating whether this rule is violated """
-        marr_date = get_marriage_date(self.db, self.obj)
+        marr_date = self.obj.marriage
         marr_date_ok = marr_date > 0
 
         mother = get_mother(self.db, self.obj)
@@ -1385,7 +1533,7 @@ class LateMarriage(FamilyRule):
 
     def broken(self):
         """ return boolean indicating whether this rule is violated """
-        marr_date = get_marriage_date(self.db, self.obj)
+        marr_date = self.obj.marriage
         marr_date_ok = marr_date > 0
 
         mother = get_mother(self.db, self.obj)
@@ -1432,7 +1580,7 @@ class OldParent(FamilyRule):
         mother_birth_date_ok = mother_birth_date > 0
         father_birth_date_ok = father_birth_date > 0
 
-        for child_ref in self.obj.get_child_ref_list():
+        for child_ref in self.obj.children:
             child = find_person(self.db, child_ref.ref)
             child_birth_date = get_birth_date(self.db, child, self.est)
             child_birth_date_ok = child_birth_date > 0
@@ -1485,7 +1633,7 @@ class YoungParent(FamilyRule):
         mother_birth_date_ok = mother_birth_date > 0
         father_birth_date_ok = father_birth_date > 0
 
-        for child_ref in self.obj.get_child_ref_list():
+        for child_ref in self.obj.children:
             child = find_person(self.db, child_ref.ref)
             child_birth_date = get_birth_date(self.db, child, self.est)
             child_birth_date_ok = child_birth_date > 0
@@ -1536,7 +1684,7 @@ class UnbornParent(FamilyRule):
         mother_birth_date_ok = mother_birth_date > 0
         father_birth_date_ok = father_birth_date > 0
 
-        for child_ref in self.obj.get_child_ref_list():
+        for child_ref in self.obj.children:
             child = find_person(self.db, child_ref.ref)
             child_birth_date = get_birth_date(self.db, child, self.est)
             child_birth_date_ok = child_birth_date > 0
@@ -1584,7 +1732,7 @@ class DeadParent(FamilyRule):
         mother_death_date_ok = mother_death_date > 0
         father_death_date_ok = father_death_date > 0
 
-        for child_ref in self.obj.get_child_ref_list():
+        for child_ref in self.obj.children:
             child = find_person(self.db, child_ref.ref)
             child_birth_date = get_birth_date(self.db, child, self.est)
             child_birth_date_ok = child_birth_date > 0
@@ -1676,8 +1824,8 @@ class Disconnected(PersonRule):
     SEVERITY = Rule.WARNING
     def broken(self):
         """ return boolean indicating whether this rule is violated """
-        return (len(self.obj.get_parent_family_handle_list())
-                + len(self.obj.get_family_handle_list()) == 0)
+        return (self.obj.parent_families
+                + len(self.obj.families) == 0)
 
     def get_message(self):
         """ return the rule's error message """
@@ -1696,15 +1844,8 @@ class InvalidBirthDate(PersonRule):
         """ return boolean indicating whether this rule is violated """
         if not self._invdate: # should we check?
             return False
-        # if so, let's get the birth date
-        person = self.obj
-        birth_ref = person.get_birth_ref()
-        if birth_ref:
-            birth_event = self.db.get_event_from_handle(birth_ref.ref)
-            birth_date = birth_event.get_date_object()
-            if birth_date and not birth_date.get_valid():
-                return True
-        return False
+        # if so, let's look at the birth date
+        return self.obj.birth_invalid
 
     def get_message(self):
         """ return the rule's error message """
@@ -1723,15 +1864,8 @@ class InvalidDeathDate(PersonRule):
         """ return boolean indicating whether this rule is violated """
         if not self._invdate: # should we check?
             return False
-        # if so, let's get the death date
-        person = self.obj
-        death_ref = person.get_death_ref()
-        if death_ref:
-            death_event = self.db.get_event_from_handle(death_ref.ref)
-            death_date = death_event.get_date_object()
-            if death_date and not death_date.get_valid():
-                return True
-        return False
+        # if so, let's look at the death date
+        return self.obj.death_invalid
 
     def get_message(self):
         """ return the rule's error message """
@@ -1747,9 +1881,9 @@ class MarriedRelation(FamilyRule):
 
     def broken(self):
         """ return boolean indicating whether this rule is violated """
-        marr_date = get_marriage_date(self.db, self.obj)
+        marr_date = self.obj.marriage
         marr_date_ok = marr_date > 0
-        married = self.obj.get_relationship() == FamilyRelType.MARRIED
+        married = self.obj.married
         if not married and marr_date_ok:
             return self.get_message
 
@@ -1809,9 +1943,9 @@ class BirthEqualsMarriage(PersonRule):
         """ return boolean indicating whether this rule is violated """
         birth_date = get_birth_date(self.db, self.obj)
         birth_ok = birth_date > 0 if birth_date is not None else False
-        for fhandle in self.obj.get_family_handle_list():
-            family = self.db.get_family_from_handle(fhandle)
-            marr_date = get_marriage_date(self.db, family)
+        for fhandle in self.obj.families:
+            family = find_family(self.db, fhandle)
+            marr_date = family.marriage if family else 0
             marr_ok = marr_date > 0 if marr_date is not None else False
             return marr_ok and birth_ok and birth_date == marr_date
 
@@ -1827,9 +1961,9 @@ class DeathEqualsMarriage(PersonRule):
         """ return boolean indicating whether this rule is violated """
         death_date = get_death_date(self.db, self.obj)
         death_ok = death_date > 0 if death_date is not None else False
-        for fhandle in self.obj.get_family_handle_list():
-            family = self.db.get_family_from_handle(fhandle)
-            marr_date = get_marriage_date(self.db, family)
+        for fhandle in self.obj.families:
+            family = find_family(self.db, fhandle)
+            marr_date = family.marriage if family else 0
             marr_ok = marr_date > 0 if marr_date is not None else False
             return marr_ok and death_ok and death_date == marr_date
 
@@ -584,9 +584,10 @@ class RelationshipView(NavigationView):
                 self.bookmarks.redraw()
         self.redraw()
 
-    def get_name(self, handle, use_gender=False):
+    def get_name(self, handle, use_gender=False, person=None):
         if handle:
-            person = self.dbstate.db.get_person_from_handle(handle)
+            if person is None:
+                person = self.dbstate.db.get_person_from_handle(handle)
             name = name_displayer.display(person)
             if use_gender:
                 gender = self.symbols.get_symbol_for_string(person.gender)
@@ -1136,9 +1137,12 @@ class RelationshipView(NavigationView):
                     vbox = Gtk.Box(orientation=Gtk.Orientation.VERTICAL)
                     i = 1
                     child_list = [ref.ref for ref in family.get_child_ref_list()]
-                    for child_handle in child_list:
+                    children = self.dbstate.db.get_people_from_handles(
+                        child_list)
+                    for child_handle, child in zip(child_list, children):
                         child_should_be_linked = (child_handle != active)
-                        self.write_child(vbox, child_handle, i, child_should_be_linked)
+                        self.write_child(vbox, child_handle, i,
+                                         child_should_be_linked, child)
                         i += 1
                     eventbox = widgets.ShadeBox(self.use_shade)
                     eventbox.add(vbox)
@@ -1289,10 +1293,13 @@ class RelationshipView(NavigationView):
             lbl.set_margin_end(5)
         return lbl
 
-    def write_child(self, vbox, handle, index, child_should_be_linked):
+    def write_child(self, vbox, handle, index, child_should_be_linked,
+                    person=None):
         """
         Write a child cell (used for children and siblings of active person)
         """
+        if person is None:
+            person = self.dbstate.db.get_person_from_handle(handle)
         original_vbox = vbox
         # Always create a transparent eventbox to allow dnd drag
         ev = Gtk.EventBox()
@@ -1310,8 +1317,7 @@ class RelationshipView(NavigationView):
         else:
             original_vbox.pack_start(ev, True, True, 0)
 
-        parent = has_children(self.dbstate.db,
-                              self.dbstate.db.get_person_from_handle(handle))
+        parent = has_children(self.dbstate.db, person)
 
         format = ''
         relation_display_theme = self._config.get(
@@ -1329,7 +1335,7 @@ class RelationshipView(NavigationView):
         else:
             link_func = None
 
-        name = self.get_name(handle, True)
+        name = self.get_name(handle, True, person)
         link_label = widgets.LinkLabel(name, link_func, handle, emph,
                                        theme=self.theme)
         link_label.set_padding(3, 0)
@@ -1352,7 +1358,7 @@ class RelationshipView(NavigationView):
         vbox.pack_start(hbox, True, True, 0)
 
         if self.show_details:
-            value = self.info_string(handle)
+            value = self.info_string(handle, person)
             if value:
                 l = widgets.MarkupLabel(value)
                 l.set_margin_start(48)
@@ -1364,8 +1370,9 @@ class RelationshipView(NavigationView):
         label.set_selectable(selectable)
         box.add(label)
 
-    def info_string(self, handle):
-        person = self.dbstate.db.get_person_from_handle(handle)
+    def info_string(self, handle, person=None):
+        if person is None:
+            person = self.dbstate.db.get_person_from_handle(handle)
         if not person:
             return None
 
@@ -1636,9 +1643,10 @@ class RelationshipView(NavigationView):
 
                 vbox = Gtk.Box(orientation=Gtk.Orientation.VERTICAL)
                 i = 1
-                child_list = family.get_child_ref_list()
-                for child_ref in child_list:
-                    self.write_child(vbox, child_ref.ref, i, True)
+                child_list = [ref.ref for ref in family.get_child_ref_list()]
+                children = self.dbstate.db.get_people_from_handles(child_list)
+                for child_handle, child in zip(child_list, children):
+                    self.write_child(vbox, child_handle, i, True, child)
                     i += 1
 
                 self.row += 1
@@ -1930,8 +1938,7 @@ def has_children(db,p):
     """
     Return if a person has children.
     """
-    for family_handle in p.get_family_handle_list():
-        family = db.get_family_from_handle(family_handle)
+    for family in db.get_families_from_handles(p.get_family_handle_list()):
         if not family:
             continue
         childlist = family.get_child_ref_list()
@@ -118,7 +118,10 @@ class EventPages(BasePage):
             for event_handle in event_handle_list:
                 step()
                 index += 1
-                self.eventpage(self.report, title, event_handle)
+                if self.report.page_is_current(Event, event_handle):
+                    continue
+                with self.report.page_dependencies(Event, event_handle):
+                    self.eventpage(self.report, title, event_handle)
             step()
         self.eventlistpage(self.report, title, event_types,
                            event_handle_list)
@@ -113,7 +113,10 @@ class FamilyPages(BasePage):
             for family_handle in self.report.obj_dict[Family]:
                 step()
                 index += 1
-                self.familypage(self.report, title, family_handle)
+                if self.report.page_is_current(Family, family_handle):
+                    continue
+                with self.report.page_dependencies(Family, family_handle):
+                    self.familypage(self.report, title, family_handle)
             step()
             self.familylistpage(self.report, title,
                                 self.report.obj_dict[Family].keys())
@@ -0,0 +1,417 @@
+# -*- coding: utf-8 -*-
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+"""
+Narrative Web Page generator.
+
+The manifest of an incremental run: for each page of an object, the files
+written for it and what it was made from, so that the next run only writes
+the pages whose objects changed.
+
+Classes:
+    PageManifest
+    DependencyDb
+    DependencyDict
+"""
+#------------------------------------------------
+# python modules
+#------------------------------------------------
+from collections import defaultdict
+from hashlib import md5
+import json
+import logging
+import os
+import re
+
+#------------------------------------------------
+# Gramps module
+#------------------------------------------------
+from gramps.gen.const import VERSION
+from gramps.gen.errors import HandleError
+
+LOG = logging.getLogger(".NarrativeWeb")
+
+MANIFEST_NAME = ".narrativeweb.json"
+MANIFEST_VERSION = 2
+
+# database methods whose results a page depends on
+_OBJECT_METHOD = re.compile(r"get_([a-z]+)_from_handle$|has_([a-z]+)_handle$")
+_ID_METHOD = re.compile(r"get_([a-z]+)_from_gramps_id$")
+_HANDLES_METHOD = re.compile(r"get_([a-z]+)_handles$")
+_SETTING_METHODS = ("get_mediapath", "get_save_path", "get_dbname")
+# other database methods, which a page cannot be kept for
+_READ_METHOD = re.compile(r"(?:get|iter|find|has)_")
+
+def _freeze(value):
+    """
+    Return value with the objects and classes in it replaced by what stays
+    the same from one run to the next.
+    """
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted((_freeze(item) for item in value), key=repr))
+    if isinstance(value, type):
+        return value.__name__
+    if hasattr(value, "serialize"):
+        return value.serialize()
+    return value
+
+def _digest(value):
+    """
+    Return a short string which changes when value changes.
+    """
+    return md5(repr(value).encode("utf-8")).hexdigest()
+
+#------------------------------------------------
+#
+# PageManifest
+#
+#------------------------------------------------
+class PageManifest:
+    """
+    The manifest of the pages of the objects, kept in the output directory.
+
+    A page is current if nothing it read has changed since it was written,
+    and its files are still there.  What a page reads is recorded while it
+    is written, through a DependencyDb in place of the report database and
+    DependencyDict objects in the dictionaries of the report.  Each thing
+    read is kept as a key, with a state:
+
+    ("object", name, handle)     the object, as the report sees it
+    ("id", name, gramps_id)      the handle of the object with the ID
+    ("handles", name)            all the handles of the objects
+    ("setting", method)          a setting of the database, like its media path
+    ("backlinks", handle, ...)   the objects referring to the object
+    ("obj_dict", name, handle)   the entry of the object in the obj_dict
+    ("bkref_dict", name, handle) the entry of the object in the bkref_dict
+
+    A page which reads anything else is always written again.
+
+    The states are found through the proxies of the report, so a page is
+    also written again when what the private and living proxies leave of
+    an object it read changes, even if the object itself did not.
+    """
+
+    def __init__(self, html_dir, database, options):
+        """
+        @param: html_dir -- The output directory
+        @param: database -- The report database, with its proxies
+        @param: options  -- The options of the report
+        """
+        self.path = os.path.join(html_dir, MANIFEST_NAME)
+        self.html_dir = html_dir
+        self.database = database
+        self.report_dicts = {}
+        self.options = _digest((VERSION, sorted(options.items(), key=repr)))
+        self.states = {}
+        self.pages = {}
+        self.written = set()
+        self.recording = None
+
+        self.old_pages = {}
+        self.old_keys = []
+        self.old_states = []
+        self.keep_old = False
+        try:
+            with open(self.path, encoding="utf-8") as manifest:
+                data = json.load(manifest)
+            if data["version"] == MANIFEST_VERSION:
+                self.old_pages = data["pages"]
+                self.old_keys = [tuple(key) for key in data["keys"]]
+                self.old_states = data["states"]
+                self.keep_old = data["options"] == self.options
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError, TypeError) as err:
+            LOG.warning("ignoring the manifest %s: %s", self.path, err)
+
+    def add_report_dict(self, kind, report_dict):
+        """
+        Add a dictionary of the report, like the obj_dict, whose entries the
+        pages read.
+        """
+        self.report_dicts[kind] = {obj_class.__name__: entries
+                                   for obj_class, entries
+                                   in report_dict.items()}
+
+    def state(self, key):
+        """
+        Return the state of a key in this run.
+        """
+        if key not in self.states:
+            self.states[key] = self.__find_state(key)
+        return self.states[key]
+
+    def __find_state(self, key):
+        """
+        Find the state of a key.
+        """
+        kind = key[0]
+        if kind == "object":
+            func = self.database.method("get_%s_from_handle", key[1])
+            try:
+                obj = func(key[2]) if func else None
+            except HandleError:
+                obj = None
+            return None if obj is None else _digest(obj.serialize())
+        if kind == "id":
+            func = self.database.method("get_%s_from_gramps_id", key[1])
+            obj = func(key[2]) if func else None
+            return None if obj is None else obj.handle
+        if kind == "handles":
+            func = self.database.method("get_%s_handles", key[1])
+            return _digest(sorted(func())) if func else None
+        if kind == "setting":
+            return str(getattr(self.database, key[1])())
+        if kind == "backlinks":
+            include_classes = list(key[2:]) or None
+            return _digest(sorted(self.database.find_backlink_handles(
+                key[1], include_classes)))
+        if kind in self.report_dicts:
+            entries = self.report_dicts[kind].get(key[1], {})
+            value = dict.get(entries, key[2])
+            return _digest(_freeze(value)) if value else None
+        return None
+
+    def is_current(self, page):
+        """
+        Return True if the page need not be written again.  It is then kept
+        in the manifest as it is.
+        """
+        entry = self.old_pages.get(page) if self.keep_old else None
+        if entry is None or entry["deps"] is None:
+            return False
+        for index in entry["deps"]:
+            if self.state(self.old_keys[index]) != self.old_states[index]:
+                return False
+        for fname in entry["files"]:
+            if not os.path.exists(os.path.join(self.html_dir, fname)):
+                return False
+        self.pages[page] = {
+            "files": entry["files"],
+            "deps": {self.old_keys[index] for index in entry["deps"]},
+            "link": entry.get("link")}
+        return True
+
+    def get_link(self, page):
+        """
+        Return the link the page left for the pages after it, if any.
+        """
+        return self.pages[page]["link"]
+
+    def start(self, page):
+        """
+        Start recording what the page reads and the files written for it.
+        """
+        self.recording = {"files": [], "deps": set(), "link": None}
+        self.pages[page] = self.recording
+
+    def stop(self, link=None):
+        """
+        Stop recording the page, with the link it left for the pages after
+        it, if any.
+        """
+        self.recording["link"] = link
+        self.recording = None
+
+    def record(self, key):
+        """
+        Record that the page being written reads key.
+        """
+        if self.recording is not None and self.recording["deps"] is not None:
+            self.recording["deps"].add(key)
+
+    def record_all(self):
+        """
+        Record that the page being written reads something without a key,
+        so it is always written again.
+        """
+        if self.recording is not None:
+            self.recording["deps"] = None
+
+    def add_file(self, fname):
+        """
+        Note that a file was written, relative to the output directory.
+        """
+        self.written.add(fname)
+        if self.recording is not None:
+            self.recording["files"].append(fname)
+
+    def save(self):
+        """
+        Remove the files of the pages which are not in the web site anymore,
+        and save the manifest.
+        """
+        files = set(self.written)
+        for entry in self.pages.values():
+            files.update(entry["files"])
+        for entry in self.old_pages.values():
+            for fname in entry["files"]:
+                if fname not in files:
+                    files.add(fname)
+                    path = os.path.join(self.html_dir, fname)
+                    if os.path.isfile(path):
+                        LOG.debug("removing '%s'", path)
+                        os.remove(path)
+
+        keys = sorted({key for entry in self.pages.values()
+                       if entry["deps"] for key in entry["deps"]})
+        index = {key: number for number, key in enumerate(keys)}
+        pages = {}
+        for page, entry in self.pages.items():
+            deps = entry["deps"]
+            pages[page] = {
+                "files": entry["files"],
+                "deps": (None if deps is None
+                         else sorted(index[key] for key in deps)),
+                "link": entry["link"]}
+        data = {"version": MANIFEST_VERSION,
+                "options": self.options,
+                "keys": keys,
+                "states": [self.state(key) for key in keys],
+                "pages": pages}
+        with open(self.path + ".new", "w", encoding="utf-8") as manifest:
+            json.dump(data, manifest)
+        os.replace(self.path + ".new", self.path)
+
+#------------------------------------------------
+#
+# DependencyDb
+#
+#------------------------------------------------
+class DependencyDb:
+    """
+    A proxy for the report database, which records in a PageManifest what
+    the page being written reads.
+    """
+    def __init__(self, database, manifest):
+        """
+        @param: database -- The report database
+        @param: manifest -- The PageManifest
+        """
+        self.db = database
+        self.manifest = manifest
+
+    def __getattr__(self, attr):
+        """
+        Use the self.db version, recording what its methods return.
+        """
+        value = getattr(self.db, attr)
+        if not callable(value) or attr.startswith("_"):
+            return value
+        match = _OBJECT_METHOD.match(attr)
+        if match:
+            name = match.group(1) or match.group(2)
+            def func(handle):
+                self.manifest.record(("object", name, handle))
+                return value(handle)
+        elif _ID_METHOD.match(attr):
+            name = _ID_METHOD.match(attr).group(1)
+            def func(gramps_id):
+                self.manifest.record(("id", name, gramps_id))
+                obj = value(gramps_id)
+                if obj is not None:
+                    self.manifest.record(("object", name, obj.handle))
+                return obj
+        elif _HANDLES_METHOD.match(attr):
+            name = _HANDLES_METHOD.match(attr).group(1)
+            def func(*args, **kwargs):
+                self.manifest.record(("handles", name))
+                return value(*args, **kwargs)
+        elif attr in _SETTING_METHODS:
+            def func():
+                self.manifest.record(("setting", attr))
+                return value()
+        elif _READ_METHOD.match(attr):
+            def func(*args, **kwargs):
+                self.manifest.record_all()
+                return value(*args, **kwargs)
+        else:
+            return value
+        setattr(self, attr, func)
+        return func
+
+    def find_backlink_handles(self, handle, include_classes=None):
+        """
+        Find all objects that hold a reference to the object handle.
+        """
+        self.manifest.record(("backlinks", handle) +
+                             tuple(include_classes or ()))
+        return self.db.find_backlink_handles(handle, include_classes)
+
+    def method(self, fmt, *args):
+        """
+        Return the database method, recording what it returns.
+        """
+        func = self.db.method(fmt, *args)
+        return getattr(self, func.__name__) if func else None
+
+#------------------------------------------------
+#
+# DependencyDict
+#
+#------------------------------------------------
+class DependencyDict(defaultdict):
+    """
+    The entries of one class in a dictionary of the report, which records in
+    a PageManifest the entries the page being written reads.
+    """
+    def __init__(self, manifest, kind, name):
+        """
+        @param: manifest -- The PageManifest
+        @param: kind     -- The name of the dictionary, e.g. "obj_dict"
+        @param: name     -- The name of the class of the objects
+        """
+        defaultdict.__init__(self, set)
+        self.manifest = manifest
+        self.kind = kind
+        self.name = name
+
+    def __getitem__(self, handle):
+        self.manifest.record((self.kind, self.name, handle))
+        return defaultdict.__getitem__(self, handle)
+
+    def __contains__(self, handle):
+        self.manifest.record((self.kind, self.name, handle))
+        return defaultdict.__contains__(self, handle)
+
+    def get(self, handle, default=None):
+        self.manifest.record((self.kind, self.name, handle))
+        return defaultdict.get(self, handle, default)
+
+    def __iter__(self):
+        self.manifest.record_all()
+        return defaultdict.__iter__(self)
+
+    def __len__(self):
+        self.manifest.record_all()
+        return defaultdict.__len__(self)
+
+    def keys(self):
+        self.manifest.record_all()
+        return defaultdict.keys(self)
+
+    def values(self):
+        self.manifest.record_all()
+        return defaultdict.values(self)
+
+    def items(self):
+        self.manifest.record_all()
+        return defaultdict.items(self)
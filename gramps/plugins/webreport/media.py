@@ -153,8 +153,10 @@ class MediaPages(BasePage):
                     next_ = self.unused_media_handles[0]
                 else:
                     next_ = None
-                self.mediapage(self.report, title,
-                               handle, (prev, next_, index, media_count))
+                info = (prev, next_, index, media_count)
+                if not self.report.page_is_current(Media, handle, *info):
+                    with self.report.page_dependencies(Media, handle, *info):
+                        self.mediapage(self.report, title, handle, info)
                 prev = handle
                 step()
                 index += 1
@@ -170,8 +172,14 @@ class MediaPages(BasePage):
                         next_ = None
                     else:
                         next_ = self.unused_media_handles[idx]
-                    self.mediapage(self.report, title, media_handle,
-                                   (prev, next_, index, media_count))
+                    info = (prev, next_, index, media_count)
+                    if not self.report.page_is_current(Media, media_handle,
+                                                       *info):
+                        with self.report.page_dependencies(Media,
+                                                           media_handle,
+                                                           *info):
+                            self.mediapage(self.report, title, media_handle,
+                                           info)
                     prev = media_handle
                     step()
                     index += 1
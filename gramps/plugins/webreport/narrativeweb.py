@@ -55,6 +55,7 @@ import shutil
 import tarfile
 from io import BytesIO, TextIOWrapper
 from collections import defaultdict
+from contextlib import contextmanager
 from decimal import getcontext
 
 #------------------------------------------------
@@ -104,6 +105,8 @@ from gramps.plugins.webreport.download import DownloadPage
 from gramps.plugins.webreport.introduction import IntroductionPage
 from gramps.plugins.webreport.addressbook import AddressBookPage
 from gramps.plugins.webreport.addressbooklist import AddressBookListPage
+from gramps.plugins.webreport.manifest import (PageManifest, DependencyDb,
+                                               DependencyDict)
 
 from gramps.plugins.webreport.common import (get_gendex_data,
                                              HTTP, HTTPS, _WEB_EXT, CSS,
@@ -147,6 +150,12 @@ class NavWebReport(Report):
         stdoptions.run_private_data_option(self, menu)
         stdoptions.run_living_people_option(self, menu)
         self.database = CacheProxyDb(self.database)
+        # in an incremental run, only the pages of changed objects are written
+        self.manifest = None
+        if self.options['incremental'] and not self.options['archive']:
+            self.manifest = PageManifest(self.options['target'],
+                                         self.database, self.options)
+            self.database = DependencyDb(self.database, self.manifest)
         self._db = self.database
 
         filters_option = menu.get_option_by_name('filter')
@@ -507,6 +516,8 @@ class NavWebReport(Report):
             if len(_WRONGMEDIAPATH) > 10:
                 error += '\n ...'
             self.user.warn(_("Missing media objects:"), error)
+        if self.manifest:
+            self.manifest.save()
         self.database.clear_cache()
 
     def _build_obj_dict(self):
@@ -533,7 +544,17 @@ class NavWebReport(Report):
         # initialise the dictionary to empty in case no objects of any
         # particular class are incuded in the web report
         for obj_class in _obj_class_list:
-            self.obj_dict[obj_class] = defaultdict(set)
+            if self.manifest:
+                name = obj_class.__name__
+                self.obj_dict[obj_class] = DependencyDict(self.manifest,
+                                                          "obj_dict", name)
+                self.bkref_dict[obj_class] = DependencyDict(self.manifest,
+                                                            "bkref_dict", name)
+            else:
+                self.obj_dict[obj_class] = defaultdict(set)
+        if self.manifest:
+            self.manifest.add_report_dict("obj_dict", self.obj_dict)
+            self.manifest.add_report_dict("bkref_dict", self.bkref_dict)
 
         ind_list = self._db.iter_person_handles()
         ind_list = self.filter.apply(self._db, ind_list, user=self.user)
@@ -589,9 +610,10 @@ class NavWebReport(Report):
             # Now tell the events tab to display the individual events
             evt_ref_list = person.get_event_ref_list()
             if evt_ref_list:
-                for evt_ref in evt_ref_list:
+                events = self._db.get_events_from_handles(
+                    [evt_ref.ref for evt_ref in evt_ref_list])
+                for evt_ref, event in zip(evt_ref_list, events):
                     role = evt_ref.get_role().xml_str()
-                    event = self._db.get_event_from_handle(evt_ref.ref)
                     if event:
                         self._add_event(evt_ref.ref, Person, person_handle,
                                         role)
@@ -617,19 +639,22 @@ class NavWebReport(Report):
             # Tell the families tab to display this individuals families
             family_handle_list = person.get_family_handle_list()
             if family_handle_list:
-                for family_handle in person.get_family_handle_list():
+                families = self._db.get_families_from_handles(
+                    family_handle_list)
+                for family_handle, family in zip(family_handle_list, families):
                     self._add_family(family_handle, Person, person_handle)
 
                     # Tell the events tab to display the family events which
                     # are referenced from the individual page.
-                    family = self._db.get_family_from_handle(family_handle)
                     if family:
                         family_evt_ref_list = family.get_event_ref_list()
                         if family_evt_ref_list:
-                            for evt_ref in family_evt_ref_list:
+                            events = self._db.get_events_from_handles(
+                                [evt_ref.ref
+                                 for evt_ref in family_evt_ref_list])
+                            for evt_ref, event in zip(family_evt_ref_list,
+                                                      events):
                                 role = evt_ref.get_role().xml_str()
-                                event = self._db.get_event_from_handle(
-                                    evt_ref.ref)
                                 if event:
                                     self._add_event(evt_ref.ref, Person,
                                                     person_handle, "Primary")
@@ -727,9 +752,11 @@ class NavWebReport(Report):
                 self._add_media(media_handle, Family, family_handle)
 
         ############### Events section ##############
-        for evt_ref in family.get_event_ref_list():
+        evt_ref_list = family.get_event_ref_list()
+        events = self._db.get_events_from_handles(
+            [evt_ref.ref for evt_ref in evt_ref_list])
+        for evt_ref, event in zip(evt_ref_list, events):
             role = evt_ref.get_role().xml_str()
-            event = self._db.get_event_from_handle(evt_ref.ref)
             place_handle = event.get_place_handle()
             if place_handle:
                 self._add_place(place_handle, Family, family_handle, event)
@@ -1259,9 +1286,9 @@ class NavWebReport(Report):
         """
         url_addr_res = []
 
-        for person_handle in ind_list:
+        people = self._db.get_people_from_handles(ind_list)
+        for person_handle, person in zip(ind_list, people):
 
-            person = self._db.get_person_from_handle(person_handle)
             addrlist = person.get_address_list()
             evt_ref_list = person.get_event_ref_list()
             urllist = person.get_url_list()
@@ -1270,8 +1297,9 @@ class NavWebReport(Report):
             url = urllist or None
             res = []
 
-            for event_ref in evt_ref_list:
-                event = self._db.get_event_from_handle(event_ref.ref)
+            events = self._db.get_events_from_handles(
+                [event_ref.ref for event_ref in evt_ref_list])
+            for event in events:
                 if event.get_type() == EventType.RESIDENCE:
                     res.append(event)
 
@@ -1484,6 +1512,8 @@ class NavWebReport(Report):
                 self.cur_fname = os.path.join(subdir, fname) + ext
             else:
                 self.cur_fname = fname + ext
+        if self.manifest:
+            self.manifest.add_file(self.cur_fname)
         if self.archive:
             string_io = BytesIO()
             output_file = TextIOWrapper(string_io, encoding=self.encoding,
@@ -1586,6 +1616,8 @@ class NavWebReport(Report):
                 try:
                     shutil.copyfile(from_fname, dest)
                     os.utime(dest, (mtime, mtime))
+                    if self.manifest:
+                        self.manifest.add_file(os.path.join(to_dir, to_fname))
                 except Exception as exception:
                     LOG.exception(exception)
                     print("Copying error: %s" % sys.exc_info()[1])
@@ -1601,6 +1633,53 @@ class NavWebReport(Report):
                       "web pages."))
                 self.warn_dir = False
 
+    def page_is_current(self, obj_class, handle, *args):
+        """
+        In an incremental run, return True if the page of the object was
+        written by the last run and nothing it shows changed since.
+
+        @param: obj_class -- The class of the object
+        @param: handle    -- The handle of the object
+        @param: args      -- What else the page is written for
+        """
+        if self.manifest is None:
+            return False
+        page = self.__page_name(obj_class, handle, args)
+        if not self.manifest.is_current(page):
+            return False
+        link = self.manifest.get_link(page)
+        if link:
+            self.fam_link[handle] = link
+        return True
+
+    @contextmanager
+    def page_dependencies(self, obj_class, handle, *args):
+        """
+        In an incremental run, record what the page of the object written
+        in the context shows, for the next run.
+
+        @param: obj_class -- The class of the object
+        @param: handle    -- The handle of the object
+        @param: args      -- What else the page is written for
+        """
+        if self.manifest is None:
+            yield
+            return
+        page = self.__page_name(obj_class, handle, args)
+        self.manifest.start(page)
+        try:
+            yield
+        finally:
+            self.manifest.stop(self.fam_link.get(handle))
+
+    @staticmethod
+    def __page_name(obj_class, handle, args):
+        """
+        Return the name of the page of the object in the manifest.
+        """
+        return "/".join([obj_class.__name__, handle] +
+                        [str(arg) for arg in args])
+
     def person_in_webreport(self, person_handle):
         """
         Return the handle if we created a page for this person.
@@ -1713,6 +1792,14 @@ class NavWebOptions(MenuReportOptions):
                                  "files"))
         addopt("target", self.__target)
 
+        self.__incremental = BooleanOption(
+            _('Only write the pages of changed objects'), False)
+        self.__incremental.set_help(
+            _('Whether to keep the pages of the people, families, events, '
+              'places, sources, repositories and media which did not change '
+              'since the web site was last written to the destination'))
+        addopt("incremental", self.__incremental)
+
         self.__archive_changed()
 
         title = StringOption(_("Web site title"), _('My Family Tree'))
@@ -2311,8 +2398,10 @@ class NavWebOptions(MenuReportOptions):
         if self.__archive.get_value() is True:
             self.__target.set_extension(".tar.gz")
             self.__target.set_directory_entry(False)
+            self.__incremental.set_available(False)
         else:
             self.__target.set_directory_entry(True)
+            self.__incremental.set_available(True)
 
     def __update_filters(self):
         """
@@ -147,8 +147,11 @@ class PersonPages(BasePage):
             for person_handle in sorted(self.report.obj_dict[Person]):
                 step()
                 index += 1
-                person = self.r_db.get_person_from_handle(person_handle)
-                self.individualpage(self.report, title, person)
+                if self.report.page_is_current(Person, person_handle):
+                    continue
+                with self.report.page_dependencies(Person, person_handle):
+                    person = self.r_db.get_person_from_handle(person_handle)
+                    self.individualpage(self.report, title, person)
             step()
             self.individuallistpage(self.report, title,
                                     self.report.obj_dict[Person].keys())
@@ -126,7 +126,13 @@ class PlacePages(BasePage):
                 step()
                 p_handle = self.report.obj_dict[PlaceName][place_name]
                 index += 1
-                self.placepage(self.report, title, p_handle[0], place_name)
+                if self.report.page_is_current(Place, p_handle[0],
+                                               place_name):
+                    continue
+                with self.report.page_dependencies(Place, p_handle[0],
+                                                   place_name):
+                    self.placepage(self.report, title, p_handle[0],
+                                   place_name)
             step()
             self.placelistpage(self.report, title)
 
@@ -119,7 +119,10 @@ class RepositoryPages(BasePage):
                 (repo, handle) = repos_dict[key]
                 step()
                 idx += 1
-                self.repositorypage(self.report, title, repo, handle)
+                if self.report.page_is_current(Repository, handle):
+                    continue
+                with self.report.page_dependencies(Repository, handle):
+                    self.repositorypage(self.report, title, repo, handle)
 
     def repositorylistpage(self, report, title, repos_dict, keys):
         """
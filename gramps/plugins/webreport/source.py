@@ -110,7 +110,10 @@ class SourcePages(BasePage):
             for source_handle in self.report.obj_dict[Source]:
                 step()
                 index += 1
-                self.sourcepage(self.report, title, source_handle)
+                if self.report.page_is_current(Source, source_handle):
+                    continue
+                with self.report.page_dependencies(Source, source_handle):
+                    self.sourcepage(self.report, title, source_handle)
 
     def sourcelistpage(self, report, title, source_handles):
         """
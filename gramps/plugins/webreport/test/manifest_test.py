@@ -0,0 +1,97 @@
+#
+# Gramps - a GTK+/GNOME based genealogy program
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+#
+
+""" Unittest for the manifest of the narrated web site """
+
+import os
+import tempfile
+import unittest
+
+from gramps.gen.db import DbTxn
+from gramps.gen.db.utils import make_database
+from gramps.gen.lib import Citation, Person, Source
+from gramps.gen.proxy import PrivateProxyDb
+from ..manifest import PageManifest, DependencyDb
+
+PAGE = "person"
+
+class PageManifestTest(unittest.TestCase):
+    def setUp(self):
+        self.db = make_database("sqlite")
+        self.db.load(":memory:")
+        source = Source()
+        self.citation = Citation()
+        self.person = Person()
+        with DbTxn('Add test objects', self.db) as trans:
+            self.db.add_source(source, trans)
+            self.citation.set_reference_handle(source.handle)
+            self.db.add_citation(self.citation, trans)
+            self.person.add_citation(self.citation.handle)
+            self.db.add_person(self.person, trans)
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.html_dir = self.tmpdir.name
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+        self.db.close()
+
+    def __write(self):
+        """
+        Write the page of the person through the private proxy, unless it is
+        current, and return True if it was written.
+        """
+        database = PrivateProxyDb(self.db)
+        manifest = PageManifest(self.html_dir, database, {})
+        written = not manifest.is_current(PAGE)
+        if written:
+            manifest.start(PAGE)
+            DependencyDb(database, manifest).get_person_from_handle(
+                self.person.handle)
+            fname = "person.html"
+            with open(os.path.join(self.html_dir, fname), "w") as page:
+                page.write("page")
+            manifest.add_file(fname)
+            manifest.stop()
+        manifest.save()
+        return written
+
+    def test_unchanged(self):
+        self.assertTrue(self.__write())
+        self.assertFalse(self.__write())
+
+    def test_changed(self):
+        self.assertTrue(self.__write())
+        with DbTxn('Change test objects', self.db) as trans:
+            self.db.commit_person(self.person, trans, 1)
+        self.assertTrue(self.__write())
+
+    def test_private_reference(self):
+        """
+        A page is written again when an object it shows becomes private,
+        though the object of the page did not change.
+        """
+        self.assertTrue(self.__write())
+        self.citation.set_privacy(True)
+        with DbTxn('Change test objects', self.db) as trans:
+            self.db.commit_citation(self.citation, trans)
+        self.assertTrue(self.__write())
+        self.assertFalse(self.__write())
+
+
+if __name__ == "__main__":
+    unittest.main()